@@ -0,0 +1,132 @@
+"""
+Build the map from a PDF plan, in one command
+
+Runs the pipeline stages the map needs on every floor (in parallel, cached,
+see pipeline.py), then publishes one versioned artifact that the server
+loads, and serves to the app as wall tiles (services/map_tiles.py):
+
+    echoaid-server/maps/<version>.json   + maps/manifest.json ("current")
+    echoaid-app/src/map/fallback.json    coarsest tile, for the app without a server
+
+The version is a hash of the artifact's content, so rebuilding an unchanged
+plan reproduces the same version and the same bytes.
+
+Run with:
+    python build_map.py floorplan.pdf
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from pipeline import HERE, build, digest, write_floor
+from nav_graph import transform_nav
+from transform_walls import load_transform
+
+FORMAT = 1
+ROOT = os.path.dirname(HERE)
+SERVER_MAPS = os.path.join(ROOT, 'echoaid-server', 'maps')
+APP_FALLBACK = os.path.join(ROOT, 'echoaid-app', 'src', 'map', 'fallback.json')
+
+# The app's fallback is cut by the same tiler the server uses
+sys.path.append(os.path.join(ROOT, 'echoaid-server'))
+from services.map_tiles import MapTiles
+
+# Stages whose outputs go into the artifact
+ARTIFACT_STAGES = ['walls_transformed', 'nav_graph']
+
+
+def make_artifact(pdf_path: str, floors: list, transform: dict) -> dict:
+    """
+    Artifact for the given floor outputs
+
+    Walls are in room coordinate space (the space RAW uses), one
+    [x1, y1, x2, y2] per wall, rounded to 0.1. The generated nav graph
+    (nodes shaped like RAW, edges as [id, id]) is in the same space.
+    """
+    payload = {
+        'format': FORMAT,
+        'source': os.path.basename(pdf_path),
+        'transform': transform,
+        'floors': [{
+            'floor': outputs['summary']['floor'],
+            'walls': np.round(outputs['walls_transformed'].astype(float), 1).tolist(),
+            'nav': transform_nav(outputs['nav_graph'], transform),
+        } for outputs in floors],
+    }
+    return {'version': digest(payload)[:12], **payload}
+
+
+def write_json(path: str, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(value, f, separators=(',', ':'))
+    os.replace(tmp, path)
+
+
+def publish(artifact: dict, keep: int = 3):
+    """Write the artifact for the server, keeping the last few versions"""
+    version = artifact['version']
+    write_json(os.path.join(SERVER_MAPS, f"{version}.json"), artifact)
+
+    manifest_path = os.path.join(SERVER_MAPS, 'manifest.json')
+    try:
+        with open(manifest_path) as f:
+            history = json.load(f).get('history', [])
+    except (OSError, ValueError):
+        history = []
+    history = [version] + [v for v in history if v != version]
+    for old in history[keep:]:
+        try:
+            os.remove(os.path.join(SERVER_MAPS, f"{old}.json"))
+        except OSError:
+            pass
+    write_json(manifest_path, {'format': FORMAT, 'current': version, 'history': history[:keep]})
+    write_json(APP_FALLBACK, app_fallback(artifact))
+
+
+def app_fallback(artifact: dict, floor: int = 0) -> dict:
+    """Level-0 wall tile of a floor (a few KB), bundled so offline simulation still shows the plan"""
+    tiles = MapTiles(artifact)
+    entry = tiles.floors[floor]
+    return {
+        'version': artifact['version'],
+        'floor': floor,
+        'origin': entry['origin'],
+        'size': entry['size'],
+        'tile': base64.b64encode(tiles.get(artifact['version'], floor, 0, 0, 0).raw).decode(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build and publish the map artifact from a PDF plan')
+    parser.add_argument('pdf', nargs='?', default=os.path.join(HERE, 'floorplan.pdf'))
+    parser.add_argument('--cache', default=os.path.join(HERE, '.map_cache'), help='Stage cache directory')
+    parser.add_argument('--out', default=os.path.join(HERE, 'build'), help='Where intermediates (.npy) are written')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per core)')
+    parser.add_argument('--mode', choices=['auto', 'vector', 'raster'], default='auto', help='Wall extraction mode')
+    parser.add_argument('--transform', default=os.path.join(HERE, 'coordinate_transform.json'))
+    parser.add_argument('--dry-run', action='store_true', help='Build but do not publish')
+    args = parser.parse_args()
+
+    started = time.time()
+    transform = load_transform(args.transform)
+    floors = build(args.pdf, args.cache, args.workers, args.mode, transform, ARTIFACT_STAGES)
+    for outputs in floors:
+        write_floor(outputs, args.out)
+        summary = outputs['summary']
+        print(f"Floor {summary['floor']}: {len(outputs['walls_transformed'])} walls, "
+              f"{len(outputs['nav_graph']['nodes'])} nav nodes in {summary['seconds']}s "
+              f"(cached: {', '.join(summary['cached']) or 'none'}; computed: {', '.join(summary['computed']) or 'none'})")
+
+    artifact = make_artifact(args.pdf, floors, transform)
+    if not args.dry_run:
+        publish(artifact)
+        print(f"Published map {artifact['version']} to {os.path.relpath(SERVER_MAPS, ROOT)}")
+    print(f"Done in {time.time() - started:.1f}s")
@@ -3,6 +3,8 @@ import cv2
 import numpy as np
 import json
 import pytesseract
+from concurrent.futures import ThreadPoolExecutor
+from extract_walls import render_page
 
 # --- 1. THE DELETE LIST ---
 EXCLUDE_LIST = [132, 131, 1, 129, 128, 127, 126, 20, 19, 17, 16, 15, 14, 140, 88, 130, 18, 53, 12, 0]
@@ -10,22 +12,108 @@ EXCLUDE_LIST = [132, 131, 1, 129, 128, 127, 126, 20, 19, 17, 16, 15, 14, 140, 88
 # --- 2. THE EXIT LIST ---
 EXIT_IDS = [1088, 23, 133, 125, 8]
 
-def extract_with_id_markers(pdf_path, output_file='final_rooms.geojson'):
-    doc = fitz.open(pdf_path)
-    page = doc.load_page(0)
-    pix = page.get_pixmap(matrix=fitz.Matrix(3, 3))
-    img_data = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
-    img = cv2.cvtColor(img_data, cv2.COLOR_RGB2BGR)
-    
-    vis_img = cv2.addWeighted(img, 0.8, np.full(img.shape, (204, 255, 255), np.uint8), 0.2, 0)
+# --- 3. OCR SETTINGS ---
+DIGITS = '-c tessedit_char_whitelist=0123456789'
+PAD = 30  # Half-size of the box around a room centroid that its label must fall in
+
+
+def ocr_page_tokens(gray):
+    """
+    One tesseract pass over the whole page (sparse text mode)
+
+    Returns:
+        List of (center x, center y, top, left, text, confidence) for every digit token
+    """
+    data = pytesseract.image_to_data(gray, config=f'--psm 11 {DIGITS}', output_type=pytesseract.Output.DICT)
+    tokens = []
+    for text, conf, left, top, w, h in zip(data['text'], data['conf'], data['left'],
+                                           data['top'], data['width'], data['height']):
+        text = text.strip()
+        if text and float(conf) > 0:
+            tokens.append((left + w / 2, top + h / 2, top, left, text, float(conf)))
+    return tokens
+
+
+def assign_tokens(tokens, centroids, pad=PAD):
+    """
+    Give every OCR token to the nearest room whose label box contains it
+
+    Returns:
+        One label per centroid (tokens joined in reading order), or None
+    """
+    labels = [None] * len(centroids)
+    if not tokens or not centroids:
+        return labels
+
+    points = np.array([(x, y) for x, y, *_ in tokens])
+    rooms = np.array(centroids, dtype=float)
+    d = np.abs(points[:, None, :] - rooms[None, :, :])  # tokens x rooms x (dx, dy)
+    inside = (d[:, :, 0] < pad) & (d[:, :, 1] < pad)
+    dist = np.where(inside, np.hypot(d[:, :, 0], d[:, :, 1]), np.inf)
+    nearest = dist.argmin(axis=1)
+
+    per_room = {}
+    for t, room in enumerate(nearest):
+        if np.isfinite(dist[t, room]):
+            per_room.setdefault(int(room), []).append(tokens[t])
+    for room, room_tokens in per_room.items():
+        labels[room] = ''.join(text for _, _, top, left, text, _ in sorted(room_tokens, key=lambda tok: (tok[2] // 10, tok[3])))
+    return labels
+
+
+def ocr_roi(roi):
+    """Single-ROI fallback for rooms the page pass found no label for"""
+    try:
+        return pytesseract.image_to_string(roi, config=f'--psm 10 {DIGITS}').strip()
+    except Exception:
+        return ''
+
+
+def ocr_labels(gray, centroids, workers=None):
+    """
+    Room labels for every centroid
+
+    The page pass replaces one tesseract process per room; rooms it missed
+    are retried one ROI at a time, in parallel (each call is its own
+    tesseract process, so threads scale with cores).
+    """
+    try:
+        labels = assign_tokens(ocr_page_tokens(gray), centroids)
+    except Exception as e:
+        print(f"Page OCR failed ({e}), falling back to per-room OCR")
+        labels = [None] * len(centroids)
+
+    missing = [i for i, label in enumerate(labels) if not label]
+    rois = [gray[max(0, cY-PAD):min(gray.shape[0], cY+PAD), max(0, cX-PAD):min(gray.shape[1], cX+PAD)]
+            for cX, cY in (centroids[i] for i in missing)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for i, text in zip(missing, pool.map(ocr_roi, rois)):
+            labels[i] = text or None
+
+    print(f"OCR: {len(centroids) - len(missing)} labels from the page pass, "
+          f"{sum(labels[i] is not None for i in missing)}/{len(missing)} from per-room retries")
+    return labels
+
+
+def find_rooms(img, exclude=EXCLUDE_LIST, exit_ids=EXIT_IDS, workers=None):
+    """
+    Room and exit markers on a rendered page
+
+    Args:
+        img: BGR page image (3x)
+        exclude: Internal IDs to drop (hand-picked per floor)
+        exit_ids: Internal IDs that are exits
+
+    Returns:
+        GeoJSON point features
+    """
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     _, thresh = cv2.threshold(gray, 230, 255, cv2.THRESH_BINARY_INV)
     kernel = np.ones((7, 7), np.uint8) 
     closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
     contours, _ = cv2.findContours(closed, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
 
-    features = []
-    found_rooms = [] 
+    rooms = []  # (cX, cY, id), labelled after all rooms are found
     internal_id_counter = 0
     
     contours = sorted(contours, key=lambda c: cv2.boundingRect(c)[1])
@@ -39,51 +127,65 @@ def extract_with_id_markers(pdf_path, output_file='final_rooms.geojson'):
 
                 # --- FIXED LINE BELOW ---
                 # We use *rest to tell Python "ignore the other values in the list"
-                if any(abs(cX - px) < 40 and abs(cY - py) < 40 for (px, py, *rest) in found_rooms):
+                if any(abs(cX - px) < 40 and abs(cY - py) < 40 for (px, py, *rest) in rooms):
                     continue
 
                 current_id = internal_id_counter
                 internal_id_counter += 1
 
-                if current_id in EXCLUDE_LIST:
+                if current_id in exclude:
                     continue
 
-                if current_id in EXIT_IDS:
-                    label = "EXIT"
-                    marker_type = "EXIT"
-                    color = (255, 0, 0) # Blue for exits
-                else:
-                    pad = 30
-                    roi = gray[max(0, cY-pad):min(img.shape[0], cY+pad), max(0, cX-pad):min(img.shape[1], cX+pad)]
-                    try:
-                        text = pytesseract.image_to_string(roi, config='--psm 10 -c tessedit_char_whitelist=0123456789').strip()
-                        label = text if text else str(current_id)
-                    except:
-                        label = str(current_id)
-                    marker_type = "ROOM"
-                    color = (0, 0, 255) # Red for rooms
-
-                found_rooms.append((cX, cY, label, color))
-
-                features.append({
-                    "type": "Feature",
-                    "geometry": {"type": "Point", "coordinates": [float(cX), float(cY)]},
-                    "properties": {
-                        "id": current_id,
-                        "type": marker_type,
-                        "label": label
-                    }
-                })
-
-    for (cX, cY, label, color) in found_rooms:
+                rooms.append((cX, cY, current_id))
+
+    # --- OCR all room labels at once ---
+    room_centroids = [(cX, cY) for cX, cY, current_id in rooms if current_id not in exit_ids]
+    labels = iter(ocr_labels(gray, room_centroids, workers))
+
+    features = []
+    for cX, cY, current_id in rooms:
+        if current_id in exit_ids:
+            label = "EXIT"
+            marker_type = "EXIT"
+        else:
+            label = next(labels) or str(current_id)
+            marker_type = "ROOM"
+
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [float(cX), float(cY)]},
+            "properties": {
+                "id": current_id,
+                "type": marker_type,
+                "label": label
+            }
+        })
+    return features
+
+
+def draw_rooms(img, features, output_png='final_verification_with_exits.png'):
+    """Verification image: every marker and its label over the page"""
+    vis_img = cv2.addWeighted(img, 0.8, np.full(img.shape, (204, 255, 255), np.uint8), 0.2, 0)
+    for feature in features:
+        cX, cY = (int(c) for c in feature["geometry"]["coordinates"])
+        label = feature["properties"]["label"]
+        color = (255, 0, 0) if feature["properties"]["type"] == "EXIT" else (0, 0, 255) # Blue exits, red rooms
         cv2.circle(vis_img, (cX, cY), 10, (255, 255, 255), -1)
         cv2.circle(vis_img, (cX, cY), 6, color, -1)
         cv2.putText(vis_img, label, (cX + 12, cY + 12), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
+    cv2.imwrite(output_png, vis_img)
+
+
+def extract_with_id_markers(pdf_path, output_file='final_rooms.geojson', workers=None):
+    doc = fitz.open(pdf_path)
+    img = render_page(doc.load_page(0))
 
-    cv2.imwrite('final_verification_with_exits.png', vis_img)
+    features = find_rooms(img, workers=workers)
+    draw_rooms(img, features)
     with open(output_file, 'w') as f:
         json.dump({"type": "FeatureCollection", "features": features}, f, indent=4)
 
     print(f"File saved! {len(features)} points processed.")
 
-extract_with_id_markers('floorplan.pdf')
\ No newline at end of file
+if __name__ == "__main__":
+    extract_with_id_markers('floorplan.pdf')
@@ -2,19 +2,89 @@ import fitz
 import cv2
 import numpy as np
 import json
+import argparse
+
+SCALE = 3  # Same scale as room extraction (3x)
+
+# CAD layers that block walking (matched as substrings, case-insensitive).
+# Doors are left out on purpose: they are openings.
+WALL_LAYERS = ['WALL', 'WINDOW', 'COLUMN']
+
+# Fewer vector segments than this means a scanned plan: use the raster path
+MIN_VECTOR_SEGMENTS = 50
 
-def extract_walls(pdf_path, output_file='walls.json'):
-    """Extract wall segments from PDF floor plan"""
-    doc = fitz.open(pdf_path)
-    page = doc.load_page(0)
 
-    # Same scale as room extraction (3x)
-    pix = page.get_pixmap(matrix=fitz.Matrix(3, 3))
+def render_page(page, scale=SCALE):
+    """Rasterize a page to a BGR image"""
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale))
     img_data = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.h, pix.w, pix.n)
-    img = cv2.cvtColor(img_data, cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(img_data, cv2.COLOR_RGB2BGR)
 
-    print(f"Image size: {img.shape[1]}x{img.shape[0]}")
 
+def keep_axis_aligned(walls, min_length):
+    """Only keep horizontal or vertical walls (within ~6 degrees) of at least min_length"""
+    kept = []
+    for x1, y1, x2, y2 in walls:
+        dx = abs(x2 - x1)
+        dy = abs(y2 - y1)
+        length = np.sqrt(dx**2 + dy**2)
+
+        if length < min_length:  # Skip very short segments
+            continue
+
+        # Check if mostly horizontal or vertical
+        if dx > dy:  # Horizontal
+            if dy / dx < 0.1:  # Within ~6 degrees of horizontal
+                kept.append([int(x1), int(y1), int(x2), int(y2)])
+        else:  # Vertical
+            if dx / dy < 0.1:  # Within ~6 degrees of vertical
+                kept.append([int(x1), int(y1), int(x2), int(y2)])
+    return kept
+
+
+def vector_walls(page, scale=SCALE, layers=WALL_LAYERS):
+    """
+    Wall segments read straight from the page's vector drawing operators
+
+    Lines, rectangles and quads of stroked paths become exact segments in
+    the same pixel space as the rendered image (page rotation included).
+    If the PDF has CAD layers, only wall-like layers are used.
+
+    Returns:
+        List of [x1, y1, x2, y2], or None if the page has too little vector
+        geometry to be a CAD export (e.g. a scanned plan)
+    """
+    drawings = [d for d in page.get_drawings() if d['type'] in ('s', 'fs')]
+    if any(d.get('layer') for d in drawings):
+        wanted = [layer.upper() for layer in layers]
+        drawings = [d for d in drawings if any(w in (d.get('layer') or '').upper() for w in wanted)]
+
+    to_pixels = page.rotation_matrix * fitz.Matrix(scale, scale)
+    segments = []
+    for drawing in drawings:
+        for item in drawing['items']:
+            if item[0] == 'l':
+                points = [item[1], item[2]]
+            elif item[0] == 're':
+                rect = item[1]
+                points = [rect.tl, rect.tr, rect.br, rect.bl, rect.tl]
+            elif item[0] == 'qu':
+                quad = item[1]
+                points = [quad.ul, quad.ur, quad.lr, quad.ll, quad.ul]
+            else:
+                continue  # Curves: door swings, fixtures
+
+            points = [p * to_pixels for p in points]
+            for a, b in zip(points, points[1:]):
+                segments.append([round(a.x), round(a.y), round(b.x), round(b.y)])
+
+    if len(segments) < MIN_VECTOR_SEGMENTS:
+        return None
+    return segments
+
+
+def raster_walls(img):
+    """Wall segments from a rendered page (Canny + Hough), for scanned plans"""
     # Convert to grayscale
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
 
@@ -30,30 +100,65 @@ def extract_walls(pdf_path, output_file='walls.json'):
                             minLineLength=20, maxLineGap=10)
 
     if lines is None:
+        return []
+    return lines.reshape(-1, 4).tolist()
+
+
+def page_walls(page, mode='auto', render=None):
+    """
+    Wall segments of one page
+
+    Args:
+        mode: 'vector' (drawing operators), 'raster' (Canny + Hough) or
+              'auto' (vector, falling back to raster for scanned plans)
+        render: Returns the page image when called (lets stages share one
+                rendering); defaults to rendering the page
+
+    Returns:
+        (walls, source) with source 'vector' or 'raster'; walls is None if
+        nothing was found
+    """
+    if mode in ('auto', 'vector'):
+        segments = vector_walls(page)
+        if segments is not None:
+            print(f"Read {len(segments)} vector segments")
+            return keep_axis_aligned(segments, min_length=3), 'vector'  # Exact geometry: only drop specks
+        if mode == 'vector':
+            print("No vector geometry found!")
+            return None, 'vector'
+        print("No vector geometry found, falling back to raster extraction")
+
+    segments = raster_walls((render or (lambda: render_page(page)))())
+    if not segments:
         print("No lines detected!")
-        return
+        return None, 'raster'
+    print(f"Detected {len(segments)} line segments")
+    return keep_axis_aligned(segments, min_length=15), 'raster'
 
-    print(f"Detected {len(lines)} line segments")
 
-    # Convert to wall segments format [x1, y1, x2, y2]
-    walls = []
-    for line in lines:
-        x1, y1, x2, y2 = line[0]
-        # Only keep horizontal or vertical walls (within 5 degrees)
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1)
-        length = np.sqrt(dx**2 + dy**2)
+def extract_walls(pdf_path, output_file='walls.json', mode='auto', visualize=True):
+    """
+    Extract wall segments from PDF floor plan
 
-        if length < 15:  # Skip very short segments
-            continue
+    Args:
+        mode: See page_walls
+        visualize: Also render walls_visualization.png
+    """
+    doc = fitz.open(pdf_path)
+    page = doc.load_page(0)
+    width, height = int(page.rect.width * SCALE), int(page.rect.height * SCALE)
+    print(f"Image size: {width}x{height}")
 
-        # Check if mostly horizontal or vertical
-        if dx > dy:  # Horizontal
-            if dy / dx < 0.1:  # Within ~6 degrees of horizontal
-                walls.append([int(x1), int(y1), int(x2), int(y2)])
-        else:  # Vertical
-            if dx / dy < 0.1:  # Within ~6 degrees of vertical
-                walls.append([int(x1), int(y1), int(x2), int(y2)])
+    rendered = []
+
+    def render():
+        if not rendered:
+            rendered.append(render_page(page))
+        return rendered[0]
+
+    walls, source = page_walls(page, mode, render)
+    if walls is None:
+        return
 
     print(f"Filtered to {len(walls)} horizontal/vertical walls")
 
@@ -61,24 +166,32 @@ def extract_walls(pdf_path, output_file='walls.json'):
     with open(output_file, 'w') as f:
         json.dump({
             "walls": walls,
-            "image_size": {"width": img.shape[1], "height": img.shape[0]},
-            "scale": 3
+            "image_size": {"width": width, "height": height},
+            "scale": SCALE,
+            "source": source
         }, f, indent=2)
 
     # Create visualization
-    vis_img = img.copy()
-    for wall in walls:
-        x1, y1, x2, y2 = wall
-        cv2.line(vis_img, (x1, y1), (x2, y2), (0, 255, 0), 2)
-
-    cv2.imwrite('walls_visualization.png', vis_img)
+    if visualize:
+        vis_img = render().copy()
+        for wall in walls:
+            x1, y1, x2, y2 = wall
+            cv2.line(vis_img, (x1, y1), (x2, y2), (0, 255, 0), 2)
+
+        cv2.imwrite('walls_visualization.png', vis_img)
+        print("Visualization saved to walls_visualization.png")
     print(f"Saved {len(walls)} walls to {output_file}")
-    print("Visualization saved to walls_visualization.png")
 
     return walls
 
 if __name__ == "__main__":
-    walls = extract_walls('floorplan.pdf')
+    parser = argparse.ArgumentParser(description='Extract wall segments from a PDF floor plan')
+    parser.add_argument('pdf', nargs='?', default='floorplan.pdf')
+    parser.add_argument('--mode', choices=['auto', 'vector', 'raster'], default='auto')
+    parser.add_argument('--no-vis', action='store_true', help='Skip walls_visualization.png')
+    args = parser.parse_args()
+
+    walls = extract_walls(args.pdf, mode=args.mode, visualize=not args.no_vis)
 
     # Print a sample in JavaScript array format
     if walls:
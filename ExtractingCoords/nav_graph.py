@@ -0,0 +1,397 @@
+"""
+Navigation graph generated from the extracted walls and rooms
+
+Free space is rasterized from the walls, thinned to its medial axis, and the
+axis is traced into hallway nodes and edges. Rooms and exits are then linked
+to the nearest hallway node they can see, which is through their door gap.
+
+The nodes use the same fields as RAW in echoaid-server/models/map_data.py, so
+the server can route on the output directly.
+
+Run with:
+    python nav_graph.py walls_optimized.json final_rooms.geojson
+"""
+
+import argparse
+import json
+
+import cv2
+import numpy as np
+
+CELL = 3  # Image pixels per grid cell
+CLEARANCE = 1  # Cells kept free around walls
+DOOR = 80  # Gaps up to this many pixels are closed to find the building outline
+MIN_SPUR = 30  # Dead-end hallway branches shorter than this (pixels) are pruned
+MIN_EDGE = 25  # Hallway nodes closer than this (pixels) are merged
+SIMPLIFY = 6  # Douglas-Peucker tolerance (pixels)
+LINK_RADIUS = 250  # How far (pixels) a room or exit may be from its hallway node
+LINK_CANDIDATES = 8  # Nearest hallway nodes tried for line of sight
+
+# 8-neighbourhood in Zhang-Suen order P2..P9 (clockwise from north)
+NEIGHBOURS = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+
+def rasterize_walls(walls, shape, cell=CELL):
+    """Boolean grid with every cell a wall passes through set"""
+    grid = np.zeros(shape, dtype=bool)
+    w = np.asarray(walls, dtype=float).reshape(-1, 4) / cell
+    if not len(w):
+        return grid
+    steps = np.ceil(np.abs(w[:, 2:] - w[:, :2]).max(axis=1)).astype(int) + 1
+    seg = np.repeat(np.arange(len(w)), steps)
+    t = (np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps)) / np.repeat(np.maximum(steps - 1, 1), steps)
+    x = np.rint(w[seg, 0] + (w[seg, 2] - w[seg, 0]) * t).astype(int)
+    y = np.rint(w[seg, 1] + (w[seg, 3] - w[seg, 1]) * t).astype(int)
+    keep = (x >= 0) & (x < shape[1]) & (y >= 0) & (y < shape[0])
+    grid[y[keep], x[keep]] = True
+    return grid
+
+
+def free_space(walls, size, cell=CELL, clearance=CLEARANCE, door=DOOR):
+    """
+    Walkable cells inside the building
+
+    Args:
+        walls: [x1, y1, x2, y2] in image pixels
+        size: (width, height) of the image
+        clearance: Cells kept free around walls
+        door: Widest gap (pixels) in the outer wall, e.g. entrances
+
+    Returns:
+        (free, open) boolean grids: free keeps the clearance, open is every
+        non-wall cell inside the building (used for line of sight)
+    """
+    shape = (int(np.ceil(size[1] / cell)), int(np.ceil(size[0] / cell)))
+    wall = rasterize_walls(walls, shape, cell)
+
+    # Close door-sized gaps, then everything the outside can't reach is the building
+    k = max(3, int(door / cell) | 1)
+    closed = cv2.morphologyEx(wall.astype(np.uint8), cv2.MORPH_CLOSE, np.ones((k, k), np.uint8))
+    outside = np.pad(closed, 1)
+    cv2.floodFill(outside, None, (0, 0), 2)
+    inside = outside[1:-1, 1:-1] != 2
+
+    k = 2 * clearance + 1
+    blocked = cv2.dilate(wall.astype(np.uint8), np.ones((k, k), np.uint8)).astype(bool)
+    return inside & ~blocked, inside & ~wall
+
+
+def _neighbours(img):
+    """The 8 neighbour planes P2..P9 of a boolean image (outside counts as empty)"""
+    p = np.pad(img, 1)
+    h, w = img.shape
+    return [p[1 + dy:1 + dy + h, 1 + dx:1 + dx + w] for dy, dx in NEIGHBOURS]
+
+
+def skeletonize(mask):
+    """
+    Zhang-Suen thinning, each pass vectorized over the whole grid
+
+    Returns:
+        Boolean grid of one-cell-wide medial lines
+    """
+    img = mask.copy()
+    while True:
+        changed = False
+        for step in (0, 1):
+            n = [p.astype(np.uint8) for p in _neighbours(img)]
+            count = sum(n)
+            transitions = sum((n[i] == 0) & (n[(i + 1) % 8] == 1) for i in range(8))
+            p2, p4, p6, p8 = n[0], n[2], n[4], n[6]
+            if step == 0:
+                c = (p2 * p4 * p6 == 0) & (p4 * p6 * p8 == 0)
+            else:
+                c = (p2 * p4 * p8 == 0) & (p2 * p6 * p8 == 0)
+            remove = img & (count >= 2) & (count <= 6) & (transitions == 1) & c
+            if remove.any():
+                img &= ~remove
+                changed = True
+        if not changed:
+            return img
+
+
+def douglas_peucker(points, tolerance, clear=None):
+    """
+    Indices of the points kept when simplifying an open polyline
+
+    clear(p, q), if given, must also hold for every simplified segment
+    (e.g. line of sight, so corners are not cut through walls).
+    """
+    keep = [0, len(points) - 1]
+    stack = [(0, len(points) - 1)]
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        seg = points[b] - points[a]
+        rel = points[a + 1:b] - points[a]
+        length = np.hypot(*seg)
+        if length == 0:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance or (clear and not clear(points[a], points[b])):
+            keep.append(a + 1 + i)
+            stack += [(a, a + 1 + i), (a + 1 + i, b)]
+    return sorted(keep)
+
+
+def trace_skeleton(skeleton):
+    """
+    Hallway graph of a skeleton
+
+    Junctions and dead ends become nodes (touching junction cells are one
+    node); the cells between them become edges, kept as ordered polylines.
+
+    Returns:
+        (nodes, edges): nodes as an (N, 2) array of (row, col), edges as
+        (a, b, polyline) with the polyline an (M, 2) array from a to b
+    """
+    count = sum(p.astype(np.uint8) for p in _neighbours(skeleton))
+    node_mask = skeleton & (count != 2)
+    n_nodes, labels = cv2.connectedComponents(node_mask.astype(np.uint8), connectivity=8)
+    rows, cols = np.nonzero(node_mask)
+    nodes = np.zeros((n_nodes, 2))
+    np.add.at(nodes, labels[rows, cols], np.stack([rows, cols], axis=1))
+    nodes /= np.maximum(np.bincount(labels[rows, cols], minlength=n_nodes), 1)[:, None]
+
+    h, w = skeleton.shape
+    visited = np.zeros_like(skeleton)
+    edges = []
+
+    def step_from(r, c, prev):
+        for dy, dx in NEIGHBOURS:
+            y, x = r + dy, c + dx
+            if 0 <= y < h and 0 <= x < w and skeleton[y, x] and (y, x) != prev and not visited[y, x]:
+                yield y, x
+
+    for r, c in zip(rows, cols):
+        start = labels[r, c]
+        for y, x in list(step_from(r, c, None)):
+            if labels[y, x] == start or visited[y, x]:
+                continue
+            path = [(r, c)]
+            prev = (r, c)
+            while labels[y, x] == 0:
+                visited[y, x] = True
+                path.append((y, x))
+                following = next(step_from(y, x, prev), None)
+                if following is None:
+                    break
+                prev, (y, x) = (y, x), following
+            else:
+                path.append((y, x))
+                edges.append((start, labels[y, x], np.array(path, dtype=float)))
+    edges = [(a, b, p) for a, b, p in edges if a != b]
+    return nodes[1:], [(a - 1, b - 1, p) for a, b, p in edges]
+
+
+def hallway_graph(skeleton, open_grid, cell=CELL, min_spur=MIN_SPUR, min_edge=MIN_EDGE, tolerance=SIMPLIFY):
+    """
+    Simplified hallway nodes and edges, in image pixels
+
+    Short dead-end spurs are pruned, each traced edge keeps the bends needed
+    to stay within tolerance and in line of sight, and nodes closer than
+    min_edge are merged.
+
+    Returns:
+        (points, edges): points as an (N, 2) array of (x, y), edges as index pairs
+    """
+    nodes, traced = trace_skeleton(skeleton)
+    xy = nodes[:, ::-1] * cell
+    # Edges run between the node centres, not the cells where tracing started
+    polylines = [(a, b, np.vstack([xy[a], p[1:-1, ::-1] * cell, xy[b]])) for a, b, p in traced]
+
+    # Prune dead-end spurs (the thinning leaves them in corners and alcoves)
+    while True:
+        degree = np.bincount([v for a, b, _ in polylines for v in (a, b)], minlength=len(xy))
+        lengths = [np.hypot(*np.diff(p, axis=0).T).sum() for _, _, p in polylines]
+        kept = [e for e, length in zip(polylines, lengths)
+                if not (min(degree[e[0]], degree[e[1]]) == 1 and max(degree[e[0]], degree[e[1]]) > 2 and length < min_spur)]
+        if len(kept) == len(polylines):
+            break
+        polylines = kept
+
+    # Bends become nodes of their own, so edges follow the corridor
+    points = list(xy)
+    edges = []
+    for a, b, p in polylines:
+        idx = douglas_peucker(p, tolerance, lambda u, v: line_of_sight(open_grid, u, v, cell, skip=0))
+        chain = [a] + [len(points) + i for i in range(len(idx) - 2)] + [b]
+        points += [p[i] for i in idx[1:-1]]
+        edges += list(zip(chain[:-1], chain[1:]))
+    points = np.array(points)
+
+    # Merge nodes joined by very short edges (a wide junction thins into several).
+    # The busier node stays put, if it can see the other one's neighbours.
+    adjacency = {i: set() for i in range(len(points))}
+    for a, b in edges:
+        if a != b:
+            adjacency[a].add(b)
+            adjacency[b].add(a)
+    short = sorted((np.hypot(*(points[a] - points[b])), a, b) for a, b in edges)
+    for length, a, b in short:
+        if length >= min_edge:
+            break
+        if b not in adjacency.get(a, ()):
+            continue
+        if len(adjacency[a]) < len(adjacency[b]):
+            a, b = b, a
+        others = adjacency[b] - {a}
+        if not all(line_of_sight(open_grid, points[a], points[o], cell, skip=0) for o in others):
+            continue
+        for o in others:
+            adjacency[o].discard(b)
+            adjacency[o].add(a)
+        adjacency[a] |= others
+        adjacency[a].discard(b)
+        del adjacency[b]
+
+    kept = sorted(i for i in adjacency if adjacency[i])
+    index = {i: k for k, i in enumerate(kept)}
+    pairs = {tuple(sorted((index[a], index[b]))) for a in kept for b in adjacency[a]}
+    return points[kept], sorted(pairs)
+
+
+def line_of_sight(open_grid, p, q, cell=CELL, skip=2):
+    """True if the straight line p -> q crosses no wall cell (ignoring `skip` cells at each end)"""
+    a, b = np.asarray(p, dtype=float) / cell, np.asarray(q, dtype=float) / cell
+    n = int(np.ceil(np.abs(b - a).max())) + 1
+    if n <= 2 * skip:
+        return True
+    t = np.linspace(0, 1, n)[skip:n - skip]
+    x = np.clip(np.rint(a[0] + (b[0] - a[0]) * t).astype(int), 0, open_grid.shape[1] - 1)
+    y = np.clip(np.rint(a[1] + (b[1] - a[1]) * t).astype(int), 0, open_grid.shape[0] - 1)
+    return bool(open_grid[y, x].all())
+
+
+def link(point, hallway, open_grid, radius=LINK_RADIUS, candidates=LINK_CANDIDATES, cell=CELL):
+    """Nearest hallway node visible from point (through a door gap), or None"""
+    if not len(hallway):
+        return None
+    dist = np.hypot(*(hallway - point).T)
+    for i in np.argsort(dist)[:candidates]:
+        if dist[i] > radius:
+            break
+        if line_of_sight(open_grid, point, hallway[i], cell):
+            return int(i)
+    return None
+
+
+def build_nav_graph(walls, rooms, size, cell=CELL):
+    """
+    Navigation graph for one floor
+
+    Args:
+        walls: [x1, y1, x2, y2] in image pixels
+        rooms: GeoJSON point features (type ROOM or EXIT) in image pixels
+        size: (width, height) of the image
+
+    Returns:
+        {"nodes": [{id, x, y, type, label, hallway}], "edges": [[id, id]],
+         "unlinked": [room ids]} in image pixels; only the parts of the graph
+        that reach an exit are kept
+    """
+    free, open_grid = free_space(walls, size, cell)
+    points, pairs = hallway_graph(skeletonize(free), open_grid, cell)
+
+    # Hallway ids follow the room ids, so all ids stay unique
+    first_id = max([int(f['properties']['id']) for f in rooms] + [0]) + 1
+    nodes = [{'id': first_id + i, 'x': float(x), 'y': float(y), 'type': 'ROOM', 'label': '', 'hallway': True}
+             for i, (x, y) in enumerate(points)]
+    edges = [[nodes[a]['id'], nodes[b]['id']] for a, b in pairs]
+
+    unlinked = []
+    exit_number = 0
+    for f in sorted(rooms, key=lambda f: (f['properties']['type'] != 'EXIT', f['properties']['id'])):
+        props = f['properties']
+        x, y = f['geometry']['coordinates']
+        i = link(np.array([x, y], dtype=float), points, open_grid, cell=cell)
+        if i is None:
+            unlinked.append(props['id'])
+            continue
+        if props['type'] == 'EXIT':
+            exit_number += 1
+            label = f"Exit {exit_number}"
+        else:
+            label = str(props.get('label') or props['id'])
+        nodes.append({'id': props['id'], 'x': float(x), 'y': float(y), 'type': props['type'],
+                      'label': label, 'hallway': False})
+        edges.append([props['id'], nodes[i]['id']])
+
+    # Keep what is connected to an exit
+    adjacency = {n['id']: [] for n in nodes}
+    for a, b in edges:
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+    reachable = {n['id'] for n in nodes if n['type'] == 'EXIT'}
+    frontier = list(reachable)
+    while frontier:
+        for other in adjacency[frontier.pop()]:
+            if other not in reachable:
+                reachable.add(other)
+                frontier.append(other)
+    unlinked += [n['id'] for n in nodes if not n['hallway'] and n['id'] not in reachable]
+    nodes = [n for n in nodes if n['id'] in reachable]
+
+    # Hallways are labelled h1, h2, ... from top-left, like the hand-made graph
+    hallways = sorted((n for n in nodes if n['hallway']), key=lambda n: (round(n['y'] / 50), n['x']))
+    for k, n in enumerate(hallways, 1):
+        n['label'] = f"h{k}"
+    return {'nodes': nodes, 'edges': [e for e in edges if e[0] in reachable], 'unlinked': sorted(unlinked)}
+
+
+def transform_nav(nav, transform):
+    """Nav graph moved to room coordinate space (see transform_walls.py), rounded to 0.1"""
+    nodes = [{**n, 'x': round(n['x'] * transform['scale_x'] + transform['offset_x'], 1),
+              'y': round(n['y'] * transform['scale_y'] + transform['offset_y'], 1)} for n in nav['nodes']]
+    return {**nav, 'nodes': nodes}
+
+
+def draw_nav(nav, walls, size, output_png='nav_graph.png'):
+    img = np.full((size[1], size[0], 3), 255, np.uint8)
+    for x1, y1, x2, y2 in walls:
+        cv2.line(img, (int(x1), int(y1)), (int(x2), int(y2)), (0, 0, 0), 2)
+    at = {n['id']: (int(n['x']), int(n['y'])) for n in nav['nodes']}
+    for a, b in nav['edges']:
+        cv2.line(img, at[a], at[b], (255, 128, 0), 3)
+    colors = {'EXIT': (0, 0, 255), 'ROOM': (0, 160, 0)}
+    for n in nav['nodes']:
+        cv2.circle(img, at[n['id']], 6 if n['hallway'] else 10, (255, 0, 0) if n['hallway'] else colors[n['type']], -1)
+    cv2.imwrite(output_png, img)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate the navigation graph from walls and rooms')
+    parser.add_argument('walls', nargs='?', default='walls_optimized.json')
+    parser.add_argument('rooms', nargs='?', default='final_rooms.geojson')
+    parser.add_argument('--output', default='nav_graph.json')
+    parser.add_argument('--transform', default='coordinate_transform.json', help='Write room-space coordinates')
+    parser.add_argument('--no-vis', action='store_true', help='Skip nav_graph.png')
+    args = parser.parse_args()
+
+    with open(args.walls) as f:
+        data = json.load(f)
+    with open(args.rooms) as f:
+        rooms = json.load(f)['features']
+    if 'image_size' in data:
+        size = (data['image_size']['width'], data['image_size']['height'])
+    else:  # walls_optimized.json has no image size: the walls' extent is enough
+        w = np.asarray(data['walls']).reshape(-1, 4)
+        size = (int(w[:, ::2].max()) + 1, int(w[:, 1::2].max()) + 1)
+
+    nav = build_nav_graph(data['walls'], rooms, size)
+    if not args.no_vis:
+        draw_nav(nav, data['walls'], size)
+    with open(args.transform) as f:
+        nav = transform_nav(nav, json.load(f))
+    with open(args.output, 'w') as f:
+        json.dump(nav, f, indent=2)
+
+    kinds = [n['type'] if not n['hallway'] else 'HALLWAY' for n in nav['nodes']]
+    print(f"Nav graph: {kinds.count('HALLWAY')} hallway nodes, {kinds.count('ROOM')} rooms, "
+          f"{kinds.count('EXIT')} exits, {len(nav['edges'])} edges")
+    if nav['unlinked']:
+        print(f"Not reachable (check walls/door gaps): {nav['unlinked']}")
+    print(f"Saved to {args.output}")
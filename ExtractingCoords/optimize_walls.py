@@ -1,94 +1,110 @@
 import json
 import numpy as np
 
-def merge_collinear_segments(walls):
-    """Merge collinear wall segments that are close together"""
-    merged = []
-    used = set()
+def orientations(walls):
+    """Boolean array: True where the wall is (closer to) horizontal"""
+    w = np.asarray(walls).reshape(-1, 4)
+    return np.abs(w[:, 3] - w[:, 1]) < np.abs(w[:, 2] - w[:, 0])
+
+
+def merge_collinear_segments(walls, gap=5, tolerance=3):
+    """
+    Merge collinear wall segments that are close together
+
+    Walls are taken in (min x, min y) order; each one absorbs every later
+    wall of the same orientation whose line is within `tolerance` pixels and
+    whose span overlaps its own (allowing `gap` pixels between them).
+    Instead of comparing against every later wall, each orientation is kept
+    sorted by its line coordinate, so only walls on nearby lines are looked
+    at (a binary search plus one vectorized interval test): O(n log n).
+    """
+    if not walls:
+        return []
 
     # Sort walls for consistent processing
     walls = sorted(walls, key=lambda w: (min(w[0], w[2]), min(w[1], w[3])))
+    w = np.asarray(walls)
+    horizontal = orientations(w)
+    used = np.zeros(len(w), dtype=bool)
+
+    # Per orientation: line coordinate (y1 or x1) and span, sorted by line
+    lines = {}
+    for is_h in (True, False):
+        idx = np.flatnonzero(horizontal == is_h)
+        line, a, b = (w[idx, 1], w[idx, 0], w[idx, 2]) if is_h else (w[idx, 0], w[idx, 1], w[idx, 3])
+        order = np.argsort(line, kind='stable')
+        lines[is_h] = (line[order], idx[order], np.minimum(a, b)[order], np.maximum(a, b)[order])
 
-    for i, wall1 in enumerate(walls):
-        if i in used:
+    merged = []
+    for i in range(len(w)):
+        if used[i]:
             continue
+        used[i] = True
 
-        x1, y1, x2, y2 = wall1
-
-        # Check if horizontal or vertical
-        is_horizontal = abs(y2 - y1) < abs(x2 - x1)
+        is_h = bool(horizontal[i])
+        line, idx, lo, hi = lines[is_h]
+        x1, y1, x2, y2 = walls[i]
+        key, start, end = (y1, min(x1, x2), max(x1, x2)) if is_h else (x1, min(y1, y2), max(y1, y2))
 
-        # Try to find segments to merge
-        candidates = [wall1]
-        used.add(i)
+        # Walls on lines within tolerance, later in order, not merged yet, spans overlapping
+        first = np.searchsorted(line, key - tolerance, side='left')
+        last = np.searchsorted(line, key + tolerance, side='right')
+        near = idx[first:last]
+        hit = (near > i) & ~used[near] & (lo[first:last] <= end + gap) & (hi[first:last] >= start - gap)
+        candidates = near[hit]
 
-        for j, wall2 in enumerate(walls[i+1:], i+1):
-            if j in used:
-                continue
-
-            x3, y3, x4, y4 = wall2
-
-            # Check if same orientation
-            is_h2 = abs(y4 - y3) < abs(x4 - x3)
-            if is_horizontal != is_h2:
-                continue
+        # Merge all candidates
+        if len(candidates) == 0:
+            merged.append(walls[i])
+            continue
+        used[candidates] = True
+        group = w[np.concatenate(([i], np.sort(candidates)))]
+        if is_h:
+            y_avg = int(np.mean(np.concatenate((group[:, 1], group[:, 3]))))
+            merged.append([int(min(group[:, 0].min(), group[:, 2].min())), y_avg,
+                           int(max(group[:, 0].max(), group[:, 2].max())), y_avg])
+        else:
+            x_avg = int(np.mean(np.concatenate((group[:, 0], group[:, 2]))))
+            merged.append([x_avg, int(min(group[:, 1].min(), group[:, 3].min())),
+                           x_avg, int(max(group[:, 1].max(), group[:, 3].max()))])
 
-            # Check if collinear and close
-            if is_horizontal:
-                # Same y-coordinate (within 3 pixels)
-                if abs(y1 - y3) <= 3:
-                    # Check if overlapping or touching on x-axis
-                    min_x1, max_x1 = min(x1, x2), max(x1, x2)
-                    min_x3, max_x3 = min(x3, x4), max(x3, x4)
+    return merged
 
-                    if not (max_x1 < min_x3 - 5 or max_x3 < min_x1 - 5):
-                        candidates.append(wall2)
-                        used.add(j)
-            else:
-                # Same x-coordinate (within 3 pixels)
-                if abs(x1 - x3) <= 3:
-                    # Check if overlapping or touching on y-axis
-                    min_y1, max_y1 = min(y1, y2), max(y1, y2)
-                    min_y3, max_y3 = min(y3, y4), max(y3, y4)
 
-                    if not (max_y1 < min_y3 - 5 or max_y3 < min_y1 - 5):
-                        candidates.append(wall2)
-                        used.add(j)
+def remove_duplicates(walls, tolerance=2):
+    """
+    Remove duplicate or very similar walls
 
-        # Merge all candidates
-        if len(candidates) == 1:
-            merged.append(wall1)
-        else:
-            if is_horizontal:
-                y_avg = int(np.mean([w[1] for w in candidates] + [w[3] for w in candidates]))
-                x_coords = [w[0] for w in candidates] + [w[2] for w in candidates]
-                merged.append([min(x_coords), y_avg, max(x_coords), y_avg])
-            else:
-                x_avg = int(np.mean([w[0] for w in candidates] + [w[2] for w in candidates]))
-                y_coords = [w[1] for w in candidates] + [w[3] for w in candidates]
-                merged.append([x_avg, min(y_coords), x_avg, max(y_coords)])
+    A wall is dropped if an earlier kept wall has all four (normalized)
+    coordinates within `tolerance` pixels. Kept walls are hashed into a grid
+    on their first corner, so each wall is only compared with the kept walls
+    in the neighbouring cells instead of all of them.
+    """
+    if not walls:
+        return []
 
-    return merged
+    # Normalize: make sure x1 <= x2 and y1 <= y2
+    w = np.asarray(walls)
+    normalized = np.stack([np.minimum(w[:, 0], w[:, 2]), np.minimum(w[:, 1], w[:, 3]),
+                           np.maximum(w[:, 0], w[:, 2]), np.maximum(w[:, 1], w[:, 3])], axis=1).tolist()
 
-def remove_duplicates(walls):
-    """Remove duplicate or very similar walls"""
+    cell = tolerance + 1  # Anything within tolerance is at most one cell away
+    grid = {}
     unique = []
-    for wall in walls:
-        # Normalize: make sure x1 <= x2 and y1 <= y2
-        x1, y1, x2, y2 = wall
-        normalized = [min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)]
+    for wall in normalized:
+        cx, cy = wall[0] // cell, wall[1] // cell
 
         # Check if similar wall already exists
-        is_duplicate = False
-        for existing in unique:
-            ex1, ey1, ex2, ey2 = existing
-            if (abs(normalized[0] - ex1) <= 2 and abs(normalized[1] - ey1) <= 2 and
-                abs(normalized[2] - ex2) <= 2 and abs(normalized[3] - ey2) <= 2):
-                is_duplicate = True
-                break
+        is_duplicate = any(
+            abs(wall[0] - ex1) <= tolerance and abs(wall[1] - ey1) <= tolerance and
+            abs(wall[2] - ex2) <= tolerance and abs(wall[3] - ey2) <= tolerance
+            for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+            for ex1, ey1, ex2, ey2 in grid.get((cx + dx, cy + dy), ())
+        )
 
         if not is_duplicate:
-            unique.append(normalized)
+            unique.append(wall)
+            grid.setdefault((cx, cy), []).append(wall)
 
     return unique
 
@@ -0,0 +1,266 @@
+"""
+Map pipeline: every floor (page) of a plan, in parallel, with cached stages
+
+Each page runs in its own worker process. The page is rendered at most once
+and shared by the stages that need pixels. Stages are declared in STAGES
+with their dependencies; each output is cached under a key derived from its
+inputs (page content, upstream keys, stage code, parameters), so after
+editing one floor only that floor is recomputed. Arrays are cached as
+.npy/.npz, everything else as compact JSON.
+
+Run with:
+    python pipeline.py floorplan.pdf --out build
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, NamedTuple
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import fitz
+import numpy as np
+import pytesseract
+
+from extract import EXCLUDE_LIST, EXIT_IDS, find_rooms
+from extract_walls import SCALE, page_walls, render_page
+from nav_graph import build_nav_graph
+from optimize_walls import merge_collinear_segments, remove_duplicates
+from transform_walls import load_transform, transform_walls
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Hand-picked marker IDs only apply to the page they were picked on
+FLOOR_OVERRIDES = {0: {'exclude': EXCLUDE_LIST, 'exit_ids': EXIT_IDS}}
+
+
+class Stage(NamedTuple):
+    deps: List[str]  # Upstream stages
+    code: List[str]  # Source files: editing one invalidates the stage
+    run: Callable  # (floor context, *upstream outputs) -> output
+    params: Callable = lambda ctx: None  # Extra key material
+
+
+def _walls(ctx):
+    walls, source = page_walls(ctx.page, ctx.mode, ctx.render)
+    return {'walls': np.asarray(walls or [], dtype=np.int32).reshape(-1, 4), 'source': source}
+
+
+def _walls_optimized(ctx, walls):
+    return np.asarray(merge_collinear_segments(remove_duplicates(walls['walls'].tolist())), dtype=np.int32).reshape(-1, 4)
+
+
+def _walls_transformed(ctx, optimized):
+    return transform_walls(optimized, ctx.transform).astype(np.float32)
+
+
+def _rooms(ctx):
+    overrides = FLOOR_OVERRIDES.get(ctx.floor, {'exclude': [], 'exit_ids': []})
+    return find_rooms(ctx.render(), overrides['exclude'], overrides['exit_ids'])
+
+
+def _nav_graph(ctx, optimized, rooms):
+    size = (int(ctx.page.rect.width * SCALE), int(ctx.page.rect.height * SCALE))
+    return build_nav_graph(optimized.tolist(), rooms, size)
+
+
+STAGES = {
+    'walls': Stage([], ['extract_walls.py'], _walls, lambda ctx: ctx.mode),
+    'walls_optimized': Stage(['walls'], ['optimize_walls.py'], _walls_optimized),
+    'walls_transformed': Stage(['walls_optimized'], ['transform_walls.py'], _walls_transformed,
+                               lambda ctx: ctx.transform),
+    'rooms': Stage([], ['extract.py', 'extract_walls.py'], _rooms,
+                   lambda ctx: [FLOOR_OVERRIDES.get(ctx.floor), tesseract_version()]),
+    'nav_graph': Stage(['walls_optimized', 'rooms'], ['nav_graph.py'], _nav_graph),
+}
+
+
+def digest(*parts) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else json.dumps(part, sort_keys=True).encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def code_hash(files: List[str]) -> str:
+    parts = []
+    for name in files:
+        with open(os.path.join(HERE, name), 'rb') as f:
+            parts.append(f.read())
+    return digest(*parts)
+
+
+def page_fingerprint(doc, page) -> str:
+    """Hash of everything that draws the page: content streams, XObjects, images, geometry"""
+    parts = [page.read_contents(), [page.rotation, list(page.rect)]]
+    xrefs = sorted({x[0] for x in page.get_xobjects()} | {x[0] for x in page.get_images(full=True)})
+    for xref in xrefs:
+        parts.append(doc.xref_stream_raw(xref) or b'')
+    return digest(*parts)
+
+
+def tesseract_version() -> str:
+    """Part of the rooms key, so labels are redone once tesseract is installed or upgraded"""
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except Exception:
+        return 'missing'
+
+
+class StageCache:
+    """
+    Stage outputs on disk, named by stage and key
+
+    Arrays are stored as .npy, dicts of arrays and strings as .npz, anything
+    else as compact JSON.
+    """
+
+    FORMATS = ('.npy', '.npz', '.json')
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def get(self, stage: str, key: str):
+        base = self._path(stage, key)
+        for ext in self.FORMATS:
+            path = base + ext
+            if not os.path.exists(path):
+                continue
+            try:
+                if ext == '.npy':
+                    return np.load(path, allow_pickle=False)
+                if ext == '.npz':
+                    with np.load(path, allow_pickle=False) as data:
+                        return {k: (str(v) if v.dtype.kind == 'U' else v) for k, v in data.items()}
+                with open(path) as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return None
+        return None
+
+    def put(self, stage: str, key: str, value):
+        base = self._path(stage, key)
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+        tmp = f"{base}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            if isinstance(value, np.ndarray):
+                ext = '.npy'
+                np.save(f, value, allow_pickle=False)
+            elif isinstance(value, dict) and any(isinstance(v, np.ndarray) for v in value.values()):
+                ext = '.npz'
+                np.savez(f, **{k: np.asarray(v) for k, v in value.items()})
+            else:
+                ext = '.json'
+                f.write(json.dumps(value, separators=(',', ':')).encode())
+        os.replace(tmp, base + ext)  # Workers never see a partial file
+
+    def _path(self, stage: str, key: str) -> str:
+        return os.path.join(self.directory, stage, key)
+
+
+class Floor:
+    """One page being built: what the stages get as their context"""
+
+    def __init__(self, pdf_path: str, floor: int, mode: str, transform: dict):
+        self.doc = fitz.open(pdf_path)
+        self.page = self.doc.load_page(floor)
+        self.floor = floor
+        self.mode = mode
+        self.transform = transform
+        self.fingerprint = page_fingerprint(self.doc, self.page)
+        self._image = None
+
+    def render(self):
+        # Shared raster: rendered on first use, by whichever stage needs it
+        if self._image is None:
+            self._image = render_page(self.page)
+        return self._image
+
+
+def build_floor(pdf_path: str, floor: int, cache_dir: str, mode: str = 'auto',
+                transform: dict = None, targets: List[str] = None) -> dict:
+    """
+    Run the stages needed for `targets` on one page (in a worker process)
+
+    Returns:
+        Outputs by stage, plus a 'summary' (which stages were cached, seconds)
+    """
+    started = time.time()
+    ctx = Floor(pdf_path, floor, mode, transform)
+    cache = StageCache(cache_dir)
+    keys, outputs = {}, {}
+    summary = {'floor': floor, 'cached': [], 'computed': []}
+
+    def run(name):
+        if name in outputs:
+            return outputs[name]
+        stage = STAGES[name]
+        upstream = [run(dep) for dep in stage.deps]
+        keys[name] = digest(name, ctx.fingerprint, [keys[dep] for dep in stage.deps],
+                            code_hash(stage.code), stage.params(ctx))
+        value = cache.get(name, keys[name])
+        if value is None:
+            value = stage.run(ctx, *upstream)
+            cache.put(name, keys[name], value)
+            summary['computed'].append(name)
+        else:
+            summary['cached'].append(name)
+        outputs[name] = value
+        return value
+
+    for target in targets or list(STAGES):
+        run(target)
+
+    summary.update(size={"width": int(ctx.page.rect.width * SCALE), "height": int(ctx.page.rect.height * SCALE)},
+                   rendered=ctx._image is not None, seconds=round(time.time() - started, 2))
+    outputs['summary'] = summary
+    return outputs
+
+
+def build(pdf_path: str, cache_dir: str = '.map_cache', workers: int = None, mode: str = 'auto',
+          transform: dict = None, targets: List[str] = None) -> list:
+    """Build every floor of the plan, one worker process per page"""
+    floors = range(len(fitz.open(pdf_path)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(build_floor, pdf_path, floor, cache_dir, mode, transform, targets)
+                   for floor in floors]
+        return [future.result() for future in futures]
+
+
+def write_floor(outputs: dict, out_dir: str):
+    """Intermediates of one floor as files in build/floor_<n>/ (.npy for arrays)"""
+    floor_dir = os.path.join(out_dir, f"floor_{outputs['summary']['floor']}")
+    os.makedirs(floor_dir, exist_ok=True)
+    for name, value in outputs.items():
+        if name == 'summary':
+            continue
+        if isinstance(value, dict) and 'walls' in value:
+            value = value['walls']
+        if isinstance(value, np.ndarray):
+            np.save(os.path.join(floor_dir, f"{name}.npy"), value)
+        else:
+            with open(os.path.join(floor_dir, f"{name}.json"), 'w') as f:
+                json.dump(value, f, separators=(',', ':'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build map data for every floor of a PDF plan')
+    parser.add_argument('pdf', nargs='?', default='floorplan.pdf')
+    parser.add_argument('--out', default='build', help='Output directory (one floor_<n> folder per page)')
+    parser.add_argument('--cache', default='.map_cache', help='Stage cache directory')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per core)')
+    parser.add_argument('--mode', choices=['auto', 'vector', 'raster'], default='auto', help='Wall extraction mode')
+    parser.add_argument('--transform', default=os.path.join(HERE, 'coordinate_transform.json'))
+    args = parser.parse_args()
+
+    started = time.time()
+    for outputs in build(args.pdf, args.cache, args.workers, args.mode, load_transform(args.transform)):
+        write_floor(outputs, args.out)
+        summary = outputs['summary']
+        print(f"Floor {summary['floor']}: {len(outputs['walls_optimized'])} walls, {len(outputs['rooms'])} rooms, "
+              f"{len(outputs['nav_graph']['nodes'])} nav nodes in {summary['seconds']}s (cached: {', '.join(summary['cached']) or 'none'}; "
+              f"computed: {', '.join(summary['computed']) or 'none'})")
+    print(f"Done in {time.time() - started:.1f}s")
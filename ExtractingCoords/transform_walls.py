@@ -1,76 +1,81 @@
 import json
+import numpy as np
 
-# Load the coordinate transformation parameters
-with open('coordinate_transform.json', 'r') as f:
-    transform = json.load(f)
 
-scale_x = transform['scale_x']
-scale_y = transform['scale_y']
-offset_x = transform['offset_x']
-offset_y = transform['offset_y']
+def load_transform(path='coordinate_transform.json'):
+    """Affine fit from the 3x page image to the room coordinate space"""
+    with open(path, 'r') as f:
+        return json.load(f)
 
-# Load the optimized walls
-with open('walls_optimized.json', 'r') as f:
-    data = json.load(f)
-    walls = data['walls']
 
-print(f"Transforming {len(walls)} walls...")
-print(f"Transformation: x' = {scale_x} * x + {offset_x}")
-print(f"                y' = {scale_y} * y + {offset_y}")
+def transform_walls(walls, transform):
+    """
+    Apply x' = scale_x * x + offset_x, y' = scale_y * y + offset_y to every wall
 
-# Apply transformation to all wall coordinates
-transformed_walls = []
-for wall in walls:
-    x1, y1, x2, y2 = wall
+    Returns:
+        float array (N, 4), rounded to 0.1
+    """
+    w = np.asarray(walls, dtype=float).reshape(-1, 4)
+    scale = np.array([transform['scale_x'], transform['scale_y']] * 2)
+    offset = np.array([transform['offset_x'], transform['offset_y']] * 2)
+    return np.round(w * scale + offset, 1)
 
-    # Apply affine transformation
-    new_x1 = scale_x * x1 + offset_x
-    new_y1 = scale_y * y1 + offset_y
-    new_x2 = scale_x * x2 + offset_x
-    new_y2 = scale_y * y2 + offset_y
 
-    transformed_walls.append([
-        round(new_x1, 1),
-        round(new_y1, 1),
-        round(new_x2, 1),
-        round(new_y2, 1)
-    ])
+if __name__ == "__main__":
+    # Load the coordinate transformation parameters
+    transform = load_transform()
+    scale_x = transform['scale_x']
+    scale_y = transform['scale_y']
+    offset_x = transform['offset_x']
+    offset_y = transform['offset_y']
 
-# Save transformed walls
-output_data = {
-    "walls": transformed_walls,
-    "count": len(transformed_walls),
-    "transformation": {
-        "scale_x": scale_x,
-        "scale_y": scale_y,
-        "offset_x": offset_x,
-        "offset_y": offset_y
+    # Load the optimized walls
+    with open('walls_optimized.json', 'r') as f:
+        data = json.load(f)
+        walls = data['walls']
+
+    print(f"Transforming {len(walls)} walls...")
+    print(f"Transformation: x' = {scale_x} * x + {offset_x}")
+    print(f"                y' = {scale_y} * y + {offset_y}")
+
+    # Apply affine transformation to all wall coordinates
+    transformed_walls = transform_walls(walls, transform).tolist()
+
+    # Save transformed walls
+    output_data = {
+        "walls": transformed_walls,
+        "count": len(transformed_walls),
+        "transformation": {
+            "scale_x": scale_x,
+            "scale_y": scale_y,
+            "offset_x": offset_x,
+            "offset_y": offset_y
+        }
     }
-}
 
-with open('walls_transformed.json', 'w') as f:
-    json.dump(output_data, f, indent=2)
+    with open('walls_transformed.json', 'w') as f:
+        json.dump(output_data, f, indent=2)
 
-# Format for JavaScript
-with open('walls_for_js.txt', 'w') as f:
-    f.write('const WALLS_RAW = [\n')
-    for i, wall in enumerate(transformed_walls):
-        f.write(f'  [{wall[0]},{wall[1]},{wall[2]},{wall[3]}]')
-        if i < len(transformed_walls) - 1:
-            f.write(',')
-        f.write('\n')
-    f.write('];\n')
+    # Format for JavaScript
+    with open('walls_for_js.txt', 'w') as f:
+        f.write('const WALLS_RAW = [\n')
+        for i, wall in enumerate(transformed_walls):
+            f.write(f'  [{wall[0]},{wall[1]},{wall[2]},{wall[3]}]')
+            if i < len(transformed_walls) - 1:
+                f.write(',')
+            f.write('\n')
+        f.write('];\n')
 
-print(f"\nTransformation complete!")
-print(f"Saved {len(transformed_walls)} transformed walls to walls_transformed.json")
-print(f"JavaScript format saved to walls_for_js.txt")
+    print(f"\nTransformation complete!")
+    print(f"Saved {len(transformed_walls)} transformed walls to walls_transformed.json")
+    print(f"JavaScript format saved to walls_for_js.txt")
 
-# Show coordinate ranges
-x_coords = [coord for wall in transformed_walls for coord in [wall[0], wall[2]]]
-y_coords = [coord for wall in transformed_walls for coord in [wall[1], wall[3]]]
-print(f"\nTransformed wall coordinate ranges:")
-print(f"  X: {min(x_coords):.1f} to {max(x_coords):.1f}")
-print(f"  Y: {min(y_coords):.1f} to {max(y_coords):.1f}")
-print(f"\nExpected room coordinate ranges (from message.txt):")
-print(f"  X: 1309.0 to 4255.5")
-print(f"  Y: 330.5 to 3111.5")
+    # Show coordinate ranges
+    x_coords = [coord for wall in transformed_walls for coord in [wall[0], wall[2]]]
+    y_coords = [coord for wall in transformed_walls for coord in [wall[1], wall[3]]]
+    print(f"\nTransformed wall coordinate ranges:")
+    print(f"  X: {min(x_coords):.1f} to {max(x_coords):.1f}")
+    print(f"  Y: {min(y_coords):.1f} to {max(y_coords):.1f}")
+    print(f"\nExpected room coordinate ranges (from message.txt):")
+    print(f"  X: 1309.0 to 4255.5")
+    print(f"  Y: 330.5 to 3111.5")
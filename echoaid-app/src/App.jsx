@@ -1,5 +1,6 @@
-import { useState, useEffect, useRef, useCallback, useMemo } from "react";
+import { useState, useEffect, useRef, useCallback } from "react";
 import { io } from "socket.io-client";
+import MAP_FALLBACK from "./map/fallback.json";
 
 /* ═══════════════════════════════════════════════════════════════
    ECHOAID — Disaster Evacuation Companion
@@ -98,1314 +99,12 @@ const ROOMS = RAW.filter(r => r.type === "ROOM").map(r => ({ ...r, sx: tx(r.x),
 const EXITS = RAW.filter(r => r.type === "EXIT").map(r => ({ ...r, sx: tx(r.x), sy: ty(r.y) }));
 
 // ── WALL SEGMENTS extracted from architectural PDF ──
-// Each [x1,y1,x2,y2] in GeoJSON 3× coordinate space
-const WALLS_RAW = [
-  [204.7,61.1,4950.2,61.1],
-  [204.7,3308.3,4950.2,3308.3],
-  [206.0,63.9,206.0,3305.5],
-  [329.5,2651.0,329.5,2721.4],
-  [329.5,2924.1,329.5,2973.3],
-  [330.8,1951.4,330.8,2023.2],
-  [330.8,2135.8,330.8,2206.2],
-  [350.6,2515.9,350.6,2590.5],
-  [351.9,3043.7,351.9,3174.6],
-  [350.6,3102.8,387.3,3102.8],
-  [350.6,3157.7,460.9,3157.7],
-  [350.6,3166.2,472.7,3166.2],
-  [350.6,3173.2,488.5,3173.2],
-  [351.9,2271.0,351.9,2316.0],
-  [351.9,2786.1,351.9,2848.1],
-  [351.9,3112.7,397.8,3112.7],
-  [351.9,3119.7,405.7,3119.7],
-  [351.9,3132.4,418.9,3133.8],
-  [351.9,3150.7,441.2,3150.7],
-  [368.9,3077.5,371.6,3149.3],
-  [541.1,1743.1,585.7,1744.5],
-  [545.0,3191.5,592.3,3191.5],
-  [665.9,3174.6,709.2,3174.6],
-  [780.2,3191.5,827.5,3191.5],
-  [890.5,3173.2,922.1,3173.2],
-  [983.8,3191.5,1035.0,3191.5],
-  [1103.4,3171.8,1166.4,3171.8],
-  [1179.6,1730.4,1246.6,1731.9],
-  [1222.9,3191.5,1284.7,3191.5],
-  [1259.7,1370.1,1309.6,1371.5],
-  [1261.0,1375.7,1309.6,1377.1],
-  [1266.3,1296.9,1301.7,1298.3],
-  [1278.1,1251.9,1547.4,1251.9],
-  [1278.1,1265.9,1837.8,1265.9],
-  [1278.1,1339.1,1309.6,1339.1],
-  [1279.4,1057.6,1279.4,1263.1],
-  [1287.3,1406.7,1548.7,1406.7],
-  [1287.3,1412.3,1550.1,1412.3],
-  [1287.3,1416.6,1550.1,1416.6],
-  [1292.5,1118.2,1292.5,1423.6],
-  [1289.9,1274.4,1547.4,1274.4],
-  [1293.9,1368.7,1295.2,1425.0],
-  [1300.4,1067.5,1523.8,1067.5],
-  [1332.0,1302.5,1504.1,1302.5],
-  [1332.0,1377.1,1505.4,1377.1],
-  [1334.6,1123.8,1454.1,1123.8],
-  [1349.0,1130.8,1489.6,1130.8],
-  [1377.9,1185.7,1429.2,1185.7],
-  [1380.6,1197.0,1429.2,1198.4],
-  [1397.7,1330.7,1441.0,1332.1],
-  [1397.7,1339.1,1446.3,1339.1],
-  [1397.7,1344.8,1442.3,1344.8],
-  [1409.5,1353.2,1446.3,1353.2],
-  [1455.5,1122.4,1489.6,1125.2],
-  [1459.4,1171.6,1547.4,1171.6],
-  [1481.7,1211.1,1547.4,1211.1],
-  [1510.6,1201.2,1547.4,1201.2],
-  [1510.6,2917.0,1512.0,2987.4],
-  [1522.5,1181.5,1564.5,1184.3],
-  [1525.1,1175.9,1526.4,1253.3],
-  [1529.0,1278.6,1529.0,1415.2],
-  [1534.3,1118.2,1534.3,1425.0],
-  [1539.5,1298.3,1539.5,1425.0],
-  [1542.2,1191.3,1542.2,1278.6],
-  [1546.1,1060.4,1546.1,1188.5],
-  [1606.5,1168.8,1749.8,1168.8],
-  [1606.5,1191.3,1713.0,1195.6],
-  [1606.5,1202.6,1714.3,1202.6],
-  [1606.5,1222.3,1714.3,1232.2],
-  [1614.4,1236.4,1714.3,1237.8],
-  [1614.4,1251.9,1915.3,1251.9],
-  [1703.8,687.4,2080.8,687.4],
-  [1703.8,694.5,2080.8,694.5],
-  [1703.8,698.7,1783.9,698.7],
-  [1705.1,351.0,1705.1,697.3],
-  [1713.0,351.0,1713.0,700.1],
-  [1739.2,1059.0,1837.8,1059.0],
-  [1739.2,1060.4,1739.2,1180.1],
-  [1739.2,1070.3,1783.9,1070.3],
-  [1752.4,484.8,1752.4,557.9],
-  [1748.4,382.0,1753.7,442.5],
-  [1755.0,477.7,1755.0,546.7],
-  [1781.3,1254.7,1914.0,1254.7],
-  [1782.6,353.8,1782.6,431.3],
-  [1782.6,428.4,1782.6,490.4],
-  [1782.6,476.3,1782.6,594.5],
-  [1782.6,593.1,1942.9,595.9],
-  [1782.6,708.6,1837.8,708.6],
-  [1782.6,874.6,1835.2,874.6],
-  [1782.6,1429.2,1837.8,1429.2],
-  [1782.6,1636.1,1837.8,1636.1],
-  [1782.6,1986.6,1837.8,1988.0],
-  [1783.9,351.0,1946.8,351.0],
-  [1783.9,1244.8,1837.8,1244.8],
-  [1783.9,1450.3,1837.8,1450.3],
-  [1783.9,1820.5,1837.8,1820.5],
-  [1785.2,895.8,1837.8,895.8],
-  [1785.2,1080.2,1836.5,1080.2],
-  [1785.2,1799.4,1837.8,1799.4],
-  [1785.2,2169.6,1869.3,2169.6],
-  [1786.5,408.7,1927.1,411.6],
-  [1789.2,2190.7,1850.9,2190.7],
-  [1793.1,362.3,1793.1,477.7],
-  [1794.4,546.7,1794.4,688.8],
-  [1793.1,462.2,1793.1,539.6],
-  [1793.1,521.3,1794.4,560.8],
-  [1793.1,639.6,1856.2,639.6],
-  [1794.4,641.0,1824.6,643.8],
-  [1794.4,646.6,1861.4,650.8],
-  [1794.4,894.4,1798.4,1060.4],
-  [1795.7,977.4,1916.6,977.4],
-  [1799.7,1278.6,1799.7,1430.6],
-  [1798.4,1463.0,1801.0,1616.4],
-  [1799.7,710.0,1799.7,745.2],
-  [1799.7,833.8,1886.4,833.8],
-  [1801.0,1078.7,1801.0,1257.5],
-  [1799.7,1346.2,1915.3,1346.2],
-  [1799.7,1719.2,1916.6,1719.2],
-  [1799.7,1900.8,1915.3,1900.8],
-  [1799.7,1906.4,1915.3,1906.4],
-  [1799.7,2004.9,1799.7,2171.0],
-  [1801.0,838.1,1803.6,873.2],
-  [1801.0,1634.7,1801.0,1800.8],
-  [1801.0,1820.5,1801.0,1985.2],
-  [1801.0,2030.3,1829.9,2030.3],
-  [1802.3,2158.3,1829.9,2158.3],
-  [1804.9,583.3,1833.8,584.7],
-  [1806.2,894.4,1806.2,1060.4],
-  [1808.9,1867.0,1808.9,1985.2],
-  [1808.9,1278.6,1808.9,1430.6],
-  [1808.9,1078.7,1808.9,1254.7],
-  [1808.9,1448.9,1808.9,1616.4],
-  [1808.9,1634.7,1810.2,1733.3],
-  [1810.2,2004.9,1810.2,2171.0],
-  [1812.8,653.7,1857.5,655.1],
-  [1815.4,1219.5,1815.4,1289.9],
-  [1818.1,743.7,1818.1,839.5],
-  [1819.4,688.8,1819.4,722.6],
-  [1823.3,1219.5,1823.3,1289.9],
-  [1828.6,1219.5,1828.6,1288.5],
-  [1829.9,710.0,1829.9,873.2],
-  [1832.5,1159.0,1869.3,1160.4],
-  [1836.5,1996.5,1915.3,1996.5],
-  [1837.8,1068.9,1915.3,1068.9],
-  [1837.8,1810.7,1915.3,1810.7],
-  [1839.1,921.1,1886.4,921.1],
-  [1839.1,1311.0,1915.3,1312.4],
-  [1839.1,1436.3,1914.0,1439.1],
-  [1840.4,1851.5,1877.2,1852.9],
-  [1843.0,1760.0,1891.6,1761.4],
-  [1843.0,1771.3,1890.3,1771.3],
-  [1845.7,856.3,1899.5,860.6],
-  [1845.7,1220.9,1886.4,1220.9],
-  [1848.3,831.0,1848.3,887.3],
-  [1848.3,757.8,1898.2,757.8],
-  [1848.3,863.4,1906.1,869.0],
-  [1848.3,2088.0,1895.6,2088.0],
-  [1848.3,2095.0,1894.3,2095.0],
-  [1848.3,2104.9,1891.6,2104.9],
-  [1850.9,763.4,1899.5,763.4],
-  [1852.2,2169.6,1941.6,2169.6],
-  [1853.5,2190.7,1853.5,2432.8],
-  [1856.2,831.0,1856.2,887.3],
-  [1854.9,880.3,1914.0,883.1],
-  [1862.7,832.4,1862.7,887.3],
-  [1862.7,2169.6,1862.7,2432.8],
-  [1864.1,770.5,1898.2,773.3],
-  [1869.3,885.9,1898.2,887.3],
-  [1873.3,832.4,1915.3,832.4],
-  [1873.3,831.0,1873.3,885.9],
-  [1874.6,2180.9,1941.6,2180.9],
-  [1885.1,831.0,1885.1,887.3],
-  [1887.7,1845.9,1890.3,1878.2],
-  [1891.6,808.5,1891.6,887.3],
-  [1889.0,1106.9,1891.6,1136.5],
-  [1889.0,1187.1,1891.6,1220.9],
-  [1889.0,1372.9,1889.0,1402.5],
-  [1889.0,1743.1,1890.3,1771.3],
-  [1891.6,998.5,1891.6,1032.3],
-  [1896.9,1109.7,1896.9,1198.4],
-  [1898.2,804.3,1898.2,866.2],
-  [1895.6,1682.6,1900.8,1755.8],
-  [1896.9,801.5,2040.1,801.5],
-  [1899.5,940.8,1899.5,1014.0],
-  [1902.2,1123.8,1902.2,1199.8],
-  [1902.2,1865.6,1902.2,1941.6],
-  [1903.5,802.9,1903.5,887.3],
-  [1904.8,1679.8,1904.8,1755.8],
-  [1906.1,963.3,1906.1,997.1],
-  [1906.1,1494.0,1906.1,1682.6],
-  [1903.5,2045.7,1904.8,2078.1],
-  [1904.8,2078.1,2080.8,2078.1],
-  [1904.8,2082.3,1973.1,2082.3],
-  [1906.1,2171.0,1935.0,2171.0],
-  [1908.7,1938.8,1908.7,2047.1],
-  [1911.4,867.6,1911.4,942.2],
-  [1908.7,1067.5,1908.7,1128.0],
-  [1908.7,1149.1,1910.0,1177.3],
-  [1908.7,1197.0,1908.7,1312.4],
-  [1908.7,1395.4,1963.9,1395.4],
-  [1908.7,1567.2,1910.0,1612.2],
-  [1910.0,1707.9,1910.0,1868.4],
-  [1908.7,1888.1,1910.0,1916.2],
-  [1910.0,1382.8,1910.0,1498.2],
-  [1914.0,871.8,1914.0,915.5],
-  [1914.0,1012.6,1914.0,1126.6],
-  [1914.0,1197.0,1914.0,1311.0],
-  [1914.0,1568.6,1914.0,1655.8],
-  [1914.0,1709.3,1914.0,1868.4],
-  [1914.0,1938.8,1915.3,2042.9],
-  [1915.3,1382.8,1915.3,1496.8],
-  [1921.9,2351.2,1921.9,2432.8],
-  [1921.9,2361.0,2067.7,2362.4],
-  [1921.9,2403.3,1923.2,2432.8],
-  [1928.4,662.1,1928.4,804.3],
-  [1927.1,762.0,2008.6,763.4],
-  [1927.1,767.7,1963.9,769.1],
-  [1927.1,774.7,2007.3,774.7],
-  [1927.1,793.0,2009.9,793.0],
-  [1927.1,795.8,2080.8,795.8],
-  [1928.4,780.3,2007.3,780.3],
-  [1931.1,270.8,1931.1,418.6],
-  [1931.1,522.8,1931.1,608.6],
-  [1929.7,1384.2,2075.6,1384.2],
-  [1929.7,1433.4,1963.9,1436.3],
-  [1931.1,422.8,1932.4,453.8],
-  [1931.1,612.8,1932.4,649.4],
-  [1931.1,629.7,2074.3,629.7],
-  [1931.1,641.0,2080.8,641.0],
-  [1931.1,650.8,2080.8,650.8],
-  [1931.1,662.1,2044.0,662.1],
-  [1931.1,679.0,2080.8,679.0],
-  [1933.7,705.7,1933.7,804.3],
-  [1931.1,2185.1,2007.3,2185.1],
-  [1931.1,2192.1,2005.9,2192.1],
-  [1931.1,2200.6,2004.6,2200.6],
-  [1931.1,2207.6,2004.6,2207.6],
-  [1931.1,2183.7,1931.1,2382.1],
-  [1931.1,2389.2,1932.4,2432.8],
-  [1932.4,669.1,2072.9,669.1],
-  [1932.4,1401.1,1962.6,1402.5],
-  [1935.0,2088.0,1963.9,2088.0],
-  [1935.0,2102.0,2016.5,2102.0],
-  [1935.0,2109.1,2016.5,2109.1],
-  [1935.0,2117.5,2016.5,2117.5],
-  [1936.3,2099.2,1936.3,2166.8],
-  [1941.6,339.8,1941.6,453.8],
-  [1942.9,270.8,1942.9,341.2],
-  [1941.6,327.1,1941.6,383.4],
-  [1941.6,522.8,1941.6,557.9],
-  [1942.9,563.6,1942.9,693.1],
-  [1941.6,1385.6,1941.6,1437.7],
-  [1941.6,2083.7,1941.6,2362.4],
-  [1944.2,2224.5,2003.3,2224.5],
-  [1945.5,656.5,2072.9,656.5],
-  [1945.5,2231.5,2003.3,2234.4],
-  [1952.1,270.8,1952.1,349.6],
-  [1949.5,2349.8,1996.7,2351.2],
-  [1957.3,270.8,1957.3,345.4],
-  [1953.4,619.9,1954.7,693.1],
-  [1957.3,873.2,2100.5,873.2],
-  [1957.3,909.8,1960.0,940.8],
-  [1957.3,971.8,2097.9,971.8],
-  [1957.3,1001.3,1957.3,1239.2],
-  [1957.3,1157.6,2070.3,1157.6],
-  [1957.3,1195.6,1957.3,1235.0],
-  [1957.3,1274.4,2099.2,1274.4],
-  [1957.3,1304.0,1957.3,1463.0],
-  [1958.6,1529.2,1958.6,1688.2],
-  [1957.3,1712.1,1957.3,1945.8],
-  [1957.3,2002.1,2099.2,2002.1],
-  [1957.3,2007.7,2013.8,2009.1],
-  [1958.6,1609.4,2099.2,1609.4],
-  [1958.6,1720.6,2100.5,1720.6],
-  [1960.0,2285.0,2040.1,2286.4],
-  [1963.9,270.8,1963.9,320.1],
-  [1961.3,763.4,1961.3,804.3],
-  [1961.3,784.6,2007.3,784.6],
-  [1963.9,960.5,1963.9,1128.0],
-  [1962.6,1129.4,1963.9,1239.2],
-  [1962.6,1302.5,1962.6,1430.6],
-  [1963.9,1707.9,1963.9,1795.2],
-  [1962.6,1781.1,1962.6,1958.5],
-  [1963.9,1896.5,1963.9,2007.7],
-  [1963.9,612.8,1969.2,684.6],
-  [1963.9,1527.8,1963.9,1689.6],
-  [1967.8,270.8,1967.8,382.0],
-  [1965.2,1256.1,1965.2,1285.7],
-  [1966.5,270.8,1969.2,300.4],
-  [1970.5,407.3,1970.5,535.4],
-  [1966.5,2217.5,2004.6,2220.3],
-  [1971.8,470.7,1971.8,504.5],
-  [1970.5,753.6,1974.4,802.9],
-  [1971.8,2066.9,2000.7,2066.9],
-  [1977.0,593.1,1977.0,695.9],
-  [1973.1,1686.8,1973.1,1722.0],
-  [1981.0,405.9,1981.0,535.4],
-  [1975.7,593.1,2042.7,593.1],
-  [1975.7,970.4,1975.7,1001.3],
-  [1975.7,1494.0,1978.4,1529.2],
-  [1977.0,749.4,1981.0,802.9],
-  [1977.0,2061.2,2004.6,2061.2],
-  [1979.7,270.8,1979.7,382.0],
-  [1981.0,594.5,1981.0,695.9],
-  [1978.4,2183.7,1981.0,2237.2],
-  [1981.0,503.0,1983.6,535.4],
-  [1983.6,404.5,1983.6,483.3],
-  [1983.6,719.8,2033.5,719.8],
-  [1983.6,2064.0,1983.6,2116.1],
-  [1986.2,732.5,2032.2,732.5],
-  [1991.5,594.5,1991.5,695.9],
-  [1990.2,762.0,1990.2,804.3],
-  [1987.6,2088.0,2016.5,2089.4],
-  [1992.8,341.2,1992.8,535.4],
-  [1998.1,594.5,1998.1,693.1],
-  [1992.8,1268.8,2099.2,1268.8],
-  [1995.4,348.2,1999.4,458.0],
-  [1996.7,1059.0,2055.9,1059.0],
-  [1998.1,1067.5,2058.5,1073.1],
-  [1998.1,2145.7,2048.0,2145.7],
-  [2002.0,594.5,2002.0,697.3],
-  [2000.7,2183.7,2000.7,2286.4],
-  [2002.0,387.6,2002.0,448.2],
-  [2000.7,2154.1,2048.0,2154.1],
-  [2000.7,2161.2,2048.0,2162.6],
-  [2002.0,1861.3,2050.6,1864.2],
-  [2003.3,270.8,2004.6,377.8],
-  [2003.3,918.3,2053.2,918.3],
-  [2003.3,1323.7,2053.2,1323.7],
-  [2004.6,594.5,2005.9,624.1],
-  [2004.6,1208.2,2055.9,1208.2],
-  [2004.6,1662.9,2054.6,1662.9],
-  [2004.6,1855.7,2050.6,1858.5],
-  [2004.6,1869.8,2053.2,1869.8],
-  [2004.6,1874.0,2048.0,1875.4],
-  [2005.9,925.3,2053.2,926.7],
-  [2005.9,1329.3,2053.2,1329.3],
-  [2005.9,1334.9,2053.2,1334.9],
-  [2005.9,2185.1,2005.9,2286.4],
-  [2007.3,417.2,2008.6,448.2],
-  [2007.3,1677.0,2054.6,1677.0],
-  [2008.6,763.4,2008.6,804.3],
-  [2008.6,1215.3,2055.9,1216.7],
-  [2008.6,1222.3,2053.2,1222.3],
-  [2011.2,594.5,2011.2,693.1],
-  [2013.8,1159.0,2097.9,1159.0],
-  [2017.8,594.5,2017.8,693.1],
-  [2016.5,2085.2,2016.5,2114.7],
-  [2019.1,2082.3,2080.8,2083.7],
-  [2023.0,594.5,2023.0,693.1],
-  [2020.4,2044.3,2101.9,2044.3],
-  [2025.7,270.8,2025.7,301.8],
-  [2033.5,594.5,2033.5,693.1],
-  [2030.9,815.5,2094.0,815.5],
-  [2033.5,377.8,2033.5,448.2],
-  [2037.5,594.5,2037.5,693.1],
-  [2042.7,594.5,2042.7,693.1],
-  [2042.7,270.8,2042.7,372.1],
-  [2046.7,612.8,2049.3,693.1],
-  [2048.0,826.8,2094.0,826.8],
-  [2048.0,831.0,2091.3,831.0],
-  [2050.6,2034.5,2101.9,2034.5],
-  [2053.2,612.8,2053.2,693.1],
-  [2059.8,1382.8,2099.2,1382.8],
-  [2062.4,612.8,2062.4,693.1],
-  [2062.4,2082.3,2062.4,2117.5],
-  [2063.8,396.1,2095.3,396.1],
-  [2069.0,308.8,2069.0,407.3],
-  [2071.6,611.4,2071.6,742.3],
-  [2074.3,308.8,2074.3,401.7],
-  [2074.3,439.7,2074.3,610.0],
-  [2078.2,2116.1,2078.2,2348.4],
-  [2074.3,2323.0,2074.3,2362.4],
-  [2075.6,2187.9,2113.7,2190.7],
-  [2075.6,2325.8,2113.7,2325.8],
-  [2079.5,439.7,2079.5,763.4],
-  [2079.5,2117.5,2082.1,2180.9],
-  [2079.5,2248.4,2082.1,2327.3],
-  [2088.7,2211.8,2088.7,2362.4],
-  [2091.3,2244.2,2094.0,2289.2],
-  [2094.0,308.8,2094.0,401.7],
-  [2092.7,870.4,2092.7,1958.5],
-  [2094.0,1710.7,2094.0,2009.1],
-  [2092.7,2324.4,2092.7,2362.4],
-  [2096.6,919.7,2096.6,1240.6],
-  [2097.9,1302.5,2097.9,1465.8],
-  [2097.9,1526.3,2097.9,1691.0],
-  [2097.9,1710.7,2097.9,1861.3],
-  [2099.2,2211.8,2099.2,2296.3],
-  [2100.5,2324.4,2100.5,2400.4],
-  [2103.2,2400.4,2212.2,2400.4],
-  [2108.4,2933.9,2108.4,2994.4],
-  [2111.1,2176.6,2163.6,2176.6],
-  [2111.1,2324.4,2116.3,2400.4],
-  [2122.9,2355.4,2122.9,2400.4],
-  [2121.6,308.8,2122.9,379.2],
-  [2122.9,2173.8,2163.6,2175.2],
-  [2128.1,400.3,2182.0,400.3],
-  [2129.4,2189.3,2163.6,2189.3],
-  [2130.8,308.8,2132.1,356.7],
-  [2140.0,2133.0,2140.0,2251.2],
-  [2138.6,2154.1,2166.2,2154.1],
-  [2143.9,2171.0,2143.9,2400.4],
-  [2143.9,2168.2,2207.0,2168.2],
-  [2147.8,2154.1,2147.8,2328.7],
-  [2146.5,2078.1,2228.0,2078.1],
-  [2151.8,310.2,2153.1,363.7],
-  [2151.8,2065.4,2225.4,2065.4],
-  [2151.8,2251.2,2151.8,2313.2],
-  [2153.1,1280.0,2179.4,1281.4],
-  [2153.1,1330.7,2187.3,1330.7],
-  [2155.7,2175.2,2155.7,2224.5],
-  [2155.7,2354.0,2155.7,2400.4],
-  [2162.3,1240.6,2162.3,1330.7],
-  [2161.0,310.2,2162.3,401.7],
-  [2162.3,527.0,2203.0,527.0],
-  [2162.3,586.1,2250.3,588.9],
-  [2162.3,618.5,2208.3,619.9],
-  [2162.3,565.0,2162.3,804.3],
-  [2162.3,687.4,3486.6,687.4],
-  [2162.3,711.4,2207.0,711.4],
-  [2162.3,738.1,2162.3,804.3],
-  [2162.3,798.6,2274.0,798.6],
-  [2162.3,870.4,2463.1,870.4],
-  [2162.3,871.8,2162.3,901.4],
-  [2162.3,1056.2,2162.3,1092.8],
-  [2162.3,1637.5,2224.0,1640.4],
-  [2162.3,1798.0,2163.6,1850.1],
-  [2162.3,1876.8,2162.3,2006.3],
-  [2162.3,2009.1,2791.6,2009.1],
-  [2164.9,2075.3,2164.9,2263.9],
-  [2163.6,2238.6,2214.8,2238.6],
-  [2164.9,2050.0,2229.3,2050.0],
-  [2166.2,2054.2,2229.3,2058.4],
-  [2167.5,712.8,2167.5,804.3],
-  [2167.5,2045.7,2167.5,2169.6],
-  [2168.9,563.6,2168.9,607.2],
-  [2168.9,1876.8,2168.9,1985.2],
-  [2168.9,2080.9,2228.0,2080.9],
-  [2171.5,2290.7,2171.5,2400.4],
-  [2170.2,1636.1,2170.2,1688.2],
-  [2171.5,2194.9,2171.5,2266.7],
-  [2174.1,607.2,2174.1,684.6],
-  [2174.1,1820.5,2174.1,1883.9],
-  [2176.7,525.6,2176.7,566.4],
-  [2180.7,1080.2,2180.7,1242.0],
-  [2179.4,1643.2,2216.2,1643.2],
-  [2182.0,525.6,2182.0,619.9],
-  [2180.7,901.4,2180.7,1054.8],
-  [2180.7,1330.7,2180.7,1426.4],
-  [2180.7,1453.2,2180.7,1610.8],
-  [2180.7,1671.3,2180.7,1796.6],
-  [2182.0,1862.8,2182.0,1983.8],
-  [2184.6,360.9,2184.6,401.7],
-  [2183.3,576.2,2229.3,577.7],
-  [2183.3,2187.9,3570.7,2187.9],
-  [2184.6,393.3,2212.2,393.3],
-  [2185.9,1332.1,2185.9,1561.5],
-  [2185.9,1484.1,2187.3,1619.2],
-  [2185.9,1620.7,2506.5,1620.7],
-  [2185.9,1672.7,2185.9,1840.2],
-  [2185.9,1868.4,2187.3,2000.7],
-  [2185.9,2002.1,2510.4,2002.1],
-  [2185.9,2354.0,2185.9,2400.4],
-  [2187.3,870.4,2187.3,1277.2],
-  [2187.3,1627.7,2506.5,1627.7],
-  [2188.6,876.1,2463.1,876.1],
-  [2195.1,679.0,2325.2,679.0],
-  [2196.4,2200.6,2325.2,2200.6],
-  [2199.1,2237.2,2199.1,2330.1],
-  [2201.7,2286.4,2201.7,2399.0],
-  [2204.3,308.8,2204.3,380.6],
-  [2201.7,2252.7,2203.0,2282.2],
-  [2203.0,2130.2,2235.9,2130.2],
-  [2212.2,2118.9,2239.8,2118.9],
-  [2213.5,2240.0,2213.5,2400.4],
-  [2216.2,308.8,2220.1,370.7],
-  [2225.4,2092.2,2293.7,2092.2],
-  [2233.2,739.5,2283.2,739.5],
-  [2235.9,308.8,2235.9,405.9],
-  [2235.9,749.4,2283.2,749.4],
-  [2237.2,442.5,2237.2,590.3],
-  [2237.2,515.7,2238.5,619.9],
-  [2239.8,756.4,2279.2,756.4],
-  [2249.0,308.8,2249.0,619.9],
-  [2280.5,2142.9,2306.8,2144.3],
-  [2288.4,2130.2,2317.3,2130.2],
-  [2292.4,797.2,2401.4,797.2],
-  [2292.4,804.3,2400.1,804.3],
-  [2292.4,2080.9,2401.4,2080.9],
-  [2293.7,2075.3,2350.2,2075.3],
-  [2298.9,2120.3,2325.2,2120.3],
-  [2314.7,708.6,2380.4,708.6],
-  [2314.7,2171.0,2380.4,2171.0],
-  [2318.6,1273.0,2367.2,1273.0],
-  [2319.9,1280.0,2368.6,1280.0],
-  [2319.9,1288.5,2367.2,1288.5],
-  [2321.3,1807.9,2368.6,1807.9],
-  [2327.8,2704.5,2389.6,2705.9],
-  [2329.1,3191.5,2385.6,3191.5],
-  [2333.1,1799.4,2368.6,1800.8],
-  [2337.0,2237.2,2337.0,2332.9],
-  [2342.3,2075.3,2400.1,2075.3],
-  [2350.2,2088.0,2350.2,2171.0],
-  [2356.7,546.7,2356.7,643.8],
-  [2358.0,2237.2,2358.0,2332.9],
-  [2365.9,2140.0,2392.2,2141.5],
-  [2368.6,679.0,2498.6,679.0],
-  [2368.6,2200.6,2498.6,2200.6],
-  [2373.8,2130.2,2406.7,2130.2],
-  [2383.0,2120.3,2409.3,2121.7],
-  [2383.0,2126.0,2409.3,2126.0],
-  [2398.8,2086.6,2469.7,2086.6],
-  [2400.1,2095.0,2435.6,2095.0],
-  [2409.3,740.9,2459.2,740.9],
-  [2411.9,750.8,2460.5,750.8],
-  [2411.9,756.4,2460.5,756.4],
-  [2421.1,800.0,2573.5,800.0],
-  [2456.6,895.8,2530.2,897.2],
-  [2463.1,2130.2,2492.1,2130.2],
-  [2464.5,2121.7,2501.3,2121.7],
-  [2465.8,2080.9,2573.5,2080.9],
-  [2471.0,2075.3,2573.5,2075.3],
-  [2473.7,2116.1,2501.3,2116.1],
-  [2485.5,691.7,2511.8,691.7],
-  [2486.8,708.6,2552.5,708.6],
-  [2486.8,2171.0,2552.5,2171.0],
-  [2497.3,686.0,2528.8,687.4],
-  [2507.8,870.4,2790.3,870.4],
-  [2509.1,1427.8,2509.1,2014.8],
-  [2510.4,2238.6,2510.4,2334.3],
-  [2511.8,546.7,2511.8,643.8],
-  [2513.1,1477.1,2514.4,1613.6],
-  [2513.1,1636.1,2513.1,1800.8],
-  [2513.1,1821.9,2513.1,1985.2],
-  [2519.6,711.4,2519.6,802.9],
-  [2522.3,2076.7,2522.3,2171.0],
-  [2530.2,546.7,2530.2,643.8],
-  [2530.2,878.9,2792.9,878.9],
-  [2530.2,2238.6,2530.2,2334.3],
-  [2542.0,679.0,2672.0,679.0],
-  [2542.0,2200.6,2611.6,2202.0],
-  [2548.5,2127.4,2576.1,2128.8],
-  [2548.5,2133.0,2574.8,2133.0],
-  [2570.9,2085.2,2641.8,2085.2],
-  [2581.4,746.6,2631.3,746.6],
-  [2582.7,738.1,2631.3,738.1],
-  [2582.7,2002.1,2653.7,2002.1],
-  [2584.0,752.2,2631.3,752.2],
-  [2584.0,757.8,2631.3,757.8],
-  [2616.9,794.4,2716.7,794.4],
-  [2622.1,1727.6,2672.0,1727.6],
-  [2623.4,1149.1,2673.4,1149.1],
-  [2627.4,2141.5,2653.7,2141.5],
-  [2635.3,2134.4,2662.8,2137.2],
-  [2637.9,679.0,2672.0,680.4],
-  [2637.9,2128.8,2664.2,2128.8],
-  [2639.2,2078.1,2746.9,2078.1],
-  [2640.5,804.3,2746.9,804.3],
-  [2644.5,2121.7,2672.0,2121.7],
-  [2660.2,708.6,2725.9,711.4],
-  [2660.2,797.2,2746.9,797.2],
-  [2660.2,2171.0,2724.6,2171.0],
-  [2669.4,2002.1,2792.9,2002.1],
-  [2672.0,2075.3,2746.9,2076.7],
-  [2683.9,546.7,2683.9,643.8],
-  [2685.2,686.0,2715.4,687.4],
-  [2690.4,742.3,2761.4,742.3],
-  [2693.1,711.4,2693.1,814.1],
-  [2702.3,2237.2,2702.3,2300.5],
-  [2703.6,546.7,2703.6,643.8],
-  [2710.1,1265.9,2711.5,1354.6],
-  [2710.1,1267.4,2764.0,1267.4],
-  [2710.1,1273.0,2792.9,1274.4],
-  [2710.1,1344.8,2749.6,1344.8],
-  [2710.1,1350.4,2749.6,1350.4],
-  [2710.1,1357.4,2749.6,1357.4],
-  [2710.1,1367.3,2749.6,1367.3],
-  [2710.1,1381.4,2749.6,1381.4],
-  [2710.1,1396.9,2749.6,1396.9],
-  [2710.1,1405.3,2791.6,1408.1],
-  [2710.1,1422.2,2782.4,1423.6],
-  [2710.1,1433.4,2783.7,1433.4],
-  [2710.1,1441.9,2783.7,1441.9],
-  [2712.8,752.2,2761.4,752.2],
-  [2716.7,1265.9,2719.3,1440.5],
-  [2716.7,2202.0,2844.2,2202.0],
-  [2719.3,679.0,2768.0,680.4],
-  [2736.4,2705.9,2808.7,2705.9],
-  [2745.6,1301.1,2745.6,1440.5],
-  [2743.0,788.8,2815.2,788.8],
-  [2743.0,3191.5,2804.7,3191.5],
-  [2744.3,2085.2,2794.2,2085.2],
-  [2745.6,1302.5,2792.9,1302.5],
-  [2746.9,784.6,2813.9,784.6],
-  [2753.5,2121.7,2803.4,2121.7],
-  [2756.1,2127.4,2803.4,2127.4],
-  [2756.1,2134.4,2804.7,2134.4],
-  [2766.6,797.2,2792.9,797.2],
-  [2777.1,679.0,2777.1,742.3],
-  [2779.8,707.1,2779.8,804.3],
-  [2785.0,870.4,2785.0,1137.9],
-  [2787.7,1220.9,2787.7,1405.3],
-  [2785.0,1426.4,2785.0,2007.7],
-  [2789.0,2085.2,2869.1,2085.2],
-  [2790.3,871.8,2790.3,1136.5],
-  [2791.6,1430.6,2791.6,2007.7],
-  [2792.9,1712.1,2823.1,1715.0],
-  [2795.5,679.0,2842.8,679.0],
-  [2799.5,743.7,2846.8,743.7],
-  [2802.1,755.0,2846.8,755.0],
-  [2804.7,2027.4,2846.8,2030.3],
-  [2811.3,797.2,2920.4,797.2],
-  [2811.3,2082.3,2967.7,2082.3],
-  [2812.6,802.9,2919.0,802.9],
-  [2812.6,2075.3,2874.4,2075.3],
-  [2833.6,708.6,2899.3,710.0],
-  [2833.6,2169.6,2899.3,2169.6],
-  [2844.2,679.0,2844.2,711.4],
-  [2848.1,1715.0,2974.2,1715.0],
-  [2853.4,1495.4,2853.4,1654.4],
-  [2854.7,871.8,3080.6,871.8],
-  [2854.7,873.2,2854.7,1319.4],
-  [2854.7,1610.8,3146.3,1610.8],
-  [2854.7,1678.4,2856.0,1717.8],
-  [2854.7,1720.6,2972.9,1720.6],
-  [2854.7,2007.7,2892.8,2009.1],
-  [2856.0,546.7,2856.0,643.8],
-  [2856.0,1080.2,2917.7,1081.6],
-  [2858.6,1450.3,2858.6,1578.4],
-  [2856.0,1768.4,2856.0,1821.9],
-  [2856.0,2238.6,2857.3,2331.5],
-  [2859.9,1080.2,2859.9,1244.8],
-  [2861.2,1265.9,2861.2,1384.2],
-  [2859.9,1637.5,2859.9,1729.0],
-  [2861.2,894.4,2861.2,1059.0],
-  [2861.2,1368.7,2861.2,1429.2],
-  [2861.2,1539.0,2861.2,1615.0],
-  [2865.2,2082.3,2865.2,2171.0],
-  [2866.5,710.0,2866.5,802.9],
-  [2871.7,1265.9,2871.7,1416.6],
-  [2871.7,1080.2,2871.7,1244.8],
-  [2871.7,1450.3,2871.7,1615.0],
-  [2871.7,1823.3,2871.7,1981.0],
-  [2873.1,1715.0,2878.3,1805.0],
-  [2874.4,690.3,3030.7,690.3],
-  [2875.7,546.7,2877.0,641.0],
-  [2875.7,877.5,3164.7,877.5],
-  [2875.7,2237.2,2875.7,2332.9],
-  [2877.0,1059.0,2877.0,1318.0],
-  [2877.0,1422.2,2877.0,1581.2],
-  [2877.0,1821.9,2878.3,1874.0],
-  [2877.0,1883.9,2877.0,2009.1],
-  [2877.0,1905.0,2924.3,1905.0],
-  [2879.6,1799.4,2978.2,1799.4],
-  [2880.9,840.9,2928.2,845.1],
-  [2884.9,740.9,2933.5,740.9],
-  [2886.2,749.4,2933.5,749.4],
-  [2886.2,753.6,2932.2,755.0],
-  [2887.5,680.4,3017.6,680.4],
-  [2887.5,2200.6,3017.6,2200.6],
-  [2892.8,1617.8,3146.3,1617.8],
-  [2894.1,1948.6,3036.0,1948.6],
-  [2896.7,1957.1,2959.8,1957.1],
-  [2896.7,1964.1,2938.7,1965.5],
-  [2917.7,790.2,2987.4,790.2],
-  [2917.7,1658.7,2975.5,1658.7],
-  [2920.4,1664.3,2978.2,1665.7],
-  [2920.4,1672.7,2980.8,1675.6],
-  [2924.3,2089.4,2987.4,2089.4],
-  [2936.1,794.4,3060.9,794.4],
-  [2938.7,1081.6,3080.6,1081.6],
-  [2940.1,1075.9,3082.0,1075.9],
-  [2941.4,1907.8,3104.3,1907.8],
-  [2949.3,3170.4,2983.4,3170.4],
-  [2951.9,2075.3,2951.9,2202.0],
-  [2953.2,679.0,2953.2,804.3],
-  [2954.5,1900.8,2954.5,1974.0],
-  [2958.5,971.8,3017.6,971.8],
-  [2961.1,980.2,3020.2,980.2],
-  [2963.7,3149.3,3004.4,3149.3],
-  [2965.0,3153.5,3009.7,3153.5],
-  [2970.3,742.3,3020.2,742.3],
-  [2971.6,1767.0,3147.6,1767.0],
-  [2971.6,1772.7,3149.0,1772.7],
-  [2972.9,755.0,3041.2,755.0],
-  [2975.5,985.8,3021.5,988.7],
-  [2975.5,1955.7,3039.9,1955.7],
-  [2975.5,1962.7,3039.9,1962.7],
-  [2976.8,748.0,3020.2,748.0],
-  [2984.7,2080.9,3092.5,2080.9],
-  [2986.0,2075.3,3057.0,2075.3],
-  [2988.7,1902.2,3237.0,1902.2],
-  [2990.0,2007.7,3092.5,2007.7],
-  [3005.8,708.6,3071.4,708.6],
-  [3005.8,2169.6,3071.4,2171.0],
-  [3005.8,2175.2,3071.4,2175.2],
-  [3005.8,2180.9,3071.4,2180.9],
-  [3020.2,802.9,3091.1,802.9],
-  [3020.2,1339.1,3067.5,1339.1],
-  [3022.8,1344.8,3067.5,1344.8],
-  [3022.8,1351.8,3067.5,1351.8],
-  [3028.1,2276.6,3029.4,2316.0],
-  [3029.4,546.7,3029.4,643.8],
-  [3029.4,1829.0,3095.1,1829.0],
-  [3030.7,1715.0,3093.8,1715.0],
-  [3030.7,1722.0,3092.5,1722.0],
-  [3032.0,1840.2,3095.1,1843.1],
-  [3036.0,708.6,3036.0,797.2],
-  [3036.0,2075.3,3036.0,2192.1],
-  [3038.6,1900.8,3038.6,2009.1],
-  [3039.9,1610.8,3039.9,1720.6],
-  [3041.2,711.4,3041.2,795.8],
-  [3045.2,2075.3,3092.5,2075.3],
-  [3046.5,593.1,3049.1,643.8],
-  [3046.5,690.3,3204.1,690.3],
-  [3049.1,2237.2,3049.1,2334.3],
-  [3057.0,743.7,3104.3,743.7],
-  [3058.3,1948.6,3106.9,1948.6],
-  [3059.6,749.4,3104.3,749.4],
-  [3059.6,756.4,3105.6,756.4],
-  [3059.6,1961.3,3127.9,1961.3],
-  [3059.6,2000.7,3093.8,2003.5],
-  [3060.9,679.0,3191.0,679.0],
-  [3060.9,1965.5,3106.9,1965.5],
-  [3060.9,2200.6,3149.0,2200.6],
-  [3063.6,798.6,3092.5,798.6],
-  [3064.9,2133.0,3091.1,2133.0],
-  [3075.4,1658.7,3101.7,1660.1],
-  [3076.7,2121.7,3103.0,2121.7],
-  [3078.0,1068.9,3121.4,1068.9],
-  [3084.6,1647.4,3130.6,1647.4],
-  [3089.8,787.4,3162.1,787.4],
-  [3089.8,795.8,3265.9,795.8],
-  [3089.8,1996.5,3159.5,1996.5],
-  [3089.8,2083.7,3265.9,2083.7],
-  [3091.1,2093.6,3160.8,2093.6],
-  [3103.0,2704.5,3173.9,2704.5],
-  [3105.6,1083.0,3650.8,1083.0],
-  [3108.2,3191.5,3155.5,3191.5],
-  [3118.7,870.4,3118.7,1077.3],
-  [3116.1,1060.4,3222.5,1060.4],
-  [3124.0,679.0,3124.0,804.3],
-  [3122.7,742.3,3192.3,742.3],
-  [3122.7,2142.9,3168.7,2142.9],
-  [3124.0,870.4,3162.1,870.4],
-  [3125.3,2075.3,3125.3,2202.0],
-  [3126.6,1902.2,3126.6,2009.1],
-  [3130.6,1647.4,3130.6,1722.0],
-  [3135.8,2200.6,3188.4,2202.0],
-  [3138.4,959.1,3188.4,963.3],
-  [3141.1,978.8,3183.1,978.8],
-  [3143.7,738.1,3191.0,738.1],
-  [3145.0,750.8,3184.4,752.2],
-  [3145.0,756.4,3192.3,756.4],
-  [3149.0,1948.6,3214.6,1948.6],
-  [3150.3,1955.7,3214.6,1955.7],
-  [3150.3,1964.1,3214.6,1964.1],
-  [3150.3,2131.6,3176.5,2131.6],
-  [3156.8,2002.1,3202.8,2002.1],
-  [3158.2,2006.3,3265.9,2006.3],
-  [3159.5,802.9,3264.6,802.9],
-  [3159.5,2075.3,3206.8,2075.3],
-  [3160.8,1902.2,3229.1,1905.0],
-  [3162.1,2120.3,3188.4,2120.3],
-  [3168.7,1772.7,3297.4,1772.7],
-  [3170.0,1613.6,3650.8,1613.6],
-  [3179.2,708.6,3244.9,708.6],
-  [3179.2,2171.0,3244.9,2171.0],
-  [3179.2,2176.6,3244.9,2176.6],
-  [3179.2,2183.7,3244.9,2183.7],
-  [3181.8,1634.7,3183.1,1705.1],
-  [3189.7,679.0,3189.7,711.4],
-  [3193.6,892.9,3259.3,892.9],
-  [3193.6,1821.9,3229.1,1821.9],
-  [3201.5,2237.2,3202.8,2332.9],
-  [3202.8,546.7,3202.8,643.8],
-  [3206.8,3181.6,3252.7,3181.6],
-  [3209.4,708.6,3210.7,767.7],
-  [3209.4,739.5,3276.4,739.5],
-  [3209.4,743.7,3277.7,743.7],
-  [3210.7,895.8,3210.7,1059.0],
-  [3212.0,2075.3,3212.0,2192.1],
-  [3213.3,1713.6,3298.7,1715.0],
-  [3213.3,1719.2,3293.5,1722.0],
-  [3213.3,1900.8,3213.3,1985.2],
-  [3214.6,708.6,3216.0,795.8],
-  [3214.6,1667.1,3214.6,1772.7],
-  [3216.0,2075.3,3258.0,2076.7],
-  [3221.2,546.7,3221.2,643.8],
-  [3219.9,1084.4,3219.9,1244.8],
-  [3221.2,690.3,3328.9,691.7],
-  [3221.2,1075.9,3548.4,1075.9],
-  [3223.8,1143.5,3223.8,1585.5],
-  [3221.2,1450.3,3221.2,1636.1],
-  [3221.2,2002.1,3265.9,2002.1],
-  [3221.2,2237.2,3221.2,2332.9],
-  [3222.5,1619.2,3547.0,1619.2],
-  [3222.5,1660.1,3248.8,1661.5],
-  [3222.5,1716.4,3222.5,1772.7],
-  [3225.2,1084.4,3225.2,1360.3],
-  [3226.5,1444.7,3226.5,1484.1],
-  [3229.1,3174.6,3255.4,3174.6],
-  [3230.4,749.4,3277.7,749.4],
-  [3230.4,755.0,3276.4,756.4],
-  [3230.4,1950.0,3279.0,1951.4],
-  [3233.0,679.0,3363.1,679.0],
-  [3233.0,1647.4,3259.3,1647.4],
-  [3233.0,1958.5,3280.3,1958.5],
-  [3233.0,1964.1,3280.3,1964.1],
-  [3235.7,2085.2,3334.2,2085.2],
-  [3235.7,2202.0,3363.1,2202.0],
-  [3237.0,1715.0,3239.6,1772.7],
-  [3239.6,2131.6,3267.2,2131.6],
-  [3242.2,1767.0,3293.5,1769.9],
-  [3248.8,2123.2,3276.4,2123.2],
-  [3250.1,2117.5,3276.4,2118.9],
-  [3259.3,873.2,3515.5,873.2],
-  [3261.9,788.8,3334.2,788.8],
-  [3261.9,1902.2,3326.3,1902.2],
-  [3263.3,3156.3,3336.8,3156.3],
-  [3264.6,2093.6,3331.6,2093.6],
-  [3269.8,1831.8,3317.1,1831.8],
-  [3272.5,3178.8,3317.1,3178.8],
-  [3276.4,3152.1,3336.8,3152.1],
-  [3279.0,1620.7,3283.0,1722.0],
-  [3280.3,1703.7,3306.6,1705.1],
-  [3285.6,798.6,3311.9,798.6],
-  [3285.6,1620.7,3285.6,1722.0],
-  [3288.2,3169.0,3314.5,3169.0],
-  [3296.1,679.0,3296.1,804.3],
-  [3296.1,1948.6,3364.4,1951.4],
-  [3298.7,1900.8,3298.7,2009.1],
-  [3300.0,2075.3,3300.0,2200.6],
-  [3315.8,1715.0,3472.2,1715.0],
-  [3317.1,736.7,3448.5,736.7],
-  [3317.1,1720.6,3466.9,1720.6],
-  [3317.1,1955.7,3364.4,1955.7],
-  [3317.1,1962.7,3359.2,1962.7],
-  [3318.4,745.2,3388.1,745.2],
-  [3318.4,750.8,3388.1,750.8],
-  [3318.4,1769.9,3385.4,1769.9],
-  [3321.1,756.4,3365.7,756.4],
-  [3327.6,2128.8,3353.9,2128.8],
-  [3331.6,795.8,3470.8,795.8],
-  [3331.6,2002.1,3388.1,2002.1],
-  [3331.6,2009.1,3388.1,2009.1],
-  [3331.6,2078.1,3438.0,2078.1],
-  [3331.6,2080.9,3373.6,2080.9],
-  [3332.9,802.9,3447.2,802.9],
-  [3336.8,2118.9,3364.4,2118.9],
-  [3352.6,2171.0,3417.0,2171.0],
-  [3352.6,2178.1,3417.0,2178.1],
-  [3352.6,2182.3,3417.0,2182.3],
-  [3353.9,1902.2,3386.8,1902.2],
-  [3374.9,2237.2,3374.9,2331.5],
-  [3376.2,546.7,3376.2,643.8],
-  [3378.9,687.4,3448.5,687.4],
-  [3382.8,710.0,3382.8,804.3],
-  [3384.1,1767.0,3384.1,1869.8],
-  [3382.8,1986.6,3530.0,1986.6],
-  [3382.8,1992.3,3547.0,1992.3],
-  [3382.8,2082.3,3410.4,2085.2],
-  [3384.1,976.0,3432.7,976.0],
-  [3384.1,981.6,3432.7,981.6],
-  [3385.4,1896.5,3385.4,2007.7],
-  [3385.4,1664.3,3447.2,1664.3],
-  [3385.4,1669.9,3445.9,1669.9],
-  [3385.4,1814.9,3415.7,1816.3],
-  [3385.4,2075.3,3386.8,2192.1],
-  [3393.3,588.9,3394.6,641.0],
-  [3393.3,2237.2,3393.3,2334.3],
-  [3396.0,1654.4,3444.6,1655.8],
-  [3405.1,745.2,3445.9,745.2],
-  [3405.1,752.2,3448.5,752.2],
-  [3405.1,1342.0,3455.1,1342.0],
-  [3406.5,679.0,3476.1,679.0],
-  [3406.5,1350.4,3455.1,1350.4],
-  [3406.5,1358.8,3453.8,1358.8],
-  [3406.5,2202.0,3533.9,2202.0],
-  [3414.3,2134.4,3440.6,2134.4],
-  [3415.7,2128.8,3441.9,2128.8],
-  [3424.9,2120.3,3452.4,2120.3],
-  [3435.4,2088.0,3507.6,2088.0],
-  [3436.7,2095.0,3505.0,2095.0],
-  [3444.6,791.6,3579.9,791.6],
-  [3444.6,1767.0,3508.9,1767.0],
-  [3444.6,1772.7,3649.5,1772.7],
-  [3449.8,690.3,3476.1,690.3],
-  [3465.6,795.8,3497.1,797.2],
-  [3468.2,2103.5,3473.5,2187.9],
-  [3476.1,2262.5,3476.1,2420.2],
-  [3476.1,2437.0,3476.1,2482.1],
-  [3477.4,504.5,3477.4,804.3],
-  [3477.4,786.0,3662.7,786.0],
-  [3480.0,503.0,3552.3,504.5],
-  [3485.3,2366.7,3485.3,2534.2],
-  [3486.6,503.0,3486.6,804.3],
-  [3486.6,2339.9,3487.9,2370.9],
-  [3491.9,2407.5,3491.9,2534.2],
-  [3489.2,2407.5,3493.2,2453.9],
-  [3490.5,1715.0,3569.4,1715.0],
-  [3491.9,1720.6,3566.7,1720.6],
-  [3494.5,1890.9,3541.8,1892.3],
-  [3494.5,2414.5,3497.1,2453.9],
-  [3505.0,1997.9,3547.0,1997.9],
-  [3505.0,2131.6,3532.6,2131.6],
-  [3511.6,2449.7,3516.8,2534.2],
-  [3514.2,884.5,3547.0,887.3],
-  [3514.2,2120.3,3541.8,2120.3],
-  [3515.5,2075.3,3569.4,2075.3],
-  [3516.8,2080.9,3569.4,2082.3],
-  [3524.7,2175.2,3570.7,2175.2],
-  [3524.7,2180.9,3570.7,2180.9],
-  [3524.7,2449.7,3526.0,2534.2],
-  [3524.7,2705.9,3597.0,2705.9],
-  [3530.0,2106.3,3530.0,2134.4],
-  [3532.6,2449.7,3539.2,2534.2],
-  [3535.2,2169.6,3535.2,2199.2],
-  [3537.8,797.2,3577.3,797.2],
-  [3539.2,2441.3,3545.7,2534.2],
-  [3540.5,2007.7,3646.9,2007.7],
-  [3541.8,1767.0,3649.5,1767.0],
-  [3543.1,873.2,3650.8,873.2],
-  [3544.4,2465.2,3544.4,2532.8],
-  [3545.7,897.2,3649.5,897.2],
-  [3545.7,1059.0,3547.0,1164.6],
-  [3545.7,1161.8,3650.8,1161.8],
-  [3545.7,1982.4,3649.5,1982.4],
-  [3547.0,503.0,3547.0,804.3],
-  [3547.0,721.2,3575.9,721.2],
-  [3547.0,752.2,3606.2,753.6],
-  [3547.0,1123.8,3649.5,1123.8],
-  [3547.0,1133.6,3587.8,1133.6],
-  [3547.0,1143.5,3644.3,1146.3],
-  [3551.0,1084.4,3552.3,1159.0],
-  [3551.0,2168.2,3552.3,2196.3],
-  [3552.3,712.8,3552.3,804.3],
-  [3552.3,726.9,3589.1,728.3],
-  [3552.3,738.1,3589.1,738.1],
-  [3552.3,759.2,3606.2,759.2],
-  [3552.3,788.8,3653.5,788.8],
-  [3553.6,711.4,3589.1,711.4],
-  [3556.2,1636.1,3556.2,1722.0],
-  [3556.2,2199.2,3556.2,2275.2],
-  [3564.1,1126.6,3564.1,1164.6],
-  [3562.8,2075.3,3562.8,2173.8],
-  [3562.8,2441.3,3562.8,2532.8],
-  [3566.7,2002.1,3649.5,2002.1],
-  [3568.1,522.8,3942.5,522.8],
-  [3568.1,642.4,3727.0,642.4],
-  [3569.4,483.3,3569.4,804.3],
-  [3568.1,877.5,3614.0,877.5],
-  [3568.1,890.1,3642.9,891.5],
-  [3568.1,1989.4,3604.8,1990.8],
-  [3568.1,2089.4,3568.1,2275.2],
-  [3569.4,2158.3,3569.4,2275.2],
-  [3569.4,2441.3,3569.4,2534.2],
-  [3569.4,1129.4,3572.0,1164.6],
-  [3573.3,483.3,3573.3,643.8],
-  [3573.3,552.3,3573.3,643.8],
-  [3575.9,604.4,3575.9,757.8],
-  [3575.9,2441.3,3578.6,2499.0],
-  [3577.3,2042.9,3629.8,2045.7],
-  [3579.9,2057.0,3678.4,2057.0],
-  [3579.9,2062.6,3641.6,2062.6],
-  [3583.8,483.3,3583.8,532.6],
-  [3582.5,583.3,3586.5,642.4],
-  [3586.5,676.2,3586.5,759.2],
-  [3589.1,1111.1,3589.1,1164.6],
-  [3587.8,483.3,3590.4,532.6],
-  [3590.4,1713.6,3650.8,1715.0],
-  [3591.7,2489.1,3593.0,2534.2],
-  [3597.0,483.3,3597.0,563.6],
-  [3594.3,1116.7,3597.0,1159.0],
-  [3597.0,1657.3,3597.0,1686.8],
-  [3594.3,1662.9,3620.6,1664.3],
-  [3595.6,798.6,3707.3,798.6],
-  [3599.6,871.8,3599.6,1032.3],
-  [3602.2,1111.1,3602.2,1164.6],
-  [3600.9,622.7,3600.9,670.6],
-  [3602.2,483.3,3604.8,563.6],
-  [3604.8,871.8,3604.8,953.5],
-  [3604.8,990.1,3604.8,1064.7],
-  [3603.5,1651.6,3650.8,1651.6],
-  [3604.8,985.8,3606.2,1016.8],
-  [3607.5,1106.9,3607.5,1164.6],
-  [3607.5,1641.8,3607.5,1677.0],
-  [3606.2,1619.2,3641.6,1619.2],
-  [3607.5,625.5,3607.5,669.1],
-  [3608.8,871.8,3612.7,921.1],
-  [3611.4,939.4,3612.7,978.8],
-  [3614.0,1105.5,3614.0,1188.5],
-  [3611.4,2452.5,3612.7,2534.2],
-  [3612.7,626.9,3612.7,669.1],
-  [3612.7,1001.3,3615.4,1032.3],
-  [3618.0,483.3,3618.0,532.6],
-  [3616.7,1251.9,3648.2,1251.9],
-  [3619.3,939.4,3619.3,978.8],
-  [3620.6,995.7,3620.6,1035.1],
-  [3618.0,1636.1,3618.0,1667.1],
-  [3620.6,2449.7,3620.6,2534.2],
-  [3623.2,1123.8,3623.2,1195.6],
-  [3625.9,871.8,3625.9,1075.9],
-  [3628.5,1125.2,3628.5,1191.3],
-  [3627.2,1325.1,3627.2,1364.5],
-  [3631.1,483.3,3631.1,563.6],
-  [3629.8,1125.2,3629.8,1257.5],
-  [3631.1,871.8,3631.1,1097.0],
-  [3633.8,1437.7,3633.8,1519.3],
-  [3632.4,1740.3,3633.8,1774.1],
-  [3632.4,2487.7,3632.4,2534.2],
-  [3633.8,802.9,3702.1,804.3],
-  [3633.8,1129.4,3636.4,1174.5],
-  [3636.4,1202.6,3639.0,1232.2],
-  [3640.3,483.3,3640.3,531.2],
-  [3637.7,1463.0,3639.0,1492.6],
-  [3641.6,1094.2,3641.6,1181.5],
-  [3641.6,1606.6,3641.6,1821.9],
-  [3640.3,593.1,3871.5,593.1],
-  [3640.3,653.7,3762.5,655.1],
-  [3640.3,687.4,3640.3,724.0],
-  [3640.3,695.9,3761.2,695.9],
-  [3640.3,702.9,3698.1,702.9],
-  [3640.3,729.7,3696.8,729.7],
-  [3640.3,743.7,3696.8,743.7],
-  [3640.3,760.6,3698.1,760.6],
-  [3640.3,767.7,3698.1,767.7],
-  [3642.9,597.4,3642.9,664.9],
-  [3642.9,1325.1,3642.9,1443.3],
-  [3642.9,1513.7,3642.9,1596.7],
-  [3642.9,1578.4,3644.3,1630.5],
-  [3642.9,1791.0,3642.9,1947.2],
-  [3644.3,1909.2,3644.3,2009.1],
-  [3642.9,2076.7,3828.2,2076.7],
-  [3642.9,2083.7,3858.4,2083.7],
-  [3642.9,2090.8,3721.8,2090.8],
-  [3642.9,2097.8,3686.3,2097.8],
-  [3642.9,2131.6,3782.2,2131.6],
-  [3642.9,2134.4,3733.6,2134.4],
-  [3644.3,1250.5,3644.3,1282.8],
-  [3646.9,2168.2,3646.9,2410.3],
-  [3646.9,687.4,3646.9,804.3],
-  [3648.2,795.8,3784.8,795.8],
-  [3649.5,1092.8,3649.5,1181.5],
-  [3649.5,1513.7,3649.5,1605.2],
-  [3649.5,1579.8,3649.5,1688.2],
-  [3649.5,1250.5,3649.5,1443.3],
-  [3649.5,1698.1,3650.8,1730.4],
-  [3649.5,1758.6,3649.5,2009.1],
-  [3649.5,2273.8,3649.5,2313.2],
-  [3650.8,2324.4,3650.8,2534.2],
-  [3650.8,2214.6,3650.8,2249.8],
-  [3650.8,2332.9,3782.2,2332.9],
-  [3652.1,2327.3,3791.4,2327.3],
-  [3653.5,697.3,3653.5,725.4],
-  [3653.5,2075.3,3657.4,2169.6],
-  [3657.4,483.3,3657.4,521.3],
-  [3660.0,622.7,3660.0,677.6],
-  [3660.0,2418.7,3662.7,2508.8],
-  [3661.3,726.9,3662.7,773.3],
-  [3666.6,597.4,3666.6,676.2],
-  [3664.0,752.2,3698.1,753.6],
-  [3667.9,484.8,3669.2,563.6],
-  [3671.9,604.4,3671.9,674.8],
-  [3675.8,2051.4,3675.8,2116.1],
-  [3681.0,525.6,3681.0,605.8],
-  [3681.0,783.2,3840.0,783.2],
-  [3681.0,1923.3,3745.4,1923.3],
-  [3682.4,995.7,3742.8,997.1],
-  [3682.4,1612.2,3745.4,1616.4],
-  [3682.4,1619.2,3746.7,1619.2],
-  [3682.4,2532.8,3685.0,2587.7],
-  [3683.7,1938.8,3745.4,1938.8],
-  [3685.0,793.0,3774.3,793.0],
-  [3685.0,1629.1,3746.7,1631.9],
-  [3685.0,1931.7,3745.4,1931.7],
-  [3686.3,2361.0,3744.1,2361.0],
-  [3687.6,697.3,3691.6,804.3],
-  [3688.9,586.1,3692.9,635.4],
-  [3688.9,676.2,3759.9,683.2],
-  [3688.9,684.6,3761.2,684.6],
-  [3691.6,2193.5,3737.5,2193.5],
-  [3692.9,853.5,3740.2,857.8],
-  [3692.9,1353.2,3740.2,1353.2],
-  [3692.9,1363.1,3737.5,1365.9],
-  [3692.9,2202.0,3737.5,2202.0],
-  [3696.8,534.0,3696.8,565.0],
-  [3696.8,619.9,3698.1,778.9],
-  [3699.4,2393.4,3699.4,2472.2],
-  [3698.1,534.0,3942.5,534.0],
-  [3698.1,2559.5,3699.4,2587.7],
-  [3704.7,1346.2,3740.2,1349.0],
-  [3716.5,2235.8,3716.5,2299.1],
-  [3715.2,2247.0,3783.5,2248.4],
-  [3717.8,2235.8,3782.2,2240.0],
-  [3721.8,2448.3,3721.8,2587.7],
-  [3723.1,2235.8,3723.1,2323.0],
-  [3723.1,2092.2,3782.2,2092.2],
-  [3724.4,802.9,3812.4,802.9],
-  [3724.4,2116.1,3782.2,2116.1],
-  [3725.7,2448.3,3725.7,2587.7],
-  [3727.0,557.9,3779.6,557.9],
-  [3732.3,2075.3,3732.3,2134.4],
-  [3733.6,2393.4,3733.6,2493.3],
-  [3729.7,2407.5,3795.3,2407.5],
-  [3731.0,2539.8,3734.9,2587.7],
-  [3732.3,2235.8,3737.5,2301.9],
-  [3738.9,2097.8,3782.2,2097.8],
-  [3738.9,2235.8,3741.5,2296.3],
-  [3740.2,2393.4,3740.2,2455.3],
-  [3741.5,719.8,3791.4,722.6],
-  [3741.5,2539.8,3745.4,2587.7],
-  [3744.1,728.3,3792.7,728.3],
-  [3744.1,732.5,3792.7,732.5],
-  [3744.1,738.1,3790.1,738.1],
-  [3744.1,2259.7,3783.5,2262.5],
-  [3745.4,2393.4,3750.7,2451.1],
-  [3750.7,2235.8,3750.7,2293.5],
-  [3749.4,2075.3,3753.3,2134.4],
-  [3752.0,2110.5,3782.2,2110.5],
-  [3753.3,2507.4,3757.2,2587.7],
-  [3755.9,793.0,3840.0,793.0],
-  [3759.9,555.1,3759.9,697.3],
-  [3757.2,770.5,3787.5,770.5],
-  [3757.2,776.1,3840.0,776.1],
-  [3757.2,2052.8,3832.1,2052.8],
-  [3757.2,2054.2,3759.9,2111.9],
-  [3759.9,2235.8,3762.5,2286.4],
-  [3771.7,2235.8,3773.0,2279.4],
-  [3774.3,2393.4,3774.3,2451.1],
-  [3780.9,826.8,3780.9,1294.1],
-  [3780.9,1399.7,4252.6,1399.7],
-  [3780.9,1412.3,4252.6,1412.3],
-  [3780.9,1858.5,3997.7,1858.5],
-  [3780.9,1867.0,3992.4,1867.0],
-  [3780.9,2137.2,3780.9,2587.7],
-  [3780.9,2376.5,4059.4,2376.5],
-  [3780.9,2389.2,4418.1,2389.2],
-  [3782.2,883.1,3829.5,883.1],
-  [3782.2,1294.1,3920.2,1294.1],
-  [3782.2,1460.2,3782.2,1819.1],
-  [3782.2,2047.1,3830.8,2047.1],
-  [3783.5,826.8,3883.4,826.8],
-  [3784.8,763.4,3840.0,763.4],
-  [3784.8,2045.7,3784.8,2083.7],
-  [3784.8,2062.6,3832.1,2062.6],
-  [3784.8,2399.0,3786.2,2483.5],
-  [3791.4,825.4,3791.4,1347.6],
-  [3791.4,1458.8,3791.4,1592.5],
-  [3791.4,1574.2,3792.7,1613.6],
-  [3791.4,1669.9,3791.4,1817.7],
-  [3792.7,2075.3,3792.7,2587.7],
-  [3795.3,2073.9,3883.4,2073.9],
-  [3798.0,1350.4,3800.6,1395.4],
-  [3804.5,1356.0,3807.2,1388.4],
-  [3812.4,793.0,3840.0,794.4],
-  [3826.9,883.1,3826.9,964.7],
-  [3825.6,894.4,3867.6,894.4],
-  [3825.6,900.0,3866.3,904.2],
-  [3826.9,536.8,3829.5,598.8],
-  [3828.2,624.1,3928.0,624.1],
-  [3828.2,631.1,3942.5,631.1],
-  [3828.2,655.1,3942.5,655.1],
-  [3828.2,726.9,3928.0,728.3],
-  [3828.2,742.3,3895.2,745.2],
-  [3829.5,930.9,3866.3,933.8],
-  [3829.5,963.3,3866.3,964.7],
-  [3829.5,1282.8,3922.8,1285.7],
-  [3833.4,890.1,3840.0,966.1],
-  [3841.3,536.8,3841.3,673.4],
-  [3842.6,890.1,3842.6,966.1],
-  [3847.9,583.3,3847.9,743.7],
-  [3847.9,831.0,3886.0,832.4],
-  [3849.2,1349.0,4072.6,1349.0],
-  [3849.2,1374.3,3989.8,1374.3],
-  [3850.5,586.1,3854.5,655.1],
-  [3853.2,677.6,3854.5,710.0],
-  [3854.5,890.1,3859.7,966.1],
-  [3854.5,1702.3,3904.4,1703.7],
-  [3855.8,1710.7,3904.4,1712.1],
-  [3855.8,1717.8,3904.4,1717.8],
-  [3861.0,590.3,3861.0,657.9],
-  [3858.4,648.0,3928.0,648.0],
-  [3859.7,825.4,3968.8,825.4],
-  [3861.0,876.1,3868.9,966.1],
-  [3862.4,873.2,4072.6,873.2],
-  [3863.7,636.8,3928.0,642.4],
-  [3871.5,597.4,3875.5,648.0],
-  [3892.6,1550.3,3895.2,1636.1],
-  [3892.6,1983.8,3892.6,2152.7],
-  [3893.9,726.9,3893.9,804.3],
-  [3893.9,1244.8,4016.1,1244.8],
-  [3893.9,1553.1,3926.7,1554.5],
-  [3893.9,1981.0,3989.8,1981.0],
-  [3895.2,1584.1,3951.7,1589.7],
-  [3897.8,1581.2,3899.1,1615.0],
-  [3900.5,2237.2,3950.4,2237.2],
-  [3903.1,2247.0,3949.1,2248.4],
-  [3905.7,1319.4,3955.6,1319.4],
-  [3908.3,1325.1,3955.6,1327.9],
-  [3908.3,1337.7,3950.4,1337.7],
-  [3914.9,1867.0,3914.9,2152.7],
-  [3913.6,2044.3,3992.4,2044.3],
-  [3914.9,2055.6,3983.2,2055.6],
-  [3916.2,1599.5,3968.8,1599.5],
-  [3916.2,2704.5,3978.0,2704.5],
-  [3920.2,1938.8,3920.2,1969.7],
-  [3926.7,536.8,3926.7,743.7],
-  [3929.4,1265.9,3995.0,1265.9],
-  [3930.7,825.4,4102.8,825.4],
-  [3935.9,3191.5,3983.2,3191.5],
-  [3938.6,1630.5,3983.2,1631.9],
-  [3938.6,1636.1,3983.2,1636.1],
-  [3941.2,525.6,3941.2,839.5],
-  [3941.2,1553.1,3983.2,1555.9],
-  [3942.5,1320.8,3942.5,1349.0],
-  [3943.8,1278.6,4039.7,1278.6],
-  [3946.4,1249.1,4016.1,1250.5],
-  [3946.4,1254.7,4016.1,1256.1],
-  [3958.3,838.1,4030.5,838.1],
-  [3964.8,1917.7,4013.4,1917.7],
-  [3964.8,2014.8,4001.6,2017.6],
-  [3966.1,2007.7,3996.4,2010.6],
-  [3967.5,1923.3,4014.8,1923.3],
-  [3967.5,1931.7,4013.4,1933.1],
-  [3967.5,2023.2,4012.1,2023.2],
-  [3967.5,2028.8,4010.8,2028.8],
-  [3968.8,2055.6,4067.3,2055.6],
-  [3972.7,2044.3,4066.0,2044.3],
-  [3975.3,1209.6,4016.1,1211.1],
-  [3975.3,1215.3,4016.1,1216.7],
-  [3975.3,1226.5,4016.1,1227.9],
-  [3984.5,1413.7,3984.5,1826.2],
-  [3984.5,2009.1,3984.5,2057.0],
-  [3987.2,1981.0,4085.7,1981.0],
-  [3989.8,1399.7,3989.8,1868.4],
-  [3991.1,1204.0,3991.1,1295.5],
-  [3992.4,1993.7,4066.0,1995.1],
-  [3995.0,1986.6,4085.7,1986.6],
-  [3996.4,1068.9,4043.7,1068.9],
-  [3997.7,825.4,4067.3,825.4],
-  [3997.7,1081.6,4046.3,1081.6],
-  [3997.7,1353.2,4072.6,1353.2],
-  [3999.0,1294.1,4092.3,1295.5],
-  [4016.1,1284.2,4092.3,1284.2],
-  [4017.4,1857.1,4221.0,1857.1],
-  [4020.0,1868.4,4365.5,1868.4],
-  [4025.3,838.1,4140.9,838.1],
-  [4050.2,3171.8,4081.8,3171.8],
-  [4058.1,2406.1,4431.2,2406.1],
-  [4059.4,2141.5,4059.4,2375.1],
-  [4067.3,1981.0,4067.3,2390.6],
-  [4075.2,826.8,4260.4,826.8],
-  [4085.7,726.9,4085.7,804.3],
-  [4085.7,1868.4,4085.7,2152.7],
-  [4088.3,1631.9,4147.4,1631.9],
-  [4091.0,1637.5,4150.1,1637.5],
-  [4091.0,1646.0,4151.4,1646.0],
-  [4092.3,876.1,4186.9,876.1],
-  [4097.5,871.8,4155.3,871.8],
-  [4106.7,3157.7,4179.0,3157.7],
-  [4106.7,3166.2,4158.0,3166.2],
-  [4106.7,3177.4,4156.6,3177.4],
-  [4112.0,1282.8,4260.4,1282.8],
-  [4117.2,1294.1,4251.2,1294.1],
-  [4122.5,1857.1,4171.1,1858.5],
-  [4129.1,726.9,4259.1,726.9],
-  [4129.1,740.9,4240.7,740.9],
-  [4129.1,753.6,4163.2,753.6],
-  [4129.1,815.5,4158.0,815.5],
-  [4139.6,832.4,4240.7,832.4],
-  [4176.4,791.6,4203.9,791.6],
-  [4186.9,3177.4,4239.4,3177.4],
-  [4203.9,894.4,4203.9,1112.5],
-  [4203.9,1243.4,4252.6,1243.4],
-  [4205.3,1133.6,4205.3,1249.1],
-  [4206.6,1855.7,4286.7,1855.7],
-  [4207.9,900.0,4207.9,1111.1],
-  [4223.6,815.5,4249.9,815.5],
-  [4239.4,1982.4,4418.1,1982.4],
-  [4239.4,1982.4,4239.4,2152.7],
-  [4251.2,894.4,4252.6,1032.3],
-  [4251.2,1080.2,4251.2,1244.8],
-  [4251.2,1450.3,4251.2,1615.0],
-  [4251.2,1852.9,4407.6,1852.9],
-  [4252.6,826.8,4252.6,873.2],
-  [4252.6,1265.9,4252.6,1429.2],
-  [4252.6,1636.1,4252.6,1800.8],
-  [4259.1,1979.6,4259.1,2152.7],
-  [4261.7,826.8,4261.7,1868.4],
-  [4269.6,1928.9,4318.2,1928.9],
-  [4274.9,3191.5,4337.9,3191.5],
-  [4280.1,2704.5,4340.6,2704.5],
-  [4284.1,1895.1,4326.1,1899.4],
-  [4284.1,1902.2,4324.8,1906.4],
-  [4284.1,1910.6,4323.5,1912.0],
-  [4284.1,1941.6,4313.0,1944.4],
-  [4284.1,1972.5,4429.9,1972.5],
-  [4394.4,1867.0,4420.7,1868.4],
-  [4418.1,1974.0,4418.1,2390.6],
-  [4432.5,1852.9,4432.5,2407.5],
-  [4541.6,2704.5,4592.8,2704.5],
-  [4546.8,3191.5,4608.6,3191.5],
-  [4948.9,63.9,4948.9,3305.5]
-];
+// Fetched as tiles from the map server for the current view (see loadMapTiles);
+// only the coarsest tile is bundled (MAP_FALLBACK), for when no server answers
+const MAP_URL = import.meta.env.VITE_MAP_URL || "http://localhost:5001";
+const MAP_VIEW = { x: -150, y: 0, w: 1350, h: 1120 }; // FloorPlan's full viewBox, in SVG space
+const MAP_MIN_VIEW_W = 120; // Deepest zoom: SVG units across the view
+const MAP_MAX_WIDTH = 900; // CSS px of the map shell
 
 // ── NAVIGATION GRAPH ──
 const NAV_RAW = RAW.map(r => ({ id: `p${r.id}`, x: tx(r.x), y: ty(r.y), label: r.label, feat: r }));
@@ -1709,6 +408,164 @@ function astar(s,e,bl=[]) {
   return null;
 }
 
+// ── BINARY WIRE PROTOCOL ──
+// Mirrors echoaid-server/services/wire_protocol.py (little-endian, uint16 node indices)
+const WIRE_PROTOCOL = 'binary';
+const FRAME_ROUTE = 1, FRAME_POSITION = 2, FRAME_ROUTE_DELTA = 3;
+const NO_WIRE_NODE = 0xFFFF;
+const ROUTE_HEADER_SIZE = 16, DELTA_HEADER_SIZE = 24, POSITION_SIZE = 11;
+
+function wireReason(code, node) {
+  if (code === 2) return `Rerouted due to blockage at ${node}`;
+  if (code === 1) return 'User requested reroute';
+  return 'Visual path generation';
+}
+
+function decodeRouteFrame(buf, wire) {
+  const v = new DataView(buf instanceof ArrayBuffer ? buf : buf.buffer, buf.byteOffset || 0);
+  const ts = v.getUint32(1, true), dest = v.getUint16(5, true);
+  const reason = v.getUint8(7), reasonNode = v.getUint16(8, true);
+  const version = v.getUint32(10, true), count = v.getUint16(14, true);
+  const route = [];
+  for (let i = 0; i < count; i++) route.push(wire.nodes[v.getUint16(ROUTE_HEADER_SIZE + i * 2, true)]);
+  return {
+    route,
+    version,
+    destination: dest === NO_WIRE_NODE ? null : wire.nodes[dest],
+    reason: wireReason(reason, reasonNode === NO_WIRE_NODE ? null : wire.nodes[reasonNode]),
+    timestamp: wire.epoch + ts / 1000,
+  };
+}
+
+function decodeRouteDeltaFrame(buf, wire) {
+  const v = new DataView(buf instanceof ArrayBuffer ? buf : buf.buffer, buf.byteOffset || 0);
+  const ts = v.getUint32(1, true), dest = v.getUint16(5, true);
+  const reason = v.getUint8(7), reasonNode = v.getUint16(8, true);
+  const count = v.getUint16(22, true);
+  const suffix = [];
+  for (let i = 0; i < count; i++) suffix.push(wire.nodes[v.getUint16(DELTA_HEADER_SIZE + i * 2, true)]);
+  return {
+    baseVersion: v.getUint32(10, true),
+    version: v.getUint32(14, true),
+    from: v.getUint16(18, true),
+    keep: v.getUint16(20, true),
+    suffix,
+    destination: dest === NO_WIRE_NODE ? null : wire.nodes[dest],
+    reason: wireReason(reason, reasonNode === NO_WIRE_NODE ? null : wire.nodes[reasonNode]),
+    timestamp: wire.epoch + ts / 1000,
+  };
+}
+
+function decodePositionFrame(buf, wire) {
+  const v = new DataView(buf instanceof ArrayBuffer ? buf : buf.buffer, buf.byteOffset || 0);
+  const slot = v.getUint16(5, true);
+  return {
+    userId: wire.slotUsers[slot] || `slot-${slot}`,
+    currentNode: wire.nodes[v.getUint16(7, true)],
+    progress: v.getUint16(9, true),
+  };
+}
+
+function encodePositionFrame(index, progress) {
+  const buf = new ArrayBuffer(POSITION_SIZE);
+  const v = new DataView(buf);
+  v.setUint8(0, FRAME_POSITION);
+  v.setUint16(7, index, true);
+  v.setUint16(9, Math.min(Math.max(progress | 0, 0), 0xFFFF), true);
+  return buf;
+}
+
+// ── MAP TILES (server: services/map_tiles.py) ──
+// Header "EMT1", uint16 extent, uint16 count; then four columns of zigzag
+// varints: x1, y1 as deltas from the previous wall, x2 - x1, y2 - y1
+function decodeMapTile(buf, left, top, span) {
+  const bytes = new Uint8Array(buf);
+  const v = new DataView(buf);
+  const extent = v.getUint16(4, true), count = v.getUint16(6, true);
+  const values = [];
+  let value = 0, shift = 0;
+  for (let i = 8; i < bytes.length; i++) {
+    value += (bytes[i] & 0x7f) * 2 ** shift;
+    shift += 7;
+    if (!(bytes[i] & 0x80)) {
+      values.push(value % 2 ? -(value + 1) / 2 : value / 2);
+      value = 0; shift = 0;
+    }
+  }
+  const k = span / extent, walls = [];
+  let x1 = 0, y1 = 0;
+  for (let i = 0; i < count; i++) {
+    x1 += values[i]; y1 += values[count + i];
+    const x2 = x1 + values[2 * count + i], y2 = y1 + values[3 * count + i];
+    // Room space -> SVG space
+    walls.push({ x1: tx(left + x1 * k), y1: ty(top + y1 * k), x2: tx(left + x2 * k), y2: ty(top + y2 * k) });
+  }
+  return walls;
+}
+
+// Walls of the bundled coarsest tile (build_map.py writes it next to the server's artifact)
+function fallbackWalls() {
+  const raw = atob(MAP_FALLBACK.tile);
+  const bytes = new Uint8Array(raw.length);
+  for (let i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+  return decodeMapTile(bytes.buffer, MAP_FALLBACK.origin[0], MAP_FALLBACK.origin[1], MAP_FALLBACK.size);
+}
+
+async function loadMapManifest(baseUrl) {
+  const base = baseUrl.replace(/\/$/, "");
+  const res = await fetch(`${base}/map/tiles.json`, { headers: { 'bypass-tunnel-reminder': 'true' }, cache: "no-cache" });
+  if (!res.ok) throw new Error(`HTTP ${res.status}`);
+  return { base, ...(await res.json()) };
+}
+
+// Clamp a view to the plan, keeping its aspect ratio
+function clampMapView(view) {
+  const w = Math.min(MAP_VIEW.w, Math.max(MAP_MIN_VIEW_W, view.w));
+  const h = w * MAP_VIEW.h / MAP_VIEW.w;
+  return {
+    x: Math.min(MAP_VIEW.x + MAP_VIEW.w - w, Math.max(MAP_VIEW.x, view.x)),
+    y: Math.min(MAP_VIEW.y + MAP_VIEW.h - h, Math.max(MAP_VIEW.y, view.y)),
+    w, h,
+  };
+}
+
+// Walls of one floor in the view, at the detail the view's zoom can show.
+// `cache` maps tile URLs to decoded walls, so panning back costs nothing.
+async function loadMapTiles(manifest, view, cache, floor = 0) {
+  const f = manifest.floors.find(e => e.floor === floor);
+  if (!f) return { walls: [], level: null, tiles: 0, fetched: 0 };
+
+  // Coarsest level whose tiles have at least one CSS pixel per tile pixel: what a
+  // level drops is shorter than a pixel (walls are drawn under a pixel wide anyway)
+  const screenPx = Math.min(window.innerWidth, MAP_MAX_WIDTH);
+  const mapPx = screenPx * (f.size * S) / view.w;
+  const level = Math.max(0, Math.min(manifest.levels - 1, Math.ceil(Math.log2(mapPx / manifest.tilePixels))));
+
+  // View in room space (the tiles' space)
+  const span = f.size / 2 ** level;
+  const x0 = view.x / S + OX, y0 = view.y / S + OY, x1 = (view.x + view.w) / S + OX, y1 = (view.y + view.h) / S + OY;
+  const wanted = f.tiles[level].filter(([x, y]) => {
+    const left = f.origin[0] + x * span, top = f.origin[1] + y * span;
+    return left < x1 && left + span > x0 && top < y1 && top + span > y0;
+  });
+  let fetched = 0;
+  const tiles = await Promise.all(wanted.map(([x, y]) => {
+    const url = `${manifest.base}/map/${manifest.version}/${floor}/${level}/${x}/${y}.bin`;
+    if (!cache.has(url)) {
+      fetched++;
+      cache.set(url, fetch(url, { headers: { 'bypass-tunnel-reminder': 'true' } })
+        .then(res => {
+          if (!res.ok) throw new Error(`tile ${level}/${x}/${y}: HTTP ${res.status}`);
+          return res.arrayBuffer();
+        })
+        .then(buf => decodeMapTile(buf, f.origin[0] + x * span, f.origin[1] + y * span, span))
+        .catch(err => { cache.delete(url); throw err; }));
+    }
+    return cache.get(url);
+  }));
+  return { walls: tiles.flat(), level, tiles: wanted.length, fetched };
+}
+
 function speak(t){if("speechSynthesis"in window){window.speechSynthesis.cancel();const u=new SpeechSynthesisUtterance(t);u.rate=1.1;window.speechSynthesis.speak(u);}}
 
 /* ═══════════════════════════════════════════════════════════════
@@ -1957,17 +814,55 @@ const brain = (() => {
 })();
 
 /* ─── SVG FLOOR PLAN COMPONENT ─── */
-const FloorPlan = ({ userPos, route, blockades, congestion, edgeCong, exitLoadData, onClick, people, hoveredRoom, setHoveredRoom, clients, adminMode, mode, userHeading, otherUsers }) => {
+const FloorPlan = ({ walls, view = MAP_VIEW, onViewChange, userPos, route, blockades, congestion, edgeCong, exitLoadData, onClick, people, hoveredRoom, setHoveredRoom, clients, adminMode, mode, userHeading, otherUsers }) => {
   const rp = route ? route.map(id => NM[id]).filter(Boolean) : [];
+  const svgRef = useRef(null);
+  const viewRef = useRef(view);
+  viewRef.current = view;
+  const drag = useRef(null); // { x, y, view, moved } while a pointer is down
+
+  // Screen point -> SVG space
+  const toSvg = (clientX, clientY) => {
+    const svg = svgRef.current;
+    const p = svg.createSVGPoint();
+    p.x = clientX; p.y = clientY;
+    return p.matrixTransform(svg.getScreenCTM().inverse());
+  };
 
-  // Convert wall segments to SVG space
-  const wallLines = useMemo(() => WALLS_RAW.map(([x1,y1,x2,y2]) => ({
-    x1: tx(x1), y1: ty(y1), x2: tx(x2), y2: ty(y2)
-  })), []);
+  // Wheel zooms around the cursor (non-passive, so the page doesn't scroll)
+  useEffect(() => {
+    const svg = svgRef.current;
+    if (!svg || !onViewChange) return;
+    const onWheel = (e) => {
+      e.preventDefault();
+      const v = viewRef.current, p = toSvg(e.clientX, e.clientY);
+      const k = Math.exp(e.deltaY * 0.0015);
+      onViewChange(clampMapView({ x: p.x - (p.x - v.x) * k, y: p.y - (p.y - v.y) * k, w: v.w * k }));
+    };
+    svg.addEventListener('wheel', onWheel, { passive: false });
+    return () => svg.removeEventListener('wheel', onWheel);
+  }, [onViewChange]);
+
+  // Drag pans; a drag is not a click on whatever it started on
+  const onPointerDown = (e) => {
+    if (onViewChange) drag.current = { x: e.clientX, y: e.clientY, view, moved: false };
+  };
+  const onPointerMove = (e) => {
+    const d = drag.current;
+    if (!d) return;
+    if (!d.moved && Math.hypot(e.clientX - d.x, e.clientY - d.y) < 5) return;
+    d.moved = true;
+    const scale = svgRef.current.getScreenCTM().a; // Screen px per SVG unit
+    onViewChange(clampMapView({ ...d.view, x: d.view.x - (e.clientX - d.x) / scale, y: d.view.y - (e.clientY - d.y) / scale }));
+  };
+  const onPointerUp = () => { setTimeout(() => { drag.current = null; }, 0); };
+  const onClickCapture = (e) => { if (drag.current?.moved) e.stopPropagation(); };
 
   return (
-    <svg viewBox="-150 0 1350 1120" preserveAspectRatio="xMidYMid meet"
-      style={{ width: "100%", height: "100%", background: "#060a10", borderRadius: 12, display: "block" }}>
+    <svg ref={svgRef} viewBox={`${view.x} ${view.y} ${view.w} ${view.h}`} preserveAspectRatio="xMidYMid meet"
+      onPointerDown={onPointerDown} onPointerMove={onPointerMove} onPointerUp={onPointerUp} onPointerLeave={onPointerUp}
+      onClickCapture={onClickCapture}
+      style={{ width: "100%", height: "100%", background: "#060a10", borderRadius: 12, display: "block", touchAction: onViewChange ? "none" : "auto" }}>
       <defs>
         <filter id="gl"><feGaussianBlur stdDeviation="3" result="b"/><feMerge><feMergeNode in="b"/><feMergeNode in="SourceGraphic"/></feMerge></filter>
         <filter id="gs"><feGaussianBlur stdDeviation="5" result="b"/><feMerge><feMergeNode in="b"/><feMergeNode in="SourceGraphic"/></feMerge></filter>
@@ -1977,7 +872,7 @@ const FloorPlan = ({ userPos, route, blockades, congestion, edgeCong, exitLoadDa
       <rect width="1200" height="1120" fill="url(#grd)"/>
 
       {/* ═══ ACTUAL FLOOR PLAN WALLS from PDF ═══ */}
-      {wallLines.map((w, i) => (
+      {walls.map((w, i) => (
         <line key={i} x1={w.x1} y1={w.y1} x2={w.x2} y2={w.y2}
           stroke="#A7C7E7" strokeWidth="1" strokeLinecap="round"/>
       ))}
@@ -2250,6 +1145,10 @@ export default function App() {
   const [socket, setSocket] = useState(null);
   const [isConnected, setIsConnected] = useState(false);
   const [serverUrl, setServerUrl] = useState('');
+  const [mapWalls, setMapWalls] = useState(fallbackWalls); // Walls in view, in SVG space (bundled coarse tile until the server answers)
+  const [mapView, setMapView] = useState(MAP_VIEW); // FloorPlan's viewBox (zoom and pan)
+  const [mapManifest, setMapManifest] = useState(null); // Tile manifest of the map server, null when offline
+  const mapTileCache = useRef(new Map()); // Tile URL -> decoded walls (promise)
   const [otherUsers, setOtherUsers] = useState({}); // Track other connected users
   const [voiceDirections, setVoiceDirections] = useState([]); // Turn-by-turn directions
   const [currentDirection, setCurrentDirection] = useState(0); // Current step in directions
@@ -2260,6 +1159,10 @@ export default function App() {
   const simRef = useRef(null);
   const headingRef = useRef(0);
   const lastStepTime = useRef(0);
+  const wireRef = useRef(null); // Negotiated binary protocol state (node table, epoch, slots)
+  const routeRef = useRef({ version: 0, route: null }); // Last server route, base for route_delta
+  const sessionRef = useRef(null); // Resume token so a dropped connection keeps its route
+  const voiceRef = useRef({}); // Voice streams in flight, by streamId
   
   const activeClient = clients.find(c => c.id === activeClientId);
   const updateClient = useCallback((id, updates) => {
@@ -2311,6 +1214,77 @@ export default function App() {
     }
   }, []);
 
+  // Streamed voice: voice_start, binary voice_chunk frames, voice_end.
+  // Plays as chunks arrive via MediaSource; otherwise plays the whole clip at the end.
+  const startVoiceStream = useCallback(({ streamId, mimeType }) => {
+    const stream = { chunks: [], queue: [], source: null, buffer: null, ended: false };
+    voiceRef.current[streamId] = stream;
+    if (!window.MediaSource || !MediaSource.isTypeSupported(mimeType)) return;
+
+    const source = new MediaSource();
+    const audio = new Audio(URL.createObjectURL(source));
+    stream.source = source;
+    source.addEventListener('sourceopen', () => {
+      stream.buffer = source.addSourceBuffer(mimeType);
+      stream.buffer.addEventListener('updateend', () => {
+        if (stream.queue.length) stream.buffer.appendBuffer(stream.queue.shift());
+        else if (stream.ended && source.readyState === 'open') source.endOfStream();
+      });
+      if (stream.queue.length) stream.buffer.appendBuffer(stream.queue.shift());
+    });
+
+    setIsPlayingAudio(true);
+    audio.onended = () => {
+      setIsPlayingAudio(false);
+      URL.revokeObjectURL(audio.src);
+    };
+    audio.play().catch(err => {
+      console.error('❌ Failed to play voice stream:', err);
+      setIsPlayingAudio(false);
+    });
+  }, []);
+
+  const appendVoiceChunk = useCallback(({ streamId, audio }) => {
+    const stream = voiceRef.current[streamId];
+    if (!stream) return;
+    if (!stream.source) {
+      stream.chunks.push(audio);
+    } else if (stream.buffer && !stream.buffer.updating && !stream.queue.length) {
+      stream.buffer.appendBuffer(audio);
+    } else {
+      stream.queue.push(audio);
+    }
+  }, []);
+
+  const endVoiceStream = useCallback(({ streamId, ok }) => {
+    const stream = voiceRef.current[streamId];
+    delete voiceRef.current[streamId];
+    if (!stream) return;
+    if (!ok) console.log('⚠️  Voice stream ended early');
+
+    if (stream.source) {
+      stream.ended = true;
+      if (stream.buffer && !stream.buffer.updating && !stream.queue.length && stream.source.readyState === 'open') {
+        stream.source.endOfStream();
+      }
+      return;
+    }
+
+    // No MediaSource: play what arrived as one clip
+    if (!stream.chunks.length) return;
+    const audioUrl = URL.createObjectURL(new Blob(stream.chunks, { type: 'audio/mpeg' }));
+    const audio = new Audio(audioUrl);
+    setIsPlayingAudio(true);
+    audio.onended = () => {
+      setIsPlayingAudio(false);
+      URL.revokeObjectURL(audioUrl);
+    };
+    audio.play().catch(err => {
+      console.error('❌ Failed to play voice clip:', err);
+      setIsPlayingAudio(false);
+    });
+  }, []);
+
   const log = useCallback((m, t = "info") => {
     const d = new Date();
     const ts = `${String(d.getHours()).padStart(2, "0")}:${String(d.getMinutes()).padStart(2, "0")}:${String(d.getSeconds()).padStart(2, "0")}`;
@@ -2358,6 +1332,19 @@ export default function App() {
         setIsConnected(true);
         log('Connected to server', 'success');
 
+        // Ask for compact binary routes/positions
+        wireRef.current = null;
+        newSocket.emit('negotiate_protocol', { protocol: WIRE_PROTOCOL });
+
+        // Reconnecting after a drop: pick the old session back up instead of re-joining
+        if (sessionRef.current) {
+          newSocket.emit('resume_session', {
+            resumeToken: sessionRef.current.token,
+            protocol: WIRE_PROTOCOL
+          });
+          return;
+        }
+
         // Get user's name
         const userName = prompt('Enter your name:') || 'Anonymous';
 
@@ -2399,7 +1386,20 @@ export default function App() {
         log(`Server says: ${data.message}`, 'info');
       });
 
-      newSocket.on('route_assigned', (data) => {
+      newSocket.on('protocol_ack', (data) => {
+        if (data.protocol === 'binary') {
+          wireRef.current = {
+            nodes: data.nodes,
+            index: Object.fromEntries(data.nodes.map((id, i) => [id, i])),
+            epoch: data.epoch,
+            slotUsers: {},
+          };
+        }
+        log(`Wire protocol: ${data.protocol}`, 'info');
+      });
+
+      const handleRouteAssigned = (data) => {
+        routeRef.current = { version: data.version || 0, route: data.route };
         console.log('🛤️  Route assigned from server!');
         console.log('📦 Full data:', data);
         console.log('📍 Route:', data.route);
@@ -2455,9 +1455,74 @@ export default function App() {
             return c;
           });
         });
+      };
+
+      newSocket.on('route_assigned', handleRouteAssigned);
+
+      // Users already evacuating when we joined or resumed: their slots let us place binary position frames
+      const seedOtherUsers = (users = []) => {
+        const others = users.filter(user => user.userId !== sessionRef.current?.userId);
+        if (wireRef.current) {
+          others.filter(user => user.slot != null).forEach(user => {
+            wireRef.current.slotUsers[user.slot] = user.userId;
+          });
+        }
+        setOtherUsers(prev => {
+          const updated = { ...prev };
+          others.forEach(user => {
+            updated[user.userId] = {
+              progress: 0,
+              ...prev[user.userId],
+              name: user.name,
+              currentNode: user.position,
+              lastUpdate: Date.now()
+            };
+          });
+          return updated;
+        });
+      };
+
+      newSocket.on('session_token', (data) => {
+        sessionRef.current = { token: data.resumeToken, userId: data.userId };
+        seedOtherUsers(data.users);
+      });
+
+      newSocket.on('session_resumed', (data) => {
+        sessionRef.current = { token: data.resumeToken, userId: data.userId };
+        seedOtherUsers(data.users);
+        log(`Reconnected - route kept (${data.pendingEvents} missed updates)`, 'success');
+        // Missed route deltas are replayed next; only take the full route if we have none
+        if (!routeRef.current.route && data.route?.length) {
+          handleRouteAssigned(data);
+        }
       });
 
-      newSocket.on('user_position', (data) => {
+      newSocket.on('resume_failed', (data) => {
+        sessionRef.current = null;
+        log(`${data.message}`, 'error');
+      });
+      newSocket.on('route_assigned_bin', (buf) => {
+        if (wireRef.current) handleRouteAssigned(decodeRouteFrame(buf, wireRef.current));
+      });
+
+      // Reroutes arrive as edits of the previous route: keep route[from..from+keep), append suffix
+      const handleRouteDelta = (data) => {
+        const base = routeRef.current;
+        if (!base.route || base.version !== data.baseVersion) {
+          console.log(`🔁 Route delta for v${data.baseVersion} but have v${base.version}, resyncing`);
+          newSocket.emit('request_route_sync', {});
+          return;
+        }
+        const route = [...base.route.slice(data.from, data.from + data.keep), ...data.suffix];
+        handleRouteAssigned({ ...data, route });
+      };
+
+      newSocket.on('route_delta', handleRouteDelta);
+      newSocket.on('route_delta_bin', (buf) => {
+        if (wireRef.current) handleRouteDelta(decodeRouteDeltaFrame(buf, wireRef.current));
+      });
+
+      const handleUserPosition = (data) => {
         // Update other user's position for real-time visualization
         console.log(`User ${data.userId} at ${data.currentNode}`);
         setOtherUsers(prev => ({
@@ -2469,6 +1534,23 @@ export default function App() {
             lastUpdate: Date.now()
           }
         }));
+      };
+
+      newSocket.on('user_position', handleUserPosition);
+      newSocket.on('user_position_bin', (buf) => {
+        if (wireRef.current) handleUserPosition(decodePositionFrame(buf, wireRef.current));
+      });
+
+      // The server found our last move implausible (through a wall, or too fast): resync to its node
+      newSocket.on('position_corrected', (data) => {
+        const node = NM[data.currentNode];
+        log(`📍 Position ${data.reason} by server: ${node?.label || data.currentNode}`, 'info');
+        setClients(prev => prev.map(c => c.id === activeClientId ? {
+          ...c,
+          node: data.currentNode,
+          pos: node ? { x: node.x, y: node.y } : c.pos,
+          progress: data.progress
+        } : c));
       });
 
       newSocket.on('blockage_added', (data) => {
@@ -2476,6 +1558,19 @@ export default function App() {
         log(`${data.reroutedUsers} users rerouted`, 'info');
       });
 
+      // Provisional blockages are refined once the report has been parsed
+      newSocket.on('blockage_updated', (data) => {
+        log(data.type
+          ? `⚠️  Blockage at ${data.location} confirmed: ${data.severity} ${data.type}`
+          : `⚠️  Blockage at ${data.location} reported by ${data.reportCount} people`, 'error');
+      });
+
+      newSocket.on('blockage_cleared', (data) => {
+        log(data.relocatedTo
+          ? `📍 Blockage at ${data.location} was actually at ${data.relocatedTo}`
+          : `✅ Blockage cleared at ${data.location}`, 'info');
+      });
+
       newSocket.on('blockage_alert', (data) => {
         console.log(`🚨 Blockage alert! ${data.distance}m ahead at ${data.location}`);
         log(`🚨 ${data.severity} BLOCKAGE AHEAD!`, 'error');
@@ -2489,8 +1584,16 @@ export default function App() {
         }
       });
 
-      newSocket.on('user_joined', (data) => {
+      newSocket.on('voice_start', (data) => {
+        console.log(`🔊 Voice (${data.kind}): ${data.text}`);
+        startVoiceStream(data);
+      });
+      newSocket.on('voice_chunk', appendVoiceChunk);
+      newSocket.on('voice_end', endVoiceStream);
+
+      const handleUserJoined = (data) => {
         log(`👤 ${data.name} joined evacuation`, 'info');
+        if (wireRef.current && data.slot != null) wireRef.current.slotUsers[data.slot] = data.userId;
         // Add new user to tracking
         setOtherUsers(prev => ({
           ...prev,
@@ -2501,10 +1604,19 @@ export default function App() {
             lastUpdate: Date.now()
           }
         }));
+      };
+
+      newSocket.on('user_joined', handleUserJoined);
+      // Joins are admitted in batches; the batch includes this phone's own entry
+      newSocket.on('users_joined', (data) => {
+        data.users
+          .filter(user => user.userId !== sessionRef.current?.userId)
+          .forEach(handleUserJoined);
       });
 
       newSocket.on('user_left', (data) => {
         log(`👋 User left evacuation`, 'info');
+        if (wireRef.current) delete wireRef.current.slotUsers[data.slot];
         // Remove user from tracking
         setOtherUsers(prev => {
           const updated = { ...prev };
@@ -2543,9 +1655,18 @@ export default function App() {
   useEffect(() => {
     if (mode === 'LIVE' && socket && isConnected && activeClient) {
       const interval = setInterval(() => {
+        const wire = wireRef.current;
+        const index = wire ? wire.index[activeClient.node] : undefined;
+        if (index !== undefined) {
+          // Client-only waypoints (pw*/ph*) aren't in the server table; those go as JSON
+          socket.emit('position_update_bin', encodePositionFrame(index, activeClient.progress || 0));
+          return;
+        }
         socket.emit('position_update', {
           currentNode: activeClient.node,
-          progress: activeClient.progress || 0
+          progress: activeClient.progress || 0,
+          // Coordinates let the server check moves between waypoints it doesn't know
+          ...(activeClient.pos && { x: activeClient.pos.x, y: activeClient.pos.y })
         });
       }, 2000); // Every 2 seconds
 
@@ -2867,12 +1988,50 @@ export default function App() {
     };
   }, [mode, sensorPermission, activeClient?.status, activeClientId, findNearestNode, log]);
 
+  // Walls come from the map server: the LIVE server once connected, else VITE_MAP_URL.
+  // Without one (offline simulation) the bundled coarse tile stays on screen.
+  useEffect(() => {
+    const base = mode === 'LIVE' ? serverUrl : MAP_URL;
+    if (!base) return;
+    let cancelled = false;
+    loadMapManifest(base)
+      .then(manifest => {
+        if (cancelled) return;
+        setMapManifest(manifest);
+        log(`🗺️ Map ${manifest.version} from ${base}`, "info");
+      })
+      .catch(err => {
+        if (cancelled) return;
+        setMapManifest(null);
+        setMapWalls(fallbackWalls());
+        log(`Map tiles unavailable from ${base} (${err.message}): showing the bundled outline`, "warn");
+      });
+    return () => { cancelled = true; };
+  }, [mode, serverUrl, log]);
+
+  // Fetch the tiles the current view needs, at the detail its zoom can show
+  useEffect(() => {
+    if (!mapManifest) return;
+    let cancelled = false;
+    const timer = setTimeout(() => {
+      const started = performance.now();
+      loadMapTiles(mapManifest, mapView, mapTileCache.current)
+        .then(({ walls, level, tiles, fetched }) => {
+          if (cancelled) return;
+          setMapWalls(walls);
+          if (fetched) log(`🗺️ ${walls.length} wall segments in view (level ${level}, ${fetched}/${tiles} tiles fetched) in ${Math.round(performance.now() - started)}ms`, "info");
+        })
+        .catch(err => { if (!cancelled) log(`Map tiles failed (${err.message})`, "error"); });
+    }, 120); // Wait for wheel/drag to settle
+    return () => { cancelled = true; clearTimeout(timer); };
+  }, [mapManifest, mapView, log]);
+
   // Initialize
   useEffect(() => {
     brain.seed(0); // No simulated evacuees - only real connected users
     refreshBrain();
     log("EchoAid initialized — MC Building floor plan loaded from PDF", "success");
-    log(`${NODES.length} nodes, ${EDGES.length} edges, ${WALLS_RAW.length} wall segments`, "info");
+    log(`${NODES.length} nodes, ${EDGES.length} edges`, "info");
     const a = brain.analytics();
     log(`🧠 Global Brain: ${a.totalUsers} evacuees, balance score ${a.balanceScore}%`, "route");
     const el = brain.exitLoads();
@@ -3274,6 +2433,9 @@ export default function App() {
         {/* MAP */}
         <div className="map-shell" style={{ borderRadius: 12, padding: 12, marginBottom: 14, maxWidth: "900px", maxHeight: "600px", margin: "0 auto 14px" }}>
           <FloorPlan
+            walls={mapWalls}
+            view={mapView}
+            onViewChange={setMapView}
             userPos={adminMode ? null : activeClient?.pos}
             route={adminMode ? null : activeClient?.route}
             blockades={blocks}
@@ -3290,6 +2452,18 @@ export default function App() {
             userHeading={userHeading}
             otherUsers={otherUsers}
           />
+          {/* Zoom buttons (wheel and drag work too; touch screens need these) */}
+          <div style={{ display: "flex", justifyContent: "flex-end", gap: 6, marginTop: 6 }}>
+            {[["＋", 1 / 1.5], ["－", 1.5], ["⟲", null]].map(([icon, k]) => (
+              <button key={icon}
+                onClick={() => setMapView(v => k === null ? MAP_VIEW : clampMapView({
+                  x: v.x + v.w * (1 - k) / 2, y: v.y + v.h * (1 - k) / 2, w: v.w * k
+                }))}
+                style={{ background: "#0d1520", border: "1px solid #1a2540", borderRadius: 6, color: "#7799bb", width: 28, height: 24, cursor: "pointer", fontSize: 12 }}>
+                {icon}
+              </button>
+            ))}
+          </div>
           {activeClient?.route && !adminMode && <div style={{ marginTop: 10 }}>
             <div style={{ display: "flex", justifyContent: "space-between", marginBottom: 4 }}>
               <span style={{ color: "#556677", fontSize: 11, fontFamily: "monospace" }}>{activeClient.name} - Evacuation Progress</span>
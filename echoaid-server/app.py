@@ -8,12 +8,28 @@ from flask_socketio import SocketIO
 from flask_cors import CORS
 from dotenv import load_dotenv
 import os
+import threading
 
 from services.backboard_service import BackboardService
 from services.gemini_service import GeminiService
 from services.pathfinding import PathfindingEngine
 from services.elevenlabs_service import ElevenLabsService
+from services.tts_cache import AudioCache
+from services.voice_stream import VoiceStreamer
+from services.wire_protocol import WireProtocol, worker_slots
+from services.batch_router import BatchRouter
+from services.rate_limiter import PositionThrottle
+from services.wall_index import PositionValidator, WallIndex, svg_walls
+from services.map_tiles import MapTiles
+from services.session_manager import SessionManager
+from services.join_admission import JoinAdmission
+from services.report_aggregator import ReportAggregator
+from services.message_queue import create_message_queue
+from services.replication import StateReplicator
+from services.shared_graph import SharedGraph
 from events.socket_events import register_socket_events
+from models.map_artifact import floor_walls, load_map_artifact, navigation_graph
+from services.report_parser import LocalReportParser
 
 # Load environment variables
 load_dotenv()
@@ -37,25 +53,119 @@ socketio = SocketIO(
 # Initialize services
 print("🔧 Initializing services...")
 
-backboard = BackboardService(api_key=os.getenv('BACKBOARD_API_KEY'))
-gemini = GeminiService(api_key=os.getenv('GEMINI_API_KEY'))
-pathfinder = PathfindingEngine()
+backboard = BackboardService(
+    api_key=os.getenv('BACKBOARD_API_KEY'),
+    write_behind=os.getenv('BACKBOARD_WRITE_BEHIND', '0') == '1',
+    max_pending_writes=int(os.getenv('BACKBOARD_MAX_PENDING_WRITES', 1000))
+)
+gemini = GeminiService(
+    api_key=os.getenv('GEMINI_API_KEY'),
+    cache_ttl=float(os.getenv('GEMINI_CACHE_TTL', 300)),
+    batch_window=float(os.getenv('GEMINI_BATCH_WINDOW_MS', 50)) / 1000
+)
+map_artifact = load_map_artifact()  # Wall geometry from ExtractingCoords/build_map.py
+map_tiles = MapTiles(map_artifact)  # What the app fetches instead of bundling the walls
+# NAV_GRAPH=generated routes on the graph build_map.py generated from the walls
+nav = navigation_graph(map_artifact) if os.getenv('NAV_GRAPH', 'manual') == 'generated' else None
+if nav:
+    pathfinder = PathfindingEngine(nav['nodes'], nav['edges'], nav['exits'])
+    gemini.local_parser = LocalReportParser(nav['raw'], nav['edges'])
+    print(f"🧭 Generated nav graph: {len(nav['nodes'])} nodes, {len(nav['edges'])} edges")
+else:
+    pathfinder = PathfindingEngine()
 elevenlabs = ElevenLabsService(
     api_key=os.getenv('ELEVENLABS_API_KEY'),
-    voice_id=os.getenv('ELEVENLABS_VOICE_ID')
+    voice_id=os.getenv('ELEVENLABS_VOICE_ID'),
+    cache=AudioCache(
+        os.getenv('TTS_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.tts_cache')),
+        max_bytes=int(os.getenv('TTS_CACHE_MB', 200)) * 1024 * 1024
+    )
+)
+voice = VoiceStreamer(
+    elevenlabs,
+    enabled=os.getenv('VOICE_ALERTS', '0') == '1',
+    chunk_size=int(os.getenv('TTS_CHUNK_BYTES', 4096))
 )
+worker_index = int(os.getenv('CLUSTER_WORKER_INDEX', 0))
+slot_base, slot_count = worker_slots(worker_index, int(os.getenv('CLUSTER_WORKERS', 1)))
+wire = WireProtocol(nodes=pathfinder.nodes, slot_base=slot_base, slot_count=slot_count)
+batch_router = BatchRouter(pathfinder)
+position_throttle = PositionThrottle(
+    rate=float(os.getenv('POSITION_RATE', 5)),
+    burst=int(os.getenv('POSITION_BURST', 10)),
+    interval=float(os.getenv('POSITION_FLUSH_MS', 200)) / 1000
+)
+# Position transitions are checked against the walls and a walking speed (m/s, m)
+position_validator = PositionValidator(
+    WallIndex(svg_walls(floor_walls(map_artifact))),
+    pathfinder,
+    max_speed=float(os.getenv('POSITION_MAX_SPEED', 4)),
+    slack=float(os.getenv('POSITION_SLACK', 10))
+)
+sessions = SessionManager(grace_seconds=float(os.getenv('RESUME_GRACE_SECONDS', 30)))
+join_admission = JoinAdmission(window=float(os.getenv('JOIN_WINDOW_MS', 100)) / 1000)
+report_aggregator = ReportAggregator(
+    pathfinder.graph,
+    hops=int(os.getenv('BLOCKAGE_CLUSTER_HOPS', 2)),
+    window=float(os.getenv('BLOCKAGE_CLUSTER_WINDOW', 30)),
+    max_age=float(os.getenv('BLOCKAGE_CLUSTER_MAX_AGE', 120))
+)
+
+# Offline mode (bench.py, local development): slow, flaky stand-ins for the remote services
+fake_services = None
+if os.getenv('FAKE_SERVICES') == '1':
+    from services.fakes import install_fakes
+    fake_services = install_fakes(backboard, gemini, elevenlabs)
+
+# Load the voice segments instructions are stitched from (only the first start
+# synthesizes them; later starts read the disk cache)
+if os.getenv('TTS_STITCH', '1') == '1':
+    threading.Thread(target=elevenlabs.prerender_segments, args=(pathfinder,),
+                     name='tts-segments', daemon=True).start()
+
+# Pre-synthesize every voice phrase the map can produce, so guidance at alarm
+# time is a cache read (one cluster worker warms the shared cache directory)
+if os.getenv('TTS_WARMUP', '0') == '1' and worker_index == 0:
+    threading.Thread(target=lambda: elevenlabs.warmup(elevenlabs.phrase_library(pathfinder)),
+                     name='tts-warmup', daemon=True).start()
+
+# Cluster mode (started by cluster.py): replicate state to the other workers
+# and read exit distance fields from the shared-memory graph
+message_queue = None
+if os.getenv('CLUSTER_QUEUE'):
+    message_queue = create_message_queue(os.getenv('CLUSTER_QUEUE'), app.config['SECRET_KEY'].encode())
+    StateReplicator(message_queue, f"worker-{worker_index}", backboard=backboard, wire=wire)
+    if os.getenv('CLUSTER_SHM'):
+        batch_router.shared_graph = SharedGraph.attach(os.getenv('CLUSTER_SHM'))
+    print(f"🔗 Cluster worker {worker_index} connected to {os.getenv('CLUSTER_QUEUE')}")
 
 # Attach services to app context for access in event handlers
 app.backboard = backboard
 app.gemini = gemini
 app.pathfinder = pathfinder
 app.elevenlabs = elevenlabs
+app.wire = wire
+app.batch_router = batch_router
+app.position_throttle = position_throttle
+app.position_validator = position_validator
+app.sessions = sessions
+app.join_admission = join_admission
+app.report_aggregator = report_aggregator
+app.voice = voice
+app.map_artifact = map_artifact
+app.map_tiles = map_tiles
+app.message_queue = message_queue
+app.fake_services = fake_services
 
 print("✅ Services initialized")
 
-# Register Socket.IO event handlers
-register_socket_events(socketio, app)
-print("✅ Socket.IO events registered")
+# Register Socket.IO event handlers on the Flask server. asgi.py imports this
+# module for the services and REST routes only, and registers its own handlers
+# on its AsyncServer (a second registration here would bind the throttle and
+# start a refine pool for a server that never runs).
+if os.getenv('SOCKETIO_SERVER', 'flask') == 'flask':
+    register_socket_events(socketio, app)
+    print("✅ Socket.IO events registered")
 
 
 # REST API endpoints
@@ -83,10 +193,38 @@ def health():
         "users_connected": stats['total_users'],
         "active_users": stats['active_users'],
         "blockages": stats['total_blockages'],
+        "map_version": map_artifact['version'] if map_artifact else None,
         "timestamp": import_time()
     })
 
 
+@app.route('/map/tiles.json')
+def map_manifest():
+    """Map version, bounds and the non-empty tiles of each floor and level"""
+    response = jsonify(map_tiles.manifest)
+    response.headers['Cache-Control'] = 'no-cache'  # Revalidated with the ETag on every load
+    response.set_etag(map_tiles.manifest_etag)
+    return response.make_conditional(request)
+
+
+@app.route('/map/<version>/<int:floor>/<int:z>/<int:x>/<int:y>.bin')
+def map_tile(version, floor, z, x, y):
+    """One wall tile (see services/map_tiles.py), gzipped for clients that accept it"""
+    tile = map_tiles.get(version, floor, z, x, y)
+    if tile is None:
+        return jsonify({"error": "No such tile"}), 404
+
+    gzipped = 'gzip' in request.headers.get('Accept-Encoding', '')
+    response = app.response_class(tile.gzipped if gzipped else tile.raw, mimetype='application/octet-stream')
+    if gzipped:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.headers['Vary'] = 'Accept-Encoding'
+    # The version is part of the URL, so a tile never changes
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response.set_etag(tile.etag)
+    return response.make_conditional(request)
+
+
 @app.route('/stats')
 def stats():
     """Detailed statistics endpoint"""
@@ -104,6 +242,11 @@ def stats():
 
     return jsonify({
         **stats,
+        "position_updates": position_throttle.get_stats(),
+        "position_checks": position_validator.get_stats(),
+        **sessions.get_stats(),
+        "join_admission": join_admission.get_stats(),
+        "blockage_reports": report_aggregator.get_stats(),
         "exit_distribution": exit_distribution,
         "users": [
             {
@@ -118,6 +261,31 @@ def stats():
     })
 
 
+@app.route('/metrics')
+def metrics():
+    """Counters in Prometheus text format (e.g. Gemini calls saved during an incident)"""
+    groups = {
+        'gemini': gemini.get_stats(),
+        'position': position_throttle.get_stats(),
+        'position_checks': position_validator.get_stats(),
+        'join_admission': join_admission.get_stats(),
+        'blockage_reports': report_aggregator.get_stats(),
+        'sessions': sessions.get_stats(),
+        'tts_cache': elevenlabs.cache.get_stats(),
+        'voice': voice.get_stats(),
+        'voice_segments': elevenlabs.clips.get_stats(),
+        'map_tiles': map_tiles.get_stats(),
+        'backboard': backboard.get_stats()
+    }
+    lines = [
+        f"echoaid_{group}_{name} {int(value) if isinstance(value, bool) else value}"
+        for group, stats in groups.items()
+        for name, value in stats.items()
+        if isinstance(value, (int, float))
+    ]
+    return '\n'.join(lines) + '\n', 200, {'Content-Type': 'text/plain; version=0.0.4'}
+
+
 @app.route('/api/test-route', methods=['POST'])
 def test_route():
     """Test pathfinding endpoint"""
@@ -175,6 +343,7 @@ if __name__ == '__main__':
     print(f"")
     print(f"💡 Tip: Run 'ngrok http {port}' in another terminal to expose server")
     print(f"💡 Then connect phones to the ngrok HTTPS URL")
+    print(f"💡 For production load run 'python asgi.py' (asyncio server) instead")
     print("="*60 + "\n")
 
     # Run the server
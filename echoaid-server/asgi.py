@@ -0,0 +1,63 @@
+"""
+EchoAid - Production asyncio server
+python-socketio AsyncServer on ASGI (uvicorn); REST endpoints come from app.py
+
+Run with:
+    python asgi.py
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+import socketio
+from a2wsgi import WSGIMiddleware
+
+# Cloud writes must not hold handler threads in this mode
+os.environ.setdefault('BACKBOARD_WRITE_BEHIND', '1')
+# Socket handlers are registered below on the AsyncServer, not on app.py's Flask server
+os.environ['SOCKETIO_SERVER'] = 'asgi'
+
+from app import app as flask_app  # noqa: E402  (services + REST routes)
+from events.async_socket_events import register_async_socket_events  # noqa: E402
+from services.message_queue import LocalAsyncPubSubManager  # noqa: E402
+
+# One event loop holds every socket; handler bodies run on this pool.
+# Under cluster.py, emits are fanned out to the other workers' clients too.
+client_manager = None
+if flask_app.message_queue is not None:
+    client_manager = LocalAsyncPubSubManager(flask_app.message_queue)
+
+sio = socketio.AsyncServer(
+    async_mode='asgi',
+    client_manager=client_manager,
+    cors_allowed_origins="*",
+    ping_timeout=60,
+    ping_interval=25,
+    always_connect=True
+)
+executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('HANDLER_WORKERS', 32)),
+    thread_name_prefix='handler'
+)
+
+register_async_socket_events(sio, flask_app, executor)
+print("✅ Async Socket.IO events registered")
+
+application = socketio.ASGIApp(sio, other_asgi_app=WSGIMiddleware(flask_app))
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.getenv('PORT', 5000))
+    host = os.getenv('HOST', '0.0.0.0')
+
+    print("\n" + "="*60)
+    print("🚀 EchoAid Server Starting (asyncio / ASGI)")
+    print("="*60)
+    print(f"📡 Server URL: http://{host}:{port}")
+    print(f"🧵 Handler workers: {executor._max_workers}")
+    print("="*60 + "\n")
+
+    uvicorn.run(application, host=host, port=port, log_level='info')
@@ -0,0 +1,180 @@
+"""
+EchoAid - Offline load benchmark
+Drives the real event handlers with simulated phones while Backboard.io,
+Gemini and ElevenLabs are replaced by local fakes (services/fakes.py) with
+the latency, error and timeout rates you choose
+
+Reports handler throughput and tail latency per event, plus the end-to-end
+time from a join to its stored route.
+
+Run with:
+    python bench.py --users 200 --duration 20
+    python bench.py --gemini "median=2000,p99=8000,timeouts=0.05" --write-behind
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import random
+import threading
+import time
+
+BLOCKAGE_MESSAGES = [
+    "Fire in hallway 4!",
+    "smoke near room 1040",
+    "debris blocking exit 2",
+    "h9 is packed",
+    "something strange over by the stairs",
+    "it smells like something is burning somewhere",
+    "people are pushing near the lab, can't get through",
+]
+
+
+class Recorder:
+    """Thread-safe latency samples per event"""
+
+    def __init__(self):
+        self.samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self.samples.setdefault(name, []).append(seconds)
+
+    def report(self, elapsed: float):
+        print(f"\n{'event':<24}{'count':>8}{'per s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+        for name, samples in sorted(self.samples.items()):
+            samples = sorted(samples)
+
+            def pct(p):
+                return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+            print(f"{name:<24}{len(samples):>8}{len(samples) / elapsed:>9.1f}"
+                  f"{pct(0.50):>10.1f}{pct(0.95):>10.1f}{pct(0.99):>10.1f}{samples[-1] * 1000:>10.1f}")
+
+
+def wait_for(condition, timeout: float) -> bool:
+    """
+    Poll until condition() is true
+
+    Server state is polled rather than the test client's queue, which
+    loses messages when read while another thread is delivering.
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark EchoAid handlers against fake remote services')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of steady-state load')
+    parser.add_argument('--threads', type=int, default=16, help='Concurrent simulated phones')
+    parser.add_argument('--position-hz', type=float, default=2, help='Position updates per phone per second')
+    parser.add_argument('--walk-speed', type=float, default=1.5, help='Walking speed of the phones (m/s)')
+    parser.add_argument('--report-rate', type=float, default=0.01,
+                        help='Chance per position update that the phone also reports a blockage')
+    parser.add_argument('--backboard', default='median=40,p99=400,errors=0.01')
+    parser.add_argument('--gemini', default='median=700,p99=3000,errors=0.02,timeouts=0.01')
+    parser.add_argument('--elevenlabs', default='median=300,p99=1500,errors=0.01')
+    parser.add_argument('--write-behind', action='store_true', help='Queue Backboard writes (BACKBOARD_WRITE_BEHIND=1)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    # app.py reads these at import time
+    os.environ.update({
+        'FAKE_SERVICES': '1',
+        'FAKE_BACKBOARD_LATENCY': f"{args.backboard},seed={args.seed}",
+        'FAKE_GEMINI_LATENCY': f"{args.gemini},seed={args.seed}",
+        'FAKE_ELEVENLABS_LATENCY': f"{args.elevenlabs},seed={args.seed}",
+        'BACKBOARD_WRITE_BEHIND': '1' if args.write_behind else '0',
+    })
+    from app import app, socketio
+
+    def user_of(client):
+        return app.backboard.get_user(socketio.server.manager.sid_from_eio_sid(client.eio_sid, '/')) or {}
+
+    rng = random.Random(args.seed)
+    recorder = Recorder()
+    # Phones start on hallway nodes that have a way out (rooms are not in the nav graph)
+    pathfinder = app.pathfinder
+    starts = [node for node in pathfinder.graph
+              if node not in pathfinder.exits and pathfinder.find_route(node, pathfinder.get_nearest_exit(node))]
+
+    # Phase 1: everyone joins at once (the alarm just went off)
+    print(f"\n🚨 {args.users} phones joining...")
+    clients = [socketio.test_client(app) for _ in range(args.users)]
+
+    def join(i):
+        client = clients[i]
+        started = time.perf_counter()
+        client.emit('join_evacuation', {'name': f"Bench {i}", 'startNode': rng.choice(starts)})
+        recorder.add('join_evacuation', time.perf_counter() - started)
+        if wait_for(lambda: user_of(client).get('route'), timeout=30):
+            recorder.add('join → route', time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(join, range(args.users)))
+    print(f"   All joined in {time.perf_counter() - started:.2f}s")
+
+    # Phase 2: steady state - walking phones, occasional blockage reports
+    print(f"\n🚶 {args.duration:.0f}s of movement at {args.position_hz} Hz per phone...")
+    stop = time.perf_counter() + args.duration
+
+    def walk(indices):
+        local_rng = random.Random(indices[0])
+        # Per phone: route being walked, index of the last node reached, meters walked past it, time
+        walking = {i: (None, 0, 0.0, time.perf_counter()) for i in indices}
+        period = 1 / args.position_hz / len(indices)
+        while time.perf_counter() < stop:
+            for i in indices:
+                client = clients[i]
+                route = user_of(client).get('route') or ['p129']
+                walked_route, index, ahead, since = walking[i]
+                now = time.perf_counter()
+                if route != walked_route:
+                    # Rerouted: new routes start where the phone is
+                    node = walked_route[index] if walked_route else route[0]
+                    index = route.index(node) if node in route else 0
+                ahead += args.walk_speed * (now - since)
+                while index < len(route) - 1 and pathfinder.calculate_distance(route[index], route[index + 1]) <= ahead:
+                    ahead -= pathfinder.calculate_distance(route[index], route[index + 1])
+                    index += 1
+                walking[i] = (route, index, ahead if index < len(route) - 1 else 0.0, now)
+
+                started = time.perf_counter()
+                client.emit('position_update', {'currentNode': route[index], 'progress': index})
+                recorder.add('position_update', time.perf_counter() - started)
+
+                if local_rng.random() < args.report_rate:
+                    started = time.perf_counter()
+                    client.emit('report_blockage', {'message': local_rng.choice(BLOCKAGE_MESSAGES)})
+                    recorder.add('report_blockage', time.perf_counter() - started)
+
+                client.get_received()
+                time.sleep(period)
+
+    groups = [list(range(t, args.users, args.threads)) for t in range(min(args.threads, args.users))]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+        list(pool.map(walk, groups))
+    elapsed = time.perf_counter() - started
+    time.sleep(app.position_throttle.current_interval * 2)  # Let the last flush land
+
+    recorder.report(elapsed)
+    print(f"\n📊 Position updates: {app.position_throttle.get_stats()}")
+    print(f"📊 Position checks: {app.position_validator.get_stats()}")
+    print(f"📊 Gemini: {app.gemini.get_stats()}")
+    print(f"📊 Blockage reports: {app.report_aggregator.get_stats()}")
+    print(f"📊 Backboard: {app.backboard.get_stats()}")
+    for name, profile in app.fake_services.profiles.items():
+        print(f"📊 Fake {'Backboard' if name == 'api' else 'ElevenLabs'}: {profile.stats}")
+    print(f"📊 Fake Gemini: {app.gemini.model.profile.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+EchoAid - Multi-process cluster launcher
+Runs several asyncio workers (asgi.py) on one host that behave as one server
+
+The launcher owns:
+  • a LocalMessageHub that fans Socket.IO emits and state changes out to every worker
+  • the shared-memory navigation graph, whose exit distance fields it
+    recomputes whenever a blockage is added or cleared
+
+Worker i listens on PORT + i.
+
+Sticky sessions are required: put a load balancer that pins each client to
+one worker in front (e.g. nginx `ip_hash`). Only users, routes and
+blockages are replicated between workers. Each worker keeps its own
+sessions and resume tokens, join admission, blockage report clusters and
+position throttle/validator state, so a phone that reconnects to another
+worker cannot resume its session and starts over as a new user, and
+Socket.IO polling requests must keep reaching the worker that opened them.
+
+Run with:
+    python cluster.py --workers 4
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+
+from dotenv import load_dotenv
+
+from models.map_artifact import load_map_artifact, navigation_graph
+from services.message_queue import LocalMessageHub, create_message_queue
+from services.pathfinding import PathfindingEngine
+from services.replication import STATE_CHANNEL
+from services.shared_graph import SharedGraph
+from services.wire_protocol import SLOT_SPACE
+
+
+def watch_blockages(mq, graph: SharedGraph):
+    """Keep the shared fields in step with the replicated blockage set"""
+    blocked = set()
+
+    def on_state(message: dict):
+        if message.get('target') != 'backboard':
+            return
+        if message['op'] == 'add_blockage':
+            blocked.add(message['args'][0])
+        elif message['op'] == 'remove_blockage':
+            blocked.discard(message['args'][0])
+        else:
+            return
+        graph.update_fields(blocked)
+        print(f"🗺️  Shared exit fields rebuilt for {len(blocked)} blockage(s)")
+
+    mq.subscribe(STATE_CHANNEL, on_state)
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description='Run EchoAid as several worker processes')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('CLUSTER_WORKERS', 2)))
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', 5000)),
+                        help='Port of the first worker (worker i uses port + i)')
+    parser.add_argument('--hub-port', type=int, default=int(os.getenv('CLUSTER_HUB_PORT', 5100)))
+    args = parser.parse_args()
+
+    # Workers split the uint16 slot space of binary position frames between them
+    if not 1 <= args.workers <= SLOT_SPACE:
+        parser.error(f"--workers must be between 1 and {SLOT_SPACE}")
+
+    authkey = os.getenv('SECRET_KEY', 'echoaid-secret-key').encode()
+    hub = LocalMessageHub(('127.0.0.1', args.hub_port), authkey).start()
+    queue_url = f"local://127.0.0.1:{args.hub_port}"
+
+    # Same graph the workers route on (see NAV_GRAPH in app.py)
+    nav = navigation_graph(load_map_artifact()) if os.getenv('NAV_GRAPH', 'manual') == 'generated' else None
+    engine = PathfindingEngine(nav['nodes'], nav['edges'], nav['exits']) if nav else PathfindingEngine()
+    graph = SharedGraph.create(engine)
+    watch_blockages(create_message_queue(queue_url, authkey), graph)
+
+    print("\n" + "="*60)
+    print(f"🚀 EchoAid Cluster Starting ({args.workers} workers)")
+    print("="*60)
+    print(f"🔗 Message hub: {queue_url}")
+    print(f"🗺️  Shared graph: {graph.name} ({len(graph.node_ids)} nodes)")
+    print(f"📡 Workers: ports {args.port}-{args.port + args.workers - 1} (use a sticky load balancer)")
+    print("="*60 + "\n")
+
+    workers = []
+    for index in range(args.workers):
+        env = dict(os.environ,
+                   PORT=str(args.port + index),
+                   CLUSTER_QUEUE=queue_url,
+                   CLUSTER_SHM=graph.name,
+                   CLUSTER_WORKER_INDEX=str(index),
+                   CLUSTER_WORKERS=str(args.workers))
+        workers.append(subprocess.Popen([sys.executable, 'asgi.py'], env=env,
+                                        cwd=os.path.dirname(os.path.abspath(__file__))))
+
+    # Stop the workers the same way on Ctrl+C and on SIGTERM (systemd, docker stop)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        for worker in workers:
+            worker.wait()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping workers...")
+        for worker in workers:
+            worker.send_signal(signal.SIGINT)
+        for worker in workers:
+            worker.wait()
+    finally:
+        hub.close()
+        graph.close()
+
+
+if __name__ == '__main__':
+    main()
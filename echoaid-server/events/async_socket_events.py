@@ -0,0 +1,69 @@
+"""
+Socket.IO event registration for the asyncio server (asgi.py)
+Reuses the handlers from socket_events; blocking work runs in an executor
+"""
+
+import asyncio
+
+from events.emitters import AsyncEmitter
+from events.socket_events import build_event_handlers
+
+# Cheap enough to run on the loop: they only queue into the position throttle
+INLINE_EVENTS = {'position_update', 'position_update_bin'}
+
+
+def register_async_socket_events(sio, app, executor):
+    """
+    Register all Socket.IO event handlers on a python-socketio AsyncServer
+
+    Handlers (routing, Backboard writes) run on `executor`, so the event loop
+    only does socket I/O. Gemini refinement of provisional blockages is
+    awaited on the loop itself through the async client.
+
+    Args:
+        sio: socketio.AsyncServer instance
+        app: Object with backboard, gemini, pathfinder, elevenlabs,
+             wire, batch_router, position_throttle, join_admission and sessions attached
+        executor: concurrent.futures executor for handler bodies
+    """
+    out = AsyncEmitter(sio)
+
+    def schedule_parse(message, reporter_position, callback):
+        """Called from a handler thread: await Gemini on the loop, refine on the executor"""
+        async def parse_then_refine():
+            blockage_info = await app.gemini.parse_with_gemini_async(message, reporter_position)
+            await asyncio.get_running_loop().run_in_executor(executor, callback, blockage_info)
+
+        asyncio.run_coroutine_threadsafe(parse_then_refine(), out.loop)
+
+    handlers = build_event_handlers(out, app, schedule_parse)
+
+    # Positions are sampled less often when handler work or Backboard writes back up
+    app.position_throttle.queue_depth = lambda: executor._work_queue.qsize() + app.backboard.pending_writes()
+
+    for event, handler in handlers.items():
+        if event in INLINE_EVENTS:
+            sio.on(event)(_inline(out, handler))
+        else:
+            sio.on(event)(_offload(out, executor, handler))
+
+
+def _inline(out, handler):
+    """Run a non-blocking (sid, data) handler directly on the event loop"""
+    async def wrapper(sid, data=None, *args):
+        out.bind(asyncio.get_running_loop())
+        handler(sid, data)
+
+    wrapper.__name__ = handler.__name__
+    return wrapper
+
+
+def _offload(out, executor, handler):
+    """Wrap a (sid, data) handler so it runs off the event loop"""
+    async def wrapper(sid, data=None, *args):
+        loop = asyncio.get_running_loop()
+        out.bind(loop)
+        await loop.run_in_executor(executor, handler, sid, data)
+
+    wrapper.__name__ = handler.__name__
+    return wrapper
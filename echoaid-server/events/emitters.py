@@ -0,0 +1,98 @@
+"""
+Emitters that let the same event handlers run on either Socket.IO server
+Flask-SocketIO (threading) or python-socketio's AsyncServer (ASGI)
+"""
+
+import asyncio
+
+
+class FlaskEmitter:
+    """Emitter backed by a Flask-SocketIO server"""
+
+    def __init__(self, socketio):
+        self.socketio = socketio
+
+    def emit(self, event: str, data, to=None, skip_sid=None):
+        """Emit to a sid/room, or broadcast when `to` is None"""
+        self.socketio.emit(event, data, to=to, skip_sid=skip_sid)
+
+    def enter_room(self, sid: str, room: str):
+        self.socketio.server.enter_room(sid, room, namespace='/')
+
+    def leave_room(self, sid: str, room: str):
+        self.socketio.server.leave_room(sid, room, namespace='/')
+
+
+class AsyncEmitter:
+    """
+    Emitter backed by a python-socketio AsyncServer
+
+    Handlers run in executor threads, so every call is handed to the event
+    loop through a queue. A single drain task sends them in call order,
+    which keeps per-client ordering (e.g. route versions) intact.
+    """
+
+    def __init__(self, sio):
+        self.sio = sio
+        self.loop = None
+        self._queue = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """Attach to the running loop (called from the first async handler)"""
+        if self.loop is not None:
+            return
+        self.loop = loop
+        self._queue = asyncio.Queue()
+        loop.create_task(self._drain())
+
+    def emit(self, event: str, data, to=None, skip_sid=None):
+        self._submit('emit', (event, data), {'to': to, 'skip_sid': skip_sid})
+
+    def enter_room(self, sid: str, room: str):
+        self._submit('enter_room', (sid, room), {})
+
+    def leave_room(self, sid: str, room: str):
+        self._submit('leave_room', (sid, room), {})
+
+    def _submit(self, method: str, args: tuple, kwargs: dict):
+        self.loop.call_soon_threadsafe(self._queue.put_nowait, (method, args, kwargs))
+
+    async def _drain(self):
+        while True:
+            method, args, kwargs = await self._queue.get()
+            try:
+                await getattr(self.sio, method)(*args, **kwargs)
+            except Exception as e:
+                print(f"Socket.IO {method} error: {e}")
+
+
+class SessionEmitter:
+    """
+    Wraps another emitter so handlers can address users by stable user ID
+
+    User IDs are translated to the user's current socket; events for a user
+    inside its reconnect grace period are buffered in the SessionManager
+    and replayed on resume. Broadcasts are buffered for suspended users too,
+    except high-frequency position traffic and voice audio (stale by then).
+    """
+
+    NOT_BUFFERED = {'user_position', 'user_position_bin', 'voice_start', 'voice_chunk', 'voice_end'}
+
+    def __init__(self, out, sessions):
+        self.out = out
+        self.sessions = sessions
+
+    def emit(self, event: str, data, to=None, skip_sid=None):
+        if event not in self.NOT_BUFFERED and self.sessions.buffer(event, data, to=to, skip=skip_sid):
+            return
+        if to is not None:
+            to = self.sessions.sid_for(to) or to
+        if skip_sid is not None:
+            skip_sid = self.sessions.sid_for(skip_sid) or skip_sid
+        self.out.emit(event, data, to=to, skip_sid=skip_sid)
+
+    def enter_room(self, sid: str, room: str):
+        self.out.enter_room(sid, room)
+
+    def leave_room(self, sid: str, room: str):
+        self.out.leave_room(sid, room)
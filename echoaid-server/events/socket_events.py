@@ -2,53 +2,178 @@
 Socket.IO event handlers for real-time evacuation coordination
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from flask import request
-from flask_socketio import emit
+import itertools
+import os
+import sys
 import time
 
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from events.emitters import FlaskEmitter, SessionEmitter
+
+from services.elevenlabs_service import blockage_alert_segments, blockage_alert_text
+
+from services.wire_protocol import (
+    PROTOCOL_BINARY, PROTOCOL_JSON, ROOM_BINARY, ROOM_JSON,
+    REASON_JOIN, REASON_MANUAL, REASON_BLOCKAGE, describe_reason, route_delta
+)
+
 
 def register_socket_events(socketio, app):
     """
-    Register all Socket.IO event handlers
+    Register all Socket.IO event handlers on a Flask-SocketIO server
 
     Args:
         socketio: SocketIO instance
-        app: Flask app instance (with backboard, gemini, pathfinder, elevenlabs attached)
+        app: Flask app instance (with backboard, gemini, pathfinder, elevenlabs,
+             wire, batch_router, position_throttle, position_validator, join_admission,
+             report_aggregator, voice and sessions attached)
+    """
+    handlers = build_event_handlers(FlaskEmitter(socketio), app)
+
+    # Threading mode has no handler queue to measure, so shed on the Backboard write backlog
+    app.position_throttle.queue_depth = app.backboard.pending_writes
+
+    for event, handler in handlers.items():
+        socketio.on(event)(_with_request_sid(handler))
+
+
+def _with_request_sid(handler):
+    """Adapt a (sid, data) handler to Flask-SocketIO's request-context style"""
+    def wrapper(data=None, *args):
+        return handler(request.sid, data)
+
+    wrapper.__name__ = handler.__name__
+    return wrapper
+
+
+def build_event_handlers(out, app, schedule_parse=None) -> dict:
+    """
+    Build the transport-agnostic event handlers
+
+    Handlers take (sid, data) and talk to clients only through `out`
+    (see events/emitters.py), so the Flask server and the asyncio
+    server (asgi.py) share the same logic.
+
+    Args:
+        out: Emitter with emit(event, data, to=None, skip_sid=None),
+             enter_room(sid, room) and leave_room(sid, room)
+        app: Object with backboard, gemini, pathfinder, elevenlabs, wire,
+             batch_router, position_throttle, position_validator, join_admission,
+             report_aggregator, voice and sessions attached
+        schedule_parse: fn(message, reporter_position, callback) that runs the
+             Gemini parse in the background and calls callback(blockage_info);
+             defaults to Gemini's micro-batcher plus a small refinement pool
+
+    Handlers address users by their stable user ID (the sid they joined
+    with); SessionEmitter delivers to the user's current connection, or
+    buffers while the user is inside its reconnect grace period.
+
+    Returns:
+        Dictionary of event name -> handler(sid, data)
     """
     backboard = app.backboard
     gemini = app.gemini
     pathfinder = app.pathfinder
     elevenlabs = app.elevenlabs
-
-    @socketio.on('connect')
-    def handle_connect():
+    wire = app.wire
+    batch_router = app.batch_router
+    throttle = app.position_throttle
+    validator = app.position_validator
+    sessions = app.sessions
+    admission = app.join_admission
+    aggregator = app.report_aggregator
+    voice = app.voice
+    out = SessionEmitter(out, sessions)
+    voice.bind(out)
+
+    if schedule_parse is None:
+        # Parses wait on Gemini's micro-batch, not on a thread; only the refinement uses one
+        refine_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='blockage-refine')
+
+        def schedule_parse(message, reporter_position, callback):
+            future = gemini.parse_with_gemini_future(message, reporter_position)
+            future.add_done_callback(lambda done: refine_pool.submit(callback, dict(done.result())))
+
+    report_ids = itertools.count(1)
+
+    handlers = {}
+
+    def on(event):
+        def decorator(handler):
+            handlers[event] = handler
+            return handler
+        return decorator
+
+    @on('connect')
+    def handle_connect(sid, data=None):
         """Client connected - send initial connection confirmation"""
-        print(f"✅ Client connected: {request.sid}")
-        emit('connected', {
-            'userId': request.sid,
+        print(f"✅ Client connected: {sid}")
+        # Everyone starts on JSON until they negotiate otherwise
+        out.enter_room(sid, ROOM_JSON)
+        out.emit('connected', {
+            'userId': sid,
             'message': 'Connected to EchoAid server',
             'timestamp': time.time()
-        })
+        }, to=sid)
 
-    @socketio.on('disconnect')
-    def handle_disconnect():
-        """Client disconnected - remove from Backboard and notify others"""
-        user_id = request.sid
+    @on('disconnect')
+    def handle_disconnect(sid, data=None):
+        """Client disconnected - keep a joined user for the grace period, remove anyone else"""
+        user_id = sessions.user_for(sid)
+        if sid != user_id:
+            wire.forget(sid)  # Negotiation of a resumed connection; the user keeps its own slot
+
+        if sessions.suspend(sid):
+            print(f"⏸️  Client disconnected: {user_id} (resumable for {sessions.grace_seconds:.0f}s)")
+            return
+
+        remove_user(user_id)
+
+    def remove_user(user_id):
+        """Remove a user from Backboard and notify others (on disconnect or grace expiry)"""
         user = backboard.get_user(user_id)
         user_name = user.get('name', 'Unknown') if user else 'Unknown'
 
         backboard.remove_user(user_id)
+        throttle.forget(user_id)
+        validator.forget(user_id)
+        slot = wire.slots.get(user_id)
+        wire.forget(user_id)
         print(f"❌ Client disconnected: {user_id} ({user_name})")
 
         # Notify other users
-        emit('user_left', {
+        out.emit('user_left', {
             'userId': user_id,
+            'slot': slot,
             'name': user_name,
             'timestamp': time.time()
-        }, broadcast=True, include_self=False)
+        }, skip_sid=user_id)
+
+    sessions.on_expire = remove_user
+
+    @on('negotiate_protocol')
+    def handle_negotiate_protocol(sid, data=None):
+        """
+        Client picks its wire encoding
+
+        Expected data:
+            - protocol: "binary" or "json"
+        """
+        user_id = sid  # Per connection; resume_session re-applies it to the user
+        ack = wire.negotiate(user_id, (data or {}).get('protocol'))
+
+        if ack['protocol'] == PROTOCOL_BINARY:
+            out.leave_room(sid, ROOM_JSON)
+            out.enter_room(sid, ROOM_BINARY)
+
+        print(f"📦 {user_id[:8]} using {ack['protocol']} protocol")
+        out.emit('protocol_ack', ack, to=sid)
 
-    @socketio.on('join_evacuation')
-    def handle_join(data):
+    @on('join_evacuation')
+    def handle_join(sid, data=None):
         """
         User joins evacuation with their starting position
 
@@ -56,7 +181,7 @@ def register_socket_events(socketio, app):
             - name: User's name
             - startNode: Starting node ID (e.g., "p129")
         """
-        user_id = request.sid
+        user_id = sessions.user_for(sid)
         name = data.get('name', f'User-{user_id[:6]}')
         start_node = data.get('startNode', 'p129')  # Default to hallway h4
 
@@ -64,10 +189,10 @@ def register_socket_events(socketio, app):
 
         # Validate node
         if not pathfinder.validate_node(start_node):
-            emit('error', {
+            out.emit('error', {
                 'message': f'Invalid starting node: {start_node}',
                 'code': 'INVALID_NODE'
-            })
+            }, to=sid)
             return
 
         # Store user in Backboard.io memory
@@ -80,88 +205,210 @@ def register_socket_events(socketio, app):
             'joinedAt': time.time()
         })
 
-        # Calculate initial route to best exit
-        best_exit = pathfinder.get_best_exit(start_node, backboard.get_all_users())
-        blocked_nodes = backboard.get_blocked_nodes()
-        route = pathfinder.find_route(start_node, best_exit, blocked_nodes)
+        # Routes are assigned in batches (see admit_joins), so a join storm
+        # is balanced across exits instead of every join racing the others
+        admission.submit({'userId': user_id, 'name': name, 'startNode': start_node})
+
+    def admit_joins(batch):
+        """Route a batch of joins together and send each client its route"""
+        all_users = dict(backboard.get_all_users())
+        joins = [join for join in batch if join['userId'] in all_users]  # Skip anyone who already left
+        assignments = batch_router.assign([join['userId'] for join in joins], all_users,
+                                          backboard.get_blocked_nodes())
+
+        # One store for the whole batch; its cloud writes are queued, so routes go out right away
+        swaps = backboard.swap_user_routes({user_id: route for user_id, (route, _) in assignments.items()})
+        users = user_table()
+
+        joined = []
+        for join in joins:
+            user_id, name = join['userId'], join['name']
+            if user_id not in swaps:
+                out.emit('error', {
+                    'message': 'No evacuation route available',
+                    'code': 'NO_ROUTE'
+                }, to=user_id)
+                continue
 
-        if not route:
-            # Try nearest exit if best exit has no path
-            best_exit = pathfinder.get_nearest_exit(start_node)
-            route = pathfinder.find_route(start_node, best_exit, blocked_nodes)
+            # PAUSED: Gemini AI and ElevenLabs features disabled for now
+            # Just send the route for visual path generation
+            route, best_exit = assignments[user_id]
+            emit_route(out, wire, user_id, route, best_exit, REASON_JOIN, swaps[user_id])
 
-        if not route:
-            emit('error', {
-                'message': 'No evacuation route available',
-                'code': 'NO_ROUTE'
+            # Lets the client pick this session back up after a dropped connection
+            out.emit('session_token', {
+                'userId': user_id,
+                'resumeToken': sessions.issue(user_id),
+                'graceSeconds': sessions.grace_seconds,
+                'users': users
+            }, to=user_id)
+
+            joined.append({
+                'userId': user_id,
+                'slot': wire.slot_for(user_id),
+                'name': name,
+                'position': join['startNode'],
+                'timestamp': time.time()
             })
+            print(f"✅ {name} assigned route to {best_exit}: {len(route)} nodes")
+
+        # Notify other users once per batch rather than once per join
+        if joined:
+            out.emit('users_joined', {'users': joined})
+
+    admission.bind(admit_joins)
+
+    def user_table():
+        """
+        Everyone currently evacuating, with their position-frame slots
+
+        Sent on join and resume so a client can place binary position
+        frames of users who joined before it connected.
+        """
+        return [{
+            'userId': user_id,
+            'slot': wire.slots.get(user_id),
+            'name': user.get('name'),
+            'position': user.get('currentNode')
+        } for user_id, user in dict(backboard.get_all_users()).items()]
+
+    @on('resume_session')
+    def handle_resume(sid, data=None):
+        """
+        Reconnecting client takes its session back (no route recomputation)
+
+        Expected data:
+            - resumeToken: Token from the last session_token/session_resumed
+            - protocol: "binary" or "json"
+        """
+        data = data or {}
+        resumed = sessions.resume(data.get('resumeToken', ''), sid)
+        user = backboard.get_user(resumed[0]) if resumed else None
+
+        if not user:
+            if resumed:
+                sessions.end(resumed[0])
+            out.emit('resume_failed', {
+                'message': 'Session expired, please join again',
+                'code': 'SESSION_EXPIRED'
+            }, to=sid)
             return
 
-        backboard.update_user_route(user_id, route)
+        user_id, token, pending = resumed
 
-        # PAUSED: Gemini AI and ElevenLabs features disabled for now
-        # Just send the route for visual path generation
-        print(f"✅ Route calculated: {len(route)} nodes from {start_node} to {best_exit}")
+        # The user's encoding and slot follow it to the new connection
+        protocol = data.get('protocol') or (PROTOCOL_BINARY if wire.is_binary(user_id) else PROTOCOL_JSON)
+        ack = wire.negotiate(user_id, protocol)
+        if ack['protocol'] == PROTOCOL_BINARY:
+            out.leave_room(sid, ROOM_JSON)
+            out.enter_room(sid, ROOM_BINARY)
 
-        # Send route to client (no AI or voice features)
-        emit('route_assigned', {
+        route = user.get('route', [])
+        out.emit('session_resumed', {
             'userId': user_id,
+            'resumeToken': token,
+            'slot': ack['slot'],
             'route': route,
+            'version': user.get('routeVersion', 0),
             'destination': route[-1] if route else None,
-            'reason': 'Visual path generation',
+            'currentNode': user.get('currentNode'),
+            'progress': user.get('progress', 0),
+            'pendingEvents': len(pending),
+            'users': user_table(),
             'timestamp': time.time()
-        })
+        }, to=sid)
 
-        # Notify other users
-        emit('user_joined', {
-            'userId': user_id,
-            'name': name,
-            'position': start_node,
-            'timestamp': time.time()
-        }, broadcast=True, include_self=False)
+        # Replay what happened while the phone was away, in order
+        for event, payload in pending:
+            out.emit(event, payload, to=sid)
 
-        print(f"✅ {name} assigned route to {best_exit}: {len(route)} nodes")
+        print(f"▶️  {user.get('name', 'Unknown')} resumed session on {sid[:8]} ({len(pending)} pending events)")
 
-    @socketio.on('position_update')
-    def handle_position_update(data):
+    @on('position_update')
+    def handle_position_update(sid, data=None):
         """
         Client sends position update
 
         Expected data:
             - currentNode: Current node ID
             - progress: Current index in route
+            - x, y: Position (SVG space), for waypoints only the client has
         """
-        user_id = request.sid
-        current_node = data.get('currentNode')
-        progress = data.get('progress', 0)
+        point = (data['x'], data['y']) if 'x' in data and 'y' in data else None
+        throttle.submit(sessions.user_for(sid), data.get('currentNode'), data.get('progress', 0), point)
+
+    @on('position_update_bin')
+    def handle_position_update_bin(sid, frame=None):
+        """Binary position update (fixed-width record, see wire_protocol)"""
+        decoded = wire.decode_position(frame)
+        if decoded is None:
+            out.emit('error', {'message': 'Malformed position frame', 'code': 'BAD_FRAME'}, to=sid)
+            return
 
-        # Update position in Backboard memory
-        backboard.update_user_position(user_id, current_node, progress)
+        throttle.submit(sessions.user_for(sid), *decoded)
 
-        # Broadcast position to all clients for congestion visualization
+    def apply_position(user_id, current_node, progress, point=None):
+        """Store a position and fan it out in each client's encoding (called by the throttle's flush)"""
         user = backboard.get_user(user_id)
-        if user:
-            emit('user_position', {
-                'userId': user_id,
-                'name': user.get('name', 'Unknown'),
-                'currentNode': current_node,
+        if not user:
+            return
+
+        # Moves through walls or faster than anyone walks are snapped back onto the graph or dropped
+        verdict, checked_node = validator.check(user_id, current_node, point, previous=user.get('currentNode'))
+        if verdict in ('snapped', 'rejected'):
+            if checked_node is None:
+                checked_node, progress = user.get('currentNode'), user.get('progress', 0)
+            elif checked_node in user.get('route', []):
+                progress = user['route'].index(checked_node)
+            out.emit('position_corrected', {
+                'currentNode': checked_node,
                 'progress': progress,
-                'timestamp': time.time()
-            }, broadcast=True, include_self=False)
+                'reason': verdict,
+                'reported': current_node
+            }, to=user_id)
+            if verdict == 'rejected':
+                return
+            current_node = checked_node
+
+        # Update position in Backboard memory
+        backboard.update_user_position(user_id, current_node, progress)
 
-    @socketio.on('report_blockage')
-    def handle_blockage_report(data):
+        out.emit('user_position', {
+            'userId': user_id,
+            'name': user.get('name', 'Unknown'),
+            'currentNode': current_node,
+            'progress': progress,
+            'timestamp': time.time()
+        }, to=ROOM_JSON, skip_sid=user_id)
+
+        frame = wire.encode_position(user_id, current_node, progress)
+        if frame is not None:
+            out.emit('user_position_bin', frame, to=ROOM_BINARY, skip_sid=user_id)
+
+    throttle.bind(apply_position)
+
+    @on('report_blockage')
+    def handle_blockage_report(sid, data=None):
         """
-        User reports blockage via voice/text - Gemini processes it
+        User reports blockage via voice/text
 
         Expected data:
             - message: Natural language blockage description
+
+        Clear reports are parsed locally and applied at once. Anything that
+        needs Gemini is first blocked provisionally at the reporter's node,
+        so nearby users are rerouted without waiting on the LLM; the Gemini
+        result then refines or relocates it (see refine_blockage).
+
+        Reports at an open cluster's node, or provisional ones near it, are
+        duplicates of its blockage and are merged without another reroute (see
+        merge_report). A clear report at another node is its own blockage.
         """
-        user_id = request.sid
+        user_id = sessions.user_for(sid)
         message = data.get('message', '')
 
         if not message:
-            emit('error', {'message': 'Blockage message is required'})
+            out.emit('error', {'message': 'Blockage message is required'}, to=sid)
             return
 
         user = backboard.get_user(user_id)
@@ -170,86 +417,182 @@ def register_socket_events(socketio, app):
 
         print(f"🚨 Blockage reported by {reporter_name} ({user_id}): {message}")
 
-        # Use Gemini to parse blockage location and severity
-        blockage_info = gemini.parse_blockage_report(message, reporter_position)
+        report = {
+            'id': next(report_ids),
+            'reportedBy': user_id,
+            'reporterName': reporter_name,
+            'reporterPosition': reporter_position,
+            'message': message
+        }
+
+        blockage_info = gemini.parse_locally(message, reporter_position)
+        if blockage_info is not None:
+            location = blockage_info['location']
+            severity = blockage_info.get('severity', 'HIGH')
+        else:
+            location, severity = reporter_position, 'HIGH'
+
+        cluster, is_new = aggregator.assign(report, location, severity, provisional=blockage_info is None)
+        report['cluster'] = cluster
+        if not is_new:
+            merge_report(cluster, report, blockage_info)
+            return
 
-        if not blockage_info or not blockage_info.get('location'):
-            emit('error', {'message': 'Could not understand blockage report'})
+        if blockage_info is not None:
+            register_blockage(report, blockage_info)
             return
 
+        # Provisional: the hazard is near the reporter until Gemini says otherwise
+        report['provisionalNode'] = reporter_position
+        register_blockage(report, {
+            'location': reporter_position,
+            'severity': 'HIGH',
+            'type': 'OTHER'
+        }, provisional=True)
+        schedule_parse(message, reporter_position, lambda info: refine_blockage(report, info))
+
+    def merge_report(cluster, report, blockage_info):
+        """Fold a duplicate report into its cluster's blockage (no reroute)"""
+        lead = cluster['lead']
+        print(f"🔗 Blockage report {report['id']} merged into cluster {cluster['id']} "
+              f"at {cluster['node']} ({len(cluster['reports'])} reports)")
+
+        if blockage_info is not None and cluster['provisional']:
+            # A clear duplicate places the hazard before Gemini does
+            refine_blockage(lead, blockage_info)
+            return
+
+        if blockage_info is not None and aggregator.escalate(cluster, blockage_info.get('severity', 'HIGH')):
+            register_blockage(lead, {**blockage_info, 'location': cluster['node']},
+                              provisional=cluster['provisional'], refined=True)
+            return
+
+        out.emit('blockage_updated', {
+            'location': cluster['node'],
+            'severity': cluster['severity'],
+            'reportCount': len(cluster['reports']),
+            'provisional': cluster['provisional'],
+            'timestamp': time.time()
+        })
+
+    def refine_blockage(report, blockage_info):
+        """Apply the Gemini parse (or a clear duplicate report) to a provisional blockage"""
+        provisional_node = report['provisionalNode']
+        blockage_info = blockage_info or {}
+        location = blockage_info.get('location')
+        if not location or location not in pathfinder.graph:
+            location = provisional_node  # Gemini could not place it (on the graph) either
+
+        resolved, folded_into = aggregator.resolve(report['cluster'], location,
+                                                   blockage_info.get('severity', 'HIGH'))
+        if not resolved:
+            return  # Already placed by a clear duplicate report
+
+        current = backboard.get_blockage(provisional_node) or {}
+        still_ours = current.get('reportId') == report['id']
+
+        if folded_into is not None:
+            # Someone already reported the real spot: drop ours, keep theirs
+            if still_ours:
+                backboard.remove_blockage(provisional_node)
+                out.emit('blockage_cleared', {
+                    'location': provisional_node,
+                    'relocatedTo': folded_into['node'],
+                    'timestamp': time.time()
+                })
+            merge_report(folded_into, report, blockage_info)
+            return
+
+        if location == provisional_node:
+            if still_ours:
+                register_blockage(report, {**blockage_info, 'location': location}, refined=True)
+            return
+
+        # Relocate: lift the provisional block (users already routed around it
+        # keep their routes) and reroute only users affected by the real location
+        if still_ours:
+            backboard.remove_blockage(provisional_node)
+            out.emit('blockage_cleared', {
+                'location': provisional_node,
+                'relocatedTo': location,
+                'timestamp': time.time()
+            })
+        print(f"📍 Blockage report {report['id']} relocated {provisional_node} → {location}")
+        register_blockage(report, {**blockage_info, 'location': location})
+
+    def register_blockage(report, blockage_info, provisional=False, refined=False):
+        """Store a blockage, reroute affected users and broadcast it"""
         blocked_node = blockage_info['location']
         severity = blockage_info.get('severity', 'HIGH')
+        blockage_type = blockage_info.get('type', 'OTHER')
+        message = report['message']
 
-        # Validate blocked node
-        if not pathfinder.validate_node(blocked_node):
+        # Validate blocked node: a node without edges would block no route
+        if blocked_node not in pathfinder.graph:
             # Use reporter's position as fallback
-            blocked_node = reporter_position
+            blocked_node = report['reporterPosition']
 
         # Store blockage in memory
         backboard.add_blockage(blocked_node, {
-            'reportedBy': user_id,
-            'reporterName': reporter_name,
+            'reportId': report['id'],
+            'reportedBy': report['reportedBy'],
+            'reporterName': report['reporterName'],
             'severity': severity,
-            'type': blockage_info.get('type', 'OTHER'),
+            'type': blockage_type,
             'message': message,
+            'provisional': provisional,
             'timestamp': time.time()
         })
 
-        # Find all users affected by this blockage
-        affected_users = backboard.get_users_affected_by_blockage(blocked_node)
-
-        print(f"⚠️  {len(affected_users)} users affected by blockage at {blocked_node}")
-
-        # PAUSED: Voice alerts disabled - just calculate distances for logging
-        for affected_user_id in affected_users:
-            affected_user = backboard.get_user(affected_user_id)
-            if not affected_user:
-                continue
-
-            affected_position = affected_user.get('currentNode', 'p129')
-            distance = pathfinder.calculate_distance(affected_position, blocked_node)
+        payload = {
+            'location': blocked_node,
+            'severity': severity,
+            'type': blockage_type,
+            'message': message,
+            'reportedBy': report['reporterName'],
+            'reportCount': len(report['cluster']['reports']),
+            'provisional': provisional,
+            'timestamp': time.time()
+        }
 
-            print(f"   📏 Distance from {affected_user.get('name')} to blockage: {int(distance)} meters")
+        # Same node, better details: routes already avoid it
+        if refined:
+            out.emit('blockage_updated', payload)
+            print(f"✅ Blockage at {blocked_node} confirmed: {severity} {blockage_type}")
+            return
 
-            # Send blockage alert to affected user (no voice)
-            socketio.emit('blockage_alert', {
-                'location': blocked_node,
-                'distance': int(distance),
-                'severity': severity,
-                'type': blockage_info.get('type', 'OTHER'),
-                'message': message,
-                'timestamp': time.time()
-            }, room=affected_user_id)
+        # Find all users affected by this blockage
+        affected_users = backboard.get_users_affected_by_blockage(blocked_node)
 
-        # Reroute each affected user
-        rerouted_count = 0
-        for affected_user_id in affected_users:
-            success = reroute_user(affected_user_id, blocked_node, socketio, backboard, gemini, pathfinder, elevenlabs)
-            if success:
-                rerouted_count += 1
+        print(f"⚠️  {len(affected_users)} users affected by {'provisional ' if provisional else ''}blockage at {blocked_node}")
 
-        # Broadcast blockage to all clients (for map visualization)
-        emit('blockage_added', {
+        # Alert and reroute everyone affected in one batched pass
+        alert = {
             'location': blocked_node,
             'severity': severity,
-            'type': blockage_info.get('type', 'OTHER'),
-            'message': message,
-            'reportedBy': reporter_name,
+            'type': blockage_type,
+            'message': message
+        }
+        rerouted_count = reroute_users(affected_users, blocked_node, alert, out,
+                                       backboard, pathfinder, batch_router, wire, voice)
+
+        # Broadcast blockage to all clients (for map visualization)
+        out.emit('blockage_added', {
+            **payload,
             'affectedUsers': len(affected_users),
-            'reroutedUsers': rerouted_count,
-            'timestamp': time.time()
-        }, broadcast=True)
+            'reroutedUsers': rerouted_count
+        })
 
         print(f"✅ Blockage processed: {rerouted_count}/{len(affected_users)} users rerouted")
 
-    @socketio.on('request_reroute')
-    def handle_reroute_request(data):
+    @on('request_reroute')
+    def handle_reroute_request(sid, data=None):
         """User manually requests reroute"""
-        user_id = request.sid
+        user_id = sessions.user_for(sid)
         user = backboard.get_user(user_id)
 
         if not user:
-            emit('error', {'message': 'User not found'})
+            out.emit('error', {'message': 'User not found'}, to=sid)
             return
 
         current_node = user.get('currentNode', 'p129')
@@ -260,74 +603,209 @@ def register_socket_events(socketio, app):
         route = pathfinder.find_route(current_node, best_exit, blocked_nodes)
 
         if not route:
-            emit('error', {'message': 'No route available'})
+            out.emit('error', {'message': 'No route available'}, to=sid)
             return
 
-        backboard.update_user_route(user_id, route)
-
-        emit('route_assigned', {
-            'userId': user_id,
-            'route': route,
-            'destination': best_exit,
-            'reason': 'User requested reroute',
-            'timestamp': time.time()
-        })
+        send_route(out, wire, backboard, user_id, route, best_exit, REASON_MANUAL)
 
         print(f"🔄 Manual reroute for {user.get('name')}: {len(route)} nodes to {best_exit}")
 
-    @socketio.on('clear_blockage')
-    def handle_clear_blockage(data):
+    @on('request_route_sync')
+    def handle_route_sync(sid, data=None):
+        """Client missed a route version - resend the stored route in full (no recompute)"""
+        user_id = sessions.user_for(sid)
+        user = backboard.get_user(user_id)
+
+        if not user or not user.get('route'):
+            out.emit('error', {'message': 'No route to sync'}, to=sid)
+            return
+
+        route = user['route']
+        send_full_route(out, wire, user_id, route, route[-1], REASON_JOIN, None, user.get('routeVersion', 0))
+
+    @on('clear_blockage')
+    def handle_clear_blockage(sid, data=None):
         """Clear a blockage (admin action)"""
         blocked_node = data.get('location')
 
         if not blocked_node:
-            emit('error', {'message': 'Location required'})
+            out.emit('error', {'message': 'Location required'}, to=sid)
             return
 
         backboard.remove_blockage(blocked_node)
+        aggregator.discard(blocked_node)
 
-        emit('blockage_cleared', {
+        out.emit('blockage_cleared', {
             'location': blocked_node,
             'timestamp': time.time()
-        }, broadcast=True)
+        })
 
         print(f"✅ Blockage cleared at {blocked_node}")
 
+    return handlers
+
+
+def send_route(out, wire, backboard, user_id: str, route: list, destination, reason: int, reason_node: str = None):
+    """
+    Store a user's new route and send it in the encoding they negotiated
+
+    If the new route shares nodes with the stored one, only a delta against
+    the stored route version is sent (route_delta); otherwise the full route.
+    """
+    # Read, bump and store in one step: concurrent reroutes get distinct versions
+    swap = backboard.swap_user_route(user_id, route)
+    emit_route(out, wire, user_id, route, destination, reason, swap, reason_node)
+
+
+def emit_route(out, wire, user_id: str, route: list, destination, reason: int, swap: tuple,
+               reason_node: str = None):
+    """
+    Send a route that is already stored
+
+    Args:
+        swap: (previous route, previous version, new version) from the store
+    """
+    previous, base_version, version = swap
+
+    delta = route_delta(previous, route) if base_version else None
+    if delta and delta[1] > 0:
+        start, keep, suffix = delta
+
+        if wire.is_binary(user_id):
+            frame = wire.encode_route_delta(start, keep, suffix, destination, reason, reason_node,
+                                            base_version, version)
+            if frame is not None:
+                out.emit('route_delta_bin', frame, to=user_id)
+                return
 
-def reroute_user(user_id: str, blocked_node: str, socketio, backboard, gemini, pathfinder, elevenlabs) -> bool:
+        out.emit('route_delta', {
+            'userId': user_id,
+            'baseVersion': base_version,
+            'version': version,
+            'from': start,
+            'keep': keep,
+            'suffix': suffix,
+            'destination': destination,
+            'reason': describe_reason(reason, reason_node),
+            'timestamp': time.time()
+        }, to=user_id)
+        return
+
+    send_full_route(out, wire, user_id, route, destination, reason, reason_node, version)
+
+
+def send_full_route(out, wire, user_id: str, route: list, destination, reason: int,
+                    reason_node: str = None, version: int = 0):
+    """
+    Send a complete route to one client
+
+    Binary clients get packed node indices; everyone else gets the JSON payload.
+    """
+    if wire.is_binary(user_id):
+        frame = wire.encode_route(route, destination, reason, reason_node, version)
+        if frame is not None:
+            out.emit('route_assigned_bin', frame, to=user_id)
+            return
+
+    out.emit('route_assigned', {
+        'userId': user_id,
+        'route': route,
+        'destination': destination,
+        'reason': describe_reason(reason, reason_node),
+        'version': version,
+        'timestamp': time.time()
+    }, to=user_id)
+
+
+def reroute_users(user_ids: list, blocked_node: str, alert: dict, out, backboard,
+                  pathfinder, batch_router, wire, voice=None) -> int:
     """
-    Recalculate route for a single user avoiding blockage
+    Alert and reroute every user affected by a blockage in one batch
+
+    All routes are computed together from shared exit distance fields
+    (see BatchRouter), then each user gets their alert and new route.
+    Spoken alerts are streamed once per distinct phrase (see VoiceStreamer).
 
     Returns:
-        True if reroute successful, False otherwise
+        Number of users successfully rerouted
     """
-    user = backboard.get_user(user_id)
-    if not user:
-        return False
+    all_users = dict(backboard.get_all_users())  # Snapshot; handlers mutate concurrently
+    results = batch_router.assign(user_ids, all_users, backboard.get_blocked_nodes())
+    listeners = {}  # Spoken alert text -> (segments, users who hear it)
+
+    for user_id in user_ids:
+        user = all_users.get(user_id)
+        if not user:
+            continue
 
-    current_node = user.get('currentNode', 'p129')
-    blocked_nodes = backboard.get_blocked_nodes()
+        distance = pathfinder.calculate_distance(user.get('currentNode', 'p129'), blocked_node)
+        print(f"   📏 Distance from {user.get('name')} to blockage: {int(distance)} meters")
 
-    # PAUSED: Gemini AI disabled - use simple best exit logic
-    # Just find the best exit without AI suggestions
-    target_exit = pathfinder.get_best_exit(current_node, backboard.get_all_users())
-    route = pathfinder.find_route(current_node, target_exit, blocked_nodes)
+        # Send blockage alert to affected user (the voice version streams separately)
+        out.emit('blockage_alert', {
+            **alert,
+            'distance': int(distance),
+            'timestamp': time.time()
+        }, to=user_id)
+        text = blockage_alert_text(distance, alert['severity'])
+        listeners.setdefault(text, (blockage_alert_segments(distance, alert['severity']), []))[1].append(user_id)
 
-    if route:
-        backboard.update_user_route(user_id, route)
+        if user_id not in results:
+            print(f"❌ Could not find route for {user.get('name')}")
+            continue
 
         # PAUSED: Voice features disabled
         # Just send the route for visual path generation
+        route, target_exit = results[user_id]
         print(f"🔄 Rerouted {user.get('name')} to {target_exit}: {len(route)} nodes")
-
-        socketio.emit('route_assigned', {
-            'userId': user_id,
-            'route': route,
-            'destination': target_exit,
-            'reason': f'Rerouted due to blockage at {blocked_node}',
-            'timestamp': time.time()
-        }, room=user_id)
-        return True
-    else:
-        print(f"❌ Could not find route for {user.get('name')}")
-        return False
+        send_route(out, wire, backboard, user_id, route, target_exit, REASON_BLOCKAGE, blocked_node)
+
+    if voice is not None:
+        for text, (segments, listening) in listeners.items():
+            voice.speak(text, listening, kind='blockage_alert', segments=segments)
+
+    return len(results)
+
+
+# Test the handlers end to end (offline services, Flask-SocketIO test client)
+if __name__ == "__main__":
+    os.environ['FAKE_SERVICES'] = '1'
+    from app import app, socketio
+
+    print("🧪 Testing Socket Events...")
+
+    def wait_for(client, event, timeout=5.0):
+        """First `event` the client receives within the timeout (args[0]), else None"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            for message in client.get_received():
+                if message['name'] == event:
+                    return message['args'][0]
+            time.sleep(0.02)
+        return None
+
+    # Test 1: Join, drop the connection, resume without naming a protocol
+    phone = socketio.test_client(app)
+    phone.emit('join_evacuation', {'name': 'Resumer', 'startNode': 'p129'})
+    session = wait_for(phone, 'session_token')
+    assert session is not None
+    phone.disconnect()
+    again = socketio.test_client(app)
+    again.emit('resume_session', {'resumeToken': session['resumeToken']})
+    resumed = wait_for(again, 'session_resumed')
+    print(f"\n✅ Test 1 - Resumed {resumed['userId'][:8]} without a protocol: route {resumed['route']}")
+    assert resumed['userId'] == session['userId'] and resumed['route']
+
+    # Test 2: A late joiner gets the slots of users who joined before it connected
+    early = socketio.test_client(app)
+    early.emit('negotiate_protocol', {'protocol': 'binary'})
+    slot = wait_for(early, 'protocol_ack')['slot']
+    early.emit('join_evacuation', {'name': 'Early', 'startNode': 'p129'})
+    early_id = wait_for(early, 'session_token')['userId']
+    late = socketio.test_client(app)
+    late.emit('join_evacuation', {'name': 'Late', 'startNode': 'p131'})
+    table = {user['userId']: user['slot'] for user in wait_for(late, 'session_token')['users']}
+    print(f"\n✅ Test 2 - Late joiner's user table: {len(table)} users, Early in slot {table.get(early_id)}")
+    assert table.get(early_id) == slot
+
+    print("\n✨ All tests passed!")
@@ -0,0 +1,89 @@
+"""
+Map artifact built by ExtractingCoords/build_map.py
+Wall geometry and the generated nav graph per floor, in the same coordinate
+space as RAW in map_data.py
+"""
+
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.map_data import build_nodes
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'maps')
+FORMAT = 1
+
+
+def load_map_artifact(directory: str = MAPS_DIR, version: Optional[str] = None) -> Optional[Dict]:
+    """
+    Load the current (or a given) map artifact
+
+    Args:
+        directory: Folder with manifest.json and <version>.json files
+        version: Specific version, instead of the manifest's current one
+
+    Returns:
+        Artifact dict (version, format, floors[...].walls) or None if there is none
+    """
+    try:
+        if version is None:
+            with open(os.path.join(directory, 'manifest.json')) as f:
+                version = json.load(f)['current']
+        with open(os.path.join(directory, f"{version}.json")) as f:
+            artifact = json.load(f)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️  No map artifact loaded ({e}); run ExtractingCoords/build_map.py")
+        return None
+
+    if artifact.get('format') != FORMAT:
+        print(f"⚠️  Map artifact {version} has format {artifact.get('format')}, expected {FORMAT}")
+        return None
+    return artifact
+
+
+def floor_walls(artifact: Optional[Dict], floor: int = 0) -> List[List[float]]:
+    """[x1, y1, x2, y2] walls of one floor (empty without an artifact)"""
+    if not artifact:
+        return []
+    for entry in artifact['floors']:
+        if entry['floor'] == floor:
+            return entry['walls']
+    return []
+
+
+def navigation_graph(artifact: Optional[Dict], floor: int = 0) -> Optional[Dict]:
+    """
+    Generated nav graph of one floor, in the shapes map_data uses
+
+    Returns:
+        {"raw", "nodes", "edges", "exits"} (raw as in RAW, nodes as in NODES,
+        edges and exits with p<id> node IDs), or None if the floor has none
+    """
+    for entry in (artifact or {}).get('floors', []):
+        if entry['floor'] == floor and entry.get('nav'):
+            raw = entry['nav']['nodes']
+            return {
+                'raw': raw,
+                'nodes': build_nodes(raw),
+                'edges': [[f"p{a}", f"p{b}"] for a, b in entry['nav']['edges']],
+                'exits': [f"p{r['id']}" for r in raw if r['type'] == 'EXIT'],
+            }
+    return None
+
+
+# Test the loader
+if __name__ == "__main__":
+    print("🧪 Testing Map Artifact...")
+    artifact = load_map_artifact()
+    assert artifact is not None
+    print(f"\n✅ Map {artifact['version']}: {len(artifact['floors'])} floor(s), "
+          f"{len(floor_walls(artifact))} walls on floor 0")
+    assert floor_walls(artifact, floor=99) == [] and floor_walls(None) == []
+
+    nav = navigation_graph(artifact)
+    assert nav is not None and navigation_graph(None) is None
+    print(f"✅ Generated nav graph: {len(nav['nodes'])} nodes, {len(nav['edges'])} edges, exits {nav['exits']}")
+    assert all(a in nav['nodes'] and b in nav['nodes'] for a, b in nav['edges'])
+    print("\n✨ All tests passed!")
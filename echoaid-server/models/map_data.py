@@ -6,6 +6,9 @@ S = 0.4
 OX = 1309
 OY = 330.5
 
+# Real-world size of one SVG unit (distances in directions and speed checks)
+METERS_PER_UNIT = 1.0
+
 def tx(x):
     """Transform GeoJSON X coordinate to SVG space"""
     return (x - OX) * S
@@ -93,19 +96,26 @@ RAW = [
     {"x":3720.9,"y":2150,"id":203,"type":"EXIT","label":"Exit 4"},
 ]
 
+
+def build_nodes(raw):
+    """NODES dict (p<id> -> node in SVG space) for RAW-shaped entries"""
+    nodes = {}
+    for r in raw:
+        node_id = f"p{r['id']}"
+        nodes[node_id] = {
+            'id': node_id,
+            'x': tx(r['x']),
+            'y': ty(r['y']),
+            'label': r['label'],
+            'type': r['type'],
+            'hallway': r.get('hallway', False),
+            'color': r.get('color', None)
+        }
+    return nodes
+
+
 # Build NODES dictionary with transformed coordinates
-NODES = {}
-for r in RAW:
-    node_id = f"p{r['id']}"
-    NODES[node_id] = {
-        'id': node_id,
-        'x': tx(r['x']),
-        'y': ty(r['y']),
-        'label': r['label'],
-        'type': r['type'],
-        'hallway': r.get('hallway', False),
-        'color': r.get('color', None)
-    }
+NODES = build_nodes(RAW)
 
 # Navigation edges from App.jsx (lines 1413-1441)
 EDGES = [
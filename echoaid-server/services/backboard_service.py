@@ -3,7 +3,10 @@ Backboard.io memory service for tracking user positions
 Falls back to in-memory storage if Backboard.io is not configured
 """
 
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import copy
+import threading
 import requests
 import time
 
@@ -11,14 +14,31 @@ import time
 class BackboardService:
     """Backboard.io memory service for tracking user positions"""
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, write_behind: bool = False,
+                 base_url: str = "https://app.backboard.io/api", max_pending_writes: int = 1000):
         self.api_key = api_key
-        self.base_url = "https://app.backboard.io/api"
+        self.base_url = base_url
         self.memory_id = "echoaid-evacuation"
         self.users = {}  # In-memory cache/fallback
         self.blockages = {}  # In-memory blockage storage
+        self.users_lock = threading.RLock()  # Route read-modify-writes (versions must not repeat)
         self.enabled = bool(api_key and api_key != "your-backboard-api-key-here")
 
+        # Write-behind: cloud writes go through a queue drained by one thread,
+        # so event handlers never wait on Backboard.io HTTP round trips. The
+        # queue holds one write per key (the latest wins) and at most
+        # max_pending_writes keys; past that the oldest write is dropped.
+        self.write_behind = write_behind
+        self.max_pending_writes = max_pending_writes
+        self._writes = None  # key -> (fn, args), oldest first
+        self._writes_ready = threading.Condition()
+        self._write_stats = {'queued': 0, 'coalesced': 0, 'dropped': 0, 'sent': 0}
+        if self.enabled and write_behind:
+            self.start_write_behind()
+
+        # Set by StateReplicator when several server processes share this state
+        self.replicator = None
+
         if not self.enabled:
             print("⚠️  Backboard.io not configured. Using in-memory storage.")
 
@@ -32,6 +52,7 @@ class BackboardService:
         """
         self.users[user_id] = user_data
         user_name = user_data.get('name', 'Unknown')
+        self._replicate('store_user', user_id, user_data)
 
         print(f"💾 [Backboard.io] Storing new user: {user_name} (ID: {user_id[:8]})")
 
@@ -54,32 +75,88 @@ class BackboardService:
             self.users[user_id]['currentNode'] = current_node
             self.users[user_id]['progress'] = progress
             self.users[user_id]['lastUpdate'] = time.time()
+            self._replicate('update_position', user_id, current_node, progress)
 
             # Log position update
             print(f"📍 [Backboard.io] {user_name} → {current_node} (progress: {progress})")
 
             if self.enabled:
+                # Positions always go through the write-behind queue: only the
+                # latest one per user matters, and the flush must not wait on HTTP
                 self._store_in_backboard(f"user:{user_id}:position", {
                     'node': current_node,
                     'progress': progress,
                     'timestamp': time.time()
-                })
-                print(f"   ✓ Saved to Backboard.io memory")
+                }, queued=True)
+                print(f"   ✓ Queued for Backboard.io memory")
 
-    def update_user_route(self, user_id: str, route: List[str]):
+    def update_user_route(self, user_id: str, route: List[str]) -> int:
         """
         Update user's evacuation route
 
         Args:
             user_id: User ID
             route: List of node IDs representing the path
+
+        Returns:
+            New route version (bumped on every update, 0 if user unknown)
         """
-        if user_id in self.users:
-            self.users[user_id]['route'] = route
-            self.users[user_id]['lastRouteUpdate'] = time.time()
+        return self.swap_user_route(user_id, route)[2]
 
-            if self.enabled:
-                self._store_in_backboard(f"user:{user_id}:route", route)
+    def swap_user_route(self, user_id: str, route: List[str]) -> Tuple[List[str], int, int]:
+        """
+        Replace a user's route and bump its version in one atomic step
+
+        Concurrent reroutes of one user each get their own version, and each
+        sees the route it replaced (what a delta must be computed against).
+
+        Returns:
+            (previous route, previous version, new version); new version is 0 if user unknown
+        """
+        with self.users_lock:
+            user = self.users.get(user_id)
+            if user is None:
+                return [], 0, 0
+            previous, base_version = user.get('route', []), user.get('routeVersion', 0)
+            version = base_version + 1
+            user['route'] = route
+            user['routeVersion'] = version
+            user['lastRouteUpdate'] = time.time()
+            self._replicate('set_route', user_id, route, version)
+
+        if self.enabled:
+            self._store_in_backboard(f"user:{user_id}:route", route)
+
+        return previous, base_version, version
+
+    def swap_user_routes(self, routes: Dict[str, List[str]]) -> Dict[str, Tuple[List[str], int, int]]:
+        """
+        swap_user_route for a whole batch (e.g. one join admission)
+
+        Takes the lock once, and the cloud writes go through the write-behind
+        queue, so the caller can send the routes without waiting on HTTP.
+
+        Returns:
+            user ID -> (previous route, previous version, new version) for known users
+        """
+        swaps = {}
+        with self.users_lock:
+            for user_id, route in routes.items():
+                user = self.users.get(user_id)
+                if user is None:
+                    continue
+                previous, base_version = user.get('route', []), user.get('routeVersion', 0)
+                user['route'] = route
+                user['routeVersion'] = base_version + 1
+                user['lastRouteUpdate'] = time.time()
+                self._replicate('set_route', user_id, route, base_version + 1)
+                swaps[user_id] = (previous, base_version, base_version + 1)
+
+        if self.enabled:
+            for user_id in swaps:
+                self._store_in_backboard(f"user:{user_id}:route", routes[user_id], queued=True)
+
+        return swaps
 
     def get_user(self, user_id: str) -> Optional[Dict]:
         """Get complete user data"""
@@ -103,6 +180,7 @@ class BackboardService:
         """
         if user_id in self.users:
             del self.users[user_id]
+            self._replicate('remove_user', user_id)
 
             if self.enabled:
                 self._delete_from_backboard(f"user:{user_id}")
@@ -116,6 +194,7 @@ class BackboardService:
             blockage_data: Dictionary with reportedBy, severity, message, timestamp
         """
         self.blockages[node] = blockage_data
+        self._replicate('add_blockage', node, blockage_data)
 
         if self.enabled:
             self._store_in_backboard(f"blockage:{node}", blockage_data)
@@ -124,10 +203,15 @@ class BackboardService:
         """Remove a blockage"""
         if node in self.blockages:
             del self.blockages[node]
+            self._replicate('remove_blockage', node)
 
             if self.enabled:
                 self._delete_from_backboard(f"blockage:{node}")
 
+    def get_blockage(self, node: str) -> Optional[Dict]:
+        """Get the stored details of a blockage"""
+        return self.blockages.get(node)
+
     def get_blocked_nodes(self) -> set:
         """Get all currently blocked nodes as a set"""
         return set(self.blockages.keys())
@@ -149,12 +233,93 @@ class BackboardService:
                 affected.append(user_id)
         return affected
 
+    def apply_replicated(self, op: str, args: list):
+        """
+        Apply a state change made by another server process
+
+        Only the in-memory state changes: the originating process already
+        wrote to Backboard.io, and nothing is published again.
+
+        Args:
+            op: Operation name sent by _replicate
+            args: Operation arguments
+        """
+        if op == 'store_user':
+            user_id, user_data = args
+            self.users[user_id] = user_data
+        elif op == 'update_position':
+            user_id, current_node, progress = args
+            if user_id in self.users:
+                self.users[user_id].update(currentNode=current_node, progress=progress, lastUpdate=time.time())
+        elif op == 'set_route':
+            user_id, route, version = args
+            with self.users_lock:
+                if user_id in self.users:
+                    self.users[user_id].update(route=route, routeVersion=version, lastRouteUpdate=time.time())
+        elif op == 'remove_user':
+            self.users.pop(args[0], None)
+        elif op == 'add_blockage':
+            node, blockage_data = args
+            self.blockages[node] = blockage_data
+        elif op == 'remove_blockage':
+            self.blockages.pop(args[0], None)
+
+    def _replicate(self, op: str, *args):
+        if self.replicator is not None:
+            self.replicator.publish('backboard', op, args)
+
     # Backboard.io API methods
-    def _store_in_backboard(self, key: str, value):
+    def _store_in_backboard(self, key: str, value, queued: Optional[bool] = None):
         """Store data in Backboard.io memory"""
         if not self.enabled:
             return
 
+        self._dispatch(self._post_store, key, copy.copy(value), queued=queued)
+
+    def _dispatch(self, fn, key: str, *args, queued: Optional[bool] = None):
+        """
+        Run a cloud write now, or queue it
+
+        Args:
+            queued: Force the write-behind queue on/off (None = follow write_behind)
+        """
+        if not (self.write_behind if queued is None else queued):
+            fn(key, *args)
+            return
+
+        self.start_write_behind()
+
+        with self._writes_ready:
+            if key in self._writes:
+                self._write_stats['coalesced'] += 1  # Keeps its place in line
+            elif len(self._writes) >= self.max_pending_writes:
+                self._writes.popitem(last=False)
+                self._write_stats['dropped'] += 1
+            self._writes[key] = (fn, (key, *args))
+            self._write_stats['queued'] += 1
+            self._writes_ready.notify()
+
+    def start_write_behind(self):
+        """Start the writer thread (once)"""
+        with self._writes_ready:
+            if self._writes is None:
+                self._writes = OrderedDict()
+                threading.Thread(target=self._drain_writes, name='backboard-writer', daemon=True).start()
+
+    def _drain_writes(self):
+        while True:
+            with self._writes_ready:
+                while not self._writes:
+                    self._writes_ready.wait()
+                _, (fn, args) = self._writes.popitem(last=False)
+            fn(*args)
+            self._write_stats['sent'] += 1
+
+    def pending_writes(self) -> int:
+        """Cloud writes waiting in the write-behind queue"""
+        return len(self._writes) if self._writes is not None else 0
+
+    def _post_store(self, key: str, value):
         try:
             response = requests.post(
                 f"{self.base_url}/memory/{self.memory_id}/store",
@@ -189,6 +354,9 @@ class BackboardService:
         if not self.enabled:
             return
 
+        self._dispatch(self._post_delete, key)
+
+    def _post_delete(self, key: str):
         try:
             response = requests.delete(
                 f"{self.base_url}/memory/{self.memory_id}/delete/{key}",
@@ -205,7 +373,13 @@ class BackboardService:
             "total_users": len(self.users),
             "total_blockages": len(self.blockages),
             "active_users": sum(1 for u in self.users.values() if u.get('status') == 'ACTIVE'),
-            "backboard_enabled": self.enabled
+            "backboard_enabled": self.enabled,
+            "pending_writes": self.pending_writes(),
+            "max_pending_writes": self.max_pending_writes,
+            "writes_queued": self._write_stats['queued'],
+            "writes_coalesced": self._write_stats['coalesced'],
+            "writes_dropped": self._write_stats['dropped'],
+            "writes_sent": self._write_stats['sent']
         }
 
 
@@ -273,4 +447,29 @@ if __name__ == "__main__":
     print(f"\n✅ Test 7 - Remove user:")
     print(f"   Removed user123, remaining users: {len(backboard.get_all_users())}")
 
+    # Test 8: Concurrent reroutes of one user never reuse a version
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        swaps = list(pool.map(lambda i: backboard.swap_user_route("user456", ["p129", f"p{i}"]), range(200)))
+    versions = sorted(version for _, _, version in swaps)
+    print(f"\n✅ Test 8 - 200 concurrent reroutes: versions {versions[0]}..{versions[-1]}, all distinct")
+    assert versions == list(range(1, 201))
+    assert sorted(base for _, base, _ in swaps) == list(range(200))
+    batch = backboard.swap_user_routes({"user456": ["p129", "p131", "p201"], "gone": ["p129"]})
+    assert batch == {"user456": (["p129", "p199"], 200, 201)}
+
+    # Test 9: Write-behind keeps only the latest write per key, up to the bound
+    sent = []
+    writer = BackboardService(api_key="test", max_pending_writes=3)
+    writer._writes = OrderedDict()  # Queue without a drainer so the backlog is visible
+    for i in range(50):
+        writer._dispatch(lambda key, value: sent.append((key, value)), "user:a:position", {"progress": i}, queued=True)
+    for user in ("b", "c", "d"):
+        writer._dispatch(lambda key, value: sent.append((key, value)), f"user:{user}:position", {"progress": 0}, queued=True)
+    stats = writer.get_stats()
+    print(f"\n✅ Test 9 - 53 writes queued as {stats['pending_writes']} "
+          f"({stats['writes_coalesced']} coalesced, {stats['writes_dropped']} dropped)")
+    assert list(writer._writes) == ["user:b:position", "user:c:position", "user:d:position"]
+    assert stats['writes_coalesced'] == 49 and stats['writes_dropped'] == 1
+
     print("\n✨ All tests passed!")
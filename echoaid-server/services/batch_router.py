@@ -0,0 +1,138 @@
+"""
+Batched rerouting for blockage fan-out
+Computes routes for many users together from shared per-exit distance fields
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class BatchRouter:
+    """Routes a batch of users against one shared snapshot of search state"""
+
+    def __init__(self, pathfinder, congestion_weight: int = 10):
+        self.pathfinder = pathfinder
+        self.congestion_weight = congestion_weight  # Same weighting as get_best_exit
+        self.shared_graph = None  # SharedGraph published by cluster.py, if any
+        self._cached_fields = (None, None)  # (blocked set, fields) of the last local build
+
+    def compute_fields(self, blocked_nodes: Set[str]) -> Dict[str, Dict[str, int]]:
+        """
+        Build every exit's distance field (or reuse the shared ones)
+
+        The BFS is pure Python, so it runs here rather than on threads (the
+        GIL would serialize them anyway); one field per exit is cheap, and
+        cluster.py computes them once for all workers in shared memory.
+        """
+        if self.shared_graph is not None:
+            fields = self.shared_graph.snapshot_fields(blocked_nodes)
+            if fields is not None:
+                return fields
+
+        # Back-to-back batches (join storms) usually see the same blockages
+        cached_blocked, cached = self._cached_fields
+        if cached_blocked == blocked_nodes:
+            return cached
+
+        fields = {
+            exit_id: self.pathfinder.exit_distance_field(exit_id, blocked_nodes)
+            for exit_id in self.pathfinder.exits
+        }
+        self._cached_fields = (frozenset(blocked_nodes), fields)
+        return fields
+
+    def exit_loads(self, all_users: Dict) -> Dict[str, int]:
+        """Number of users whose route passes through each exit"""
+        loads = {exit_id: 0 for exit_id in self.pathfinder.exits}
+        for user in all_users.values():
+            for exit_id in self._exits_on(user.get('route', [])):
+                loads[exit_id] += 1
+        return loads
+
+    def assign(self, user_ids: List[str], all_users: Dict, blocked_nodes: Set[str],
+               fields: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, Tuple[List[str], str]]:
+        """
+        Pick an exit and route for each user in one pass
+
+        Exits are scored like get_best_exit (route length + congestion * weight),
+        but loads are updated as each user is assigned, so the batch balances
+        itself instead of every user seeing the same stale picture.
+
+        Args:
+            user_ids: Users to route, in priority order
+            all_users: Snapshot of all users (for congestion)
+            blocked_nodes: Set of blocked node IDs
+            fields: Precomputed exit distance fields (computed if omitted)
+
+        Returns:
+            Dictionary of user ID -> (route, exit ID); unroutable users are omitted
+        """
+        if fields is None:
+            fields = self.compute_fields(blocked_nodes)
+        loads = self.exit_loads(all_users)
+
+        choices = {}
+        for user_id in user_ids:
+            user = all_users.get(user_id)
+            if not user:
+                continue
+
+            start = user.get('currentNode', 'p129')
+            best_exit, best_score = None, None
+            for exit_id, field in fields.items():
+                length = self.pathfinder.route_length_from_field(start, field)
+                if length is None:
+                    continue
+                score = length + loads[exit_id] * self.congestion_weight
+                if best_score is None or score < best_score:
+                    best_exit, best_score = exit_id, score
+
+            if best_exit is None:
+                continue
+
+            # Move this user's load from their old exit to the new one
+            for exit_id in self._exits_on(user.get('route', [])):
+                loads[exit_id] -= 1
+            loads[best_exit] += 1
+            choices[user_id] = (start, best_exit)
+
+        # Routes are read off the fields: a walk down the hop counts per user
+        results = {}
+        for user_id, (start, exit_id) in choices.items():
+            route = self.pathfinder.route_from_field(start, exit_id, fields[exit_id])
+            if route:
+                results[user_id] = (route, exit_id)
+        return results
+
+    def _exits_on(self, route: List[str]) -> Set[str]:
+        return {node for node in route if node in self.pathfinder.exits}
+
+
+# Test the batch router
+if __name__ == "__main__":
+    import sys
+    import os
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from services.pathfinding import PathfindingEngine
+
+    print("🧪 Testing Batch Router...")
+    router = BatchRouter(PathfindingEngine())
+
+    users = {
+        f"user{i}": {"currentNode": node, "route": [node, "p134", "p200"]}
+        for i, node in enumerate(["p129", "p135", "p101", "p130", "p133", "p100"])
+    }
+    blocked = {"p134"}
+
+    # Test 1: Reroute every user off the blocked node in one batch
+    results = router.assign(list(users), users, blocked)
+    print(f"\n✅ Test 1 - Batch reroute around {blocked}:")
+    for user_id, (route, exit_id) in results.items():
+        print(f"   {user_id}: {' → '.join(route)}")
+        assert "p134" not in route and route[-1] == exit_id
+
+    # Test 2: Load balancing across exits within the batch
+    exits = [exit_id for _, exit_id in results.values()]
+    print(f"\n✅ Test 2 - Exit spread: { {e: exits.count(e) for e in set(exits)} }")
+
+    print("\n✨ All tests passed!")
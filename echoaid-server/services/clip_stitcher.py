@@ -0,0 +1,203 @@
+"""
+Clip stitching for voice instructions
+Instructions are built from short pre-rendered segments (severity prefixes,
+directions, number words, exit labels) by concatenating their MP3 frames,
+so a new distance never needs a new ElevenLabs call
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+# MPEG audio layer III tables, indexed by the header fields
+BITRATES = {
+    'mpeg1': [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    'mpeg2': [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+VBR_TAGS = (b'Xing', b'Info', b'VBRI')
+
+
+def frame_header(audio: bytes, pos: int) -> Optional[Tuple[int, tuple]]:
+    """
+    Parse the MP3 frame header at `pos`
+
+    Returns:
+        (frame length in bytes, stream format) or None if there is no
+        layer III frame header there. Frames of the same format can be
+        concatenated without re-encoding.
+    """
+    if pos + 4 > len(audio) or audio[pos] != 0xFF or audio[pos + 1] & 0xE0 != 0xE0:
+        return None
+
+    version = (audio[pos + 1] >> 3) & 3  # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    layer = (audio[pos + 1] >> 1) & 3  # 1 = layer III
+    bitrate_index = audio[pos + 2] >> 4
+    rate_index = (audio[pos + 2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = BITRATES['mpeg1' if mpeg1 else 'mpeg2'][bitrate_index] * 1000
+    sample_rate = SAMPLE_RATES[version][rate_index]
+    padding = (audio[pos + 2] >> 1) & 1
+    mono = audio[pos + 3] >> 6 == 3
+
+    length = (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+    return length, (version, sample_rate, mono)
+
+
+def mp3_frames(audio: bytes) -> Tuple[bytes, Optional[tuple], int]:
+    """
+    The audio frames of an MP3 file, without tags or the VBR info frame
+
+    ID3 tags and the Xing/Info header describe the whole file, so they
+    have to go before files are concatenated; a truncated last frame is
+    dropped too.
+
+    Returns:
+        (frame bytes, stream format, frame count)
+    """
+    pos = 0
+    if audio[:3] == b'ID3' and len(audio) >= 10:
+        size = (audio[6] << 21) | (audio[7] << 14) | (audio[8] << 7) | audio[9]
+        pos = 10 + size + (10 if audio[5] & 0x10 else 0)
+
+    frames, fmt = [], None
+    while pos < len(audio):
+        header = frame_header(audio, pos)
+        if header is None:
+            pos = audio.find(b'\xff', pos + 1)  # Resync past junk
+            if pos < 0:
+                break
+            continue
+
+        length, frame_fmt = header
+        if pos + length > len(audio) or (fmt is not None and frame_fmt != fmt):
+            break
+        frame = audio[pos:pos + length]
+        if not frames and fmt is None and any(tag in frame[:48] for tag in VBR_TAGS):
+            fmt = frame_fmt  # VBR info frame: remember the format, skip the frame
+        else:
+            fmt = frame_fmt
+            frames.append(frame)
+        pos += length
+
+    return b''.join(frames), fmt, len(frames)
+
+
+class ClipStitcher:
+    """
+    Pre-rendered segments, concatenated frame by frame on demand
+
+    Segments are synthesized once (through the TTS disk cache, so only the
+    first start calls ElevenLabs) and kept in memory as bare frames.
+    Stitching is a bytes join: no decoding, no re-encoding.
+    """
+
+    def __init__(self, tts):
+        """
+        Args:
+            tts: ElevenLabsService (synthesize, has_audio)
+        """
+        self.tts = tts
+        self.format = None  # Stream format every segment shares
+        self.stats = {'segments': 0, 'failed': 0, 'stitched': 0, 'missing': 0}
+        self._clips: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def prerender(self, segments: Iterable[str]) -> dict:
+        """
+        Synthesize (or load from the cache) every segment not loaded yet
+
+        Returns:
+            Counts of segments loaded and failed
+        """
+        counts = {'loaded': 0, 'failed': 0}
+        started = time.time()
+        for segment in dict.fromkeys(segments):
+            if segment in self._clips:
+                continue
+            audio = None
+            if self.tts.enabled or self.tts.has_audio(segment):
+                audio = self.tts.synthesize(segment)
+            if audio is None or not self.add(segment, audio):
+                counts['failed'] += 1
+            else:
+                counts['loaded'] += 1
+
+        with self._lock:
+            self.stats['failed'] += counts['failed']
+        print(f"🔊 Voice segments ready in {time.time() - started:.1f}s: {counts}")
+        return counts
+
+    def add(self, segment: str, audio: bytes) -> bool:
+        """Keep one segment's frames (False if they can't be stitched to the others)"""
+        frames, fmt, count = mp3_frames(audio)
+        with self._lock:
+            if not count or (self.format is not None and fmt != self.format):
+                return False
+            self.format = fmt
+            self._clips[segment] = frames
+            self.stats['segments'] = len(self._clips)
+        return True
+
+    def stitch(self, segments: List[str]) -> Optional[bytes]:
+        """
+        One MP3 made of the given segments in order
+
+        Returns:
+            Audio, or None if any segment has not been rendered
+        """
+        try:
+            audio = b''.join([self._clips[segment] for segment in segments])
+        except KeyError:
+            with self._lock:
+                self.stats['missing'] += 1
+            return None
+        with self._lock:
+            self.stats['stitched'] += 1
+        return audio
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+
+# Test the stitcher
+if __name__ == "__main__":
+    print("🧪 Testing Clip Stitcher...")
+
+    # MPEG1 layer III, 128 kbps, 44.1 kHz: 417-byte frames
+    frame = b'\xff\xfb\x90\x64' + bytes(413)
+    info_frame = b'\xff\xfb\x90\x64' + bytes(32) + b'Info' + bytes(377)
+
+    # Test 1: Tags and the VBR info frame are stripped
+    id3 = b'ID3\x04\x00\x00\x00\x00\x00\x05' + b'title'
+    frames, fmt, count = mp3_frames(id3 + info_frame + frame * 3 + b'TAG' + bytes(125))
+    print(f"\n✅ Test 1 - {count} frames, format {fmt}")
+    assert frames == frame * 3 and fmt == (3, 44100, False)
+
+    class FakeTTS:
+        enabled = True
+
+        def has_audio(self, text):
+            return False
+
+        def synthesize(self, text):
+            return info_frame + frame * len(text.split())
+
+    # Test 2: Segments stitch in order, unknown segments give None
+    stitcher = ClipStitcher(FakeTTS())
+    stitcher.prerender(["Blockage in front!", "thirty", "five", "meters ahead!"])
+    audio = stitcher.stitch(["Blockage in front!", "thirty", "five", "meters ahead!"])
+    print(f"\n✅ Test 2 - Stitched {len(audio)} bytes: {stitcher.get_stats()}")
+    assert audio == frame * 7
+    assert stitcher.stitch(["Blockage in front!", "forty"]) is None
+
+    # Test 3: A segment in another format is rejected
+    mono_22k = b'\xff\xf3\x90\xc4' + bytes(257)
+    print(f"\n✅ Test 3 - Mismatched format accepted: {stitcher.add('odd', mono_22k)}")
+    assert not stitcher.add('odd', mono_22k)
+
+    print("\n✨ All tests passed!")
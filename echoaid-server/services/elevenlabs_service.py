@@ -2,19 +2,115 @@
 ElevenLabs text-to-speech service for voice navigation
 """
 
-import requests
 import base64
-from typing import Optional
+import os
+import sys
+import time
+from typing import Iterable, Iterator, List, Optional
+
+import requests
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.clip_stitcher import ClipStitcher
+from services.tts_cache import AudioCache
+
+MODEL_ID = "eleven_monolingual_v1"
+DIRECTIONS = ["left", "right", "straight"]
+SEVERITIES = ["CRITICAL", "HIGH", "MEDIUM"]
+
+ONES = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+        "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
+TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+ALERT_SEGMENTS = {  # Severity -> (prefix, suffix) around the spoken distance
+    "CRITICAL": ("Warning! Critical blockage ahead!", "meters in front!"),
+    "HIGH": ("Blockage in front!", "meters ahead!"),
+    "MEDIUM": ("Caution. Obstacle", "meters ahead."),
+}
+
+
+def spoken_distance(distance: float) -> int:
+    """
+    Round a distance the way it is spoken (and cached)
+
+    Exact up to 10 m, then to 5 m up to 50 m, then to 10 m, so the set of
+    distinct utterances is small enough to pre-synthesize.
+    """
+    if distance < 10:
+        return int(distance)
+    if distance < 50:
+        return int(5 * round(distance / 5))
+    return int(10 * round(distance / 10))
+
+
+def distance_buckets(max_distance: float) -> List[int]:
+    """Every value spoken_distance can return up to max_distance"""
+    return sorted({spoken_distance(d) for d in range(int(max_distance) + 6)})
+
+
+def navigation_text(direction: str, distance: Optional[float] = None) -> str:
+    if distance:
+        return f"In {spoken_distance(distance)} meters, turn {direction}."
+    return f"Turn {direction}."
+
+
+def blockage_alert_text(distance: float, severity: str = "HIGH") -> str:
+    if severity == "CRITICAL":
+        return f"Warning! Critical blockage ahead! {spoken_distance(distance)} meters in front!"
+    if severity == "HIGH":
+        return f"Blockage in front! {spoken_distance(distance)} meters ahead!"
+    return f"Caution. Obstacle {spoken_distance(distance)} meters ahead."
+
+
+def route_summary_text(destination: str, num_turns: int) -> str:
+    return f"Route calculated to {destination}. {num_turns} turns ahead. Follow the instructions."
+
+
+def number_words(n: int) -> List[str]:
+    """Spoken words for 0-9999, one segment per word ("one", "hundred", "twenty", "five")"""
+    words = []
+    if n >= 1000:
+        words += [ONES[n // 1000], "thousand"]
+        n %= 1000
+        if not n:
+            return words
+    if n >= 100:
+        words += [ONES[n // 100], "hundred"]
+        n %= 100
+        if not n:
+            return words
+    if n < 20:
+        return words + [ONES[n]]
+    return words + [TENS[n // 10]] + ([ONES[n % 10]] if n % 10 else [])
+
+
+# Segment versions of the templates above, for ClipStitcher
+def navigation_segments(direction: str, distance: Optional[float] = None) -> List[str]:
+    if distance:
+        return ["In"] + number_words(spoken_distance(distance)) + [f"meters, turn {direction}."]
+    return [f"Turn {direction}."]
+
+
+def blockage_alert_segments(distance: float, severity: str = "HIGH") -> List[str]:
+    prefix, suffix = ALERT_SEGMENTS.get(severity, ALERT_SEGMENTS["MEDIUM"])
+    return [prefix] + number_words(spoken_distance(distance)) + [suffix]
+
+
+def route_summary_segments(destination: str, num_turns: int) -> List[str]:
+    return ["Route calculated to", f"{destination}."] + number_words(num_turns) + ["turns ahead. Follow the instructions."]
 
 
 class ElevenLabsService:
     """ElevenLabs TTS service for voice instructions"""
 
-    def __init__(self, api_key: Optional[str] = None, voice_id: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, voice_id: Optional[str] = None,
+                 base_url: str = "https://api.elevenlabs.io/v1", cache: Optional[AudioCache] = None):
         self.api_key = api_key
         self.voice_id = voice_id or "21m00Tcm4TlvDq8ikWAM"  # Rachel voice
-        self.base_url = "https://api.elevenlabs.io/v1"
+        self.base_url = base_url
         self.enabled = bool(api_key and api_key != "your-elevenlabs-api-key-here")
+        self.cache = cache  # Also serves audio while the API is disabled or down
+        self.clips = ClipStitcher(self)  # Pre-rendered segments (see prerender_segments)
 
         if not self.enabled:
             print("⚠️  ElevenLabs API key not set. Voice features will be disabled.")
@@ -29,6 +125,47 @@ class ElevenLabsService:
         Returns:
             Base64 encoded audio data (MP3) or None if failed
         """
+        audio = self.synthesize(text)
+        if audio is None:
+            return None
+
+        # Convert audio to base64 for easy transmission over Socket.IO
+        return base64.b64encode(audio).decode('utf-8')
+
+    def speech(self, text: str, segments: Optional[List[str]] = None) -> Optional[bytes]:
+        """
+        MP3 bytes for a templated utterance
+
+        Stitched from pre-rendered segments when they are all loaded (no
+        ElevenLabs call, no disk read); otherwise the whole text is synthesized.
+
+        Args:
+            text: Full utterance
+            segments: The same utterance split into segments (e.g. blockage_alert_segments)
+        """
+        if segments:
+            audio = self.clips.stitch(segments)
+            if audio is not None:
+                return audio
+        return self.synthesize(text)
+
+    def has_audio(self, text: str) -> bool:
+        """Whether `text` is in the disk cache"""
+        return self.cache is not None and self._cache_key(text) in self.cache
+
+    def synthesize(self, text: str) -> Optional[bytes]:
+        """
+        MP3 bytes for `text`, from the disk cache or the ElevenLabs API
+
+        Returns:
+            Audio data or None if failed
+        """
+        key = self._cache_key(text)
+        if self.cache is not None:
+            audio = self.cache.get(key)
+            if audio is not None:
+                return audio
+
         if not self.enabled:
             print(f"   ⚠️  ElevenLabs not enabled, skipping TTS for: '{text}'")
             return None
@@ -36,34 +173,183 @@ class ElevenLabsService:
         print(f"🔊 [ElevenLabs] Generating speech: '{text}'")
 
         try:
-            response = requests.post(
-                f"{self.base_url}/text-to-speech/{self.voice_id}",
-                headers={
-                    "Accept": "audio/mpeg",
-                    "Content-Type": "application/json",
-                    "xi-api-key": self.api_key
-                },
-                json={
-                    "text": text,
-                    "model_id": "eleven_monolingual_v1",
-                    "voice_settings": {
-                        "stability": 0.5,
-                        "similarity_boost": 0.75
-                    }
-                },
-                timeout=10
-            )
+            url, headers, payload = self._tts_request(text)
+            response = requests.post(url, headers=headers, json=payload, timeout=10)
+            response.raise_for_status()
+            print(f"   ✓ Generated {len(response.content)} bytes of audio")
+
+            if self.cache is not None:
+                self.cache.put(key, response.content)
+            return response.content
+
+        except Exception as e:
+            print(f"   ❌ ElevenLabs TTS error: {e}")
+            return None
+
+    def stream_speech(self, text: str, chunk_size: int = 4096,
+                      segments: Optional[List[str]] = None) -> Iterator[bytes]:
+        """
+        MP3 bytes for `text` in chunks, as soon as they are available
+
+        Stitched or cached audio is sliced; otherwise chunks are forwarded
+        from the ElevenLabs streaming endpoint while synthesis is still
+        running, and the whole clip is cached once it is complete. Yields
+        nothing if TTS is disabled; raises if the stream breaks off.
+        """
+        key = self._cache_key(text)
+        audio = self.clips.stitch(segments) if segments else None
+        if audio is None and self.cache is not None:
+            audio = self.cache.get(key)
+        if audio is not None:
+            for start in range(0, len(audio), chunk_size):
+                yield audio[start:start + chunk_size]
+            return
+
+        if not self.enabled:
+            print(f"   ⚠️  ElevenLabs not enabled, skipping TTS for: '{text}'")
+            return
+
+        print(f"🔊 [ElevenLabs] Streaming speech: '{text}'")
+        url, headers, payload = self._tts_request(text)
+        parts = []
+        with requests.post(f"{url}/stream", headers=headers, json=payload, stream=True, timeout=10) as response:
             response.raise_for_status()
+            for chunk in response.iter_content(chunk_size):
+                parts.append(chunk)
+                yield chunk
+
+        if self.cache is not None:
+            self.cache.put(key, b''.join(parts))
+
+    async def generate_speech_async(self, text: str) -> Optional[str]:
+        """
+        Non-blocking variant of generate_speech for the asyncio server
+
+        Returns:
+            Base64 encoded audio data (MP3) or None if failed
+        """
+        key = self._cache_key(text)
+        if self.cache is not None:
+            audio = self.cache.get(key)
+            if audio is not None:
+                return base64.b64encode(audio).decode('utf-8')
+
+        if not self.enabled:
+            print(f"   ⚠️  ElevenLabs not enabled, skipping TTS for: '{text}'")
+            return None
 
-            # Convert audio to base64 for easy transmission over Socket.IO
-            audio_base64 = base64.b64encode(response.content).decode('utf-8')
+        print(f"🔊 [ElevenLabs] Generating speech (async): '{text}'")
+
+        try:
+            import httpx
+
+            url, headers, payload = self._tts_request(text)
+            async with httpx.AsyncClient(timeout=10) as client:
+                response = await client.post(url, headers=headers, json=payload)
+            response.raise_for_status()
             print(f"   ✓ Generated {len(response.content)} bytes of audio")
-            return audio_base64
+
+            if self.cache is not None:
+                self.cache.put(key, response.content)
+            return base64.b64encode(response.content).decode('utf-8')
 
         except Exception as e:
             print(f"   ❌ ElevenLabs TTS error: {e}")
             return None
 
+    def phrase_library(self, pathfinder) -> List[str]:
+        """
+        Every utterance the templates can produce on the current map
+
+        Distances are bucketed (see spoken_distance) up to the longest
+        straight-line distance between two graph nodes; destinations are the
+        exit labels and turn counts go up to the most turns on any route.
+        """
+        nodes = [node for node in pathfinder.graph if node not in pathfinder.exits]
+        max_distance = max(pathfinder.calculate_distance(a, b) for a in pathfinder.graph for b in pathfinder.graph)
+        buckets = [d for d in distance_buckets(max_distance) if d > 0]
+
+        max_turns = 0
+        for start in nodes:
+            for exit_id in pathfinder.exits:
+                route = pathfinder.find_route(start, exit_id)
+                turns = sum(step['direction'] in ('left', 'right')
+                            for step in pathfinder.generate_turn_by_turn_directions(route))
+                max_turns = max(max_turns, turns)
+
+        labels = [pathfinder.get_node_info(exit_id).get('label', exit_id) for exit_id in pathfinder.exits]
+
+        phrases = [navigation_text(direction, distance) for direction in DIRECTIONS for distance in [None] + buckets]
+        phrases += [blockage_alert_text(distance, severity) for severity in SEVERITIES for distance in [0] + buckets]
+        phrases += [route_summary_text(label, turns) for label in labels for turns in range(max_turns + 1)]
+        return list(dict.fromkeys(phrases))
+
+    def segment_library(self, pathfinder) -> List[str]:
+        """
+        Every segment the *_segments templates can produce on the current map
+
+        Number words cover anything below ten thousand, so unlike
+        phrase_library this does not grow with the building.
+        """
+        labels = [pathfinder.get_node_info(exit_id).get('label', exit_id) for exit_id in pathfinder.exits]
+
+        segments = [segment for direction in DIRECTIONS for segment in navigation_segments(direction, 15)]
+        segments += [f"Turn {direction}." for direction in DIRECTIONS]
+        segments += [segment for prefix, suffix in ALERT_SEGMENTS.values() for segment in (prefix, suffix)]
+        segments += ["Route calculated to", "turns ahead. Follow the instructions."]
+        segments += [f"{label}." for label in labels]
+        segments += ONES + TENS[2:] + ["hundred", "thousand"]
+        return list(dict.fromkeys(segments))
+
+    def prerender_segments(self, pathfinder) -> dict:
+        """Load every segment into the stitcher (see ClipStitcher.prerender)"""
+        return self.clips.prerender(self.segment_library(pathfinder))
+
+    def warmup(self, phrases: Iterable[str]) -> dict:
+        """
+        Pre-synthesize phrases that are not cached yet
+
+        Returns:
+            Counts of phrases already cached, synthesized and failed
+        """
+        counts = {'cached': 0, 'synthesized': 0, 'failed': 0}
+        if self.cache is None:
+            return counts
+
+        started = time.time()
+        for text in phrases:
+            if self.has_audio(text):
+                counts['cached'] += 1
+            elif self.enabled and self.synthesize(text) is not None:
+                counts['synthesized'] += 1
+            else:
+                counts['failed'] += 1
+
+        print(f"🔊 TTS warmup done in {time.time() - started:.1f}s: {counts}")
+        return counts
+
+    def _cache_key(self, text: str) -> str:
+        return AudioCache.key(self.voice_id, MODEL_ID, text)
+
+    def _tts_request(self, text: str):
+        """URL, headers and JSON body for a text-to-speech call"""
+        return (
+            f"{self.base_url}/text-to-speech/{self.voice_id}",
+            {
+                "Accept": "audio/mpeg",
+                "Content-Type": "application/json",
+                "xi-api-key": self.api_key
+            },
+            {
+                "text": text,
+                "model_id": MODEL_ID,
+                "voice_settings": {
+                    "stability": 0.5,
+                    "similarity_boost": 0.75
+                }
+            }
+        )
+
     def generate_navigation_instruction(self, direction: str, distance: Optional[float] = None) -> Optional[str]:
         """
         Generate voice instruction for navigation
@@ -75,12 +361,8 @@ class ElevenLabsService:
         Returns:
             Base64 encoded audio data
         """
-        if distance:
-            text = f"In {int(distance)} meters, turn {direction}."
-        else:
-            text = f"Turn {direction}."
-
-        return self.generate_speech(text)
+        audio = self.speech(navigation_text(direction, distance), navigation_segments(direction, distance))
+        return base64.b64encode(audio).decode('utf-8') if audio is not None else None
 
     def generate_blockage_alert(self, distance: float, severity: str = "HIGH") -> Optional[str]:
         """
@@ -93,14 +375,8 @@ class ElevenLabsService:
         Returns:
             Base64 encoded audio data
         """
-        if severity == "CRITICAL":
-            text = f"Warning! Critical blockage ahead! {int(distance)} meters in front!"
-        elif severity == "HIGH":
-            text = f"Blockage in front! {int(distance)} meters ahead!"
-        else:
-            text = f"Caution. Obstacle {int(distance)} meters ahead."
-
-        return self.generate_speech(text)
+        audio = self.speech(blockage_alert_text(distance, severity), blockage_alert_segments(distance, severity))
+        return base64.b64encode(audio).decode('utf-8') if audio is not None else None
 
     def generate_route_summary(self, destination: str, num_turns: int) -> Optional[str]:
         """
@@ -113,13 +389,12 @@ class ElevenLabsService:
         Returns:
             Base64 encoded audio data
         """
-        text = f"Route calculated to {destination}. {num_turns} turns ahead. Follow the instructions."
-        return self.generate_speech(text)
+        audio = self.speech(route_summary_text(destination, num_turns), route_summary_segments(destination, num_turns))
+        return base64.b64encode(audio).decode('utf-8') if audio is not None else None
 
 
 # Test the ElevenLabs service
 if __name__ == "__main__":
-    import os
     from dotenv import load_dotenv
 
     load_dotenv()
@@ -152,4 +427,18 @@ if __name__ == "__main__":
     print(f"   Text: 'Route calculated to Exit 1. 3 turns ahead. Follow the instructions.'")
     print(f"   Generated: {'Yes' if audio4 else 'No'}")
 
+    # Test 5: Distances are bucketed, so the phrase library is finite
+    from services.pathfinding import PathfindingEngine
+    phrases = tts.phrase_library(PathfindingEngine())
+    print(f"\n✅ Test 5 - Phrase library:")
+    print(f"   {len(phrases)} phrases, e.g. '{navigation_text('left', 37.4)}'")
+    assert navigation_text('left', 37.4) == "In 35 meters, turn left."
+
+    # Test 6: Segments spell out the same utterance
+    print(f"\n✅ Test 6 - Segments:")
+    print(f"   {blockage_alert_segments(127, 'CRITICAL')}")
+    assert blockage_alert_segments(127, 'CRITICAL')[1:-1] == ["one", "hundred", "thirty"]
+    assert number_words(2015) == ["two", "thousand", "fifteen"] and number_words(0) == ["zero"]
+    assert len(tts.segment_library(PathfindingEngine())) < len(phrases)
+
     print("\n✨ All tests completed!")
@@ -0,0 +1,345 @@
+"""
+Local stand-ins for Backboard.io, Gemini and ElevenLabs
+Lets the server (and bench.py) run offline against remote services that are
+as slow and unreliable as we tell them to be
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.report_parser import LocalReportParser
+from services.tts_cache import AudioCache
+
+# One silent MPEG-1 Layer III frame (128 kbps, 44.1 kHz, joint stereo): 417 bytes, 26ms
+MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0x64]) + bytes(413)
+MP3_FRAME_SECONDS = 1152 / 44100
+SPOKEN_CHARS_PER_SECOND = 15
+STREAM_FRAMES = 8  # Frames per chunk on the streaming endpoint
+
+
+class FakeTimeout(Exception):
+    """Raised by in-process fakes when a call is chosen to time out"""
+
+
+class LatencyProfile:
+    """
+    Latency, error and timeout behaviour of one fake service
+
+    Latencies are log-normal, described by their median and 99th percentile.
+    """
+
+    def __init__(self, median_ms: float = 50, p99_ms: float = 500, errors: float = 0.0,
+                 timeouts: float = 0.0, hang_s: float = 30.0, seed: Optional[int] = None):
+        """
+        Args:
+            median_ms: Median latency
+            p99_ms: 99th percentile latency
+            errors: Fraction of calls that fail (HTTP 500 / exception)
+            timeouts: Fraction of calls that hang for `hang_s` (client timeouts fire first)
+            hang_s: How long a timed-out call hangs
+            seed: Random seed for repeatable runs
+        """
+        self.median_ms = median_ms
+        self.p99_ms = max(p99_ms, median_ms)
+        self.errors = errors
+        self.timeouts = timeouts
+        self.hang_s = hang_s
+        self.random = random.Random(seed)
+        self._mu = math.log(max(median_ms, 0.001))
+        self._sigma = math.log(self.p99_ms / max(median_ms, 0.001)) / 2.326
+        self.stats = {'calls': 0, 'errors': 0, 'timeouts': 0}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, spec: Optional[str]) -> 'LatencyProfile':
+        """
+        Build a profile from a spec like "median=80,p99=900,errors=0.02,timeouts=0.01"
+
+        Missing keys keep their defaults; an empty spec means the defaults.
+        """
+        keys = {'median': 'median_ms', 'p99': 'p99_ms', 'errors': 'errors',
+                'timeouts': 'timeouts', 'hang': 'hang_s', 'seed': 'seed'}
+        kwargs = {}
+        for part in filter(None, (spec or '').split(',')):
+            name, _, value = part.partition('=')
+            if name.strip() not in keys:
+                raise ValueError(f"Unknown latency setting '{name}' (expected {', '.join(keys)})")
+            kwargs[keys[name.strip()]] = int(value) if name.strip() == 'seed' else float(value)
+        return cls(**kwargs)
+
+    def draw(self) -> tuple:
+        """
+        Decide the outcome of one call
+
+        Returns:
+            (seconds to wait, 'ok' | 'error' | 'timeout')
+        """
+        with self._lock:
+            self.stats['calls'] += 1
+            roll = self.random.random()
+            if roll < self.timeouts:
+                self.stats['timeouts'] += 1
+                return self.hang_s, 'timeout'
+            delay = self.random.lognormvariate(self._mu, self._sigma) / 1000
+            if roll < self.timeouts + self.errors:
+                self.stats['errors'] += 1
+                return delay, 'error'
+            return delay, 'ok'
+
+
+class FakeServiceServer:
+    """
+    HTTP server speaking the Backboard.io and ElevenLabs endpoints the services use
+
+    Backboard:  POST /api/memory/<id>/store, GET /api/memory/<id>/query,
+                DELETE /api/memory/<id>/delete/<key>
+    ElevenLabs: POST /v1/text-to-speech/<voice_id> (silent MP3 sized to the text)
+                POST /v1/text-to-speech/<voice_id>/stream (same, sent as it is "synthesized")
+    """
+
+    def __init__(self, backboard: LatencyProfile, elevenlabs: LatencyProfile,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.profiles = {'api': backboard, 'v1': elevenlabs}
+        self.memory: Dict[str, object] = {}
+        self.memory_lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeServiceServer':
+        threading.Thread(target=self.server.serve_forever, name='fake-services', daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self._serve('POST')
+
+            def do_GET(self):
+                self._serve('GET')
+
+            def do_DELETE(self):
+                self._serve('DELETE')
+
+            def _serve(self, method):
+                parts = self.path.split('?')[0].strip('/').split('/')
+                profile = fake.profiles.get(parts[0])
+                if profile is None:
+                    return self._reply(404, b'{"error": "not found"}')
+
+                delay, outcome = profile.draw()
+                time.sleep(delay)
+                if outcome == 'timeout':
+                    return  # The client gave up long ago
+                if outcome == 'error':
+                    return self._reply(500, b'{"error": "injected failure"}')
+
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'null') if length else None
+                if parts[0] == 'v1' and method == 'POST':
+                    audio = fake._speech((body or {}).get('text', ''))
+                    if parts[-1] == 'stream':
+                        return self._stream(audio)
+                    return self._reply(200, audio, 'audio/mpeg')
+                return self._reply(200, json.dumps(fake._memory(method, parts, body)).encode())
+
+            def _reply(self, status, payload, content_type='application/json'):
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', content_type)
+                    self.send_header('Content-Length', str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _stream(self, audio):
+                """Send the clip a few frames at a time, 4x faster than real time"""
+                try:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'audio/mpeg')
+                    self.send_header('Connection', 'close')
+                    self.end_headers()
+                    step = len(MP3_FRAME) * STREAM_FRAMES
+                    for start in range(0, len(audio), step):
+                        self.wfile.write(audio[start:start + step])
+                        self.wfile.flush()
+                        time.sleep(STREAM_FRAMES * MP3_FRAME_SECONDS / 4)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass  # Thousands of requests per bench run
+
+        return Handler
+
+    def _memory(self, method: str, parts: list, body):
+        with self.memory_lock:
+            if method == 'POST':
+                self.memory[body['key']] = body['value']
+                return {'stored': body['key']}
+            if method == 'DELETE':
+                self.memory.pop(parts[-1], None)
+                return {'deleted': parts[-1]}
+            return [{'key': k, 'value': v} for k, v in self.memory.items()]
+
+    def _speech(self, text: str) -> bytes:
+        seconds = max(len(text), 1) / SPOKEN_CHARS_PER_SECOND
+        return MP3_FRAME * max(1, round(seconds / MP3_FRAME_SECONDS))
+
+
+class FakeGeminiModel:
+    """
+    In-process stand-in for genai.GenerativeModel
+
+    Answers the blockage (single and batched) and reroute prompts with the
+    local keyword parser, after the profile's latency.
+    """
+
+    def __init__(self, profile: LatencyProfile):
+        self.profile = profile
+        self.parser = LocalReportParser()
+
+    def generate_content(self, prompt: str):
+        delay, outcome = self.profile.draw()
+        time.sleep(delay)
+        return self._respond(prompt, outcome)
+
+    async def generate_content_async(self, prompt: str):
+        delay, outcome = self.profile.draw()
+        await asyncio.sleep(delay)
+        return self._respond(prompt, outcome)
+
+    def _respond(self, prompt: str, outcome: str):
+        if outcome == 'timeout':
+            raise FakeTimeout("Deadline exceeded (injected)")
+        if outcome == 'error':
+            raise RuntimeError("500 Internal error (injected)")
+        return FakeResponse(json.dumps(self._answer(prompt)))
+
+    def _answer(self, prompt: str):
+        batch = re.search(r'^\[\s*\{.*?^\]', prompt, re.S | re.M)
+        if batch:
+            return [{'id': item['id'], **self._parse(item['message'], item['position'])}
+                    for item in json.loads(batch.group(0))]
+
+        report = re.search(r'at position "([^"]+)" reported:\s*"(.*)"', prompt)
+        if report:
+            return self._parse(report.group(2), report.group(1))
+
+        # Reroute suggestion: least loaded exit
+        loads = json.loads(re.search(r'loads:\s*(\{.*?\})', prompt, re.S).group(1))
+        best = min(['p200', 'p201', 'p202', 'p203'], key=lambda exit_id: loads.get(exit_id, 0))
+        return {'exit': best, 'reason': f"Least congested exit ({loads.get(best, 0)} users)", 'priority': 'HIGH'}
+
+    def _parse(self, message: str, reporter_position: str) -> dict:
+        blockage_type, severity = self.parser.classify(self.parser.normalize(message)) or ('OTHER', 'LOW')
+        return {
+            'location': self.parser.resolve_location(message, reporter_position),
+            'severity': severity,
+            'type': blockage_type,
+            'needsImmediate': severity in ['CRITICAL', 'HIGH']
+        }
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+def install_fakes(backboard, gemini, elevenlabs, specs: Optional[Dict[str, str]] = None) -> FakeServiceServer:
+    """
+    Point the three services at local fakes
+
+    Args:
+        backboard: BackboardService
+        gemini: GeminiService
+        elevenlabs: ElevenLabsService
+        specs: LatencyProfile specs per service ('backboard', 'gemini', 'elevenlabs');
+               defaults to the FAKE_*_LATENCY environment variables
+
+    Returns:
+        The running fake HTTP server (Backboard and ElevenLabs)
+    """
+    if specs is None:
+        specs = {name: os.getenv(f"FAKE_{name.upper()}_LATENCY") for name in ('backboard', 'gemini', 'elevenlabs')}
+
+    server = FakeServiceServer(LatencyProfile.parse(specs.get('backboard')),
+                               LatencyProfile.parse(specs.get('elevenlabs'))).start()
+
+    backboard.base_url = f"{server.url}/api"
+    backboard.api_key = backboard.api_key or 'fake'
+    backboard.enabled = True
+    if backboard.write_behind:
+        backboard.start_write_behind()
+
+    elevenlabs.base_url = f"{server.url}/v1"
+    if elevenlabs.cache is not None:
+        # Keep fake (silent) audio out of the real cache
+        elevenlabs.cache = AudioCache(tempfile.mkdtemp(prefix='fake-tts-'), elevenlabs.cache.max_bytes)
+    elevenlabs.api_key = elevenlabs.api_key or 'fake'
+    elevenlabs.enabled = True
+
+    gemini.model = FakeGeminiModel(LatencyProfile.parse(specs.get('gemini')))
+    gemini.enabled = True
+
+    print(f"🧪 Using fake Backboard/ElevenLabs at {server.url} and an in-process fake Gemini")
+    return server
+
+
+# Test the fakes
+if __name__ == "__main__":
+    import requests
+
+    print("🧪 Testing Service Fakes...")
+
+    # Test 1: Latency distribution follows the spec
+    profile = LatencyProfile.parse("median=20,p99=200,seed=1")
+    delays = sorted(profile.draw()[0] * 1000 for _ in range(10000))
+    print(f"\n✅ Test 1 - p50={delays[5000]:.0f}ms p99={delays[9900]:.0f}ms")
+    assert 15 < delays[5000] < 25 and 150 < delays[9900] < 260
+
+    # Test 2: Backboard and ElevenLabs endpoints
+    server = FakeServiceServer(LatencyProfile(median_ms=1, p99_ms=2),
+                               LatencyProfile(median_ms=1, p99_ms=2)).start()
+    requests.post(f"{server.url}/api/memory/echoaid/store", json={'key': 'user:1', 'value': {'name': 'Al'}})
+    stored = requests.get(f"{server.url}/api/memory/echoaid/query").json()
+    audio = requests.post(f"{server.url}/v1/text-to-speech/voice", json={'text': 'Turn left in 10 meters'}).content
+    print(f"\n✅ Test 2 - Stored {stored}, TTS returned {len(audio)} bytes ({len(audio) // len(MP3_FRAME)} frames)")
+    assert stored == [{'key': 'user:1', 'value': {'name': 'Al'}}] and audio[:2] == b'\xff\xfb'
+
+    # Test 3: Injected errors
+    server.profiles['api'] = LatencyProfile(median_ms=1, p99_ms=2, errors=1.0)
+    status = requests.post(f"{server.url}/api/memory/echoaid/store", json={'key': 'k', 'value': 1}).status_code
+    print(f"\n✅ Test 3 - Injected failure returned HTTP {status}")
+    assert status == 500
+    server.stop()
+
+    # Test 4: Fake Gemini answers the blockage prompt
+    model = FakeGeminiModel(LatencyProfile(median_ms=1, p99_ms=2))
+    prompt = 'A user at position "p131" reported:\n"Smoke near room 1040"'
+    print(f"\n✅ Test 4 - Fake Gemini: {model.generate_content(prompt).text}")
+
+    print("\n✨ All tests passed!")
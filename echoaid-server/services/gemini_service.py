@@ -3,14 +3,45 @@ Gemini AI service for intelligent evacuation routing and blockage parsing
 """
 
 import google.generativeai as genai
+from concurrent.futures import Future
+from typing import List, Optional
+import asyncio
 import json
+import os
 import re
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from services.report_parser import LocalReportParser
+from services.micro_batcher import MicroBatcher
+from services.result_cache import SingleFlight, TTLCache
 
 
 class GeminiService:
     """Gemini AI service for intelligent rerouting and blockage parsing"""
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_ttl: float = 300.0, cache_size: int = 256,
+                 batch_window: float = 0.05, batch_size: int = 16):
+        # Clear reports are resolved locally; repeats are answered once;
+        # distinct reports arriving together share one prompt
+        self.local_parser = LocalReportParser()
+        self.cache = TTLCache(max_entries=cache_size, ttl=cache_ttl)
+        self.inflight = SingleFlight()
+        self.batcher = MicroBatcher(self._parse_blockage_batch, window=batch_window, max_batch=batch_size)
+        self.counters = {
+            'requests': 0,       # parse_blockage_report calls
+            'local_parses': 0,   # Unambiguous reports resolved without Gemini
+            'gemini_calls': 0,   # Requests actually sent to Gemini
+            'batched_reports': 0,  # Reports sent to Gemini (several per call in bursts)
+            'cache_hits': 0,     # Answered from the cache
+            'coalesced': 0,      # Shared an identical in-flight request
+            'fallbacks': 0,      # Answered by keyword matching
+            'errors': 0          # Gemini calls that failed
+        }
+        self._counter_lock = threading.Lock()
+
         if not api_key or api_key == "your-gemini-api-key-here":
             print("⚠️  Warning: Gemini API key not set. AI features will use fallback logic.")
             self.enabled = False
@@ -33,11 +64,163 @@ class GeminiService:
         """
         print(f"🤖 [Gemini AI] Parsing blockage report: '{message}'")
 
+        local = self.parse_locally(message, reporter_position)
+        if local is not None:
+            return local
+        return self.parse_with_gemini(message, reporter_position)
+
+    def parse_with_gemini(self, message: str, reporter_position: str) -> dict:
+        """Gemini parse without the local pre-parse (cached, single-flight, batched, keyword fallback)"""
+        return dict(self.parse_with_gemini_future(message, reporter_position).result())
+
+    async def parse_blockage_report_async(self, message: str, reporter_position: str) -> dict:
+        """
+        Non-blocking variant of parse_blockage_report for the asyncio server
+
+        Same prompt and fallback, but awaits Gemini instead of holding a thread.
+        """
+        print(f"🤖 [Gemini AI] Parsing blockage report (async): '{message}'")
+
+        local = self.parse_locally(message, reporter_position)
+        if local is not None:
+            return local
+        return await self.parse_with_gemini_async(message, reporter_position)
+
+    async def parse_with_gemini_async(self, message: str, reporter_position: str) -> dict:
+        """Awaitable parse_with_gemini for the asyncio server"""
+        return dict(await asyncio.wrap_future(self.parse_with_gemini_future(message, reporter_position)))
+
+    def parse_with_gemini_future(self, message: str, reporter_position: str) -> Future:
+        """
+        Start a Gemini parse and return a future for its result
+
+        Cached and already in-flight reports resolve without a new request;
+        the rest join the current micro-batch (one prompt per burst).
+        Treat the result as shared: copy it before changing it.
+        """
         if not self.enabled:
             print(f"   ⚠️  Gemini not enabled, using fallback logic")
-            return self._fallback_parse_blockage(message, reporter_position)
+            return self._resolved(self._fallback(message, reporter_position))
+
+        key = self._cache_key(message, reporter_position)
+        cached, future, leader = self._lookup(key)
+        if cached is not None:
+            return self._resolved(cached)
+        if not leader:
+            return future
+
+        batched = self.batcher.submit((message, reporter_position))
+        batched.add_done_callback(lambda done: self._finish(key, done, message, reporter_position))
+        return future
+
+    def get_stats(self) -> dict:
+        """Counters for /metrics (calls_saved = Gemini requests avoided)"""
+        with self._counter_lock:
+            stats = dict(self.counters)
+        stats['calls_saved'] = (stats['local_parses'] + stats['cache_hits'] + stats['coalesced']
+                                + stats['batched_reports'] - stats['gemini_calls'])
+        stats['cache_entries'] = len(self.cache)
+        stats['largest_batch'] = self.batcher.stats['largest_batch']
+        return stats
+
+    def parse_locally(self, message: str, reporter_position: str) -> Optional[dict]:
+        """Label index + keyword match; None when the report needs Gemini"""
+        self._count('requests')
+        result = self.local_parser.parse(message, reporter_position)
+        if result is not None:
+            self._count('local_parses')
+            print(f"   ⚡ Parsed locally: location={result['location']}, severity={result['severity']}, type={result['type']}")
+        return result
+
+    def _cache_key(self, message: str, reporter_position: str) -> tuple:
+        """"Fire here!!" and "fire   here" are the same report from the same spot"""
+        normalized = ' '.join(re.sub(r'[^a-z0-9]+', ' ', message.lower()).split())
+        return normalized, reporter_position
+
+    def _lookup(self, key: tuple):
+        """
+        Check the cache, then join or start the in-flight request
 
-        prompt = f"""
+        Returns:
+            (cached result or None, shared future, True if this caller must query Gemini)
+        """
+        cached = self.cache.get(key)
+        if cached is not None:
+            self._count('cache_hits')
+            print(f"   ♻️  Cached result: location={cached.get('location')}")
+            return dict(cached), None, False
+
+        future, leader = self.inflight.claim(key)
+        if not leader:
+            self._count('coalesced')
+            print(f"   ♻️  Identical report already being parsed, sharing its result")
+        return None, future, leader
+
+    def _parse_blockage_batch(self, reports: List[tuple]) -> List[Optional[dict]]:
+        """
+        Send a micro-batch of (message, reporter_position) to Gemini
+
+        Returns:
+            One parsed result per report, None where Gemini's answer was unusable
+        """
+        self._count('gemini_calls')
+        with self._counter_lock:
+            self.counters['batched_reports'] += len(reports)
+
+        if len(reports) == 1:
+            response = self.model.generate_content(self._blockage_prompt(*reports[0]))
+            return [self._parse_blockage_response(response.text)]
+
+        print(f"   📦 Sending {len(reports)} blockage reports to Gemini in one prompt")
+        response = self.model.generate_content(self._blockage_batch_prompt(reports))
+        return self._parse_blockage_batch_response(response.text, len(reports))
+
+    def _finish(self, key: tuple, batched: Future, message: str, reporter_position: str):
+        """Cache one report's share of a batch and release everyone waiting on it"""
+        result = None
+        try:
+            result = batched.result()
+            if result is None:
+                raise ValueError("no usable result for this report in the batch")
+            result = self._place(result)
+            self.cache.put(key, result)
+        except Exception as e:
+            result = self._gemini_failed(e, message, reporter_position)
+        finally:
+            self.inflight.finish(key, result)
+
+    def _place(self, result: dict) -> dict:
+        """Map the location Gemini named ("1040", "h4") to a routable node ID via the label index"""
+        location = result.get('location')
+        node = self.local_parser.resolve_node(location)
+        if node is None or node == location:
+            return result  # Unknown places are left to refine_blockage (provisional node)
+        print(f"   📍 Gemini location {location} → {node}")
+        return {**result, 'location': node}
+
+    def _resolved(self, result: dict) -> Future:
+        future = Future()
+        future.set_result(result)
+        return future
+
+    def _gemini_failed(self, error: Exception, message: str, reporter_position: str) -> dict:
+        # Not cached, so the next report tries Gemini again
+        self._count('errors')
+        print(f"   ❌ Gemini parse error: {error}")
+        print(f"   ⚠️  Falling back to keyword matching")
+        return self._fallback(message, reporter_position)
+
+    def _fallback(self, message: str, reporter_position: str) -> dict:
+        self._count('fallbacks')
+        return self._fallback_parse_blockage(message, reporter_position)
+
+    def _count(self, name: str):
+        with self._counter_lock:
+            self.counters[name] += 1
+
+    def _blockage_prompt(self, message: str, reporter_position: str) -> str:
+        """Build the blockage extraction prompt"""
+        return f"""
 You are an emergency evacuation AI. A user at position "{reporter_position}" reported:
 "{message}"
 
@@ -62,50 +245,88 @@ Rules:
 Return ONLY the JSON object, no additional text.
 """
 
-        try:
-            response = self.model.generate_content(prompt)
-            text = response.text.strip()
+    def _blockage_batch_prompt(self, reports: List[tuple]) -> str:
+        """Build one extraction prompt for several reports"""
+        numbered = [
+            {"id": i, "position": reporter_position, "message": message}
+            for i, (message, reporter_position) in enumerate(reports)
+        ]
+        return f"""
+You are an emergency evacuation AI. Several users reported blockages at the same time.
+Each report has an id, the node ID where the user is ("position") and what they said:
+{json.dumps(numbered, indent=2)}
+
+For EVERY report, extract the following information:
+{{
+  "id": the report's id,
+  "location": "node_id or room_number",
+  "severity": "LOW" | "MEDIUM" | "HIGH" | "CRITICAL",
+  "type": "FIRE" | "DEBRIS" | "CROWD" | "STRUCTURAL" | "OTHER",
+  "needsImmediate": true/false
+}}
 
-            # Extract JSON from response (handle markdown code blocks)
-            if '```json' in text:
-                text = text.split('```json')[1].split('```')[0].strip()
-            elif '```' in text:
-                text = text.split('```')[1].split('```')[0].strip()
+If a user mentions "here" or "this hallway", use that report's position.
+If unclear, return null for location.
 
-            result = json.loads(text)
-            print(f"   ✓ Gemini parsed: location={result.get('location')}, severity={result.get('severity')}, type={result.get('type')}")
-            return result
-        except Exception as e:
-            print(f"   ❌ Gemini parse error: {e}")
-            print(f"   ⚠️  Falling back to keyword matching")
-            return self._fallback_parse_blockage(message, reporter_position)
+Rules:
+- Fire/smoke/explosion = CRITICAL
+- Structural damage/collapse = CRITICAL
+- Debris/blocked path = HIGH
+- Crowded/slow = MEDIUM
+- Other = LOW
+
+Return ONLY a JSON array with one object per report, no additional text.
+"""
+
+    def _parse_blockage_response(self, text: str) -> dict:
+        """Extract the JSON object from a Gemini response (raises on bad JSON)"""
+        result = json.loads(self._strip_code_block(text))
+        print(f"   ✓ Gemini parsed: location={result.get('location')}, severity={result.get('severity')}, type={result.get('type')}")
+        return result
+
+    def _parse_blockage_batch_response(self, text: str, count: int) -> List[Optional[dict]]:
+        """
+        Split a batched Gemini response back into per-report results
+
+        Items are matched by "id" (falling back to their position in the
+        array); reports with a missing or malformed item get None.
+        """
+        items = json.loads(self._strip_code_block(text))
+        if not isinstance(items, list):
+            raise ValueError("expected a JSON array")
+
+        results: List[Optional[dict]] = [None] * count
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            report_id = item.pop('id', index)
+            if isinstance(report_id, int) and 0 <= report_id < count and results[report_id] is None:
+                results[report_id] = item
+
+        parsed = sum(result is not None for result in results)
+        print(f"   ✓ Gemini parsed {parsed}/{count} batched reports")
+        return results
+
+    def _strip_code_block(self, text: str) -> str:
+        """Extract JSON from response (handle markdown code blocks)"""
+        text = text.strip()
+        if '```json' in text:
+            text = text.split('```json')[1].split('```')[0].strip()
+        elif '```' in text:
+            text = text.split('```')[1].split('```')[0].strip()
+        return text
 
     def _fallback_parse_blockage(self, message: str, reporter_position: str) -> dict:
         """
         Fallback blockage parser using keyword matching
         """
-        message_lower = message.lower()
-
-        # Determine severity based on keywords
-        if any(word in message_lower for word in ['fire', 'smoke', 'explosion', 'collapse', 'structural']):
-            severity = 'CRITICAL'
-            type_detected = 'FIRE' if 'fire' in message_lower or 'smoke' in message_lower else 'STRUCTURAL'
-        elif any(word in message_lower for word in ['blocked', 'debris', 'obstacle', 'fallen']):
-            severity = 'HIGH'
-            type_detected = 'DEBRIS'
-        elif any(word in message_lower for word in ['crowd', 'congested', 'slow', 'packed']):
-            severity = 'MEDIUM'
-            type_detected = 'CROWD'
-        else:
-            severity = 'HIGH'
-            type_detected = 'OTHER'
-
-        # Try to extract room/hallway number
-        room_match = re.search(r'(\d{3,4}|h\d+)', message)
-        location = f"p{room_match.group(1)}" if room_match else reporter_position
+        # Same keyword table and room/hallway label index as the local parser,
+        # but always answers (unknown hazard = HIGH/OTHER at the reporter's node)
+        text = self.local_parser.normalize(message)
+        type_detected, severity = self.local_parser.classify(text) or ('OTHER', 'HIGH')
 
         return {
-            "location": location if location.startswith('p') else reporter_position,
+            "location": self.local_parser.resolve_location(message, reporter_position),
             "severity": severity,
             "type": type_detected,
             "needsImmediate": severity in ['CRITICAL', 'HIGH']
@@ -196,7 +417,6 @@ Return ONLY the JSON object, no additional text.
 
 # Test the Gemini service
 if __name__ == "__main__":
-    import os
     from dotenv import load_dotenv
 
     load_dotenv()
@@ -230,4 +450,23 @@ if __name__ == "__main__":
     print(f"   Current: p129, Blocked: p134")
     print(f"   Output: {json.dumps(result3, indent=2)}")
 
+    # Test 4: Repeated report never reaches Gemini (local parse, cache or single-flight)
+    before = gemini.get_stats()
+    gemini.parse_blockage_report("There's a FIRE blocking the hallway", "p129")
+    print(f"\n✅ Test 4 - Gemini calls saved:")
+    print(f"   Before: {before}")
+    print(f"   After:  {gemini.get_stats()}")
+
+    # Test 5: A batched answer with a missing item falls back for that report only
+    items = gemini._parse_blockage_batch_response(
+        '[{"id": 1, "location": "p134", "severity": "CRITICAL", "type": "FIRE"}, "garbage"]', 3)
+    print(f"\n✅ Test 5 - Demultiplexed batch: {items}")
+    assert items[0] is None and items[1]['location'] == "p134" and items[2] is None
+
+    # Test 6: Room and hallway labels from Gemini become graph nodes before they are cached
+    placed = [gemini._place({"location": location, "severity": "HIGH"})['location']
+              for location in ["1040", "h4", "p134", "nowhere"]]
+    print(f"\n✅ Test 6 - Gemini locations placed on the graph: {placed}")
+    assert placed == ["p100", "p129", "p134", "nowhere"]
+
     print("\n✨ All tests completed!")
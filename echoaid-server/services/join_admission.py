@@ -0,0 +1,103 @@
+"""
+Batched admission for join storms
+When the alarm sounds everyone joins at once; joins are collected for a short
+window and routed together against one picture of exit loads
+"""
+
+from typing import Callable, Dict, List, Optional
+import threading
+import time
+
+
+class JoinAdmission:
+    """
+    Collects joins for `window` seconds, then hands the whole batch over
+
+    The first join of a batch starts the timer; a full batch
+    (`max_batch`) is flushed straight away.
+    """
+
+    def __init__(self, window: float = 0.1, max_batch: int = 500):
+        """
+        Args:
+            window: Seconds to collect joins before admitting them
+            max_batch: Batch size that triggers an immediate flush
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self.admit: Optional[Callable[[List[Dict]], None]] = None  # fn(batch)
+
+        self.batch: List[Dict] = []
+        self.stats = {'joins': 0, 'batches': 0, 'largest_batch': 0}
+        self._timer = None
+        self._lock = threading.Lock()
+        self._admit_lock = threading.Lock()  # Batches see each other's exit loads
+
+    def bind(self, admit: Callable[[List[Dict]], None]):
+        """Set the function that routes a batch (the last server registered owns admission)"""
+        self.admit = admit
+
+    def submit(self, join: Dict):
+        """Queue a join (any dict the admit function understands)"""
+        with self._lock:
+            self.batch.append(join)
+            self.stats['joins'] += 1
+            if len(self.batch) >= self.max_batch:
+                flush_now = True
+            else:
+                flush_now = False
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if flush_now:
+            self.flush()
+
+    def flush(self):
+        """Admit everything queued so far"""
+        with self._lock:
+            batch, self.batch = self.batch, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not batch:
+            return
+
+        self.stats['batches'] += 1
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+        started = time.time()
+        with self._admit_lock:
+            try:
+                self.admit(batch)
+            except Exception as e:
+                print(f"Join admission error: {e}")
+        print(f"🚪 Admitted {len(batch)} joins in {(time.time() - started) * 1000:.0f}ms")
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'queued': len(self.batch)}
+
+
+# Test the admission queue
+if __name__ == "__main__":
+    print("🧪 Testing Join Admission...")
+    batches = []
+    admission = JoinAdmission(window=0.05, max_batch=5)
+    admission.bind(lambda batch: batches.append([join['userId'] for join in batch]))
+
+    # Test 1: Joins inside one window are admitted together
+    for i in range(3):
+        admission.submit({'userId': f"user{i}"})
+    time.sleep(0.15)
+    print(f"\n✅ Test 1 - Batches: {batches}")
+    assert batches == [["user0", "user1", "user2"]]
+
+    # Test 2: A full batch does not wait for the window
+    for i in range(5):
+        admission.submit({'userId': f"storm{i}"})
+    print(f"\n✅ Test 2 - Full batch flushed immediately: {len(batches[-1])} joins")
+    assert len(batches) == 2 and len(batches[-1]) == 5
+
+    print(f"\n✅ Test 3 - Stats: {admission.get_stats()}")
+    print("\n✨ All tests passed!")
@@ -0,0 +1,233 @@
+"""
+Tiled, level-of-detail wall geometry for the app
+Cut from the map artifact once at startup, then served as cached binary tiles
+"""
+
+import gzip
+import hashlib
+import math
+import struct
+from typing import Dict, List, Optional, Tuple
+
+MAGIC = b'EMT1'
+HEADER = struct.Struct('<4sHH')  # Magic, extent, wall count
+EXTENT = 4096  # Quantization steps across a tile
+TILE_PIXELS = 256  # Screen size a tile is meant for: sets what each level may drop
+LEVELS = 4  # Levels 0 (one tile) .. 3 (8 x 8 tiles, every wall)
+
+
+def clip(wall, x0: float, y0: float, x1: float, y1: float) -> Optional[Tuple[float, float, float, float]]:
+    """Part of a wall inside the rectangle (Liang-Barsky), or None"""
+    ax, ay, bx, by = wall
+    dx, dy = bx - ax, by - ay
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, ax - x0), (dx, x1 - ax), (-dy, ay - y0), (dy, y1 - ay)):
+        if p == 0:
+            if q < 0:
+                return None
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return None
+    return (ax + t0 * dx, ay + t0 * dy, ax + t1 * dx, ay + t1 * dy)
+
+
+def _zigzag(v: int) -> int:
+    return (v << 1) ^ (v >> 31)
+
+
+def _varint(v: int, out: bytearray):
+    while v >= 0x80:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+
+
+def encode_tile(walls: List[Tuple[int, int, int, int]], extent: int = EXTENT) -> bytes:
+    """
+    Header, then four columns of zigzag varints: x1 and y1 as deltas from
+    the previous wall, x2 - x1 and y2 - y1 (mostly 0 for axis-aligned walls).
+    Columns of small, repetitive numbers are what gzip compresses best.
+    """
+    columns = [bytearray() for _ in range(4)]
+    px = py = 0
+    for x1, y1, x2, y2 in walls:
+        for column, value in zip(columns, (x1 - px, y1 - py, x2 - x1, y2 - y1)):
+            _varint(_zigzag(value), column)
+        px, py = x1, y1
+    return HEADER.pack(MAGIC, extent, len(walls)) + b''.join(columns)
+
+
+def decode_tile(data: bytes) -> Tuple[int, List[Tuple[int, ...]]]:
+    """(extent, walls) of an encoded tile"""
+    magic, extent, count = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('Not a map tile')
+    values, v, shift = [], 0, 0
+    for byte in data[HEADER.size:]:
+        v |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            values.append((v >> 1) ^ -(v & 1))
+            v, shift = 0, 0
+    walls, px, py = [], 0, 0
+    for i in range(count):
+        x1, y1 = px + values[i], py + values[count + i]
+        walls.append((x1, y1, x1 + values[2 * count + i], y1 + values[3 * count + i]))
+        px, py = x1, y1
+    return extent, walls
+
+
+class Tile:
+    """One encoded tile, kept both raw and gzipped"""
+
+    __slots__ = ('raw', 'gzipped', 'etag', 'walls')
+
+    def __init__(self, raw: bytes, walls: int):
+        self.raw = raw
+        self.gzipped = gzip.compress(raw, compresslevel=9, mtime=0)
+        self.etag = hashlib.sha1(raw).hexdigest()[:16]
+        self.walls = walls
+
+
+class MapTiles:
+    """
+    Wall tiles of every floor of a map artifact
+
+    Level z splits the map's bounds into 2^z x 2^z tiles. Walls are clipped
+    to each tile and quantized to EXTENT steps across it. Below the finest
+    level, walls shorter than one pixel of a TILE_PIXELS-wide tile are
+    dropped, and walls that quantize to the same segment are kept once.
+    Empty tiles are not stored; the manifest lists the ones that exist.
+    """
+
+    def __init__(self, artifact: Optional[Dict], levels: int = LEVELS, extent: int = EXTENT):
+        """
+        Args:
+            artifact: Map artifact (see models/map_artifact.py), or None for no tiles
+            levels: Number of detail levels
+            extent: Quantization steps across a tile
+        """
+        self.version = artifact['version'] if artifact else None
+        self.levels = levels
+        self.extent = extent
+        self.floors: Dict[int, Dict] = {}
+        self.tiles: Dict[Tuple[int, int, int, int], Tile] = {}  # (floor, z, x, y) -> tile
+        for entry in (artifact or {}).get('floors', []):
+            self._cut(entry['floor'], entry['walls'])
+        self.manifest = {
+            'version': self.version,
+            'extent': extent,
+            'levels': levels,
+            'tilePixels': TILE_PIXELS,
+            'floors': [self.floors[f] for f in sorted(self.floors)],
+        }
+        self.manifest_etag = hashlib.sha1(repr((self.version, sorted(
+            (k, t.etag) for k, t in self.tiles.items()))).encode()).hexdigest()[:16]
+
+    def _cut(self, floor: int, walls: List[List[float]]):
+        if not walls:
+            return
+        xs = [v for w in walls for v in (w[0], w[2])]
+        ys = [v for w in walls for v in (w[1], w[3])]
+        # Square bounds, so tiles are square and one level has one resolution
+        size = max(max(xs) - min(xs), max(ys) - min(ys)) + 1
+        x0, y0 = math.floor(min(xs)), math.floor(min(ys))
+        listing = []  # Per level: [x, y, walls] of each non-empty tile
+        level_bytes = []
+        for z in range(self.levels):
+            n = 2 ** z
+            span = size / n
+            min_length = 0 if z == self.levels - 1 else span / TILE_PIXELS
+            kept = [w for w in walls if math.hypot(w[2] - w[0], w[3] - w[1]) >= min_length]
+            listing.append([])
+            total = 0
+            for ty in range(n):
+                for tx in range(n):
+                    left, top = x0 + tx * span, y0 + ty * span
+                    quads = set()
+                    for w in kept:
+                        part = clip(w, left, top, left + span, top + span)
+                        if part is None:
+                            continue
+                        q = tuple(min(self.extent, max(0, round((v - o) / span * self.extent)))
+                                  for v, o in zip(part, (left, top, left, top)))
+                        if q[:2] != q[2:]:
+                            quads.add(q)
+                    if not quads:
+                        continue
+                    tile = Tile(encode_tile(sorted(quads), self.extent), len(quads))
+                    self.tiles[(floor, z, tx, ty)] = tile
+                    listing[z].append([tx, ty, tile.walls])
+                    total += len(tile.gzipped)
+            level_bytes.append(total)
+        self.floors[floor] = {
+            'floor': floor,
+            'origin': [x0, y0],
+            'size': size,
+            'tiles': listing,
+            'bytes': level_bytes,
+        }
+
+    def get(self, version: str, floor: int, z: int, x: int, y: int) -> Optional[Tile]:
+        """A tile of the current version (None for another version or an empty tile)"""
+        if version != self.version:
+            return None
+        return self.tiles.get((floor, z, x, y))
+
+    def get_stats(self) -> Dict:
+        return {
+            'tiles': len(self.tiles),
+            'raw_bytes': sum(len(t.raw) for t in self.tiles.values()),
+            'gzip_bytes': sum(len(t.gzipped) for t in self.tiles.values())
+        }
+
+
+# Test the tiler
+if __name__ == "__main__":
+    import sys
+    import os
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from models.map_artifact import load_map_artifact, floor_walls
+
+    print("🧪 Testing Map Tiles...")
+
+    # Test 1: Clipping and the tile encoding round-trip
+    assert clip((0, 5, 20, 5), 0, 0, 10, 10) == (0, 5, 10, 5)
+    assert clip((20, 0, 30, 0), 0, 0, 10, 10) is None
+    walls = [(0, 0, 4096, 0), (10, 20, 10, 4000)]
+    assert decode_tile(encode_tile(walls)) == (EXTENT, walls)
+    print("\n✅ Test 1 - Clipping and encoding round-trip")
+
+    # Test 2: The finest level reproduces every wall within a quantization step
+    artifact = load_map_artifact()
+    tiles = MapTiles(artifact)
+    floor = tiles.floors[0]
+    finest = tiles.levels - 1
+    span = floor['size'] / 2 ** finest
+    rebuilt = []
+    for x, y, _ in floor['tiles'][finest]:
+        extent, quads = decode_tile(tiles.get(tiles.version, 0, finest, x, y).raw)
+        ox, oy = floor['origin'][0] + x * span, floor['origin'][1] + y * span
+        rebuilt += [(ox + a / extent * span, oy + b / extent * span, ox + c / extent * span, oy + d / extent * span)
+                    for a, b, c, d in quads]
+    step = span / EXTENT
+    for w in floor_walls(artifact):
+        # Every endpoint is on some rebuilt segment's endpoint (walls may be split at tile borders)
+        assert any(math.hypot(r[0] - w[0], r[1] - w[1]) <= step or math.hypot(r[2] - w[0], r[3] - w[1]) <= step
+                   for r in rebuilt), w
+    print(f"\n✅ Test 2 - {len(floor_walls(artifact))} walls rebuilt from {len(floor['tiles'][finest])} "
+          f"level-{finest} tiles (quantization step {step:.3f})")
+
+    # Test 3: Coarser levels are smaller
+    counts = [sum(t[2] for t in floor['tiles'][z]) for z in range(tiles.levels)]
+    print(f"\n✅ Test 3 - Walls per level {counts}, gzip bytes per level {floor['bytes']}")
+    print(f"   Stats: {tiles.get_stats()}")
+    assert counts[0] < counts[-1] and floor['bytes'][0] < floor['bytes'][-1]
+    assert tiles.get('stale', 0, 0, 0, 0) is None
+
+    print("\n✨ All tests passed!")
@@ -0,0 +1,224 @@
+"""
+Local message queue for running several server processes on one host
+Carries Socket.IO fan-out between workers and replicated in-memory state
+
+Queues are chosen by URL (like Flask-SocketIO's message_queue):
+    memory://                 same process only (tests, single worker)
+    local://127.0.0.1:5100    LocalMessageHub socket started by cluster.py
+"""
+
+from abc import ABC, abstractmethod
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import urlparse
+import asyncio
+import queue
+import threading
+
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+
+class MessageQueue(ABC):
+    """Publish/subscribe interface; subscribers are called on a background thread"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Callable]] = {}
+
+    @abstractmethod
+    def publish(self, channel: str, message):
+        """Send `message` to every subscriber of `channel`"""
+
+    def subscribe(self, channel: str, callback: Callable):
+        """Call `callback(message)` for every message on `channel`"""
+        self._subscribers.setdefault(channel, []).append(callback)
+
+    def close(self):
+        pass
+
+    def _dispatch(self, channel: str, message):
+        for callback in self._subscribers.get(channel, []):
+            try:
+                callback(message)
+            except Exception as e:
+                print(f"Message queue subscriber error on '{channel}': {e}")
+
+
+class InProcessQueue(MessageQueue):
+    """Single-process queue; delivery still happens off the publisher's thread"""
+
+    def __init__(self):
+        super().__init__()
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name='mq-dispatch', daemon=True).start()
+
+    def publish(self, channel: str, message):
+        self._queue.put((channel, message))
+
+    def _run(self):
+        while True:
+            channel, message = self._queue.get()
+            self._dispatch(channel, message)
+
+
+class LocalSocketQueue(MessageQueue):
+    """Client of a LocalMessageHub; every published message reaches every worker (sender included)"""
+
+    def __init__(self, address: Tuple[str, int], authkey: bytes):
+        super().__init__()
+        self._conn = Client(address, authkey=authkey)
+        self._send_lock = threading.Lock()
+        threading.Thread(target=self._run, name='mq-reader', daemon=True).start()
+
+    def publish(self, channel: str, message):
+        with self._send_lock:
+            self._conn.send((channel, message))
+
+    def close(self):
+        self._conn.close()
+
+    def _run(self):
+        while True:
+            try:
+                channel, message = self._conn.recv()
+            except (EOFError, OSError):
+                print("⚠️  Message hub connection closed")
+                return
+            self._dispatch(channel, message)
+
+
+class LocalMessageHub:
+    """
+    Fan-out broker for LocalSocketQueue clients
+
+    Each connection gets a reader thread; every message it sends is
+    forwarded to all connections. Runs inside the cluster launcher.
+    """
+
+    def __init__(self, address: Tuple[str, int], authkey: bytes):
+        self._listener = Listener(address, authkey=authkey)
+        self.address = self._listener.address
+        self._connections = {}  # connection -> send lock
+        self._lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self._accept, name='mq-hub', daemon=True).start()
+        return self
+
+    def close(self):
+        self._listener.close()
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def _accept(self):
+        while True:
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError):
+                return
+            except Exception as e:  # e.g. AuthenticationError from a stray client
+                print(f"Message hub rejected connection: {e}")
+                continue
+            with self._lock:
+                self._connections[conn] = threading.Lock()
+            threading.Thread(target=self._forward, args=(conn,), daemon=True).start()
+
+    def _forward(self, conn):
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self._lock:
+                targets = list(self._connections.items())
+            for target, send_lock in targets:
+                try:
+                    with send_lock:
+                        target.send(message)
+                except (OSError, ValueError):
+                    pass  # Reader thread of that connection cleans it up
+        with self._lock:
+            self._connections.pop(conn, None)
+        conn.close()
+
+
+class LocalAsyncPubSubManager(AsyncPubSubManager):
+    """
+    python-socketio client manager that fans emits/room changes out over a MessageQueue
+
+    Passed to AsyncServer(client_manager=...) so an emit on one worker
+    reaches clients connected to any worker.
+    """
+
+    name = 'local'
+
+    def __init__(self, mq: MessageQueue, channel: str = 'socketio', write_only: bool = False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.mq = mq
+
+    async def _publish(self, data):
+        self.mq.publish(self.channel, data)
+
+    async def _listen(self):
+        loop = asyncio.get_running_loop()
+        inbox = asyncio.Queue()
+        self.mq.subscribe(self.channel, lambda message: loop.call_soon_threadsafe(inbox.put_nowait, message))
+        while True:
+            yield await inbox.get()
+
+
+def create_message_queue(url: str, authkey: bytes = b'echoaid') -> MessageQueue:
+    """
+    Build a message queue from a URL
+
+    Args:
+        url: 'memory://' or 'local://host:port'
+        authkey: Shared secret for the local hub connection
+
+    Returns:
+        Connected MessageQueue
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == 'memory':
+        return InProcessQueue()
+    if parsed.scheme == 'local':
+        return LocalSocketQueue((parsed.hostname, parsed.port), authkey)
+    raise ValueError(f"Unsupported message queue URL: {url}")
+
+
+# Test the message queue
+if __name__ == "__main__":
+    import time
+
+    print("🧪 Testing Message Queue...")
+
+    def collect(mq, channel):
+        received = []
+        mq.subscribe(channel, received.append)
+        return received
+
+    # Test 1: In-process queue
+    mq = create_message_queue('memory://')
+    received = collect(mq, 'state')
+    mq.publish('state', {'op': 'ping'})
+    mq.publish('other', {'op': 'ignored'})
+    time.sleep(0.1)
+    print(f"\n✅ Test 1 - memory:// delivered {received}")
+    assert received == [{'op': 'ping'}]
+
+    # Test 2: Hub fans out to every client, sender included
+    hub = LocalMessageHub(('127.0.0.1', 0), b'test').start()
+    host, port = hub.address
+    workers = [create_message_queue(f'local://{host}:{port}', b'test') for _ in range(3)]
+    inboxes = [collect(worker, 'socketio') for worker in workers]
+    time.sleep(0.1)
+    workers[0].publish('socketio', {'method': 'emit', 'event': 'hello'})
+    time.sleep(0.2)
+    print(f"\n✅ Test 2 - local:// hub on port {port} delivered to {sum(map(len, inboxes))}/3 workers")
+    assert all(inbox == [{'method': 'emit', 'event': 'hello'}] for inbox in inboxes)
+
+    for worker in workers:
+        worker.close()
+    hub.close()
+    print("\n✨ All tests passed!")
@@ -0,0 +1,123 @@
+"""
+Micro-batching for remote calls
+Requests arriving within a short window are sent as one call (e.g. one Gemini
+prompt for a burst of blockage reports) and the results handed back per caller
+"""
+
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import threading
+
+
+class MicroBatcher:
+    """
+    Collects items for `window` seconds, then runs them as one batch
+
+    `run_batch(items)` returns one result per item, in order. Each caller
+    gets a Future for its own result; if the whole batch fails, every
+    future gets the exception.
+    """
+
+    def __init__(self, run_batch: Callable[[List[Any]], List[Any]],
+                 window: float = 0.05, max_batch: int = 16):
+        """
+        Args:
+            run_batch: fn(items) -> results (same length and order)
+            window: Seconds to collect items before sending the batch
+            max_batch: Batch size that is sent without waiting
+        """
+        self.run_batch = run_batch
+        self.window = window
+        self.max_batch = max_batch
+
+        self.batch: List[Tuple[Any, Future]] = []
+        self.stats = {'items': 0, 'batches': 0, 'largest_batch': 0}
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def submit(self, item: Any) -> Future:
+        """Queue an item; the future resolves to its result"""
+        future = Future()
+        with self._lock:
+            self.batch.append((item, future))
+            self.stats['items'] += 1
+            if len(self.batch) >= self.max_batch:
+                flush_now = True
+            else:
+                flush_now = False
+                if self._timer is None:
+                    self._timer = threading.Timer(self.window, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if flush_now:
+            # Never run the remote call on the submitting (handler or event loop) thread
+            threading.Thread(target=self.flush, name='micro-batch', daemon=True).start()
+        return future
+
+    def flush(self):
+        """Send everything queued so far as one batch"""
+        with self._lock:
+            batch, self.batch = self.batch, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not batch:
+            return
+
+        self.stats['batches'] += 1
+        self.stats['largest_batch'] = max(self.stats['largest_batch'], len(batch))
+        items = [item for item, _ in batch]
+        try:
+            results = self.run_batch(items)
+            if len(results) != len(items):
+                raise ValueError(f"batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'queued': len(self.batch)}
+
+
+# Test the batcher
+if __name__ == "__main__":
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    print("🧪 Testing Micro Batcher...")
+    calls = []
+
+    def shout(items):
+        calls.append(list(items))
+        return [item.upper() for item in items]
+
+    # Test 1: Concurrent callers share one call and get their own result back
+    batcher = MicroBatcher(shout, window=0.05, max_batch=16)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda word: batcher.submit(word).result(), ["fire", "smoke", "debris"]))
+    print(f"\n✅ Test 1 - 3 callers, {len(calls)} call(s): {results}")
+    assert results == ["FIRE", "SMOKE", "DEBRIS"] and len(calls) == 1
+
+    # Test 2: A full batch is sent without waiting for the window
+    batcher = MicroBatcher(shout, window=10, max_batch=2)
+    started = time.time()
+    futures = [batcher.submit("a"), batcher.submit("b")]
+    print(f"\n✅ Test 2 - Full batch answered in {(time.time() - started) * 1000:.0f}ms: "
+          f"{[f.result(timeout=1) for f in futures]}")
+
+    # Test 3: A failed batch fails every caller
+    def broken(items):
+        raise RuntimeError("quota exceeded")
+
+    future = MicroBatcher(broken, window=0.01).submit("x")
+    error: Optional[BaseException] = future.exception(timeout=1)
+    print(f"\n✅ Test 3 - Batch failure reaches the caller: {error}")
+    assert isinstance(error, RuntimeError)
+
+    print("\n✨ All tests passed!")
@@ -4,6 +4,7 @@ Ported from JavaScript brain module in App.jsx
 """
 
 import heapq
+from collections import deque
 from typing import List, Optional, Set, Dict, Tuple
 import sys
 import os
@@ -11,16 +12,19 @@ import math
 
 # Add parent directory to path to import models
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from models.map_data import NODES, EDGES, EXITS
+from models.map_data import NODES, EDGES, EXITS, METERS_PER_UNIT
 
 
 class PathfindingEngine:
     """A* pathfinding algorithm for evacuation routing"""
 
-    def __init__(self):
-        self.nodes = NODES
-        self.edges = EDGES
-        self.exits = EXITS
+    def __init__(self, nodes: Optional[Dict] = None, edges: Optional[List] = None,
+                 exits: Optional[List[str]] = None):
+        # The hand-made graph from map_data unless another one is given
+        # (e.g. the generated one in the map artifact, see models/map_artifact.py)
+        self.nodes = nodes if nodes is not None else NODES
+        self.edges = edges if edges is not None else EDGES
+        self.exits = exits if exits is not None else EXITS
         self._build_graph()
 
     def _build_graph(self):
@@ -165,6 +169,74 @@ class PathfindingEngine:
 
         return min(exit_distances.items(), key=lambda x: x[1])[0]
 
+    def exit_distance_field(self, exit_id: str, blocked_nodes: Optional[Set[str]] = None) -> Dict[str, int]:
+        """
+        Hop distance from every reachable node to one exit (reverse BFS)
+
+        One field answers "how far to this exit" for every user at once,
+        so batch routing does one search per exit instead of one per user.
+
+        Args:
+            exit_id: Exit node ID
+            blocked_nodes: Set of blocked node IDs to avoid
+
+        Returns:
+            Dictionary of node ID -> number of hops to the exit
+        """
+        if blocked_nodes is None:
+            blocked_nodes = set()
+
+        if exit_id not in self.graph or exit_id in blocked_nodes:
+            return {}
+
+        field = {exit_id: 0}
+        queue = deque([exit_id])
+        while queue:
+            current = queue.popleft()
+            for neighbor in self.graph.get(current, []):
+                if neighbor not in field and neighbor not in blocked_nodes:
+                    field[neighbor] = field[current] + 1
+                    queue.append(neighbor)
+        return field
+
+    def route_from_field(self, start: str, exit_id: str, field: Dict[str, int]) -> List[str]:
+        """
+        Walk downhill on an exit distance field to produce a route
+
+        A user standing on a blocked node (not in the field) steps off
+        through the best unblocked neighbor.
+
+        Args:
+            start: Starting node ID
+            exit_id: Exit the field was built for
+            field: Output of exit_distance_field
+
+        Returns:
+            List of node IDs from start to exit, or empty list if unreachable
+        """
+        if start not in field:
+            entries = [n for n in self.graph.get(start, []) if n in field]
+            if not entries:
+                return []
+            first = min(entries, key=lambda n: (field[n], self._heuristic(n, exit_id)))
+            return [start] + self.route_from_field(first, exit_id, field)
+
+        route = [start]
+        current = start
+        while current != exit_id:
+            # Ties broken toward the exit so routes are deterministic
+            current = min((n for n in self.graph[current] if field.get(n) == field[current] - 1),
+                          key=lambda n: self._heuristic(n, exit_id))
+            route.append(current)
+        return route
+
+    def route_length_from_field(self, start: str, field: Dict[str, int]) -> Optional[int]:
+        """Route length in nodes (same unit as len(find_route(...))) or None if unreachable"""
+        if start in field:
+            return field[start] + 1
+        hops = [field[n] for n in self.graph.get(start, []) if n in field]
+        return min(hops) + 2 if hops else None
+
     def validate_node(self, node_id: str) -> bool:
         """Check if a node ID exists in the graph"""
         return node_id in self.nodes
@@ -190,9 +262,8 @@ class PathfindingEngine:
         x1, y1 = pos_a.get('x', 0), pos_a.get('y', 0)
         x2, y2 = pos_b.get('x', 0), pos_b.get('y', 0)
 
-        # Distance is already in a scaled coordinate system
-        # Assuming 1 unit ≈ 1 meter (adjust if needed)
-        return math.sqrt((x2 - x1)**2 + (y2 - y1)**2)
+        # SVG units, scaled by the map's METERS_PER_UNIT
+        return math.sqrt((x2 - x1)**2 + (y2 - y1)**2) * METERS_PER_UNIT
 
     def generate_turn_by_turn_directions(self, route: List[str]) -> List[Dict]:
         """
@@ -0,0 +1,179 @@
+"""
+Rate limiting and coalescing for high-frequency client events
+Keeps one chatty (or buggy) phone from flooding Backboard writes and broadcasts
+"""
+
+from typing import Callable, Dict, Optional, Tuple
+import threading
+import time
+
+# Refills are float products; one exactly on time may come out a hair under a token
+EPS = 1e-9
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, at most `burst` saved up"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """Take one token if available"""
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1 - EPS:
+            self.tokens = max(0.0, self.tokens - 1)
+            return True
+        return False
+
+
+class PositionThrottle:
+    """
+    Per-client token buckets plus latest-wins coalescing for position updates
+
+    Accepted updates only overwrite the client's pending slot; a flush thread
+    applies whatever is pending once per interval. Under load (queue depth
+    above `high_water`) the interval doubles up to `max_interval`, so clients
+    are sampled less often instead of handler threads piling up.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, interval: float = 0.2,
+                 max_interval: float = 2.0, high_water: int = 64):
+        """
+        Args:
+            rate: Sustained position updates per second allowed per client
+            burst: Updates a client may send back-to-back
+            interval: Normal flush period in seconds
+            max_interval: Longest flush period while shedding load
+            high_water: Queue depth at which shedding starts
+        """
+        self.rate = rate
+        self.burst = burst
+        self.interval = interval
+        self.max_interval = max_interval
+        self.high_water = high_water
+        self.current_interval = interval
+
+        self.apply: Optional[Callable] = None  # fn(sid, node, progress, point)
+        self.queue_depth: Optional[Callable[[], int]] = None  # Set by the server in use
+
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.pending: Dict[str, Tuple[str, int, Optional[tuple]]] = {}
+        self.stats = {'accepted': 0, 'rate_limited': 0, 'coalesced': 0, 'applied': 0}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def bind(self, apply: Callable):
+        """Set the function that applies a position (the last server registered owns delivery)"""
+        self.apply = apply
+
+    def submit(self, sid: str, current_node: str, progress: int, point: Optional[tuple] = None) -> bool:
+        """
+        Queue a client's position
+
+        Args:
+            point: Reported (x, y), for nodes only the client knows
+
+        Returns:
+            False if the client is over its rate limit and the update was dropped
+        """
+        with self._lock:
+            bucket = self.buckets.get(sid)
+            if bucket is None:
+                bucket = self.buckets[sid] = TokenBucket(self.rate, self.burst)
+            if not bucket.allow():
+                self.stats['rate_limited'] += 1
+                return False
+
+            if sid in self.pending:
+                self.stats['coalesced'] += 1
+            self.pending[sid] = (current_node, progress, point)
+            self.stats['accepted'] += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='position-flush', daemon=True)
+                self._thread.start()
+        return True
+
+    def forget(self, sid: str):
+        """Drop a disconnected client's bucket and unapplied position"""
+        with self._lock:
+            self.buckets.pop(sid, None)
+            self.pending.pop(sid, None)
+
+    def flush(self):
+        """Apply the latest pending position of every client"""
+        with self._lock:
+            batch, self.pending = self.pending, {}
+
+        for sid, (current_node, progress, point) in batch.items():
+            try:
+                self.apply(sid, current_node, progress, point)
+            except Exception as e:
+                print(f"Position update error for {sid[:8]}: {e}")
+        self.stats['applied'] += len(batch)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'pending': len(self.pending),
+            'flush_interval': self.current_interval
+        }
+
+    def _run(self):
+        while True:
+            time.sleep(self.current_interval)
+            self.flush()
+            self._adapt()
+
+    def _adapt(self):
+        depth = self.queue_depth() if self.queue_depth else 0
+        if depth > self.high_water:
+            if self.current_interval < self.max_interval:
+                self.current_interval = min(self.current_interval * 2, self.max_interval)
+                print(f"⚠️  Handler queue at {depth}: position flush every {self.current_interval:.1f}s")
+        elif self.current_interval > self.interval:
+            self.current_interval = max(self.current_interval / 2, self.interval)
+
+
+# Test the throttle
+if __name__ == "__main__":
+    print("🧪 Testing Position Throttle...")
+
+    # Test 1: Token bucket allows a burst, then the sustained rate
+    bucket = TokenBucket(rate=5, burst=3)
+    burst = [bucket.allow(now=bucket.updated) for _ in range(5)]
+    later = bucket.allow(now=bucket.updated + 0.2)
+    print(f"\n✅ Test 1 - Burst {burst}, after 200ms: {later}")
+    assert burst == [True, True, True, False, False] and later
+
+    # Test 2: Only the latest position per client is applied per interval
+    applied = []
+    throttle = PositionThrottle(rate=100, burst=100, interval=0.05)
+    throttle.bind(lambda sid, node, progress, point: applied.append((sid, node, progress)))
+    for progress, node in enumerate(["p129", "p131", "p134"]):
+        throttle.submit("user123", node, progress)
+    throttle.submit("user456", "p200", 4)
+    time.sleep(0.2)
+    print(f"\n✅ Test 2 - Applied {applied}, stats {throttle.get_stats()}")
+    assert sorted(applied) == [("user123", "p134", 2), ("user456", "p200", 4)]
+
+    # Test 3: A flooding client is cut off at its burst
+    flooder = PositionThrottle(rate=5, burst=10)
+    flooder.bind(lambda *args: None)
+    accepted = sum(flooder.submit("flooder", "p129", i) for i in range(100))
+    print(f"\n✅ Test 3 - Flood of 100 updates, {accepted} accepted")
+    assert accepted == 10
+
+    # Test 4: Queue pressure stretches the flush interval
+    throttle.queue_depth = lambda: 1000
+    throttle._adapt()
+    throttle._adapt()
+    print(f"\n✅ Test 4 - Under load, flush every {throttle.current_interval}s")
+    assert throttle.current_interval == 0.2
+
+    print("\n✨ All tests passed!")
@@ -0,0 +1,88 @@
+"""
+State replication between server processes
+Each worker keeps its own in-memory users/blockages/protocol tables; changes
+are broadcast over the message queue and applied by every other worker
+"""
+
+import os
+
+STATE_CHANNEL = 'state'
+
+
+class StateReplicator:
+    """Publishes local state changes and applies changes from other workers"""
+
+    def __init__(self, mq, worker_id: str = None, **targets):
+        """
+        Args:
+            mq: MessageQueue shared by all workers
+            worker_id: Unique ID for this process (defaults to the PID)
+            **targets: Name -> object with apply_replicated(op, args) and a
+                       `replicator` attribute (e.g. backboard=..., wire=...)
+        """
+        self.mq = mq
+        self.worker_id = worker_id or str(os.getpid())
+        self.targets = targets
+
+        for target in targets.values():
+            target.replicator = self
+        mq.subscribe(STATE_CHANNEL, self._apply)
+
+    def publish(self, target: str, op: str, args):
+        self.mq.publish(STATE_CHANNEL, {
+            'origin': self.worker_id,
+            'target': target,
+            'op': op,
+            'args': list(args)
+        })
+
+    def _apply(self, message: dict):
+        if message.get('origin') == self.worker_id:
+            return
+        target = self.targets.get(message.get('target'))
+        if target is not None:
+            target.apply_replicated(message['op'], message['args'])
+
+
+# Test the replicator
+if __name__ == "__main__":
+    import sys
+    import time
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from services.backboard_service import BackboardService
+    from services.message_queue import create_message_queue
+    from services.wire_protocol import WireProtocol, worker_slots
+
+    print("🧪 Testing State Replication...")
+    mq = create_message_queue('memory://')
+    workers = []
+    for worker_id in ('w0', 'w1'):
+        backboard = BackboardService()
+        slot_base, slot_count = worker_slots(len(workers), 2)
+        wire = WireProtocol(slot_base=slot_base, slot_count=slot_count)
+        StateReplicator(mq, worker_id, backboard=backboard, wire=wire)
+        workers.append((backboard, wire))
+    (bb0, wire0), (bb1, wire1) = workers
+
+    # Test 1: Users, routes and blockages reach the other worker
+    bb0.store_user("user123", {"name": "Test User", "currentNode": "p129", "route": [], "status": "ACTIVE"})
+    version = bb0.update_user_route("user123", ["p129", "p131", "p201"])
+    bb0.update_user_position("user123", "p131", 1)
+    bb0.add_blockage("p134", {"reportedBy": "user123", "severity": "HIGH"})
+    time.sleep(0.1)
+    user = bb1.get_user("user123")
+    print(f"\n✅ Test 1 - Replicated user at {user['currentNode']}, route v{user['routeVersion']}, blocked {bb1.get_blocked_nodes()}")
+    assert user['routeVersion'] == version and bb1.get_blocked_nodes() == {"p134"}
+
+    # Test 2: Protocol negotiation is mirrored; slots don't collide
+    slot = wire0.negotiate("user123", "binary")['slot']
+    other = wire1.negotiate("user456", "json")['slot']
+    time.sleep(0.1)
+    print(f"\n✅ Test 2 - Slots {slot} and {other}, worker 1 sees user123 as binary: {wire1.is_binary('user123')}")
+    assert wire1.is_binary("user123") and slot != other
+
+    bb0.remove_user("user123")
+    time.sleep(0.1)
+    assert bb1.get_user("user123") is None
+    print("\n✨ All tests passed!")
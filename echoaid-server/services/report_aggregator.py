@@ -0,0 +1,237 @@
+"""
+Spatio-temporal clustering of blockage reports
+Five people reporting the same smoke within seconds is one blockage: only the
+first report blocks and reroutes, the rest are merged into it
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import itertools
+import threading
+import time
+
+SEVERITY_RANK = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2, 'CRITICAL': 3}
+
+
+class ReportAggregator:
+    """
+    Groups reports by graph neighborhood and time
+
+    A report joins an open cluster at its own node. A report whose location
+    is only provisional (the reporter's position), or one near a cluster that
+    is still provisional, may also join a cluster within `hops` edges: one of
+    the two is not really placed yet. A clearly placed report at a different
+    node is a different blockage and opens its own cluster.
+
+    Clusters close `window` seconds after their latest report, and at the
+    latest `max_age` seconds after their first, so a steady stream of reports
+    cannot keep one open forever.
+    """
+
+    def __init__(self, graph: Dict[str, List[str]], hops: int = 2, window: float = 30.0,
+                 max_age: float = 120.0):
+        """
+        Args:
+            graph: Adjacency list built from EDGES (pathfinder.graph)
+            hops: Max hop distance between a provisional report and its cluster
+            window: Seconds after a cluster's latest report that it stays open
+            max_age: Seconds after a cluster's first report that it closes regardless
+        """
+        self.graph = graph
+        self.hops = hops
+        self.window = window
+        self.max_age = max_age
+
+        self.clusters: Dict[int, dict] = {}
+        self.stats = {'reports': 0, 'clusters': 0, 'merged': 0}
+        self._neighborhoods: Dict[str, Dict[str, int]] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def assign(self, report: dict, node: str, severity: str = 'HIGH',
+               provisional: bool = False) -> Tuple[dict, bool]:
+        """
+        Put a report into the nearest open cluster, or open a new one
+
+        Args:
+            report: Report dict (becomes the cluster lead if new)
+            node: Node ID the report resolves to
+            severity: Parsed severity of the report
+            provisional: True if the node is only the reporter's position
+
+        Returns:
+            (cluster, True if the report opened it and must be applied)
+        """
+        now = time.time()
+        with self._lock:
+            self.stats['reports'] += 1
+            self._prune(now)
+
+            nearby = self.neighborhood(node)
+            candidates = [c for c in self.clusters.values()
+                          if c['node'] == node or (c['node'] in nearby and (provisional or c['provisional']))]
+            if candidates:
+                cluster = min(candidates, key=lambda c: (nearby[c['node']], -c['last']))
+                cluster['reports'].append(report['id'])
+                cluster['reporters'].add(report['reportedBy'])
+                cluster['last'] = now
+                self.stats['merged'] += 1
+                return cluster, False
+
+            cluster = {
+                'id': next(self._ids),
+                'node': node,
+                'lead': report,
+                'reports': [report['id']],
+                'reporters': {report['reportedBy']},
+                'severity': severity,
+                'provisional': provisional,
+                'first': now,
+                'last': now
+            }
+            self.clusters[cluster['id']] = cluster
+            self.stats['clusters'] += 1
+            return cluster, True
+
+    def resolve(self, cluster: dict, node: str, severity: str) -> Tuple[bool, Optional[dict]]:
+        """
+        Record where a provisional cluster actually is
+
+        Returns:
+            (False if it was already resolved, the open cluster it was folded
+            into if that node is already reported)
+        """
+        with self._lock:
+            if not cluster['provisional']:
+                return False, None
+            cluster['provisional'] = False
+            target = next((c for c in self.clusters.values()
+                           if c is not cluster and not c['provisional'] and c['node'] == node), None)
+            if target is None:
+                cluster['node'] = node
+                cluster['severity'] = severity
+                return True, None
+
+            target['reports'].extend(cluster['reports'])
+            target['reporters'] |= cluster['reporters']
+            target['last'] = max(target['last'], cluster['last'])
+            self.clusters.pop(cluster['id'], None)
+            self.stats['merged'] += 1
+            return True, target
+
+    def escalate(self, cluster: dict, severity: str) -> bool:
+        """Raise a cluster's severity; True if it went up"""
+        with self._lock:
+            if SEVERITY_RANK.get(severity, 0) <= SEVERITY_RANK.get(cluster['severity'], 0):
+                return False
+            cluster['severity'] = severity
+            return True
+
+    def discard(self, node: str):
+        """Close clusters at a node (its blockage was cleared)"""
+        with self._lock:
+            for cluster_id in [c['id'] for c in self.clusters.values() if c['node'] == node]:
+                del self.clusters[cluster_id]
+
+    def neighborhood(self, node: str) -> Dict[str, int]:
+        """Nodes within `hops` edges of `node` -> hop distance (cached)"""
+        nearby = self._neighborhoods.get(node)
+        if nearby is not None:
+            return nearby
+
+        nearby = {node: 0}
+        queue = deque([node])
+        while queue:
+            current = queue.popleft()
+            if nearby[current] == self.hops:
+                continue
+            for neighbor in self.graph.get(current, []):
+                if neighbor not in nearby:
+                    nearby[neighbor] = nearby[current] + 1
+                    queue.append(neighbor)
+
+        self._neighborhoods[node] = nearby
+        return nearby
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'open_clusters': len(self.clusters)}
+
+    def _prune(self, now: float):
+        for cluster_id in [c['id'] for c in self.clusters.values()
+                           if now - c['last'] > self.window or now - c['first'] > self.max_age]:
+            del self.clusters[cluster_id]
+
+
+# Test the aggregator
+if __name__ == "__main__":
+    import os
+    import sys
+
+    # Add parent directory to path for imports
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from services.pathfinding import PathfindingEngine
+
+    print("🧪 Testing Report Aggregator...")
+    graph = PathfindingEngine().graph
+    aggregator = ReportAggregator(graph, hops=2, window=0.2)
+
+    def report(report_id, user):
+        return {'id': report_id, 'reportedBy': user}
+
+    # Test 1: A burst at one spot becomes one cluster, a provisional report nearby joins it
+    node = next(n for n in graph if len(graph[n]) >= 2)
+    neighbor = graph[node][0]
+    results = [aggregator.assign(report(1, "a"), node),
+               aggregator.assign(report(2, "b"), neighbor, provisional=True),
+               aggregator.assign(report(3, "c"), node)]
+    print(f"\n✅ Test 1 - 3 reports at or near {node}: new={[new for _, new in results]}")
+    assert [new for _, new in results] == [True, False, False]
+    assert results[0][0]['reporters'] == {"a", "b", "c"}
+
+    # Test 2: A report far away opens its own cluster
+    far = next(n for n in graph if n not in aggregator.neighborhood(node))
+    _, new = aggregator.assign(report(4, "d"), far)
+    print(f"\n✅ Test 2 - Report at {far} opened a new cluster: {new}")
+    assert new
+
+    # Test 3: Two nearby but distinct blockages are kept apart
+    separate = ReportAggregator(graph, hops=2, window=10)
+    first, _ = separate.assign(report(8, "h"), node)
+    second, new = separate.assign(report(9, "i"), neighbor)
+    print(f"\n✅ Test 3 - Reports at {node} and {neighbor}: clusters {first['id']} and {second['id']}")
+    assert new and second is not first and second['node'] == neighbor
+
+    # Test 4: Severity only goes up
+    cluster = results[0][0]
+    assert aggregator.escalate(cluster, 'CRITICAL') and not aggregator.escalate(cluster, 'LOW')
+    print(f"\n✅ Test 4 - Escalated to {cluster['severity']}")
+
+    # Test 5: A provisional report is folded in only if placed on an already reported node
+    placing = ReportAggregator(graph, hops=2, window=10)
+    reported, _ = placing.assign(report(6, "f"), node)
+    provisional, _ = placing.assign(report(7, "g"), far, provisional=True)
+    _, folded = placing.resolve(provisional, node, 'HIGH')
+    assert folded is reported and reported['reporters'] == {"f", "g"}
+    elsewhere, _ = placing.assign(report(10, "j"), far, provisional=True)
+    _, folded = placing.resolve(elsewhere, neighbor, 'HIGH')
+    assert folded is None and elsewhere['node'] == neighbor
+    print(f"\n✅ Test 5 - Provisional reports placed at {node} folded, at {neighbor} kept")
+
+    # Test 6: Clusters close after the window
+    time.sleep(0.3)
+    _, new = aggregator.assign(report(5, "e"), node)
+    print(f"\n✅ Test 6 - After the window a new cluster opens: {new}, stats {aggregator.get_stats()}")
+    assert new
+
+    # Test 7: ... and after max_age, however often they are reported
+    aging = ReportAggregator(graph, hops=2, window=10, max_age=0.2)
+    opened, _ = aging.assign(report(11, "k"), node)
+    time.sleep(0.1)
+    _, new = aging.assign(report(12, "l"), node)
+    assert not new
+    time.sleep(0.15)
+    reopened, new = aging.assign(report(13, "m"), node)
+    print(f"\n✅ Test 7 - Cluster reported every 0.1s closed after max_age: {new}")
+    assert new and reopened is not opened
+
+    print("\n✨ All tests passed!")
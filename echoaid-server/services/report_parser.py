@@ -0,0 +1,284 @@
+"""
+Local blockage report parser
+Resolves clear reports ("fire in room 1040", "hallway 4 is blocked") without
+an LLM round trip; only ambiguous reports need Gemini
+"""
+
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+import os
+import re
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.map_data import RAW, EDGES
+
+SEVERITY_RANK = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2, 'CRITICAL': 3}
+
+# Keyword -> (type, severity); same rules as the Gemini prompt
+KEYWORDS = {
+    'fire': ('FIRE', 'CRITICAL'), 'smoke': ('FIRE', 'CRITICAL'), 'smoky': ('FIRE', 'CRITICAL'),
+    'flame': ('FIRE', 'CRITICAL'), 'flames': ('FIRE', 'CRITICAL'), 'burning': ('FIRE', 'CRITICAL'),
+    'explosion': ('STRUCTURAL', 'CRITICAL'), 'collapse': ('STRUCTURAL', 'CRITICAL'),
+    'collapsed': ('STRUCTURAL', 'CRITICAL'), 'structural': ('STRUCTURAL', 'CRITICAL'),
+    'ceiling fell': ('STRUCTURAL', 'CRITICAL'), 'caved in': ('STRUCTURAL', 'CRITICAL'),
+    'blocked': ('DEBRIS', 'HIGH'), 'debris': ('DEBRIS', 'HIGH'), 'obstacle': ('DEBRIS', 'HIGH'),
+    'fallen': ('DEBRIS', 'HIGH'), 'rubble': ('DEBRIS', 'HIGH'), 'can t get through': ('DEBRIS', 'HIGH'),
+    'crowd': ('CROWD', 'MEDIUM'), 'crowded': ('CROWD', 'MEDIUM'), 'congested': ('CROWD', 'MEDIUM'),
+    'packed': ('CROWD', 'MEDIUM'), 'slow': ('CROWD', 'MEDIUM'), 'jammed': ('CROWD', 'MEDIUM'),
+}
+
+# Words that flip or hedge the meaning: leave those reports to Gemini
+HEDGES = {'no', 'not', 'isn', 'aren', 'don', 'doesn', 'never', 'cleared', 'clear', 'maybe', 'might', 'think'}
+
+# Spoken names for word labels in RAW
+ALIASES = {'elevator': 'elv', 'elevators': 'elv', 'lift': 'elv'}
+
+_MENTION = re.compile(
+    r'\b(?:(?P<kind>room|rm|hallway|hall|corridor|exit)\s*#?\s*)?'
+    r'(?P<label>h\d{1,2}|\d{1,4}[a-z]?)\b'
+)
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton: finds every keyword in one pass over the text"""
+
+    def __init__(self, keywords: Dict[str, tuple]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+        self.values = keywords
+
+        for keyword in keywords:
+            state = 0
+            for char in keyword:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(keyword)
+
+        # Breadth-first failure links
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, text: str) -> List[str]:
+        """Keywords in `text` that start and end on word boundaries"""
+        found = []
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for keyword in self.output[state]:
+                start = end - len(keyword) + 1
+                if (start == 0 or not text[start - 1].isalnum()) and \
+                        (end + 1 == len(text) or not text[end + 1].isalnum()):
+                    found.append(keyword)
+        return found
+
+
+class LabelIndex:
+    """
+    Room/hallway/exit labels from RAW -> routable node IDs (e.g. "h4" -> "p129")
+
+    A blockage only reroutes anyone if its node is on the graph, so a label
+    whose node has no edges (most rooms in the hand-made graph) resolves to
+    the nearest node that has, preferring hallways ("1040" -> "p100").
+    """
+
+    def __init__(self, raw: List[dict] = RAW, edges: List[List[str]] = EDGES):
+        self.nodes: Dict[str, Set[str]] = {}
+        self.routable: Dict[str, str] = {}  # Any RAW node ID -> the node its labels resolve to
+        self.word_labels: Set[str] = {r['label'].lower() for r in raw if r['label'].isalpha()}
+        connected = {node_id for edge in edges for node_id in edge[:2]}
+        routable = [r for r in raw if f"p{r['id']}" in connected]
+        hallways = [r for r in routable if r.get('hallway')] or routable
+        for r in raw:
+            node_id = f"p{r['id']}"
+            if node_id not in connected and hallways:
+                nearest = min(hallways, key=lambda h: (h['x'] - r['x']) ** 2 + (h['y'] - r['y']) ** 2)
+                self.routable[node_id] = f"p{nearest['id']}"
+            node_id = self.routable.setdefault(node_id, node_id)
+            label = r['label'].lower()
+            self._add(label, node_id)
+            if r['type'] == 'EXIT':
+                self._add(f"exit {label.split()[-1]}", node_id)
+
+    def lookup(self, kind: Optional[str], label: str) -> Set[str]:
+        """Node IDs for a mention like ("room", "1040"), ("hallway", "4") or (None, "h4")"""
+        label = label.lower()
+        if kind == 'exit':
+            return self.nodes.get(f"exit {label}", set())
+        if kind in ('hallway', 'hall', 'corridor') and not label.startswith('h'):
+            label = f"h{label}"
+        return self.nodes.get(label, set())
+
+    def _add(self, label: str, node_id: str):
+        self.nodes.setdefault(label, set()).add(node_id)
+
+
+class LocalReportParser:
+    """Parses blockage reports with the label index and keyword automaton"""
+
+    def __init__(self, raw: List[dict] = RAW, edges: List[List[str]] = EDGES):
+        """
+        Args:
+            raw: RAW-shaped map entries
+            edges: Navigation edges (labels resolve to nodes on them)
+        """
+        self.labels = LabelIndex(raw, edges)
+        self.keywords = KeywordAutomaton(KEYWORDS)
+
+    def parse(self, message: str, reporter_position: str) -> Optional[dict]:
+        """
+        Parse a report if it is unambiguous
+
+        Args:
+            message: User's blockage report
+            reporter_position: Node ID where the user is located
+
+        Returns:
+            Same shape as the Gemini result, or None if Gemini should decide
+        """
+        text = self.normalize(message)
+        words = set(text.split())
+        if words & HEDGES:
+            return None
+
+        hazard = self.classify(text)
+        if hazard is None:
+            return None
+
+        locations, unresolved = self.locations(text)
+        if unresolved or len(locations) > 1:
+            return None
+        location = locations.pop() if locations else reporter_position
+
+        blockage_type, severity = hazard
+        return {
+            "location": location,
+            "severity": severity,
+            "type": blockage_type,
+            "needsImmediate": severity in ['CRITICAL', 'HIGH'],
+            "source": "local"
+        }
+
+    def classify(self, text: str) -> Optional[Tuple[str, str]]:
+        """Most severe (type, severity) mentioned, or None if no keyword matched"""
+        matches = [self.keywords.values[keyword] for keyword in self.keywords.find(text)]
+        if not matches:
+            return None
+        return max(matches, key=lambda match: SEVERITY_RANK[match[1]])
+
+    def locations(self, text: str) -> Tuple[Set[str], bool]:
+        """
+        Node IDs mentioned in the text
+
+        Returns:
+            (resolved node IDs, True if some mention was unknown or matched several nodes)
+        """
+        found, unresolved = set(), False
+        for mention in _MENTION.finditer(text):
+            kind, label = mention.group('kind'), mention.group('label')
+            if not kind and label[0].isdigit() and len(label) < 3:
+                continue  # "10 people" is a count, not room 10
+            nodes = self.labels.lookup(kind, label)
+            if len(nodes) == 1:
+                found |= nodes
+            else:
+                unresolved = True  # "room 9999" or a duplicated label
+
+        for word in text.split():
+            label = ALIASES.get(word, word)
+            if label in self.labels.word_labels:
+                nodes = self.labels.lookup(None, label)
+                found |= nodes
+                unresolved |= len(nodes) > 1
+        return found, unresolved
+
+    def resolve_location(self, message: str, reporter_position: str) -> str:
+        """Best-effort location for the keyword fallback (reporter's node if unclear)"""
+        locations, _ = self.locations(self.normalize(message))
+        return sorted(locations)[0] if len(locations) == 1 else reporter_position
+
+    def resolve_node(self, location) -> Optional[str]:
+        """
+        Routable node ID for a location named by Gemini ("p129", "1040", "h4", "exit 2")
+
+        Returns:
+            None if the location matches no node, or more than one
+        """
+        if not isinstance(location, str):
+            return None
+        if location in self.labels.routable:
+            return self.labels.routable[location]
+
+        text = self.normalize(location)
+        locations, unresolved = self.locations(text)
+        if not locations and not unresolved:
+            locations = self.labels.lookup(None, text)  # Bare short labels ("12")
+        return next(iter(locations)) if len(locations) == 1 and not unresolved else None
+
+    def normalize(self, message: str) -> str:
+        return ' '.join(re.sub(r'[^a-z0-9#]+', ' ', message.lower()).split())
+
+
+# Test the local parser
+if __name__ == "__main__":
+    import time
+
+    print("🧪 Testing Local Report Parser...")
+    parser = LocalReportParser()
+
+    # Test 1: Labels resolve to graph IDs, not p{number}; rooms off the graph to their hallway
+    result1 = parser.parse("Room 1040 has debris blocking the door", "p129")
+    print(f"\n✅ Test 1 - Room label: {result1}")
+    assert result1['location'] == "p100" and result1['type'] == "DEBRIS"
+    assert parser.resolve_location("something odd in room 1040", "p129") == "p100"
+    connected = {node_id for edge in EDGES for node_id in edge}
+    assert all(node_id in connected for nodes in parser.labels.nodes.values() for node_id in nodes)
+
+    # Test 2: Hallway and exit wording
+    assert parser.parse("Fire in hallway 4!", "p135")['location'] == "p129"
+    assert parser.parse("smoke at exit 2", "p129")['location'] == "p201"
+    assert parser.parse("h9 is packed", "p129")['type'] == "CROWD"
+    assert parser.parse("fire by the ELV", "p129")['location'] == "p131"  # Both elevators open onto h6
+    print(f"\n✅ Test 2 - 'hallway 4' → p129, 'exit 2' → p201, 'h9' → p134")
+
+    # Test 3: No location means the reporter's position
+    result3 = parser.parse("There's a fire blocking the hallway!", "p131")
+    print(f"\n✅ Test 3 - No location: {result3['location']} ({result3['type']}, {result3['severity']})")
+    assert result3['location'] == "p131" and result3['severity'] == "CRITICAL"
+
+    # Test 4: Ambiguous reports go to Gemini
+    for message in ["the fire is not in 1040", "something weird near 1040",
+                    "fire between 1040 and 1001", "room 9999 is on fire"]:
+        assert parser.parse(message, "p129") is None, message
+    print(f"\n✅ Test 4 - Negated/unknown/multi-location reports left for Gemini")
+
+    # Test 5: Locations named by Gemini map onto the graph like report text does
+    named = {location: parser.resolve_node(location)
+             for location in ["p129", "p48", "1040", "h4", "Room 1040", "exit 2", "p9999", None]}
+    print(f"\n✅ Test 5 - Gemini locations: {named}")
+    assert named == {"p129": "p129", "p48": "p100", "1040": "p100", "h4": "p129", "Room 1040": "p100",
+                     "exit 2": "p201", "p9999": None, None: None}
+
+    # Test 6: Speed
+    started = time.perf_counter()
+    for _ in range(1000):
+        parser.parse("Room 1040 has debris blocking the door", "p129")
+    print(f"\n✅ Test 6 - {(time.perf_counter() - started) * 1000:.1f}µs per report")
+
+    print("\n✨ All tests passed!")
@@ -0,0 +1,114 @@
+"""
+Small caching helpers for expensive remote calls (Gemini, ElevenLabs)
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, Optional, Tuple
+import threading
+import time
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value, or None if missing/expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SingleFlight:
+    """
+    Merges concurrent calls for the same key into one
+
+    The first caller (leader) does the work and resolves the shared future;
+    everyone else waits on it. Works for threads (future.result()) and
+    asyncio (asyncio.wrap_future(future)) alike.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: Hashable) -> Tuple[Future, bool]:
+        """
+        Returns:
+            (shared future, True if the caller is the leader and must call finish)
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = self._inflight[key] = Future()
+            return future, True
+
+    def finish(self, key: Hashable, result: Any = None, error: Optional[BaseException] = None):
+        """Publish the leader's outcome to every waiter"""
+        with self._lock:
+            future = self._inflight.pop(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+# Test the helpers
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
+    print("🧪 Testing Result Cache...")
+
+    # Test 1: LRU eviction and TTL expiry
+    cache = TTLCache(max_entries=2, ttl=0.1)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)  # Evicts "b" (least recently used)
+    print(f"\n✅ Test 1 - After eviction: a={cache.get('a')}, b={cache.get('b')}, c={cache.get('c')}")
+    assert cache.get("b") is None and cache.get("a") == 1
+    time.sleep(0.15)
+    assert cache.get("a") is None
+
+    # Test 2: Ten concurrent callers, one execution
+    flight = SingleFlight()
+    calls = []
+
+    def slow_call(key):
+        future, leader = flight.claim(key)
+        if leader:
+            time.sleep(0.1)
+            calls.append(key)
+            flight.finish(key, f"result-{key}")
+        return future.result()
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(slow_call, ["fire"] * 10))
+    print(f"\n✅ Test 2 - 10 callers, {len(calls)} execution(s), all got {results[0]}")
+    assert calls == ["fire"] and set(results) == {"result-fire"}
+
+    print("\n✨ All tests passed!")
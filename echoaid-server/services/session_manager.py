@@ -0,0 +1,207 @@
+"""
+Resumable client sessions
+A phone that drops its connection keeps its user, route and slot for a grace
+period; reconnecting with its resume token picks everything back up
+"""
+
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+import secrets
+import threading
+import time
+
+
+class SessionManager:
+    """
+    Maps socket IDs to stable user IDs and holds disconnected sessions
+
+    A user's ID is the sid of the connection that joined. Later
+    connections that resume the session are mapped back to that ID, and
+    events sent to a suspended user are kept until it comes back.
+    """
+
+    def __init__(self, grace_seconds: float = 30.0, max_pending: int = 100):
+        """
+        Args:
+            grace_seconds: How long a dropped user is kept before removal
+            max_pending: Events buffered per suspended user (oldest dropped first)
+        """
+        self.grace_seconds = grace_seconds
+        self.max_pending = max_pending
+        self.on_expire: Optional[Callable[[str], None]] = None  # fn(user_id)
+
+        self.tokens: Dict[str, str] = {}  # token -> user ID
+        self.user_tokens: Dict[str, str] = {}  # user ID -> token
+        self.connections: Dict[str, str] = {}  # resumed sid -> user ID
+        self.current_sids: Dict[str, str] = {}  # user ID -> resumed sid
+        self.suspended: Dict[str, dict] = {}  # user ID -> {'since', 'pending', 'timer'}
+        self._lock = threading.Lock()
+
+    def issue(self, user_id: str) -> str:
+        """Create (or replace) the resume token for a user"""
+        with self._lock:
+            return self._issue(user_id)
+
+    def user_for(self, sid: str) -> str:
+        """Stable user ID behind a socket ID"""
+        return self.connections.get(sid, sid)
+
+    def sid_for(self, user_id: str) -> Optional[str]:
+        """Socket ID currently serving a user (None while suspended)"""
+        if user_id in self.suspended:
+            return None
+        return self.current_sids.get(user_id, user_id)
+
+    def is_resumable(self, user_id: str) -> bool:
+        return user_id in self.user_tokens
+
+    def suspend(self, sid: str) -> bool:
+        """
+        Start the grace period for a dropped connection
+
+        Returns:
+            False if the connection has no resumable session (remove it now)
+        """
+        with self._lock:
+            user_id = self.connections.pop(sid, sid)
+            if user_id not in self.user_tokens:
+                return False
+            if self.current_sids.get(user_id, user_id) != sid:
+                return True  # A newer connection already took over this session
+            self.current_sids.pop(user_id, None)
+
+            timer = threading.Timer(self.grace_seconds, self._expire, args=(user_id,))
+            timer.daemon = True
+            self.suspended[user_id] = {
+                'since': time.time(),
+                'pending': deque(maxlen=self.max_pending),
+                'timer': timer
+            }
+            timer.start()
+            return True
+
+    def resume(self, token: str, sid: str) -> Optional[Tuple[str, str, List[tuple]]]:
+        """
+        Attach a new connection to a suspended (or still live) session
+
+        Args:
+            token: Resume token issued on join
+            sid: The new connection's socket ID
+
+        Returns:
+            (user ID, new token, pending events) or None if the token is unknown/expired
+        """
+        with self._lock:
+            user_id = self.tokens.get(token)
+            if user_id is None:
+                return None
+
+            session = self.suspended.pop(user_id, None)
+            pending = []
+            if session is not None:
+                session['timer'].cancel()
+                pending = list(session['pending'])
+
+            old_sid = self.current_sids.get(user_id)
+            if old_sid is not None:
+                self.connections.pop(old_sid, None)
+            if sid != user_id:
+                self.connections[sid] = user_id
+                self.current_sids[user_id] = sid
+            else:
+                self.current_sids.pop(user_id, None)
+
+            # Tokens are single-use
+            return user_id, self._issue(user_id), pending
+
+    def end(self, user_id: str):
+        """Forget a user's session entirely"""
+        with self._lock:
+            session = self.suspended.pop(user_id, None)
+            if session is not None:
+                session['timer'].cancel()
+            token = self.user_tokens.pop(user_id, None)
+            self.tokens.pop(token, None)
+            sid = self.current_sids.pop(user_id, None)
+            self.connections.pop(sid, None)
+
+    def buffer(self, event: str, data, to: Optional[str] = None, skip: Optional[str] = None) -> bool:
+        """
+        Keep an event for suspended users
+
+        Args:
+            event: Event name
+            data: Event payload
+            to: Target user ID (None = broadcast to everyone)
+            skip: User ID excluded from a broadcast
+
+        Returns:
+            True if `to` is a suspended user (so the event must not be sent now)
+        """
+        with self._lock:
+            if to is not None:
+                session = self.suspended.get(to)
+                if session is None:
+                    return False
+                session['pending'].append((event, data))
+                return True
+
+            for user_id, session in self.suspended.items():
+                if user_id != skip:
+                    session['pending'].append((event, data))
+            return False
+
+    def get_stats(self) -> Dict:
+        return {
+            'resumable_sessions': len(self.user_tokens),
+            'suspended_sessions': len(self.suspended)
+        }
+
+    def _issue(self, user_id: str) -> str:
+        self.tokens.pop(self.user_tokens.get(user_id), None)
+        token = secrets.token_urlsafe(16)
+        self.tokens[token] = user_id
+        self.user_tokens[user_id] = token
+        return token
+
+    def _expire(self, user_id: str):
+        with self._lock:
+            if user_id not in self.suspended:
+                return  # Resumed in the meantime
+        self.end(user_id)
+        if self.on_expire:
+            self.on_expire(user_id)
+
+
+# Test the session manager
+if __name__ == "__main__":
+    print("🧪 Testing Session Manager...")
+    expired = []
+    sessions = SessionManager(grace_seconds=0.2)
+    sessions.on_expire = expired.append
+
+    # Test 1: Suspend, buffer, resume on a new socket
+    token = sessions.issue("sid-1")
+    assert sessions.suspend("sid-1")
+    sessions.buffer("blockage_alert", {"location": "p134"}, to="sid-1")
+    sessions.buffer("blockage_added", {"location": "p134"})
+    user_id, new_token, pending = sessions.resume(token, "sid-2")
+    print(f"\n✅ Test 1 - Resumed {user_id} on sid-2 with {len(pending)} pending events")
+    assert user_id == "sid-1" and [e for e, _ in pending] == ["blockage_alert", "blockage_added"]
+    assert sessions.user_for("sid-2") == "sid-1" and sessions.sid_for("sid-1") == "sid-2"
+
+    # Test 2: Old token no longer works
+    assert sessions.resume(token, "sid-3") is None
+    print(f"\n✅ Test 2 - Resume tokens are single-use")
+
+    # Test 3: Grace period expires
+    assert sessions.suspend("sid-2")
+    time.sleep(0.4)
+    print(f"\n✅ Test 3 - Expired after grace period: {expired}")
+    assert expired == ["sid-1"] and sessions.resume(new_token, "sid-4") is None
+
+    # Test 4: Connections that never joined are not resumable
+    assert not sessions.suspend("sid-5")
+    print(f"\n✅ Test 4 - Stats: {sessions.get_stats()}")
+
+    print("\n✨ All tests passed!")
@@ -0,0 +1,253 @@
+"""
+Compiled navigation graph and exit distance fields in shared memory
+One process publishes, every worker process attaches and reads without copying the map
+"""
+
+from array import array
+from collections.abc import Mapping
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Set
+import hashlib
+import json
+import struct
+
+MAGIC = b'EAG1'
+UNREACHABLE = -1
+
+# magic, node count, adjacency length, exit count, id table bytes, generation, blocked fingerprint
+_HEADER = struct.Struct('<4sIIIIQQ')
+_INT = array('i').itemsize
+
+# Blocks created by this process (or the process it was forked from): their
+# tracker registration is the owner's and must stay
+_created: Set[str] = set()
+
+
+def blocked_fingerprint(blocked_nodes: Set[str]) -> int:
+    """Stable 64-bit hash of a blocked-node set (identifies which fields are current)"""
+    digest = hashlib.blake2b('\n'.join(sorted(blocked_nodes)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class SharedField(Mapping):
+    """Read-only node ID -> hops view over one exit's field (same interface as the dict fields)"""
+
+    def __init__(self, values: array, node_index: Dict[str, int]):
+        self._values = values
+        self._node_index = node_index
+
+    def __getitem__(self, node_id: str) -> int:
+        index = self._node_index.get(node_id)
+        if index is None or self._values[index] == UNREACHABLE:
+            raise KeyError(node_id)
+        return self._values[index]
+
+    def __iter__(self):
+        return (node_id for node_id, i in self._node_index.items() if self._values[i] != UNREACHABLE)
+
+    def __len__(self):
+        return sum(1 for v in self._values if v != UNREACHABLE)
+
+
+class SharedGraph:
+    """
+    CSR adjacency + per-exit hop fields in a multiprocessing.shared_memory block
+
+    Layout: header | node ID table (JSON) | offsets[n+1] | adjacency[m] | exits[k] | fields[k*n]
+
+    Fields are rewritten by a single owner (see cluster.py) under a seqlock:
+    the generation is odd while a write is in progress, so readers retry.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+
+        magic, n, m, k, ids_len, _, _ = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Shared memory block {shm.name} is not an EchoAid graph")
+
+        offset = _HEADER.size
+        self.node_ids = json.loads(bytes(shm.buf[offset:offset + ids_len]))
+        self.node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        offset += _padded(ids_len)
+
+        self._offsets = shm.buf[offset:offset + (n + 1) * _INT].cast('i')
+        offset += (n + 1) * _INT
+        self._adjacency = shm.buf[offset:offset + m * _INT].cast('i')
+        offset += m * _INT
+        exit_indices = shm.buf[offset:offset + k * _INT].cast('i')
+        self.exits = [self.node_ids[i] for i in exit_indices]
+        offset += k * _INT
+        self._fields_offset = offset
+        self._fields_bytes = k * n * _INT
+        self._fields = shm.buf[offset:offset + self._fields_bytes].cast('i')
+
+    @classmethod
+    def create(cls, pathfinder, name: Optional[str] = None) -> 'SharedGraph':
+        """
+        Compile a PathfindingEngine's graph into a new shared memory block
+
+        Args:
+            pathfinder: PathfindingEngine whose nodes/graph/exits to publish
+            name: Optional shared memory name (random if omitted)
+
+        Returns:
+            Owning SharedGraph with fields computed for "no blockages"
+        """
+        node_ids = list(pathfinder.nodes.keys())
+        node_index = {node_id: i for i, node_id in enumerate(node_ids)}
+
+        offsets = array('i', [0])
+        adjacency = array('i')
+        for node_id in node_ids:
+            adjacency.extend(node_index[nb] for nb in pathfinder.graph.get(node_id, []))
+            offsets.append(len(adjacency))
+        exits = array('i', (node_index[e] for e in pathfinder.exits))
+
+        ids = json.dumps(node_ids).encode()
+        n, m, k = len(node_ids), len(adjacency), len(exits)
+        size = (_HEADER.size + _padded(len(ids)) + (n + 1 + m + k + k * n) * _INT)
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created.add(shm._name)
+        _HEADER.pack_into(shm.buf, 0, MAGIC, n, m, k, len(ids), 0, 0)
+        offset = _HEADER.size
+        shm.buf[offset:offset + len(ids)] = ids
+        offset += _padded(len(ids))
+        for block in (offsets, adjacency, exits):
+            raw = block.tobytes()
+            shm.buf[offset:offset + len(raw)] = raw
+            offset += len(raw)
+
+        graph = cls(shm, owner=True)
+        graph.update_fields(set())
+        return graph
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedGraph':
+        """Attach to a block published by another process (read-only use)"""
+        shm = shared_memory.SharedMemory(name=name)
+        if shm._name not in _created:
+            # A worker process: the publisher owns the block, so don't let this
+            # process's tracker unlink it on exit
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def neighbors(self, index: int) -> memoryview:
+        return self._adjacency[self._offsets[index]:self._offsets[index + 1]]
+
+    def update_fields(self, blocked_nodes: Set[str]):
+        """Recompute every exit's hop field for a blocked-node set (owner only)"""
+        blocked = [False] * len(self.node_ids)
+        for node_id in blocked_nodes:
+            if node_id in self.node_index:
+                blocked[self.node_index[node_id]] = True
+
+        fields = array('i')
+        for exit_id in self.exits:
+            fields.extend(self._bfs(self.node_index[exit_id], blocked))
+
+        generation = self._header()[5]
+        self._write_generation(generation + 1, 0)  # Odd: write in progress
+        self._fields[:] = fields
+        self._write_generation(generation + 2, blocked_fingerprint(blocked_nodes))
+
+    def snapshot_fields(self, blocked_nodes: Set[str]) -> Optional[Dict[str, SharedField]]:
+        """
+        Consistent copy of the fields if they match the given blockages
+
+        Returns:
+            Dictionary of exit ID -> SharedField, or None if the shared fields
+            are mid-update or were built for a different blocked set
+        """
+        wanted = blocked_fingerprint(blocked_nodes)
+        for _ in range(3):
+            before = self._header()
+            if before[5] % 2 or before[6] != wanted:
+                return None
+            values = array('i', self._fields)
+            if self._header()[5] == before[5]:
+                break
+        else:
+            return None
+
+        n = len(self.node_ids)
+        return {
+            exit_id: SharedField(values[i * n:(i + 1) * n], self.node_index)
+            for i, exit_id in enumerate(self.exits)
+        }
+
+    def close(self):
+        # Release exported views before closing the mapping
+        for view in (self._offsets, self._adjacency, self._fields):
+            view.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            _created.discard(self.shm._name)
+
+    def _bfs(self, source: int, blocked: List[bool]) -> array:
+        hops = array('i', [UNREACHABLE]) * len(self.node_ids)
+        if blocked[source]:
+            return hops
+        hops[source] = 0
+        frontier = [source]
+        while frontier:
+            next_frontier = []
+            for current in frontier:
+                for neighbor in self.neighbors(current):
+                    if hops[neighbor] == UNREACHABLE and not blocked[neighbor]:
+                        hops[neighbor] = hops[current] + 1
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return hops
+
+    def _header(self) -> tuple:
+        return _HEADER.unpack_from(self.shm.buf, 0)
+
+    def _write_generation(self, generation: int, fingerprint: int):
+        header = list(self._header())
+        header[5], header[6] = generation, fingerprint
+        _HEADER.pack_into(self.shm.buf, 0, *header)
+
+
+def _padded(size: int) -> int:
+    """Round up so the int arrays that follow stay aligned"""
+    return (size + _INT - 1) // _INT * _INT
+
+
+# Test the shared graph
+if __name__ == "__main__":
+    import sys
+    import os
+
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from services.pathfinding import PathfindingEngine
+
+    print("🧪 Testing Shared Graph...")
+    engine = PathfindingEngine()
+    owner = SharedGraph.create(engine)
+    reader = SharedGraph.attach(owner.name)
+
+    # Test 1: Attached fields match locally computed BFS
+    fields = reader.snapshot_fields(set())
+    local = engine.exit_distance_field("p200")
+    print(f"\n✅ Test 1 - Attach {owner.name}: {len(reader.node_ids)} nodes, exits {reader.exits}")
+    assert dict(fields["p200"]) == local
+
+    # Test 2: Fields are tied to a blocked set
+    assert reader.snapshot_fields({"p134"}) is None
+    owner.update_fields({"p134"})
+    blocked_fields = reader.snapshot_fields({"p134"})
+    assert dict(blocked_fields["p200"]) == engine.exit_distance_field("p200", {"p134"})
+    print(f"\n✅ Test 2 - Fields refreshed for {{'p134'}}: p129 → p200 = {blocked_fields['p200'].get('p129')} hops")
+
+    del fields, blocked_fields
+    reader.close()
+    owner.close()
+    print("\n✨ All tests passed!")
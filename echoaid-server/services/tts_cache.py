@@ -0,0 +1,164 @@
+"""
+Content-addressed disk cache for synthesized speech
+Voice guidance comes from a few templates, so at alarm time almost every
+utterance has been synthesized before; this keeps the MP3s on disk
+"""
+
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import os
+import tempfile
+import threading
+
+
+class AudioCache:
+    """
+    MP3 files named by the hash of (voice_id, model_id, text), evicted LRU
+
+    Entries survive restarts; recency is the file's mtime, refreshed on
+    every hit, so eviction order also survives restarts. Several processes
+    may share the directory: a miss checks the disk before giving up.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024):
+        """
+        Args:
+            directory: Where the MP3 files live (created if missing)
+            max_bytes: Total size kept on disk before the least recently used go
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._size = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def key(voice_id: str, model_id: str, text: str) -> str:
+        return hashlib.sha256(f"{voice_id}\0{model_id}\0{text}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached audio, or None"""
+        with self._lock:
+            if key not in self._entries and not self._adopt(key):
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+
+        try:
+            path = self._path(key)
+            with open(path, 'rb') as f:
+                audio = f.read()
+            os.utime(path)
+            return audio
+        except OSError:
+            self._forget(key)  # Deleted behind our back
+            return None
+
+    def put(self, key: str, audio: bytes):
+        """Store audio (atomically: readers never see a partial file)"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(audio)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._size += len(audio) - self._entries.pop(key, 0)
+            self._entries[key] = len(audio)
+            evicted = self._evict()
+
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries or self._adopt(key)
+
+    def get_stats(self) -> dict:
+        return {**self.stats, 'entries': len(self._entries), 'bytes': self._size}
+
+    def _evict(self) -> list:
+        evicted = []
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            old_key, size = self._entries.popitem(last=False)
+            self._size -= size
+            evicted.append(old_key)
+        self.stats['evictions'] += len(evicted)
+        return evicted
+
+    def _adopt(self, key: str) -> bool:
+        """Index a file another process wrote (caller holds the lock)"""
+        try:
+            size = os.path.getsize(self._path(key))
+        except OSError:
+            return False
+        self._entries[key] = size
+        self._size += size
+        return True
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.mp3")
+
+    def _load(self):
+        """Index what a previous run left behind, least recently used first"""
+        found = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith('.tmp'):
+                    os.remove(path)  # Crashed mid-write
+                elif name.endswith('.mp3'):
+                    stat = os.stat(path)
+                    found.append((stat.st_mtime, name[:-4], stat.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._size += size
+        for old_key in self._evict():
+            os.remove(self._path(old_key))
+
+
+# Test the cache
+if __name__ == "__main__":
+    import time
+
+    print("🧪 Testing Audio Cache...")
+    directory = tempfile.mkdtemp(prefix='tts-cache-')
+
+    # Test 1: Same voice/model/text -> same entry
+    cache = AudioCache(directory, max_bytes=250)
+    key = AudioCache.key("rachel", "eleven_monolingual_v1", "Turn left.")
+    cache.put(key, b"x" * 100)
+    print(f"\n✅ Test 1 - Hit: {len(cache.get(key))} bytes, key {key[:12]}...")
+    assert cache.get(key) == b"x" * 100
+    assert AudioCache.key("other-voice", "eleven_monolingual_v1", "Turn left.") != key
+
+    # Test 2: Least recently used entry is evicted
+    second = AudioCache.key("rachel", "eleven_monolingual_v1", "Turn right.")
+    cache.put(second, b"y" * 100)
+    time.sleep(0.01)
+    cache.get(key)
+    cache.put(AudioCache.key("rachel", "eleven_monolingual_v1", "Exit ahead."), b"z" * 100)
+    print(f"\n✅ Test 2 - After eviction: {cache.get_stats()}")
+    assert key in cache and second not in cache
+
+    # Test 3: Entries survive a restart
+    reopened = AudioCache(directory, max_bytes=250)
+    print(f"\n✅ Test 3 - Reopened cache has {reopened.get_stats()['entries']} entries")
+    assert reopened.get(key) == b"x" * 100 and second not in reopened
+
+    print("\n✨ All tests passed!")
@@ -0,0 +1,142 @@
+"""
+Streaming voice delivery
+Speech is forwarded to phones as binary Socket.IO frames while it is being
+synthesized (or read from the cache), instead of one base64 blob at the end
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+import itertools
+import threading
+import time
+
+
+class VoiceStreamer:
+    """
+    Streams one utterance to a group of users
+
+    Each stream is `voice_start` {streamId, kind, text, mimeType}, then
+    `voice_chunk` {streamId, seq, audio: <bytes>} frames, then `voice_end`
+    {streamId, chunks, bytes, ok}. Audio travels as Socket.IO binary
+    attachments, so there is no base64 overhead.
+    """
+
+    def __init__(self, tts, enabled: bool = True, max_workers: int = 4, chunk_size: int = 4096):
+        """
+        Args:
+            tts: ElevenLabsService (stream_speech)
+            enabled: Speak at all (voice alerts can be switched off)
+            max_workers: Utterances synthesized/streamed at once
+            chunk_size: Bytes per voice_chunk frame
+        """
+        self.tts = tts
+        self.enabled = enabled
+        self.chunk_size = chunk_size
+        self.out = None  # Emitter, set by the server in use
+
+        self.stats = {'streams': 0, 'failed': 0, 'bytes': 0, 'first_chunk_ms_max': 0.0}
+        self._first_chunk_total = 0.0
+        self._ids = itertools.count(1)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='voice-stream')
+        self._lock = threading.Lock()
+
+    def bind(self, out):
+        """Set the emitter (the last server registered owns delivery)"""
+        self.out = out
+
+    def speak(self, text: str, user_ids: List[str], kind: str = 'instruction',
+              segments: Optional[List[str]] = None) -> Optional[int]:
+        """
+        Queue `text` to be streamed to every user in `user_ids`
+
+        Args:
+            segments: `text` split into pre-rendered segments, stitched instead
+                      of synthesized when they are all loaded
+
+        Returns:
+            Stream ID, or None if there is nobody to speak to
+        """
+        if not self.enabled or not user_ids or self.out is None:
+            return None
+        stream_id = next(self._ids)
+        self._pool.submit(self._stream, stream_id, text, list(user_ids), kind, segments)
+        return stream_id
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            done = stats['streams'] - stats['failed']
+            stats['first_chunk_ms_avg'] = round(self._first_chunk_total / done, 1) if done else 0.0
+        return stats
+
+    def _stream(self, stream_id: int, text: str, user_ids: List[str], kind: str,
+                segments: Optional[List[str]]):
+        started = time.perf_counter()
+        for user_id in user_ids:
+            self.out.emit('voice_start', {
+                'streamId': stream_id,
+                'kind': kind,
+                'text': text,
+                'mimeType': 'audio/mpeg'
+            }, to=user_id)
+
+        seq, sent, first_chunk_ms, ok = 0, 0, None, True
+        try:
+            for chunk in self.tts.stream_speech(text, self.chunk_size, segments):
+                if first_chunk_ms is None:
+                    first_chunk_ms = (time.perf_counter() - started) * 1000
+                frame = {'streamId': stream_id, 'seq': seq, 'audio': chunk}
+                for user_id in user_ids:
+                    self.out.emit('voice_chunk', frame, to=user_id)
+                seq += 1
+                sent += len(chunk)
+        except Exception as e:
+            ok = False
+            print(f"   ❌ Voice stream {stream_id} broke off after {seq} chunks: {e}")
+
+        for user_id in user_ids:
+            self.out.emit('voice_end', {'streamId': stream_id, 'chunks': seq, 'bytes': sent, 'ok': ok}, to=user_id)
+
+        with self._lock:
+            self.stats['streams'] += 1
+            self.stats['bytes'] += sent * len(user_ids)
+            if not ok or first_chunk_ms is None:
+                self.stats['failed'] += 1
+            else:
+                self._first_chunk_total += first_chunk_ms
+                self.stats['first_chunk_ms_max'] = round(max(self.stats['first_chunk_ms_max'], first_chunk_ms), 1)
+
+
+# Test the streamer
+if __name__ == "__main__":
+    print("🧪 Testing Voice Streamer...")
+
+    class FakeTTS:
+        def stream_speech(self, text, chunk_size, segments=None):
+            audio = text.encode() * 10
+            for start in range(0, len(audio), chunk_size):
+                yield audio[start:start + chunk_size]
+
+    class Recorder:
+        def __init__(self):
+            self.events = []
+
+        def emit(self, event, data, to=None, skip_sid=None):
+            self.events.append((event, to, data))
+
+    # Test 1: One synthesis, frames fanned out to every listener in order
+    out = Recorder()
+    streamer = VoiceStreamer(FakeTTS(), chunk_size=16)
+    streamer.bind(out)
+    streamer.speak("Blockage in front!", ["alice", "bob"], kind='blockage_alert')
+    streamer._pool.shutdown(wait=True)
+
+    alice = [(event, data) for event, to, data in out.events if to == "alice"]
+    audio = b''.join(data['audio'] for event, data in alice if event == 'voice_chunk')
+    print(f"\n✅ Test 1 - Alice got {[event for event, _ in alice][:3]}... {len(audio)} bytes")
+    assert alice[0][0] == 'voice_start' and alice[-1][0] == 'voice_end' and alice[-1][1]['ok']
+    assert audio == b"Blockage in front!" * 10
+    assert len(out.events) == 2 * len(alice)
+
+    print(f"\n✅ Test 2 - Stats: {streamer.get_stats()}")
+    print("\n✨ All tests passed!")
@@ -0,0 +1,336 @@
+"""
+Wall spatial index and position plausibility checks
+Rejects (or snaps back onto the graph) position updates that walk through walls
+"""
+
+import heapq
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import sys
+import os
+
+# Add parent directory to path to import models
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.map_data import METERS_PER_UNIT, tx, ty
+
+Point = Tuple[float, float]
+EPS = 1e-9
+
+
+def svg_walls(walls: Iterable[List[float]]) -> List[Tuple[float, float, float, float]]:
+    """Artifact walls (room space, like RAW) moved to the SVG space the nodes use"""
+    return [(tx(x1), ty(y1), tx(x2), ty(y2)) for x1, y1, x2, y2 in walls]
+
+
+def _orient(ax, ay, bx, by, cx, cy) -> float:
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def segments_intersect(a: Point, b: Point, c: Point, d: Point) -> bool:
+    """True if segment ab touches segment cd (touching and collinear overlap count)"""
+    d1 = _orient(c[0], c[1], d[0], d[1], a[0], a[1])
+    d2 = _orient(c[0], c[1], d[0], d[1], b[0], b[1])
+    d3 = _orient(a[0], a[1], b[0], b[1], c[0], c[1])
+    d4 = _orient(a[0], a[1], b[0], b[1], d[0], d[1])
+    if ((d1 > EPS and d2 < -EPS) or (d1 < -EPS and d2 > EPS)) and \
+       ((d3 > EPS and d4 < -EPS) or (d3 < -EPS and d4 > EPS)):
+        return True
+
+    def on_segment(p, q, r, o):
+        # r lies on pq, given that p, q, r are collinear
+        return abs(o) <= EPS and min(p[0], q[0]) - EPS <= r[0] <= max(p[0], q[0]) + EPS \
+            and min(p[1], q[1]) - EPS <= r[1] <= max(p[1], q[1]) + EPS
+
+    return on_segment(c, d, a, d1) or on_segment(c, d, b, d2) or \
+        on_segment(a, b, c, d3) or on_segment(a, b, d, d4)
+
+
+class WallIndex:
+    """
+    Uniform grid over wall segments
+
+    Every wall is listed in each cell its bounding box covers. A query walks
+    only the cells its own segment passes through (grid traversal), so a
+    line-of-sight check between nearby points tests a handful of walls.
+    """
+
+    def __init__(self, walls: Iterable, cell: float = 25.0):
+        """
+        Args:
+            walls: (x1, y1, x2, y2) segments
+            cell: Grid cell size, in the walls' units
+        """
+        self.walls = [tuple(map(float, w)) for w in walls]
+        self.cell = cell
+        self.cells: Dict[Tuple[int, int], List[int]] = {}
+        for i, (x1, y1, x2, y2) in enumerate(self.walls):
+            for cx in range(self._cell(min(x1, x2)), self._cell(max(x1, x2)) + 1):
+                for cy in range(self._cell(min(y1, y2)), self._cell(max(y1, y2)) + 1):
+                    self.cells.setdefault((cx, cy), []).append(i)
+
+    def _cell(self, v: float) -> int:
+        return int(math.floor(v / self.cell))
+
+    def cells_on(self, a: Point, b: Point) -> List[Tuple[int, int]]:
+        """Grid cells segment ab passes through, in order (Amanatides-Woo traversal)"""
+        cx, cy = self._cell(a[0]), self._cell(a[1])
+        end = (self._cell(b[0]), self._cell(b[1]))
+        dx, dy = b[0] - a[0], b[1] - a[1]
+        step_x = 1 if dx > 0 else -1
+        step_y = 1 if dy > 0 else -1
+        # Parameter t (0..1 along ab) at the next vertical / horizontal cell boundary
+        if dx:
+            t_x = ((cx + (step_x > 0)) * self.cell - a[0]) / dx
+            dt_x = self.cell / abs(dx)
+        else:
+            t_x = dt_x = math.inf
+        if dy:
+            t_y = ((cy + (step_y > 0)) * self.cell - a[1]) / dy
+            dt_y = self.cell / abs(dy)
+        else:
+            t_y = dt_y = math.inf
+
+        cells = [(cx, cy)]
+        while (cx, cy) != end and min(t_x, t_y) <= 1:
+            if t_x < t_y:
+                cx += step_x
+                t_x += dt_x
+            else:
+                cy += step_y
+                t_y += dt_y
+            cells.append((cx, cy))
+        return cells
+
+    def first_hit(self, a: Point, b: Point) -> Optional[int]:
+        """Index of a wall segment ab crosses, or None"""
+        seen: Set[int] = set()
+        for key in self.cells_on(a, b):
+            for i in self.cells.get(key, ()):
+                if i in seen:
+                    continue
+                seen.add(i)
+                x1, y1, x2, y2 = self.walls[i]
+                if segments_intersect(a, b, (x1, y1), (x2, y2)):
+                    return i
+        return None
+
+    def line_of_sight(self, a: Point, b: Point) -> bool:
+        """True if the straight walk a -> b crosses no wall"""
+        return self.first_hit(a, b) is None
+
+    def get_stats(self) -> Dict:
+        sizes = [len(v) for v in self.cells.values()]
+        return {
+            'walls': len(self.walls),
+            'cells': len(self.cells),
+            'max_walls_per_cell': max(sizes, default=0)
+        }
+
+
+class PositionValidator:
+    """
+    Plausibility check for each position transition of a user
+
+    A move is accepted if it follows a graph edge, or walks in a straight
+    line without crossing a wall, or can be walked along the graph in the
+    time since the last accepted position. Otherwise the user is snapped to
+    the farthest node they could have reached along the graph, or, if there
+    is no such node, the update is rejected.
+    """
+
+    def __init__(self, walls: WallIndex, pathfinder, max_speed: float = 4.0, slack: float = 10.0,
+                 meters_per_unit: float = METERS_PER_UNIT):
+        """
+        Args:
+            walls: Wall index in the nodes' (SVG) space
+            pathfinder: PathfindingEngine whose nodes and graph positions refer to
+            max_speed: Fastest plausible movement in meters per second (a hurried walk
+                is 1.5-2; 4 still allows reporting the next node halfway to it)
+            slack: Meters allowed on top of max_speed * elapsed (dead reckoning jitter)
+            meters_per_unit: Map scale (meters per SVG unit)
+        """
+        self.walls = walls
+        self.pathfinder = pathfinder
+        # Kept in SVG units, the space positions are compared in
+        self.max_speed = max_speed / meters_per_unit
+        self.slack = slack / meters_per_unit
+        self.last: Dict[str, Tuple[str, Point, float]] = {}  # user -> (node, position, time)
+        self.stats = {'checked': 0, 'accepted': 0, 'snapped': 0, 'rejected': 0, 'unchecked': 0,
+                      'check_us_total': 0.0}
+
+    def position(self, node: Optional[str], point: Optional[Point] = None) -> Optional[Point]:
+        """Coordinates of a server node, else the client-reported point (client-only waypoints)"""
+        known = self.pathfinder.nodes.get(node)
+        if known:
+            return (known['x'], known['y'])
+        if point is not None:
+            return (float(point[0]), float(point[1]))
+        return None
+
+    def check(self, user_id: str, node: str, point: Optional[Point] = None,
+              previous: Optional[str] = None, now: Optional[float] = None) -> Tuple[str, Optional[str]]:
+        """
+        Validate one position update
+
+        Args:
+            user_id: User ID
+            node: Reported node ID
+            point: Reported (x, y), for nodes the server doesn't know
+            previous: Last stored node, used when this user has no checked position yet
+            now: Time of the update (default: now)
+
+        Returns:
+            (verdict, node to store): verdict is "accepted", "snapped",
+            "rejected" (node is None) or "unchecked" (no coordinates known)
+        """
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        verdict, result = self._check(user_id, node, point, previous, now)
+        self.stats[verdict] += 1
+        self.stats['checked'] += 1
+        self.stats['check_us_total'] += (time.perf_counter() - started) * 1e6
+        return verdict, result
+
+    def forget(self, user_id: str):
+        self.last.pop(user_id, None)
+
+    def _check(self, user_id, node, point, previous, now):
+        pos = self.position(node, point)
+        if pos is None:
+            return 'unchecked', node
+
+        last = self.last.get(user_id)
+        if last is None:
+            prev_pos = self.position(previous)
+            if prev_pos is None:
+                self.last[user_id] = (node, pos, now)
+                return 'accepted', node
+            last = (previous, prev_pos, None)  # Unknown time: only walls are checked
+        prev_node, prev_pos, prev_time = last
+        budget = math.inf if prev_time is None else self.max_speed * max(now - prev_time, 0) + self.slack
+        distance = math.dist(prev_pos, pos)
+
+        graph = self.pathfinder.graph
+        if node == prev_node or (distance <= budget and (
+                node in graph.get(prev_node, ()) or self.walls.line_of_sight(prev_pos, pos))):
+            self.last[user_id] = (node, pos, now)
+            return 'accepted', node
+
+        # Through a wall or too fast: how far could they have walked along the graph?
+        path = self._walk(prev_node, node)
+        reached = prev_node
+        walked = 0.0
+        for a, b in zip(path, path[1:]):
+            walked += self._length(a, b)
+            if walked > budget:
+                break
+            reached = b
+        if reached == node:
+            self.last[user_id] = (node, pos, now)
+            return 'accepted', node
+        if reached != prev_node:
+            self.last[user_id] = (reached, self.position(reached), now)
+            return 'snapped', reached
+        return 'rejected', None
+
+    def _length(self, a: str, b: str) -> float:
+        na, nb = self.pathfinder.nodes[a], self.pathfinder.nodes[b]
+        return math.hypot(nb['x'] - na['x'], nb['y'] - na['y'])
+
+    def _walk(self, start: str, goal: str) -> List[str]:
+        """Shortest walking path between two graph nodes (empty if either is off the graph)"""
+        graph = self.pathfinder.graph
+        if start not in graph or goal not in graph:
+            return []
+        best = {start: 0.0}
+        came_from = {}
+        heap = [(0.0, start)]
+        while heap:
+            cost, current = heapq.heappop(heap)
+            if current == goal:
+                path = [goal]
+                while path[-1] != start:
+                    path.append(came_from[path[-1]])
+                return path[::-1]
+            if cost > best[current]:
+                continue
+            for neighbor in graph[current]:
+                new_cost = cost + self._length(current, neighbor)
+                if new_cost < best.get(neighbor, math.inf):
+                    best[neighbor] = new_cost
+                    came_from[neighbor] = current
+                    heapq.heappush(heap, (new_cost, neighbor))
+        return []
+
+    def get_stats(self) -> Dict:
+        checked = self.stats['checked']
+        return {
+            **{k: v for k, v in self.stats.items() if k != 'check_us_total'},
+            'avg_check_us': round(self.stats['check_us_total'] / checked, 2) if checked else 0.0,
+            'tracked_users': len(self.last)
+        }
+
+
+# Test the index and the validator
+if __name__ == "__main__":
+    print("🧪 Testing Wall Index...")
+    from models.map_artifact import load_map_artifact, floor_walls
+    from services.pathfinding import PathfindingEngine
+
+    # Test 1: Intersection primitives
+    assert segments_intersect((0, 0), (10, 10), (0, 10), (10, 0))
+    assert not segments_intersect((0, 0), (10, 0), (0, 1), (10, 1))
+    assert segments_intersect((0, 0), (10, 0), (5, 0), (5, 5))  # Touching counts
+    index = WallIndex([(0, 0, 100, 0), (50, -50, 50, 50)], cell=10)
+    assert not index.line_of_sight((10, -5), (10, 5)) and index.line_of_sight((10, 5), (40, 30))
+    assert index.cells_on((5, 5), (35, 5)) == [(0, 0), (1, 0), (2, 0), (3, 0)]
+    print("\n✅ Test 1 - Segment intersection and grid traversal")
+
+    # Test 2: Every query agrees with a brute-force scan of the real walls
+    import random
+    walls = svg_walls(floor_walls(load_map_artifact()))
+    index = WallIndex(walls)
+    rng = random.Random(7)
+    queries = [((rng.uniform(0, 1200), rng.uniform(0, 1150)), (rng.uniform(0, 1200), rng.uniform(0, 1150)))
+               for _ in range(300)]
+    queries = [(a, (a[0] + (b[0] - a[0]) * 0.1, a[1] + (b[1] - a[1]) * 0.1)) for a, b in queries] + queries
+    for a, b in queries:
+        brute = any(segments_intersect(a, b, (w[0], w[1]), (w[2], w[3])) for w in walls)
+        assert brute == (not index.line_of_sight(a, b))
+    started = time.perf_counter()
+    for a, b in queries[:300]:
+        index.line_of_sight(a, b)
+    per_query = (time.perf_counter() - started) / 300 * 1e6
+    print(f"\n✅ Test 2 - {len(queries)} queries match brute force; short line of sight in {per_query:.1f}µs "
+          f"({index.get_stats()})")
+
+    # Test 3: Walking the graph is accepted, drifting through walls is not
+    engine = PathfindingEngine()
+    validator = PositionValidator(index, engine)
+    route = engine.find_route("p129", "p200")
+    t = 1000.0
+    for prev, node in zip([route[0]] + route, route):
+        t += validator._length(prev, node) * METERS_PER_UNIT / 1.5  # Brisk walk (1.5 m/s)
+        assert validator.check("walker", node, now=t)[0] == 'accepted', node
+    print(f"\n✅ Test 3 - Walked {' → '.join(route)}: all accepted")
+
+    # Test 4: A jump across the building in a minute is snapped onto the route
+    validator.check("runner", "p131", now=t)
+    verdict, node = validator.check("runner", "p203", now=t + 60)
+    print(f"\n✅ Test 4 - p131 → p203 in 60s: {verdict} to {node}")
+    assert verdict == 'snapped' and node in engine.graph and node != "p203"
+
+    # Test 5: A client-only waypoint behind a wall is rejected; an unknown node is unchecked
+    start = engine.nodes["p129"]
+    behind = next((x, y) for x, y in ((start['x'] + dx, start['y'] + dy) for dx in range(-120, 121, 8)
+                                      for dy in range(-120, 121, 8))
+                  if not index.line_of_sight((start['x'], start['y']), (x, y)))
+    validator.check("drifter", "p129", now=t)
+    verdict, _ = validator.check("drifter", "pw999", point=behind, now=t + 2)
+    print(f"\n✅ Test 5 - Waypoint behind a wall: {verdict}; without coordinates: "
+          f"{validator.check('drifter', 'pw998', now=t + 4)[0]}")
+    assert verdict == 'rejected'
+    print(f"   Stats: {validator.get_stats()}")
+
+    print("\n✨ All tests passed!")
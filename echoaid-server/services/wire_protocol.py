@@ -0,0 +1,346 @@
+"""
+Compact binary wire encoding for routes and positions
+Negotiated per client; JSON stays the default for clients that never ask
+"""
+
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+import sys
+import os
+
+# Add parent directory to path to import models
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.map_data import NODES
+
+PROTOCOL_JSON = 'json'
+PROTOCOL_BINARY = 'binary'
+PROTOCOL_VERSION = 1
+
+# Socket.IO rooms used to fan out broadcasts in the right encoding
+ROOM_JSON = 'proto:json'
+ROOM_BINARY = 'proto:binary'
+
+# Frame type tags (first byte of every binary frame)
+FRAME_ROUTE = 1
+FRAME_POSITION = 2
+FRAME_ROUTE_DELTA = 3
+
+# Route reasons travel as a code plus an optional node instead of free text
+REASON_JOIN = 0
+REASON_MANUAL = 1
+REASON_BLOCKAGE = 2
+
+NO_NODE = 0xFFFF
+
+# Slots are uint16; each cluster worker gets an equal share so they never collide
+SLOT_SPACE = 0x10000
+
+# type, timestamp (ms since epoch in protocol_ack), destination, reason, reason node, version, node count
+_ROUTE_HEADER = struct.Struct('<BIHBHIH')
+# type, timestamp, destination, reason, reason node, base version, version, from, keep, suffix count
+_DELTA_HEADER = struct.Struct('<BIHBHIIHHH')
+# type, timestamp, user slot, node, progress
+_POSITION = struct.Struct('<BIHHH')
+
+
+def route_delta(old_route: List[str], new_route: List[str]) -> Optional[Tuple[int, int, List[str]]]:
+    """
+    Express a new route as an edit of the old one
+
+    The new route usually starts somewhere along the old one (wherever the
+    user is now), shares some nodes with it, then diverges.
+
+    Returns:
+        (start, keep, suffix) such that new == old[start:start + keep] + suffix,
+        or None if the routes share nothing worth diffing
+    """
+    if not old_route or not new_route or new_route[0] not in old_route:
+        return None
+
+    start = old_route.index(new_route[0])
+    keep = 0
+    limit = min(len(old_route) - start, len(new_route))
+    while keep < limit and old_route[start + keep] == new_route[keep]:
+        keep += 1
+
+    return start, keep, new_route[keep:]
+
+
+def apply_route_delta(old_route: List[str], start: int, keep: int, suffix: List[str]) -> List[str]:
+    """Inverse of route_delta (what clients do on route_delta)"""
+    return old_route[start:start + keep] + list(suffix)
+
+
+def worker_slots(worker_index: int, workers: int) -> Tuple[int, int]:
+    """
+    Slot range of one cluster worker (see cluster.py)
+
+    Returns:
+        (first slot, slot count)
+    """
+    if not 0 <= worker_index < workers <= SLOT_SPACE:
+        raise ValueError(f"worker {worker_index} of {workers}: need 0 <= index < workers <= {SLOT_SPACE}")
+    count = SLOT_SPACE // workers
+    return worker_index * count, count
+
+
+def describe_reason(reason: int, node: Optional[str] = None) -> str:
+    """Human-readable route reason for JSON clients and logs"""
+    if reason == REASON_BLOCKAGE:
+        return f'Rerouted due to blockage at {node}'
+    if reason == REASON_MANUAL:
+        return 'User requested reroute'
+    return 'Visual path generation'
+
+
+class WireProtocol:
+    """Per-client protocol negotiation plus binary frame encoding"""
+
+    def __init__(self, nodes: Optional[Dict] = None, slot_base: int = 0, slot_count: int = SLOT_SPACE):
+        """
+        Args:
+            nodes: Node table (index order = binary node IDs)
+            slot_base: First slot this process hands out (see worker_slots)
+            slot_count: Size of this process's slot range
+        """
+        if not 0 <= slot_base < slot_base + slot_count <= SLOT_SPACE:
+            raise ValueError(f"slot range {slot_base}+{slot_count} does not fit in uint16")
+        # Index order follows RAW, which is also the client's NAV_RAW order
+        self.node_ids = list((nodes or NODES).keys())
+        self.node_index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.epoch = time.time()
+        self.client_protocols = {}  # sid -> protocol name
+        self.slots = {}  # sid -> small integer id used in position frames
+        self._free_slots = []
+        # Each server process allocates from its own slot range (see cluster.py)
+        self._next_slot = slot_base
+        self._slot_end = slot_base + slot_count
+        self.replicator = None
+
+    def negotiate(self, sid: str, requested: str) -> dict:
+        """
+        Record the protocol a client asked for
+
+        Args:
+            sid: Socket ID
+            requested: "binary" or "json"
+
+        Returns:
+            Acknowledgement payload (includes the node table for binary clients)
+        """
+        protocol = PROTOCOL_BINARY if requested == PROTOCOL_BINARY else PROTOCOL_JSON
+        self.client_protocols[sid] = protocol
+        slot = self.slot_for(sid)
+        if self.replicator is not None:
+            self.replicator.publish('wire', 'negotiate', (sid, protocol, slot))
+
+        ack = {
+            'protocol': protocol,
+            'version': PROTOCOL_VERSION,
+            'slot': slot
+        }
+        if protocol == PROTOCOL_BINARY:
+            ack['epoch'] = self.epoch
+            ack['nodes'] = self.node_ids
+        return ack
+
+    def is_binary(self, sid: str) -> bool:
+        return self.client_protocols.get(sid) == PROTOCOL_BINARY
+
+    def room_for(self, sid: str) -> str:
+        return ROOM_BINARY if self.is_binary(sid) else ROOM_JSON
+
+    def slot_for(self, sid: str) -> Optional[int]:
+        """Get (or allocate) the compact slot number for a socket (None once the range is used up)"""
+        if sid not in self.slots:
+            if self._free_slots:
+                self.slots[sid] = self._free_slots.pop()
+            elif self._next_slot < self._slot_end:
+                self.slots[sid] = self._next_slot
+                self._next_slot += 1
+            else:
+                print(f"⚠️  Out of position slots: {sid[:8]} gets no binary position frames")
+                return None
+        return self.slots[sid]
+
+    def forget(self, sid: str):
+        """Release protocol state when a client disconnects"""
+        self.client_protocols.pop(sid, None)
+        slot = self.slots.pop(sid, None)
+        if slot is not None:
+            self._free_slots.append(slot)
+            if self.replicator is not None:
+                self.replicator.publish('wire', 'forget', (sid,))
+
+    def apply_replicated(self, op: str, args: list):
+        """Mirror another process's negotiation so routes to its clients use the right encoding"""
+        if op == 'negotiate':
+            sid, protocol, slot = args
+            self.client_protocols[sid] = protocol
+            self.slots[sid] = slot
+        elif op == 'forget':
+            self.client_protocols.pop(args[0], None)
+            self.slots.pop(args[0], None)
+
+    def encode_route(self, route: List[str], destination: Optional[str],
+                     reason: int = REASON_JOIN, reason_node: Optional[str] = None,
+                     version: int = 0) -> Optional[bytes]:
+        """
+        Pack a route as uint16 node indices
+
+        Returns:
+            Binary frame, or None if a node is unknown to the index table
+        """
+        indices = self._indices(route)
+        if indices is None:
+            return None
+
+        header = _ROUTE_HEADER.pack(
+            FRAME_ROUTE,
+            self._timestamp_ms(),
+            self._index_or_none(destination),
+            reason,
+            self._index_or_none(reason_node),
+            version,
+            len(indices)
+        )
+        return header + struct.pack(f'<{len(indices)}H', *indices)
+
+    def decode_route(self, frame: bytes) -> dict:
+        """Unpack a route frame (used by tests and tooling)"""
+        _, ts_ms, dest, reason, reason_node, version, count = _ROUTE_HEADER.unpack_from(frame)
+        indices = struct.unpack_from(f'<{count}H', frame, _ROUTE_HEADER.size)
+        return {
+            'route': [self.node_ids[i] for i in indices],
+            'destination': self._node_or_none(dest),
+            'reason': describe_reason(reason, self._node_or_none(reason_node)),
+            'version': version,
+            'timestamp': self.epoch + ts_ms / 1000.0
+        }
+
+    def encode_route_delta(self, start: int, keep: int, suffix: List[str], destination: Optional[str],
+                           reason: int, reason_node: Optional[str],
+                           base_version: int, version: int) -> Optional[bytes]:
+        """Pack a route delta (see route_delta) as a binary frame"""
+        indices = self._indices(suffix)
+        if indices is None:
+            return None
+
+        header = _DELTA_HEADER.pack(
+            FRAME_ROUTE_DELTA,
+            self._timestamp_ms(),
+            self._index_or_none(destination),
+            reason,
+            self._index_or_none(reason_node),
+            base_version,
+            version,
+            start,
+            keep,
+            len(indices)
+        )
+        return header + struct.pack(f'<{len(indices)}H', *indices)
+
+    def decode_route_delta(self, frame: bytes) -> dict:
+        """Unpack a route delta frame (used by tests and tooling)"""
+        (_, ts_ms, dest, reason, reason_node,
+         base_version, version, start, keep, count) = _DELTA_HEADER.unpack_from(frame)
+        indices = struct.unpack_from(f'<{count}H', frame, _DELTA_HEADER.size)
+        return {
+            'baseVersion': base_version,
+            'version': version,
+            'from': start,
+            'keep': keep,
+            'suffix': [self.node_ids[i] for i in indices],
+            'destination': self._node_or_none(dest),
+            'reason': describe_reason(reason, self._node_or_none(reason_node)),
+            'timestamp': self.epoch + ts_ms / 1000.0
+        }
+
+    def encode_position(self, sid: str, node_id: str, progress: int) -> Optional[bytes]:
+        """Pack a position update as a fixed 11-byte record"""
+        index = self.node_index.get(node_id)
+        slot = self.slot_for(sid)
+        if index is None or slot is None:
+            return None
+        return _POSITION.pack(FRAME_POSITION, self._timestamp_ms(), slot,
+                              index, min(max(int(progress), 0), 0xFFFF))
+
+    def decode_position(self, frame: bytes) -> Optional[Tuple[str, int]]:
+        """
+        Unpack a client position frame
+
+        Returns:
+            (node_id, progress) or None if the frame is malformed
+        """
+        if not isinstance(frame, (bytes, bytearray)) or len(frame) < _POSITION.size:
+            return None
+        frame_type, _, _, index, progress = _POSITION.unpack_from(frame)
+        if frame_type != FRAME_POSITION or index >= len(self.node_ids):
+            return None
+        return self.node_ids[index], progress
+
+    def _indices(self, route: List[str]) -> Optional[List[int]]:
+        indices = [self.node_index.get(node_id) for node_id in route]
+        return None if None in indices else indices
+
+    def _timestamp_ms(self) -> int:
+        return int((time.time() - self.epoch) * 1000) & 0xFFFFFFFF
+
+    def _index_or_none(self, node_id: Optional[str]) -> int:
+        return self.node_index.get(node_id, NO_NODE) if node_id else NO_NODE
+
+    def _node_or_none(self, index: int) -> Optional[str]:
+        return self.node_ids[index] if index < len(self.node_ids) else None
+
+
+# Test the wire protocol
+if __name__ == "__main__":
+    import json
+
+    print("🧪 Testing Wire Protocol...")
+    wire = WireProtocol()
+
+    # Test 1: Negotiation
+    ack = wire.negotiate("sid-a", PROTOCOL_BINARY)
+    print(f"\n✅ Test 1 - Negotiate: protocol={ack['protocol']}, slot={ack['slot']}, {len(ack['nodes'])} nodes")
+
+    # Test 2: Route round trip and size comparison
+    route = ["p129", "p135", "p101", "p130", "p134", "p200"]
+    frame = wire.encode_route(route, "p200", REASON_BLOCKAGE, "p100")
+    decoded = wire.decode_route(frame)
+    as_json = json.dumps({'userId': 'x' * 20, 'route': route, 'destination': 'p200',
+                          'reason': describe_reason(REASON_BLOCKAGE, 'p100'),
+                          'timestamp': time.time()})
+    print(f"\n✅ Test 2 - Route: {len(frame)} bytes binary vs {len(as_json)} bytes JSON")
+    print(f"   Decoded: {decoded['route']} ({decoded['reason']})")
+    assert decoded['route'] == route
+
+    # Test 3: Position round trip
+    pos = wire.encode_position("sid-a", "p131", 3)
+    print(f"\n✅ Test 3 - Position: {len(pos)} bytes -> {wire.decode_position(pos)}")
+    assert wire.decode_position(pos) == ("p131", 3)
+
+    # Test 4: Delta against the previous route (p134 blocked at p101: back out to exit 2)
+    rerouted = ["p101", "p135", "p129", "p131", "p201"]
+    delta = route_delta(route, rerouted)
+    frame = wire.encode_route_delta(*delta, rerouted[-1], REASON_BLOCKAGE, "p134", 1, 2)
+    decoded = wire.decode_route_delta(frame)
+    print(f"\n✅ Test 4 - Delta: from={delta[0]} keep={delta[1]} suffix={delta[2]} ({len(frame)} bytes)")
+    assert apply_route_delta(route, *delta) == rerouted
+    assert decoded['suffix'] == delta[2] and decoded['destination'] == rerouted[-1]
+
+    # Test 5: Worker slot ranges fit in uint16 for any worker count; a full range stops handing out slots
+    ranges = [worker_slots(index, 16) for index in range(16)]
+    last = WireProtocol(slot_base=ranges[-1][0], slot_count=ranges[-1][1])
+    slots = [last.slot_for(f"sid-{i}") for i in range(ranges[-1][1] + 1)]
+    print(f"\n✅ Test 5 - 16 workers: last range {ranges[-1]}, slots {slots[0]}..{slots[-2]}, then {slots[-1]}")
+    assert slots[-2] == 0xFFFF and slots[-1] is None and last.encode_position("sid-4096", "p131", 0) is None
+    for bad in [(16, 16), (0, 0)]:
+        try:
+            worker_slots(*bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+    print("\n✨ All tests passed!")